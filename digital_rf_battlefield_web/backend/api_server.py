@@ -2,7 +2,7 @@
 后端API服务器 - 基于FastAPI的仿真引擎API
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
@@ -15,6 +15,7 @@ from datetime import datetime
 import uuid
 
 from .simulation_engine import SimulationEngine
+from .history_buffer import ColumnarRingBuffer
 from .models import (
     SimulationConfig, RadarConfig, TargetConfig,
     SimulationRequest, SimulationResponse, SimulationStatus
@@ -46,6 +47,15 @@ simulation_engine = SimulationEngine()
 # 存储仿真会话
 sessions: Dict[str, Dict[str, Any]] = {}
 
+# 结果接口每页返回的最大历史记录数
+RESULTS_PAGE_SIZE = 1000
+RESULTS_MAX_PAGE_SIZE = 10000
+
+@app.on_event("shutdown")
+async def shutdown_simulation_engine():
+    """服务退出时停止仿真并清理历史数据落盘目录"""
+    simulation_engine.close()
+
 class APIResponse(BaseModel):
     """API响应模型"""
     success: bool
@@ -262,8 +272,17 @@ async def simulation_step(session_id: str):
         )
 
 @app.get("/api/simulation/results/{session_id}", response_model=APIResponse)
-async def get_simulation_results(session_id: str):
-    """获取仿真结果"""
+async def get_simulation_results(
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(RESULTS_PAGE_SIZE, ge=1, le=RESULTS_MAX_PAGE_SIZE)
+):
+    """
+    获取仿真结果
+    
+    历史数据（检测、雷达、目标、时间序列和性能历史）按[offset, offset+limit)分页返回，
+    只读取覆盖该区间的数据块；各历史数据的总条数见history_counts。
+    """
     if session_id not in sessions:
         raise HTTPException(status_code=404, detail="仿真会话不存在")
     
@@ -274,8 +293,16 @@ async def get_simulation_results(session_id: str):
         )
     
     try:
-        # 获取仿真结果
+        # 获取仿真结果（历史数据为惰性缓冲区，只读出请求的一页）
         results = simulation_engine.get_results()
+        history_counts = {}
+        for name, value in results.items():
+            if isinstance(value, ColumnarRingBuffer):
+                history_counts[name] = len(value)
+                results[name] = value.records(offset, offset + limit)
+        results['history_counts'] = history_counts
+        results['offset'] = offset
+        results['limit'] = limit
         
         return APIResponse(
             success=True,
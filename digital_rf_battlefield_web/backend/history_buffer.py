@@ -0,0 +1,250 @@
+"""
+历史数据缓冲区 - 定长列式环形缓冲区，旧数据分块落盘
+"""
+
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+# 落盘文件中各列有效位掩码的键名前缀
+_VALID_PREFIX = "__valid__."
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """将嵌套字典展平为以'.'连接的列名"""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _unflatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    """将以'.'连接的列名还原为嵌套字典"""
+    record: Dict[str, Any] = {}
+    for name, value in row.items():
+        *parents, leaf = name.split(".")
+        node = record
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return record
+
+
+class ColumnarRingBuffer:
+    """
+    定长列式环形缓冲区
+
+    每列一个预分配的NumPy数组，内存中只保留最近capacity行。每写满block_size行
+    即把该块以压缩.npz文件写入落盘目录，因此内存占用与仿真时长无关；按行号读取
+    历史时只加载覆盖所需区间的数据块。嵌套字典记录按'a.b'形式的列名展平存储。
+
+    缺失值（None或记录中缺少的列）不写入数据数组，而是记在每列的有效位掩码中，
+    随数据一起落盘；读出时列数据为numpy.ma.MaskedArray，还原为记录时缺失值为None。
+    """
+
+    def __init__(self, name: str, columns: Dict[str, Any], spill_dir: str,
+                 capacity: int = 8192, block_size: Optional[int] = None,
+                 owner: Any = None):
+        """
+        参数:
+            name: 缓冲区名称，用作落盘文件名前缀
+            columns: 列定义 {列名: dtype}，字符串列使用object
+            spill_dir: 落盘目录
+            capacity: 内存中保留的最大行数
+            block_size: 落盘块大小，须不大于capacity，默认capacity的1/4
+            owner: 管理落盘目录生命周期的对象，缓冲区存活期间保持其不被回收
+        """
+        self.name = name
+        self.columns = dict(columns)
+        self.spill_dir = spill_dir
+        self.block_size = max(1, int(block_size or capacity // 4))
+        # 容量取块大小的整数倍，保证未落盘的行不会被覆盖
+        self.capacity = max(self.block_size, -(-int(capacity) // self.block_size) * self.block_size)
+
+        self._arrays = {
+            column: np.empty(self.capacity, dtype=dtype)
+            for column, dtype in self.columns.items()
+        }
+        self._valid = {column: np.zeros(self.capacity, dtype=bool) for column in self.columns}
+        self._fill = {
+            column: "" if array.dtype == object else array.dtype.type(0)
+            for column, array in self._arrays.items()
+        }
+        self._owner = owner
+        self._total = 0
+        self._spilled = 0
+        # 最近读取的落盘块缓存: (块序号, 列数据)
+        self._cached_block = None
+
+    def __len__(self) -> int:
+        return self._total
+
+    @property
+    def spilled_rows(self) -> int:
+        """已落盘的行数"""
+        return self._spilled
+
+    def _block_path(self, block_index: int) -> str:
+        return os.path.join(self.spill_dir, f"{self.name}_{block_index:08d}.npz")
+
+    def append(self, record: Dict[str, Any]):
+        """追加一条记录（嵌套字典按列名展平，None和缺失列记为无效）"""
+        row = _flatten(record)
+        index = self._total % self.capacity
+        for column, array in self._arrays.items():
+            value = row.get(column)
+            valid = value is not None
+            array[index] = value if valid else self._fill[column]
+            self._valid[column][index] = valid
+        self._total += 1
+
+        if self._total - self._spilled == self.block_size:
+            self._spill()
+
+    def _spill(self):
+        """将最近写满的数据块写入磁盘（先写临时文件再重命名）"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        indices = np.arange(self._spilled, self._total) % self.capacity
+        block = {}
+        for column, array in self._arrays.items():
+            values = array[indices]
+            # 字符串列转为定长Unicode数组，避免以pickle方式保存object数组
+            block[column] = values.astype(str) if values.dtype == object else values
+            block[_VALID_PREFIX + column] = self._valid[column][indices]
+        path = self._block_path(self._spilled // self.block_size)
+        fd, tmp_path = tempfile.mkstemp(dir=self.spill_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **block)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._spilled = self._total
+
+    def _read_memory(self, start: int, stop: int) -> Dict[str, np.ma.MaskedArray]:
+        """读取仍在内存中的[start, stop)行"""
+        indices = np.arange(start, stop) % self.capacity
+        return {
+            column: np.ma.MaskedArray(array[indices], mask=~self._valid[column][indices])
+            for column, array in self._arrays.items()
+        }
+
+    def _load_block(self, block_index: int) -> Dict[str, np.ma.MaskedArray]:
+        if self._cached_block is None or self._cached_block[0] != block_index:
+            with np.load(self._block_path(block_index), allow_pickle=False) as data:
+                block = {
+                    column: np.ma.MaskedArray(data[column], mask=~data[_VALID_PREFIX + column])
+                    for column in self.columns
+                }
+            self._cached_block = (block_index, block)
+        return self._cached_block[1]
+
+    def iter_blocks(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, np.ma.MaskedArray]]:
+        """
+        按块惰性读取[start, stop)区间的列数据
+
+        仍在内存中的行直接从环形缓冲区读取，其余行逐块从磁盘加载。
+        """
+        stop = self._total if stop is None else min(stop, self._total)
+        memory_start = self._total - min(self._total, self.capacity)
+        position = max(0, start)
+        while position < stop:
+            if position >= memory_start:
+                yield self._read_memory(position, stop)
+                return
+            block_index = position // self.block_size
+            block_start = block_index * self.block_size
+            block_stop = min(block_start + self.block_size, stop, memory_start)
+            block = self._load_block(block_index)
+            yield {
+                column: values[position - block_start:block_stop - block_start]
+                for column, values in block.items()
+            }
+            position = block_stop
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ma.MaskedArray]:
+        """读取[start, stop)区间为列字典（缺失值被掩码）"""
+        blocks = list(self.iter_blocks(start, stop))
+        if not blocks:
+            return {
+                column: np.ma.MaskedArray(np.empty(0, dtype=dtype), mask=np.zeros(0, dtype=bool))
+                for column, dtype in self.columns.items()
+            }
+        return {
+            column: np.ma.concatenate([block[column] for block in blocks])
+            for column in self.columns
+        }
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """按行惰性迭代记录（还原为嵌套字典，缺失值为None）"""
+        for block in self.iter_blocks(start, stop):
+            columns = list(block)
+            for values in zip(*(block[column].tolist() for column in columns)):
+                yield _unflatten(dict(zip(columns, values)))
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """读取[start, stop)区间为记录列表"""
+        return list(self.iter_records(start, stop))
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """最近n条记录"""
+        return self.records(max(0, self._total - n))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_records()
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._total)
+            if step != 1:
+                return self.records(start, stop)[::step]
+            return self.records(start, stop)
+        if key < 0:
+            key += self._total
+        if not 0 <= key < self._total:
+            raise IndexError(f"{self.name} 索引越界: {key}")
+        return self.records(key, key + 1)[0]
+
+
+class SimulationHistory:
+    """
+    一次仿真的全部历史缓冲区，共享同一个落盘目录
+
+    自行创建的落盘目录在close()或对象被回收（包括解释器退出）时删除；
+    缓冲区持有本对象的引用，仍有缓冲区被使用时目录不会被删除。
+    """
+
+    def __init__(self, schemas: Dict[str, Dict[str, Any]], capacity: int = 8192,
+                 spill_dir: Optional[str] = None):
+        """
+        参数:
+            schemas: {缓冲区名称: 列定义}
+            capacity: 每个缓冲区内存中保留的最大行数
+            spill_dir: 落盘目录，默认在系统临时目录下新建
+        """
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="rf_battlefield_history_")
+        self._finalizer = (
+            weakref.finalize(self, shutil.rmtree, self.spill_dir, ignore_errors=True)
+            if spill_dir is None else None
+        )
+        self.buffers = {
+            name: ColumnarRingBuffer(name, columns, self.spill_dir, capacity, owner=self)
+            for name, columns in schemas.items()
+        }
+
+    def __getitem__(self, name: str) -> ColumnarRingBuffer:
+        return self.buffers[name]
+
+    def close(self):
+        """删除落盘数据（可重复调用）"""
+        if self._finalizer is not None:
+            self._finalizer()
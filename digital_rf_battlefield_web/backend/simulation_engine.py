@@ -4,24 +4,116 @@
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Deque, List, Dict, Any, Optional, Tuple
+from collections import deque
 from datetime import datetime
 import time
 import threading
 import logging
 from dataclasses import dataclass, field
 from enum import Enum
+import itertools
 import json
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 
 from .models import (
     SimulationConfig, RadarConfig, TargetConfig,
     DetectionResult, TrackResult, PerformanceMetrics
 )
+from .history_buffer import SimulationHistory
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 航迹关联波门半径（km），以航迹预测位置为中心
+TRACK_GATE_KM = 5.0
+
+# 同一步内相距小于该距离（km）的检测视为同一目标的多雷达量测并合并
+TRACK_MERGE_KM = 0.5
+
+# 1度纬度对应的距离（km）
+_KM_PER_DEG = 111.32
+
+# 1节对应的速度（km/s）
+_KTS_TO_KM_S = 0.514444 / 1000.0
+
+# 航迹超过该时长（秒）未更新即判为丢失
+TRACK_TIMEOUT_S = 5.0
+
+# 每类历史数据在内存中保留的最大行数，更早的数据分块落盘
+HISTORY_CAPACITY = 8192
+
+# 每条航迹对象保留的最近航迹点数，完整航迹点序列记入track_points历史
+TRACK_POINTS_WINDOW = 50
+
+# 内存中保留的最近航迹对象数（活动航迹始终保留在跟踪器中）
+TRACK_CAPACITY = 1000
+
+_POSITION_COLUMNS = {
+    'position.latitude': float,
+    'position.longitude': float,
+    'position.altitude': float
+}
+
+_METRIC_COLUMNS = [
+    'detection_probability', 'false_alarm_rate', 'snr_threshold_db',
+    'track_continuity', 'position_error_m', 'track_lifetime_s', 'initiation_time_s',
+    'system_load', 'throughput', 'cpu_usage', 'memory_usage',
+    'fusion_gain', 'fusion_delay_s', 'fusion_consistency'
+]
+
+# 各历史缓冲区的列定义，嵌套字段以'.'连接
+HISTORY_SCHEMAS = {
+    'detections': {
+        'detection_id': object,
+        'radar_id': object,
+        'target_id': object,
+        'timestamp': float,
+        **_POSITION_COLUMNS,
+        'snr_db': float,
+        'range_km': float,
+        'azimuth_deg': float,
+        'elevation_deg': float,
+        'confidence': float
+    },
+    'radar_data': {
+        'radar_id': object,
+        'timestamp': float,
+        'detections': np.int64,
+        'load': float
+    },
+    'target_data': {
+        'target_id': object,
+        'timestamp': float,
+        **_POSITION_COLUMNS,
+        'speed_kts': float,
+        'heading_deg': float,
+        'altitude_m': float
+    },
+    'time_series_data': {
+        'timestamp': float,
+        'detection_probability': float,
+        'false_alarm_rate': float,
+        'track_continuity': float,
+        'system_load': float,
+        'cpu_usage': float,
+        'memory_usage': float
+    },
+    'performance_history': {
+        'timestamp': float,
+        **{f'metrics.{name}': float for name in _METRIC_COLUMNS}
+    },
+    'track_points': {
+        'track_id': object,
+        'target_id': object,
+        'timestamp': float,
+        **_POSITION_COLUMNS
+    }
+}
+
 class SimulationState(Enum):
     """仿真状态枚举"""
     INITIALIZED = "initialized"
@@ -33,13 +125,51 @@ class SimulationState(Enum):
 
 @dataclass
 class SimulationData:
-    """仿真数据容器"""
-    detections: List[DetectionResult] = field(default_factory=list)
-    tracks: List[TrackResult] = field(default_factory=list)
+    """
+    仿真数据容器
+    
+    检测、雷达、目标、时间序列、性能历史和航迹点保存在定长列式环形缓冲区中，
+    超出内存容量的旧数据分块落盘，长时间仿真的内存占用保持恒定。航迹对象只保留
+    最近TRACK_CAPACITY条，每条只保留最近TRACK_POINTS_WINDOW个点。
+    """
+    history: SimulationHistory = field(
+        default_factory=lambda: SimulationHistory(HISTORY_SCHEMAS, HISTORY_CAPACITY)
+    )
+    tracks: Deque[TrackResult] = field(default_factory=lambda: deque(maxlen=TRACK_CAPACITY))
+    track_count: int = 0
     performance_metrics: PerformanceMetrics = field(default_factory=dict)
-    radar_data: List[Dict[str, Any]] = field(default_factory=list)
-    target_data: List[Dict[str, Any]] = field(default_factory=list)
-    time_series_data: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @property
+    def detections(self):
+        return self.history['detections']
+    
+    @property
+    def radar_data(self):
+        return self.history['radar_data']
+    
+    @property
+    def target_data(self):
+        return self.history['target_data']
+    
+    @property
+    def time_series_data(self):
+        return self.history['time_series_data']
+    
+    @property
+    def performance_history(self):
+        return self.history['performance_history']
+    
+    @property
+    def track_points(self):
+        return self.history['track_points']
+    
+    def recent_tracks(self, n: int) -> List[TrackResult]:
+        """最近起始的n条航迹"""
+        return list(itertools.islice(reversed(self.tracks), n))[::-1]
+    
+    def close(self):
+        """释放落盘数据"""
+        self.history.close()
 
 class SimulationEngine:
     """仿真引擎主类"""
@@ -53,7 +183,7 @@ class SimulationEngine:
         self.radars = []
         self.targets = []
         self.data = SimulationData()
-        self.performance_history = []
+        self._reset_tracker()
         
         # 线程控制
         self.simulation_thread = None
@@ -72,7 +202,9 @@ class SimulationEngine:
             self.simulation_config = config
             self.radars = []
             self.targets = []
+            self.data.close()
             self.data = SimulationData()
+            self._reset_tracker()
             self.current_time = 0.0
             self.progress = 0.0
             self.state = SimulationState.INITIALIZED
@@ -184,8 +316,20 @@ class SimulationEngine:
             logger.error(f"仿真运行错误: {e}")
             self.state = SimulationState.ERROR
     
+    def _reset_tracker(self):
+        """重置跟踪器状态"""
+        # 活动航迹（按航迹ID索引）及其局部坐标状态: 航迹ID -> (位置km, 速度km/s, 时间)
+        self._active_tracks: Dict[str, TrackResult] = {}
+        self._track_states: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        # 局部坐标参考原点(纬度, 经度)，由首批检测确定，整个仿真过程中固定
+        self._track_origin: Optional[Tuple[float, float]] = None
+        # 当前仿真步产生的检测
+        self._step_detections: List[DetectionResult] = []
+    
     def _simulation_step(self, time_step: float):
         """执行仿真步骤"""
+        self._step_detections = []
+        
         # 更新目标位置
         self._update_targets(time_step)
         
@@ -290,7 +434,8 @@ class SimulationEngine:
                             confidence=detection_prob
                         )
                         
-                        self.data.detections.append(detection)
+                        self.data.detections.append(detection.dict())
+                        self._step_detections.append(detection)
                         radar_detections += 1
             
             # 记录雷达数据
@@ -361,68 +506,156 @@ class SimulationEngine:
         
         return (azimuth_deg + 360) % 360
     
+    def _to_local_km(self, positions: List[Any]) -> np.ndarray:
+        """
+        将经纬度位置投影到以跟踪参考原点为中心的局部平面坐标（km）
+        
+        所有位置使用同一原点及原点处的经度缩放系数（等距圆柱投影），
+        首次调用时以该批位置的平均经纬度作为原点
+        """
+        lat = np.array([p.latitude for p in positions], dtype=float)
+        lon = np.array([p.longitude for p in positions], dtype=float)
+        alt = np.array([p.altitude for p in positions], dtype=float)
+        if self._track_origin is None:
+            self._track_origin = (float(lat.mean()), float(lon.mean()))
+        lat0, lon0 = self._track_origin
+        # 经度差折算到[-180, 180)，跨越日界线时保持连续
+        delta_lon = (lon - lon0 + 180.0) % 360.0 - 180.0
+        return np.column_stack([
+            delta_lon * _KM_PER_DEG * np.cos(np.radians(lat0)),
+            (lat - lat0) * _KM_PER_DEG,
+            alt / 1000.0
+        ])
+    
     def _perform_tracking(self):
-        """执行目标跟踪"""
-        # 简化跟踪算法
-        current_detections = [d for d in self.data.detections 
-                             if abs(d.timestamp - self.current_time) < 1.0]
-        
-        for detection in current_detections:
-            # 查找现有航迹
-            track_found = False
-            for track in self.data.tracks:
-                if track.target_id == detection.target_id and self.current_time - track.last_update < 5.0:
-                    # 更新现有航迹
-                    track.positions.append(detection.position)
-                    track.timestamps.append(self.current_time)
-                    track.last_update = self.current_time
-                    track.confidence = 0.9
-                    track_found = True
-                    break
-            
-            if not track_found:
-                # 创建新航迹
-                track = TrackResult(
-                    track_id=f"trk_{len(self.data.tracks)+1:06d}",
-                    target_id=detection.target_id,
-                    positions=[detection.position],
-                    timestamps=[self.current_time],
-                    confidence=0.7,
-                    start_time=self.current_time,
-                    last_update=self.current_time,
-                    status="active"
-                )
-                self.data.tracks.append(track)
-        
-        # 更新航迹状态
-        for track in self.data.tracks:
-            if self.current_time - track.last_update > 5.0:
+        """
+        执行目标跟踪（增量式）
+        
+        只处理当前仿真步的检测，活动航迹按航迹ID保存在字典中。多部雷达对同一
+        目标的检测先按TRACK_MERGE_KM合并为一个量测；在航迹预测位置上建立KD树，
+        取波门内的(量测, 航迹)候选对。波门随航迹未更新时长按场景最大目标速度
+        扩展，上限为TRACK_GATE_KM，避免密集编队中相邻目标互相抢占量测。候选对
+        优先匹配航迹目标ID与量测目标ID一致者，其次按距离由近到远贪心分配，
+        每条航迹、每个量测至多配对一次；未配对的量测起始新航迹。每步开销只与
+        当前检测数和活动航迹数有关。
+        """
+        # 超时航迹判为丢失并移出活动集合
+        for track_id, track in list(self._active_tracks.items()):
+            if self.current_time - track.last_update > TRACK_TIMEOUT_S:
                 track.status = "lost"
                 track.confidence *= 0.9
+                del self._active_tracks[track_id]
+                del self._track_states[track_id]
+        
+        detections = self._step_detections
+        if not detections:
+            return
+        
+        detection_xyz = self._to_local_km([d.position for d in detections])
+        
+        # 合并同一目标的多雷达检测，每个连通分量取第一个检测作为量测
+        pairs = cKDTree(detection_xyz).query_pairs(TRACK_MERGE_KM, output_type='ndarray')
+        n = len(detections)
+        graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        _, measurements = np.unique(labels, return_index=True)
+        measurement_xyz = detection_xyz[measurements]
+        
+        # 航迹预测位置（匀速外推）上建立KD树，波门内候选对按距离由近到远分配
+        track_ids = list(self._active_tracks)
+        assigned: Dict[str, int] = {}
+        used = np.zeros(len(measurements), dtype=bool)
+        if track_ids:
+            states = [self._track_states[t] for t in track_ids]
+            elapsed = np.array([self.current_time - timestamp for _, _, timestamp in states])
+            predicted = np.array([
+                position + velocity * dt for (position, velocity, _), dt in zip(states, elapsed)
+            ])
+            max_speed_km_s = max(t.speed_kts for t in self.targets) * _KTS_TO_KM_S if self.targets else 0.0
+            gates = np.minimum(TRACK_MERGE_KM + max_speed_km_s * elapsed, TRACK_GATE_KM)
+            candidates = cKDTree(measurement_xyz).sparse_distance_matrix(
+                cKDTree(predicted), TRACK_GATE_KM, output_type='ndarray'
+            )
+            candidates = candidates[candidates['v'] <= gates[candidates['j']]]
+            # 航迹目标ID与量测目标ID不一致的候选对排在一致者之后
+            mismatch = np.array([
+                self._active_tracks[track_ids[j]].target_id != detections[measurements[m]].target_id
+                for m, j in zip(candidates['i'], candidates['j'])
+            ], dtype=bool)
+            for k in np.lexsort((candidates['v'], mismatch)):
+                m, j = int(candidates['i'][k]), int(candidates['j'][k])
+                if used[m] or track_ids[j] in assigned:
+                    continue
+                assigned[track_ids[j]] = m
+                used[m] = True
+        
+        for track_id, m in assigned.items():
+            # 更新现有航迹
+            detection = detections[measurements[m]]
+            xyz = measurement_xyz[m]
+            track = self._active_tracks[track_id]
+            last_xyz, last_velocity, last_time = self._track_states[track_id]
+            dt = self.current_time - last_time
+            velocity = (xyz - last_xyz) / dt if dt > 0 else last_velocity
+            track.positions.append(detection.position)
+            track.timestamps.append(self.current_time)
+            del track.positions[:-TRACK_POINTS_WINDOW], track.timestamps[:-TRACK_POINTS_WINDOW]
+            self._record_track_point(track, detection)
+            track.last_update = self.current_time
+            track.confidence = 0.9
+            self._track_states[track_id] = (xyz, velocity, self.current_time)
+        
+        for m in np.flatnonzero(~used):
+            # 波门内无可用航迹的量测起始新航迹
+            detection = detections[measurements[m]]
+            self.data.track_count += 1
+            track = TrackResult(
+                track_id=f"trk_{self.data.track_count:06d}",
+                target_id=detection.target_id,
+                positions=[detection.position],
+                timestamps=[self.current_time],
+                confidence=0.7,
+                start_time=self.current_time,
+                last_update=self.current_time,
+                status="active"
+            )
+            self.data.tracks.append(track)
+            self._record_track_point(track, detection)
+            self._active_tracks[track.track_id] = track
+            self._track_states[track.track_id] = (measurement_xyz[m], np.zeros(3), self.current_time)
+    
+    def _record_track_point(self, track: TrackResult, detection: DetectionResult):
+        """将航迹点记入track_points历史"""
+        self.data.track_points.append({
+            'track_id': track.track_id,
+            'target_id': track.target_id,
+            'timestamp': self.current_time,
+            'position': detection.position.dict()
+        })
     
     def _calculate_performance_metrics(self):
         """计算性能指标"""
-        if not self.data.detections:
+        if len(self.data.detections) == 0:
             return
         
         # 计算检测性能
         total_targets = len(self.targets)
-        detected_targets = len(set([d.target_id for d in self.data.detections 
-                                   if abs(d.timestamp - self.current_time) < 1.0]))
+        detected_targets = len(set(d.target_id for d in self._step_detections))
         detection_prob = detected_targets / total_targets if total_targets > 0 else 0.0
         
         # 计算虚警率（简化）
         false_alarm_rate = 1e-4 + np.random.normal(0, 1e-5)
         
-        # 计算跟踪性能
-        active_tracks = [t for t in self.data.tracks if t.status == "active"]
-        track_continuity = len(active_tracks) / total_targets if total_targets > 0 else 0.0
+        # 计算跟踪性能：被活动航迹覆盖的目标占比，同一目标的多条航迹只计一次
+        tracked_targets = len(set(t.target_id for t in self._active_tracks.values()))
+        track_continuity = min(tracked_targets / total_targets, 1.0) if total_targets > 0 else 0.0
         
         # 计算位置误差（简化）
         position_error = 50.0 + np.random.normal(0, 10)
         
         # 计算系统性能
-        system_load = np.mean([r.get('load', 0) for r in self.data.radar_data[-10:]]) if self.data.radar_data else 0.0
+        recent_radar_data = self.data.radar_data.tail(10)
+        system_load = np.mean([r.get('load', 0) for r in recent_radar_data]) if recent_radar_data else 0.0
         
         # 创建性能指标
         metrics = PerformanceMetrics(
@@ -443,7 +676,7 @@ class SimulationEngine:
         )
         
         self.data.performance_metrics = metrics
-        self.performance_history.append({
+        self.data.performance_history.append({
             'timestamp': self.current_time,
             'metrics': metrics.dict()
         })
@@ -482,6 +715,13 @@ class SimulationEngine:
         self.state = SimulationState.STOPPED
         logger.info("仿真停止")
     
+    def close(self):
+        """停止仿真并删除历史数据的落盘文件"""
+        self.stop()
+        if self.simulation_thread and self.simulation_thread.is_alive():
+            self.simulation_thread.join()
+        self.data.close()
+    
     def step(self) -> Dict[str, Any]:
         """执行一步仿真（手动控制）"""
         if self.state not in [SimulationState.INITIALIZED, SimulationState.PAUSED]:
@@ -503,10 +743,10 @@ class SimulationEngine:
             return {
                 'current_time': self.current_time,
                 'progress': self.progress,
-                'radar_data': self.data.radar_data[-len(self.radars):] if self.data.radar_data else [],
-                'target_data': self.data.target_data[-len(self.targets):] if self.data.target_data else [],
-                'detections': [d.dict() for d in self.data.detections[-100:]],
-                'tracks': [t.dict() for t in self.data.tracks[-50:]],
+                'radar_data': self.data.radar_data.tail(len(self.radars)),
+                'target_data': self.data.target_data.tail(len(self.targets)),
+                'detections': self.data.detections.tail(100),
+                'tracks': [t.dict() for t in self.data.recent_tracks(50)],
                 'performance_metrics': self.data.performance_metrics.dict() if self.data.performance_metrics else {}
             }
             
@@ -523,18 +763,29 @@ class SimulationEngine:
             'radar_count': len(self.radars),
             'target_count': len(self.targets),
             'detection_count': len(self.data.detections),
-            'track_count': len(self.data.tracks)
+            'track_count': self.data.track_count
         }
     
-    def get_results(self) -> Dict[str, Any]:
-        """获取仿真结果"""
+    def get_results(self, lazy: bool = True) -> Dict[str, Any]:
+        """
+        获取仿真结果
+        
+        参数:
+            lazy: 默认历史数据直接返回列式缓冲区（支持len、切片和迭代，
+                  落盘部分按块惰性读取）；为False时全部读出为记录列表
+        """
+        history = {
+            name: buffer if lazy else buffer.records()
+            for name, buffer in self.data.history.buffers.items()
+        }
         return {
             'simulation_config': self.simulation_config.dict() if self.simulation_config else {},
             'performance_metrics': self.data.performance_metrics.dict() if self.data.performance_metrics else {},
-            'time_series_data': self.data.time_series_data,
-            'detections': [d.dict() for d in self.data.detections],
+            'time_series_data': history['time_series_data'],
+            'detections': history['detections'],
             'tracks': [t.dict() for t in self.data.tracks],
-            'radar_data': self.data.radar_data,
-            'target_data': self.data.target_data,
-            'performance_history': self.performance_history
-        }
\ No newline at end of file
+            'track_points': history['track_points'],
+            'radar_data': history['radar_data'],
+            'target_data': history['target_data'],
+            'performance_history': history['performance_history']
+        }
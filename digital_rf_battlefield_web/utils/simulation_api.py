@@ -108,14 +108,15 @@ class SimulationEngine:
             logger.error(f"停止仿真请求失败: {e}")
             return False
     
-    def get_results(self) -> Dict[str, Any]:
-        """获取仿真结果"""
+    def get_results(self, offset: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """获取仿真结果（历史数据按[offset, offset+limit)分页）"""
         if not self.session_id:
             return {}
         
         try:
             response = requests.get(
                 f"{self.base_url}/api/simulation/results/{self.session_id}",
+                params={"offset": offset, "limit": limit},
                 timeout=10
             )
             
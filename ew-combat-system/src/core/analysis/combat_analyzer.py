@@ -63,7 +63,7 @@ class CombatAnalyzer:
             return 0.0
     
     def calculate_cooperative_effect(self, radar, jamming_assignments: List[Dict], 
-                                   jammers: List) -> float:
+                                   jammers: List, assigned_targets: Optional[int] = None) -> float:
         """
         计算协同干扰效果（多干扰机对单雷达）
         
@@ -71,10 +71,15 @@ class CombatAnalyzer:
             radar: 目标雷达
             jamming_assignments: 干扰分配列表
             jammers: 干扰机列表
+            assigned_targets: 分配总数，默认为len(jamming_assignments)；
+                              只传入该雷达的分配时需显式给出
             
         返回:
             协同干扰效果因子
         """
+        if assigned_targets is None:
+            assigned_targets = len(jamming_assignments)
+        
         try:
             total_effect = 0.0
             active_techniques = []
@@ -89,7 +94,7 @@ class CombatAnalyzer:
                         
                         # 计算单个干扰效果
                         individual_effect = self.calculate_jamming_effectiveness(
-                            radar, jammer, technique, bw_type, len(jamming_assignments)
+                            radar, jammer, technique, bw_type, assigned_targets
                         )
                         
                         # 考虑技术交互
@@ -139,9 +144,17 @@ class CombatAnalyzer:
                     'bw_type': assignment.get('bw_type', 'M')
                 })
         
+        # 按目标雷达分组，每部雷达只遍历针对它的分配
+        assignments_by_target: Dict[Any, List[Dict]] = {}
+        for assignment in jamming_assignments:
+            assignments_by_target.setdefault(assignment['target_id'], []).append(assignment)
+        
         # 计算每个雷达的效果
         for radar in radars:
-            radar_effect = self.calculate_cooperative_effect(radar, jamming_assignments, jammers)
+            radar_effect = self.calculate_cooperative_effect(
+                radar, assignments_by_target.get(radar.id, []), jammers,
+                assigned_targets=len(jamming_assignments)
+            )
             results['radar_effects'][radar.id] = radar_effect
             results['total_effectiveness'] += radar_effect
             
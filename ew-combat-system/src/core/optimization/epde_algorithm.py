@@ -7,20 +7,39 @@
 import numpy as np
 import time
 from typing import List, Dict, Any, Tuple, Optional
-import random
 from ..analysis.combat_analyzer import CombatAnalyzer
 from ..entities.radar_enhanced import EnhancedRadar
 
+# 查表评估所复现的对抗分析器方法，分析器重写其中任一方法时逐个体调用分析器评估
+_REFERENCE_METHODS = (
+    'evaluate_assignment_effectiveness',
+    'calculate_cooperative_effect',
+    'calculate_jamming_effectiveness'
+)
+
+
+def _uses_reference_model(combat_analyzer) -> bool:
+    """判断对抗分析器是否使用CombatAnalyzer自身的效果计算方法"""
+    cls = type(combat_analyzer)
+    return all(getattr(cls, name, None) is getattr(CombatAnalyzer, name) for name in _REFERENCE_METHODS)
+
+
 class EPDEOptimizer:
     """
     扩展置换差分进化算法
     用于解决干扰资源分配的组合优化问题
     基于文章中的ePDE算法实现
+    
+    种群以二维整数矩阵表示，形状为(种群大小, 3 × 干扰机数)，每行依次为
+    各干扰机的目标雷达索引、干扰技术索引和带宽类型索引，-1表示未分配。
+    变异、交叉、修复和约束惩罚均按整个种群做数组运算。适应度由对抗分析器的
+    阶段有效性、带宽调整、距离、功率和技术交互因子预先制表后对整个种群查表计算，
+    与逐个体调用CombatAnalyzer.evaluate_assignment_effectiveness的结果一致。
     """
     
-    def __init__(self, population_size: int = 50, max_generations: int = 100, 
+    def __init__(self, population_size: int = 50, max_generations: int = 100,
                  crossover_rate: float = 0.9, scaling_factor: float = 0.5,
-                 time_limit: float = 1.0):
+                 time_limit: float = 1.0, seed: Optional[int] = None):
         """
         初始化ePDE优化器
         
@@ -30,18 +49,26 @@ class EPDEOptimizer:
             crossover_rate: 交叉概率
             scaling_factor: 缩放因子
             time_limit: 时间限制(秒)
+            seed: 随机种子
         """
         self.population_size = population_size
         self.max_generations = max_generations
         self.cr = crossover_rate
         self.f = scaling_factor
         self.time_limit = time_limit
+        self.rng = np.random.default_rng(seed)
+        
+        # 适应度缓存（以个体编码行的字节串索引，每次优化开始时清空）
+        self._fitness_cache: Dict[bytes, float] = {}
+        self.evaluation_stats = {'evaluations': 0, 'cache_hits': 0}
+        # 适应度查表所用的效果因子表: (场景, 对抗分析器, 因子表)
+        self._effect_tables_context = None
         
         # 干扰技术选项
         self.jamming_techniques = ['NJ', 'CP', 'MFT', 'RGPO', 'VGPO']
         self.bandwidth_types = ['N', 'M', 'W']
-        
-    def optimize(self, scenario, combat_analyzer: CombatAnalyzer) -> Tuple[Dict, float]:
+    
+    def optimize(self, scenario, combat_analyzer: CombatAnalyzer) -> Tuple[Dict, float, List[Dict]]:
         """
         主优化函数 - 在1秒内找到最优干扰分配
         
@@ -50,14 +77,25 @@ class EPDEOptimizer:
             combat_analyzer: 对抗分析器
             
         返回:
-            Tuple[最优分配, 最优适应度]
+            Tuple[最优分配, 最优适应度, 逐代收敛记录]
         """
         start_time = time.time()
+        self._fitness_cache = {}
+        self.evaluation_stats = {'evaluations': 0, 'cache_hits': 0}
+        self._effect_tables_context = None
+        
+        if not scenario['jammers']:
+            # 无干扰机可分配，空分配即唯一解
+            empty = np.zeros((1, 0), dtype=np.int64)
+            return {}, float(self._evaluate_fitness(empty, scenario, combat_analyzer)[0]), []
         
         # 初始化种群
         population = self._initialize_population(scenario)
-        best_solution = None
-        best_fitness = float('-inf')
+        fitness = self._evaluate_population(population, scenario, combat_analyzer)
+        # 以初始种群的最优个体作为起点，时间限制在第一代前到达时也有可用解
+        initial_best = int(np.argmax(fitness))
+        best_row = population[initial_best].copy()
+        best_fitness = float(fitness[initial_best])
         convergence_data = []
         
         print(f"开始ePDE优化: 种群大小={self.population_size}, 时间限制={self.time_limit}s")
@@ -68,38 +106,28 @@ class EPDEOptimizer:
                 print(f"时间限制到达，停止优化。当前代数: {generation}")
                 break
             
-            new_population = []
-            generation_fitness = []
+            # 1. 变异操作
+            mutants = self._mutation(population)
             
-            for i, individual in enumerate(population):
-                # 1. 变异操作
-                mutant = self._mutation(population, i)
-                
-                # 2. 交叉操作
-                trial = self._crossover(individual, mutant)
-                
-                # 3. 修复无效解
-                trial = self._repair_solution(trial, scenario)
-                
-                # 4. 评估适应度
-                individual_fitness = self._evaluate_fitness(individual, scenario, combat_analyzer)
-                trial_fitness = self._evaluate_fitness(trial, scenario, combat_analyzer)
-                
-                generation_fitness.append(individual_fitness)
-                
-                # 5. 选择操作
-                if trial_fitness > individual_fitness:
-                    new_population.append(trial)
-                    if trial_fitness > best_fitness:
-                        best_fitness = trial_fitness
-                        best_solution = trial.copy()
-                else:
-                    new_population.append(individual)
-                    if individual_fitness > best_fitness:
-                        best_fitness = individual_fitness
-                        best_solution = individual.copy()
+            # 2. 交叉操作
+            trials = self._crossover(population, mutants)
             
-            population = new_population
+            # 3. 修复无效解
+            trials = self._repair_solution(trials, scenario)
+            
+            # 4. 评估试验个体适应度（存活个体的适应度沿用上一代结果）
+            trial_fitness = self._evaluate_population(trials, scenario, combat_analyzer)
+            generation_fitness = fitness
+            
+            # 5. 选择操作
+            improved = trial_fitness > fitness
+            population = np.where(improved[:, None], trials, population)
+            fitness = np.where(improved, trial_fitness, fitness)
+            
+            generation_best = int(np.argmax(fitness))
+            if fitness[generation_best] > best_fitness:
+                best_fitness = float(fitness[generation_best])
+                best_row = population[generation_best].copy()
             
             # 记录收敛数据
             avg_fitness = np.mean(generation_fitness)
@@ -114,12 +142,78 @@ class EPDEOptimizer:
             if generation % 10 == 0:
                 print(f"代数 {generation}: 平均适应度={avg_fitness:.3f}, 最优适应度={best_fitness:.3f}")
         
+        best_solution = self._decode_individual(best_row, scenario)
+        
         optimization_time = time.time() - start_time
-        print(f"优化完成! 时间: {optimization_time:.3f}s, 最优适应度: {best_fitness:.3f}")
+        print(f"优化完成! 时间: {optimization_time:.3f}s, 最优适应度: {best_fitness:.3f}, "
+              f"评估次数: {self.evaluation_stats['evaluations']}, "
+              f"缓存命中: {self.evaluation_stats['cache_hits']}")
         
         return best_solution, best_fitness, convergence_data
     
-    def _initialize_population(self, scenario) -> List[Dict]:
+    def _split_genes(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        拆分种群矩阵为目标、技术、带宽三个(种群大小, 干扰机数)视图
+        
+        参数:
+            population: 种群矩阵
+            
+        返回:
+            (目标雷达索引, 干扰技术索引, 带宽类型索引)
+        """
+        n_jammers = population.shape[1] // 3
+        return (population[:, :n_jammers],
+                population[:, n_jammers:2 * n_jammers],
+                population[:, 2 * n_jammers:])
+    
+    def _encode_individual(self, individual: Dict, scenario) -> np.ndarray:
+        """
+        将分配字典编码为种群矩阵的一行
+        
+        参数:
+            individual: 干扰分配个体 {jammer_id: {target_id, technique, bw_type, ...}}
+            scenario: 仿真场景
+            
+        返回:
+            编码行
+        """
+        radar_index = {radar.id: i for i, radar in enumerate(scenario['radars'])}
+        genes = []
+        for jammer in scenario['jammers']:
+            assignment = individual.get(jammer['id']) or {}
+            genes.append((
+                radar_index.get(assignment.get('target_id'), -1),
+                self.jamming_techniques.index(assignment['technique'])
+                if assignment.get('technique') in self.jamming_techniques else -1,
+                self.bandwidth_types.index(assignment['bw_type'])
+                if assignment.get('bw_type') in self.bandwidth_types else -1
+            ))
+        return np.array(genes, dtype=np.int64).reshape(-1, 3).T.ravel()
+    
+    def _decode_individual(self, row: np.ndarray, scenario) -> Dict:
+        """
+        将种群矩阵的一行解码为分配字典
+        
+        参数:
+            row: 编码行
+            scenario: 仿真场景
+            
+        返回:
+            干扰分配个体
+        """
+        targets, techniques, bandwidths = self._split_genes(row[None, :])
+        individual = {}
+        for j, jammer in enumerate(scenario['jammers']):
+            target, technique, bw = targets[0, j], techniques[0, j], bandwidths[0, j]
+            individual[jammer['id']] = {
+                'target_id': scenario['radars'][target].id if target >= 0 else None,
+                'technique': self.jamming_techniques[technique] if technique >= 0 else None,
+                'bw_type': self.bandwidth_types[bw] if bw >= 0 else None,
+                'jammer_power': jammer['power']
+            }
+        return individual
+    
+    def _initialize_population(self, scenario) -> np.ndarray:
         """
         初始化种群 - 随机生成干扰分配方案
         
@@ -127,177 +221,155 @@ class EPDEOptimizer:
             scenario: 仿真场景
             
         返回:
-            种群列表
+            种群矩阵
         """
-        population = []
         n_jammers = len(scenario['jammers'])
         n_radars = len(scenario['radars'])
-
-        for _ in range(self.population_size):
-            individual = {}
-            
-            for jammer in scenario['jammers']:
-                # 随机分配干扰技术和目标
-                if n_radars > 0:
-                    # 随机选择目标雷达
-                    target_radar = random.choice(scenario['radars'])
-                    
-                    # 随机选择干扰技术
-        
-        for _ in range(self.population_size):
-            individual = {}
-            
-            for jammer in scenario['jammers']:
-                # 随机分配干扰技术和目标
-                if n_radars > 0:
-                    # 随机选择目标雷达
-                    target_radar = random.choice(scenario['radars'])
-                    
-                    # 随机选择干扰技术
-                    technique = random.choice(self.jamming_techniques)
-                    
-                    # 随机选择带宽类型
-                    bw_type = random.choice(self.bandwidth_types)
-                    
-                    individual[jammer['id']] = {
-                        'target_id': target_radar.id,
-                        'technique': technique,
-                        'bw_type': bw_type,
-                        'jammer_power': jammer['power']
-                    }
-                else:
-                    # 无雷达目标，设置空分配
-                    individual[jammer.id] = {
-                        'target_id': None,
-                        'technique': None,
-                        'bw_type': None,
-                        'jammer_power': jammer['power']
-                    }
+        shape = (self.population_size, n_jammers)
+        
+        if n_radars > 0:
+            # 随机选择目标雷达、干扰技术和带宽类型
+            targets = self.rng.integers(0, n_radars, size=shape)
+            techniques = self.rng.integers(0, len(self.jamming_techniques), size=shape)
+            bandwidths = self.rng.integers(0, len(self.bandwidth_types), size=shape)
+        else:
+            # 无雷达目标，设置空分配
+            targets = techniques = bandwidths = np.full(shape, -1)
+        
+        return np.hstack([targets, techniques, bandwidths]).astype(np.int64)
+    
+    def _sample_parents(self, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        为每个个体选择三个互不相同且不同于自身的个体索引
+        
+        参数:
+            n: 种群大小
             
-            population.append(individual)
+        返回:
+            (a, b, c) 索引数组
+        """
+        if n < 4:
+            raise ValueError("种群大小至少为4")
         
-        return population
+        own = np.arange(n)
+        chosen = [own]
+        for _ in range(3):
+            candidate = self.rng.integers(0, n, size=n)
+            # 与已选索引冲突的位置重新抽样
+            clash = np.any([candidate == c for c in chosen], axis=0)
+            while clash.any():
+                candidate[clash] = self.rng.integers(0, n, size=int(clash.sum()))
+                clash = np.any([candidate == c for c in chosen], axis=0)
+            chosen.append(candidate)
+        return chosen[1], chosen[2], chosen[3]
     
-    def _mutation(self, population: List[Dict], current_idx: int) -> Dict:
+    def _mutation(self, population: np.ndarray) -> np.ndarray:
         """
-        变异操作 - 基于差分进化的变异策略
+        变异操作 - 基于差分进化的变异策略（离散版本）
         
         参数:
-            population: 当前种群
-            current_idx: 当前个体索引
+            population: 当前种群矩阵
             
         返回:
-            变异后的个体
-        """
-        # 选择三个不同的个体
-        indices = [i for i in range(len(population)) if i != current_idx]
-        a, b, c = random.sample(indices, 3)
-        
-        individual_a = population[a]
-        individual_b = population[b]
-        individual_c = population[c]
-        
-        mutant = {}
-        
-        # 对每个干扰机进行变异
-        for jammer_id in individual_a.keys():
-            if random.random() < 0.8:  # 变异概率
-                # 差分变异: mutant = a + F * (b - c)
-                # 这里采用离散版本的差分变异
-                if random.random() < 0.5:
-                    # 从个体a继承
-                    mutant[jammer_id] = individual_a[jammer_id].copy()
-                else:
-                    # 随机扰动
-                    if individual_b[jammer_id]['target_id'] and individual_c[jammer_id]['target_id']:
-                        # 有意义的差分操作
-                        if random.random() < self.f:
-                            mutant[jammer_id] = individual_b[jammer_id].copy()
-                        else:
-                            mutant[jammer_id] = individual_c[jammer_id].copy()
-                    else:
-                        mutant[jammer_id] = individual_a[jammer_id].copy()
-            else:
-                # 保持原样
-                mutant[jammer_id] = individual_a[jammer_id].copy()
-        
-        return mutant
+            变异种群矩阵
+        """
+        n = population.shape[0]
+        a, b, c = self._sample_parents(n)
+        pop_a, pop_b, pop_c = population[a], population[b], population[c]
+        
+        targets_b = self._split_genes(pop_b)[0]
+        targets_c = self._split_genes(pop_c)[0]
+        n_jammers = targets_b.shape[1]
+        
+        # 每个干扰机基因：80%概率变异，其中一半从个体a继承，另一半做差分操作
+        mutate = self.rng.random((n, n_jammers)) < 0.8
+        perturb = self.rng.random((n, n_jammers)) >= 0.5
+        meaningful = (targets_b >= 0) & (targets_c >= 0)
+        take_b = self.rng.random((n, n_jammers)) < self.f
+        
+        # 差分操作：有意义时以缩放因子为概率取b，否则取c；其余情况从个体a继承
+        use_b = np.tile(mutate & perturb & meaningful & take_b, 3)
+        use_c = np.tile(mutate & perturb & meaningful & ~take_b, 3)
+        
+        return np.where(use_b, pop_b, np.where(use_c, pop_c, pop_a))
     
-    def _crossover(self, target: Dict, mutant: Dict) -> Dict:
+    def _crossover(self, population: np.ndarray, mutants: np.ndarray) -> np.ndarray:
         """
-        交叉操作 - 生成试验个体
+        交叉操作 - 生成试验个体（二项式交叉，每个个体至少继承一个变异基因）
         
         参数:
-            target: 目标个体
-            mutant: 变异个体
+            population: 目标种群矩阵
+            mutants: 变异种群矩阵
             
         返回:
-            交叉后的试验个体
+            试验种群矩阵
         """
-        trial = {}
+        n, n_jammers = population.shape[0], population.shape[1] // 3
+        from_mutant = self.rng.random((n, n_jammers)) < self.cr
+        from_mutant[np.arange(n), self.rng.integers(0, n_jammers, size=n)] = True
         
-        for jammer_id in target.keys():
-            if random.random() < self.cr or jammer_id not in trial:
-                # 从变异个体继承
-                trial[jammer_id] = mutant.get(jammer_id, target[jammer_id]).copy()
-            else:
-                # 从目标个体继承
-                trial[jammer_id] = target[jammer_id].copy()
+        return np.where(np.tile(from_mutant, 3), mutants, population)
+    
+    def _assignment_counts(self, targets: np.ndarray, n_radars: int) -> np.ndarray:
+        """
+        统计每个个体中每部雷达被分配的次数
         
-        return trial
+        参数:
+            targets: 目标雷达索引矩阵 (种群大小, 干扰机数)
+            n_radars: 雷达数量
+            
+        返回:
+            分配次数矩阵 (种群大小, 雷达数)
+        """
+        n = targets.shape[0]
+        valid = targets >= 0
+        rows = np.broadcast_to(np.arange(n)[:, None], targets.shape)
+        counts = np.zeros((n, n_radars), dtype=np.int64)
+        np.add.at(counts, (rows[valid], targets[valid]), 1)
+        return counts
     
-    def _repair_solution(self, individual: Dict, scenario) -> Dict:
+    def _repair_solution(self, population: np.ndarray, scenario) -> np.ndarray:
         """
         修复无效解 - 确保分配方案满足约束条件
         
         参数:
-            individual: 需要修复的个体
+            population: 需要修复的种群矩阵
             scenario: 仿真场景
             
         返回:
-            修复后的个体
+            修复后的种群矩阵
         """
-        repaired = individual.copy()
+        repaired = population.copy()
         n_radars = len(scenario['radars'])
+        if n_radars <= 1:
+            return repaired
+        
+        targets, _, bandwidths = self._split_genes(repaired)
+        max_targets = self._max_targets_table()
         
         # 统计每个雷达被分配的次数
-        radar_assignments = {}
-        for radar in scenario['radars']:
-            radar_assignments[radar.id] = 0
-        
-        # 修复无效目标分配
-        for jammer_id, assignment in repaired.items():
-            if assignment['target_id']:
-                # 检查目标是否存在
-                target_exists = any(radar.id == assignment['target_id'] for radar in scenario['radars'])
-                if not target_exists and n_radars > 0:
-                    # 分配无效，随机分配一个有效目标
-                    new_target = random.choice(scenario['radars'])
-                    assignment['target_id'] = new_target.id
-                
-                # 统计分配
-                if assignment['target_id'] in radar_assignments:
-                    radar_assignments[assignment['target_id']] += 1
-        
-        # 检查带宽约束（基于文章表3）
-        for jammer_id, assignment in repaired.items():
-            if assignment['target_id'] and assignment['bw_type']:
-                assigned_targets = radar_assignments[assignment['target_id']]
-                bw_type = assignment['bw_type']
-                
-                # 检查是否超过带宽支持的最大目标数
-                max_targets = self._get_max_targets_by_bw(bw_type)
-                if assigned_targets > max_targets:
-                    # 超过限制，需要重新分配
-                    if n_radars > 1:
-                        # 选择分配较少的雷达
-                        available_radars = [r for r in scenario['radars'] 
-                                          if radar_assignments[r.id] < self._get_max_targets_by_bw(bw_type)]
-                        if available_radars:
-                            new_target = min(available_radars, 
-                                          key=lambda r: radar_assignments[r.id])
-                            assignment['target_id'] = new_target.id
-                            radar_assignments[new_target.id] += 1
+        counts = self._assignment_counts(targets, n_radars)
+        rows = np.arange(repaired.shape[0])
+        
+        # 检查带宽约束（基于文章表3），按干扰机顺序逐列处理，各个体并行
+        for j in range(targets.shape[1]):
+            assigned = (targets[:, j] >= 0) & (bandwidths[:, j] >= 0)
+            limit = max_targets[np.maximum(bandwidths[:, j], 0)]
+            over = assigned & (counts[rows, np.maximum(targets[:, j], 0)] > limit)
+            if not over.any():
+                continue
+            
+            # 超过限制，选择分配较少的雷达重新分配
+            over_rows = rows[over]
+            over_counts = counts[over_rows]
+            available = over_counts < limit[over][:, None]
+            has_available = available.any(axis=1)
+            new_targets = np.argmin(np.where(available, over_counts, np.iinfo(np.int64).max), axis=1)
+            
+            fix_rows = over_rows[has_available]
+            new_targets = new_targets[has_available]
+            targets[fix_rows, j] = new_targets
+            counts[fix_rows, new_targets] += 1
         
         return repaired
     
@@ -318,79 +390,238 @@ class EPDEOptimizer:
         }
         return max_targets.get(bw_type, 1)
     
-    def _evaluate_fitness(self, individual: Dict, scenario, combat_analyzer: CombatAnalyzer) -> float:
+    def _max_targets_table(self) -> np.ndarray:
+        """按带宽类型索引排列的最大目标数"""
+        return np.array([self._get_max_targets_by_bw(bw) for bw in self.bandwidth_types])
+    
+    def _evaluate_population(self, population: np.ndarray, scenario,
+                             combat_analyzer: CombatAnalyzer) -> np.ndarray:
         """
-        评估个体适应度 - 基于干扰效果和资源利用率
+        批量评估适应度 - 先查缓存，未命中的个体去重后评估
         
         参数:
-            individual: 干扰分配个体
+            population: 种群矩阵
             scenario: 仿真场景
             combat_analyzer: 对抗分析器
             
         返回:
-            适应度值
+            适应度数组
         """
-        try:
-            # 转换分配格式
-            assignment_matrix = individual
-            
-            # 使用对抗分析器评估效果
-            evaluation = combat_analyzer.evaluate_assignment_effectiveness(
-                assignment_matrix, scenario['radars'], scenario['jammers']
-            )
-            
-            # 基础适应度 = 总干扰效果
-            base_fitness = evaluation['total_effectiveness']
+        keys = [row.tobytes() for row in population]
+        
+        misses = {}
+        for i, key in enumerate(keys):
+            if key not in self._fitness_cache and key not in misses:
+                misses[key] = i
+        self.evaluation_stats['evaluations'] += len(misses)
+        self.evaluation_stats['cache_hits'] += len(keys) - len(misses)
+        
+        if misses:
+            miss_population = population[list(misses.values())]
+            scores = self._evaluate_fitness(miss_population, scenario, combat_analyzer)
+            self._fitness_cache.update(zip(misses, scores.tolist()))
+        
+        return np.array([self._fitness_cache[key] for key in keys])
+    
+    def _evaluate_fitness(self, population: np.ndarray, scenario,
+                          combat_analyzer: CombatAnalyzer) -> np.ndarray:
+        """
+        评估个体适应度 - 基于干扰效果和资源利用率
+        
+        参数:
+            population: 种群矩阵（单个个体可传入一维编码行）
+            scenario: 仿真场景
+            combat_analyzer: 对抗分析器
             
-            # 考虑资源利用率（RUR）
-            rur = evaluation['resource_utilization']
-            rur_bonus = rur * 0.5  # 资源利用率奖励
+        返回:
+            适应度数组
+        """
+        population = np.atleast_2d(population)
+        effectiveness = self._evaluate_effectiveness(population, scenario, combat_analyzer)
+        
+        # 添加约束惩罚
+        total_fitness = effectiveness - self._calculate_constraint_penalty(population, scenario)
+        
+        # 评估出错的个体适应度为0，其余确保非负
+        return np.where(np.isnan(total_fitness), 0.0, np.maximum(0.0, total_fitness))
+    
+    def _evaluate_effectiveness(self, population: np.ndarray, scenario,
+                                combat_analyzer: CombatAnalyzer) -> np.ndarray:
+        """
+        评估干扰效果（不含约束惩罚）
+        
+        参数:
+            population: 种群矩阵
+            scenario: 仿真场景
+            combat_analyzer: 对抗分析器
             
-            # 考虑中断次数奖励
-            interruption_bonus = evaluation['interruption_count'] * 0.3
+        返回:
+            效果得分数组，评估出错的个体为NaN
+        """
+        if _uses_reference_model(combat_analyzer):
+            return self._evaluate_effectiveness_vectorized(population, scenario, combat_analyzer)
+        return self._evaluate_effectiveness_each(population, scenario, combat_analyzer)
+    
+    def _effect_tables(self, scenario, combat_analyzer: CombatAnalyzer) -> Dict[str, np.ndarray]:
+        """
+        构建效果因子表（同一场景和分析器只构建一次）
+        
+        参数:
+            scenario: 仿真场景
+            combat_analyzer: 对抗分析器
             
-            # 总适应度
-            total_fitness = base_fitness + rur_bonus + interruption_bonus
+        返回:
+            因子表字典: stage (雷达, 技术), bw_adjustment (带宽，无效分配为NaN),
+            distance/power (雷达, 干扰机), interaction (当前技术, 先前技术),
+            interruption_level (雷达)
+        """
+        context = self._effect_tables_context
+        if context is not None and context[0] is scenario and context[1] is combat_analyzer:
+            return context[2]
+        
+        radars, jammers = scenario['radars'], scenario['jammers']
+        tables = combat_analyzer.tables
+        # 解码后的分配字典包含全部干扰机，分配总数即干扰机数
+        bw_adjustment = [tables.get_bw_adjustment(bw, len(jammers)) for bw in self.bandwidth_types]
+        effect_tables = {
+            'stage': np.array([
+                [tables.get_stage_effectiveness(radar.current_stage, tech) for tech in self.jamming_techniques]
+                for radar in radars
+            ], dtype=float).reshape(len(radars), len(self.jamming_techniques)),
+            'bw_adjustment': np.array([np.nan if adj is None else adj for adj in bw_adjustment], dtype=float),
+            'distance': np.array([
+                [combat_analyzer._calculate_distance_effect(radar, jammer) for jammer in jammers]
+                for radar in radars
+            ], dtype=float).reshape(len(radars), len(jammers)),
+            'power': np.array([
+                [combat_analyzer._calculate_power_match(radar, jammer) for jammer in jammers]
+                for radar in radars
+            ], dtype=float).reshape(len(radars), len(jammers)),
+            'interaction': np.array([
+                [tables.get_tech_interaction(tech, other) for other in self.jamming_techniques]
+                for tech in self.jamming_techniques
+            ], dtype=float),
+            'interruption_level': np.array([1.0 - radar.interruption_threshold for radar in radars], dtype=float)
+        }
+        self._effect_tables_context = (scenario, combat_analyzer, effect_tables)
+        return effect_tables
+    
+    def _evaluate_effectiveness_vectorized(self, population: np.ndarray, scenario,
+                                           combat_analyzer: CombatAnalyzer) -> np.ndarray:
+        """
+        查表评估整个种群的干扰效果，与CombatAnalyzer逐个体评估的结果一致
+        
+        参数:
+            population: 种群矩阵
+            scenario: 仿真场景
+            combat_analyzer: 对抗分析器
             
-            # 添加约束惩罚
-            penalty = self._calculate_constraint_penalty(individual, scenario)
-            total_fitness -= penalty
+        返回:
+            效果得分数组
+        """
+        tables = self._effect_tables(scenario, combat_analyzer)
+        population = np.atleast_2d(population)
+        targets, techniques, bandwidths = self._split_genes(population)
+        n, n_jammers = targets.shape
+        n_radars = len(scenario['radars'])
+        
+        assigned = targets >= 0
+        has_technique = techniques >= 0
+        radar = np.maximum(targets, 0)
+        technique = np.maximum(techniques, 0)
+        bw_adjustment = np.where(bandwidths >= 0, tables['bw_adjustment'][np.maximum(bandwidths, 0)], np.nan)
+        
+        # 单干扰机效果: (阶段有效性 + 带宽调整) × 距离因子 × 功率因子，带宽无效时为0
+        jammer = np.arange(n_jammers)
+        individual = np.clip(
+            (tables['stage'][radar, technique] + bw_adjustment)
+            * tables['distance'][radar, jammer] * tables['power'][radar, jammer],
+            -1.0, 1.0
+        ) if n_radars > 0 else np.zeros(targets.shape)
+        individual = np.where(assigned & has_technique & ~np.isnan(bw_adjustment), individual, 0.0)
+        
+        # 技术交互: 与按干扰机顺序先分配到同一雷达的各技术的交互因子之和
+        earlier = np.tril(np.ones((n_jammers, n_jammers), dtype=bool), -1)
+        same_radar = (targets[:, :, None] == targets[:, None, :]) & earlier
+        pair_valid = same_radar & (assigned & has_technique)[:, :, None] & has_technique[:, None, :]
+        interaction = np.where(
+            pair_valid, tables['interaction'][technique[:, :, None], technique[:, None, :]], 0.0
+        ).sum(axis=2)
+        
+        # 按雷达累加协同效果并限幅
+        cells = (np.arange(n)[:, None] * n_radars + targets)[assigned]
+        radar_effect = np.bincount(
+            cells, weights=(individual + interaction)[assigned], minlength=n * n_radars
+        ).reshape(n, n_radars)
+        radar_effect = np.clip(radar_effect, -1.0, 1.0)
+        
+        total_effectiveness = radar_effect.sum(axis=1)
+        interruption_count = (radar_effect > tables['interruption_level']).sum(axis=1)
+        resource_utilization = assigned.sum(axis=1) / n_jammers if n_jammers else np.zeros(n)
+        
+        return total_effectiveness + resource_utilization * 0.5 + interruption_count * 0.3
+    
+    def _evaluate_effectiveness_each(self, population: np.ndarray, scenario,
+                                     combat_analyzer: CombatAnalyzer) -> np.ndarray:
+        """
+        逐个体调用对抗分析器评估干扰效果（不含约束惩罚）
+        
+        参数:
+            population: 种群矩阵
+            scenario: 仿真场景
+            combat_analyzer: 对抗分析器
             
-            return max(0.0, total_fitness)  # 确保非负
+        返回:
+            效果得分数组，评估出错的个体为NaN
+        """
+        scores = np.empty(len(population))
+        for i, row in enumerate(population):
+            try:
+                evaluation = combat_analyzer.evaluate_assignment_effectiveness(
+                    self._decode_individual(row, scenario), scenario['radars'], scenario['jammers']
+                )
+                
+                # 基础适应度 = 总干扰效果
+                base_fitness = evaluation['total_effectiveness']
+                
+                # 考虑资源利用率（RUR）
+                rur_bonus = evaluation['resource_utilization'] * 0.5  # 资源利用率奖励
+                
+                # 考虑中断次数奖励
+                interruption_bonus = evaluation['interruption_count'] * 0.3
+                
+                scores[i] = base_fitness + rur_bonus + interruption_bonus
             
-        except Exception as e:
-            print(f"适应度评估错误: {e}")
-            return 0.0
+            except Exception as e:
+                print(f"适应度评估错误: {e}")
+                scores[i] = np.nan
+        
+        return scores
     
-    def _calculate_constraint_penalty(self, individual: Dict, scenario) -> float:
+    def _calculate_constraint_penalty(self, population: np.ndarray, scenario) -> np.ndarray:
         """
         计算约束违反惩罚
         
         参数:
-            individual: 干扰分配个体
+            population: 种群矩阵
             scenario: 仿真场景
             
         返回:
-            惩罚值
+            惩罚值数组
         """
-        penalty = 0.0
+        population = np.atleast_2d(population)
+        targets, _, bandwidths = self._split_genes(population)
+        n_radars = len(scenario['radars'])
         
-        # 检查每个干扰机的分配
-        for jammer_id, assignment in individual.items():
-            if assignment['target_id']:
-                # 检查目标是否存在
-                target_exists = any(radar.id == assignment['target_id'] for radar in scenario['radars'])
-                if not target_exists:
-                    penalty += 1.0
-                
-                # 检查带宽约束
-                if assignment['bw_type']:
-                    # 统计该雷达被分配的次数
-                    assigned_count = sum(1 for assign in individual.values() 
-                                       if assign['target_id'] == assignment['target_id'])
-                    
-                    max_allowed = self._get_max_targets_by_bw(assignment['bw_type'])
-                    if assigned_count > max_allowed:
-                        penalty += (assigned_count - max_allowed) * 0.5
-        
-        return penalty
\ No newline at end of file
+        # 编码只含有效雷达索引，目标不存在的惩罚不会出现；这里只检查带宽约束
+        assigned = (targets >= 0) & (bandwidths >= 0)
+        if n_radars == 0 or not assigned.any():
+            return np.zeros(len(population))
+        
+        # 统计该雷达被分配的次数
+        counts = self._assignment_counts(targets, n_radars)
+        assigned_count = np.take_along_axis(counts, np.maximum(targets, 0), axis=1)
+        
+        max_allowed = self._max_targets_table()[np.maximum(bandwidths, 0)]
+        excess = np.where(assigned, np.maximum(assigned_count - max_allowed, 0), 0)
+        return excess.sum(axis=1) * 0.5
\ No newline at end of file
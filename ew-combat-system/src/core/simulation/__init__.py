@@ -4,7 +4,8 @@
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
-from ..entities import Radar, Jammer, Target, Position
+from ..entities import Radar, Jammer, Target
+from .coverage import CoverageRaster
 from scipy import signal, interpolate
 import warnings
 warnings.filterwarnings('ignore')
@@ -195,28 +196,21 @@ class EWSimulator:
             lon_step
         )
         
-        # 计算每个网格点的覆盖强度
-        coverage = np.zeros((len(lats), len(lons)))
-        
-        for i, lat in enumerate(lats):
-            for j, lon in enumerate(lons):
-                # 计算距离
-                pos = Position(lat, lon, 0)
-                distance_km = radar.position.distance_to(pos) / 1000
-                
-                # 计算覆盖强度（随距离衰减）
-                if distance_km <= radar.radar_params.range_max:
-                    # 简化模型：随距离四次方衰减
-                    strength = 1 / (1 + (distance_km / radar.radar_params.range_max)**4)
-                    
-                    # 考虑波束方向图
-                    if hasattr(radar.radar_params, 'beamwidth'):
-                        # 简化的天线方向图
-                        strength *= EWSimulator._antenna_pattern(strength)
-                    
-                    coverage[i, j] = strength
+        # 计算每个网格点的覆盖强度（整块向量化计算）
+        def coverage_strength(distance_km: np.ndarray, radar: Radar) -> np.ndarray:
+            range_max = radar.radar_params.range_max
+            
+            # 简化模型：随距离四次方衰减
+            strength = 1 / (1 + (distance_km / range_max)**4)
+            
+            # 考虑波束方向图
+            if hasattr(radar.radar_params, 'beamwidth'):
+                # 简化的天线方向图
+                strength *= EWSimulator._antenna_pattern(strength)
+            
+            return np.where(distance_km <= range_max, strength, 0.0)
         
-        return coverage
+        return CoverageRaster(lats, lons).evaluate([radar], coverage_strength)
     
     @staticmethod
     def _antenna_pattern(angle_deg: float) -> float:
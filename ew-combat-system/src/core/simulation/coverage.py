@@ -0,0 +1,104 @@
+"""
+栅格覆盖计算引擎
+在经纬度网格上向量化计算多辐射源的大圆距离与接收功率
+"""
+import numpy as np
+from typing import Any, Callable, Sequence
+
+EARTH_RADIUS_M = 6371000  # 地球半径，单位：米
+
+# 单个分块的最大网格点数，限制临时数组的内存占用（约8MB/数组）
+DEFAULT_TILE_CELLS = 1 << 20
+
+
+class CoverageRaster:
+    """
+    经纬度栅格覆盖计算
+
+    网格按纬度行分块计算，每块内对每个辐射源一次性求出整块的大圆距离，
+    再由回调函数换算为覆盖强度或接收功率并逐源累加。半正矢公式中只依赖
+    纬度或经度的项按行/列预先计算，每个网格点只做一次开方和反正弦。
+    """
+
+    def __init__(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        receiver_alt: float = 0.0,
+        include_altitude: bool = True,
+        tile_cells: int = DEFAULT_TILE_CELLS
+    ):
+        """
+        初始化栅格
+
+        参数:
+            lats: 纬度网格（度，一维）
+            lons: 经度网格（度，一维）
+            receiver_alt: 接收点高度（米）
+            include_altitude: 是否计入辐射源与接收点的高度差，False时只计算地面距离
+            tile_cells: 单个分块的最大网格点数
+        """
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.receiver_alt = receiver_alt
+        self.include_altitude = include_altitude
+        self.tile_rows = max(1, int(tile_cells) // max(1, len(self.lons)))
+
+    @property
+    def shape(self):
+        return len(self.lats), len(self.lons)
+
+    def distance_km(self, position: Any, row_start: int = 0, row_stop: int = None) -> np.ndarray:
+        """
+        计算辐射源到[row_start, row_stop)行网格点的距离（km）
+
+        参数:
+            position: 辐射源位置（具有lat、lon、alt属性）
+            row_start, row_stop: 纬度行范围
+
+        返回:
+            距离矩阵 (行数, 经度点数)
+        """
+        lat0 = np.radians(position.lat)
+        lats = np.radians(self.lats[row_start:row_stop])
+        lat_term = np.sin((lats - lat0) / 2) ** 2
+        cos_term = np.cos(lat0) * np.cos(lats)
+        lon_term = np.sin(np.radians(self.lons - position.lon) / 2) ** 2
+
+        a = lat_term[:, None] + cos_term[:, None] * lon_term[None, :]
+        np.clip(a, 0.0, 1.0, out=a)
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= 2 * EARTH_RADIUS_M
+
+        height_diff = position.alt - self.receiver_alt if self.include_altitude else 0.0
+        if height_diff:
+            np.hypot(a, height_diff, out=a)
+        a /= 1000.0
+        return a
+
+    def evaluate(
+        self,
+        emitters: Sequence[Any],
+        kernel: Callable[[np.ndarray, Any], np.ndarray],
+        combine: Callable[[np.ndarray, np.ndarray], np.ndarray] = np.add
+    ) -> np.ndarray:
+        """
+        计算全部辐射源在网格上的合成结果
+
+        参数:
+            emitters: 辐射源列表（具有position属性）
+            kernel: 回调 kernel(距离km矩阵, 辐射源) -> 该源在分块上的贡献
+            combine: 多源合成方式，默认求和（如np.maximum取最大）
+
+        返回:
+            结果矩阵 (纬度点数, 经度点数)
+        """
+        result = np.zeros(self.shape)
+        for row_start in range(0, len(self.lats), self.tile_rows):
+            row_stop = min(row_start + self.tile_rows, len(self.lats))
+            tile = result[row_start:row_stop]
+            for emitter in emitters:
+                contribution = kernel(self.distance_km(emitter.position, row_start, row_stop), emitter)
+                combine(tile, contribution, out=tile)
+        return result
@@ -0,0 +1,145 @@
+"""
+分层缓存单元测试
+"""
+import fnmatch
+import time
+
+from src.utils.cache import TieredCache, DiskTier, RedisTier
+from src.utils.config_manager import CacheConfig
+
+
+class FakeRedis:
+    """进程内Redis替身，实现RedisTier用到的命令子集"""
+
+    def __init__(self):
+        self.store = {}
+
+    def _alive(self, name):
+        entry = self.store.get(name)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self.store[name]
+            entry = None
+        return entry
+
+    def ping(self):
+        return True
+
+    def get(self, name):
+        entry = self._alive(name)
+        return entry[0] if entry else None
+
+    def set(self, name, value, px=None):
+        self.store[name] = (bytes(value), time.time() + px / 1000 if px else None)
+        return True
+
+    def pttl(self, name):
+        entry = self._alive(name)
+        if entry is None:
+            return -2
+        return -1 if entry[1] is None else int((entry[1] - time.time()) * 1000)
+
+    def delete(self, *names):
+        return sum(self.store.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match="*"):
+        return iter([name.encode() for name in list(self.store) if fnmatch.fnmatchcase(name, match) and self._alive(name)])
+
+
+def make_config(**kwargs):
+    defaults = dict(type="file", ttl=60, max_size=100, cleanup_interval=0)
+    defaults.update(kwargs)
+    return CacheConfig(**defaults)
+
+
+class TestTieredCache:
+    """测试分层缓存"""
+
+    def test_expiry_beyond_one_day(self, tmp_path):
+        """测试过期时间按总秒数计算（超过一天的条目不会被误判为未过期）"""
+        cache = TieredCache(make_config(), tmp_path)
+        cache.set("long", {"a": 1}, ttl=2 * 86400)
+        cache.set("expired", [1, 2, 3], ttl=-86400 - 10)
+
+        assert cache.get("long") == {"a": 1}
+        assert cache.get("expired") is None
+
+        # 新实例从磁盘层读取
+        reopened = TieredCache(make_config(), tmp_path)
+        assert reopened.get("long") == {"a": 1}
+        assert reopened.get("expired") is None
+
+    def test_memory_tier_lru_and_byte_bound(self, tmp_path):
+        """测试内存层与磁盘层按LRU淘汰且内存层字节数不超过上限"""
+        cache = TieredCache(make_config(max_size=3, max_memory_bytes=4096), tmp_path)
+        for i in range(3):
+            cache.set(f"k{i}", i)
+        cache.get("k0")
+        cache.set("k3", 3)
+
+        assert list(cache.memory.keys()) == ["k2", "k0", "k3"]
+        assert sorted(cache.second_tier.keys()) == ["k0", "k2", "k3"]
+
+        cache.memory.delete("k2")
+        assert cache.get("k2") == 2
+        assert cache.get("k1") is None
+
+        cache.set("big", b"x" * 3000)
+        memory = cache.memory.stats()
+        assert memory["bytes"] <= 4096
+        assert memory["bytes"] == sum(len(k) + len(cache.memory.get(k)[0]) for k in cache.memory.keys())
+
+    def test_disk_tier_accounts_file_bytes(self, tmp_path):
+        """测试磁盘层按实际文件字节数统计并在超限时淘汰最久未访问的条目"""
+        disk = DiskTier(tmp_path, max_items=100, max_bytes=10000)
+        for i in range(5):
+            disk.set(f"key{i}", b"y" * 3000, time.time() + 60)
+
+        files = list(tmp_path.glob("*.cache"))
+        assert disk.stats()["bytes"] == sum(f.stat().st_size for f in files) <= 10000
+        assert sorted(disk.keys()) == ["key2", "key3", "key4"]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_clear_by_pattern_and_purge(self, tmp_path):
+        """测试按通配符清理与过期条目清理"""
+        cache = TieredCache(make_config(), tmp_path)
+        cache.set("sim_a", 1)
+        cache.set("sim_b", 2)
+        cache.set("other", 3)
+        cache.set("short", 4, ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.purge_expired() >= 1
+        assert cache.clear("sim_*") == 2
+        assert cache.get("sim_a") is None
+        assert cache.get("other") == 3
+
+    def test_redis_tier_with_fake_client(self, tmp_path):
+        """测试Redis层（进程内替身）存取、过期与按模式清理"""
+        fake = FakeRedis()
+        cache = TieredCache(make_config(type="redis"), second_tier=RedisTier(fake))
+        cache.set("scenario:1", {"targets": [1, 2]})
+        cache.set("scenario:2", "x", ttl=-1)
+
+        assert "ew:cache:scenario:1" in fake.store
+        assert "ew:cache:scenario:2" not in fake.store
+
+        # 新实例内存层为空，从Redis回填
+        other = TieredCache(make_config(type="redis"), second_tier=RedisTier(fake))
+        assert other.get("scenario:1") == {"targets": [1, 2]}
+        assert other.memory.get("scenario:1") is not None
+
+        assert other.clear("scenario:*") == 1
+        assert fake.store == {}
+
+    def test_background_sweeper_purges_expired(self, tmp_path):
+        """测试后台线程定期清理过期条目"""
+        cache = TieredCache(make_config(cleanup_interval=0.05), tmp_path)
+        try:
+            cache.set("soon", 1, ttl=0.05)
+            deadline = time.time() + 2.0
+            while cache.memory.stats()["items"] and time.time() < deadline:
+                time.sleep(0.02)
+            assert cache.memory.stats()["items"] == 0
+            assert not list(tmp_path.glob("*.cache"))
+        finally:
+            cache.close()
@@ -0,0 +1,55 @@
+"""
+栅格覆盖计算引擎单元测试
+"""
+import numpy as np
+from src.core.entities import Radar, RadarParameters, Position, EntityType
+from src.core.simulation.coverage import CoverageRaster
+
+
+def make_radar(lat, lon, alt=50.0, power=100.0):
+    """创建测试雷达"""
+    return Radar(
+        id=f"radar_{lat}_{lon}",
+        name="测试雷达",
+        entity_type=EntityType.RADAR,
+        position=Position(lat, lon, alt),
+        radar_params=RadarParameters(frequency=3.0, power=power, gain=30.0, beamwidth=2.0)
+    )
+
+
+class TestCoverageRaster:
+    """测试栅格覆盖计算"""
+    
+    def test_distance_matches_position_distance(self):
+        """测试向量化距离与Position.distance_to一致"""
+        lats = np.linspace(39.0, 41.0, 7)
+        lons = np.linspace(115.5, 117.5, 9)
+        radar = make_radar(39.9, 116.4, alt=1500.0)
+        raster = CoverageRaster(lats, lons, receiver_alt=200.0)
+        
+        distance = raster.distance_km(radar.position)
+        
+        expected = np.array([
+            [radar.position.distance_to(Position(lat, lon, 200.0)) / 1000 for lon in lons]
+            for lat in lats
+        ])
+        np.testing.assert_allclose(distance, expected, rtol=1e-12)
+    
+    def test_tiled_evaluation_matches_single_tile(self):
+        """测试分块计算与整块计算结果一致"""
+        lats = np.linspace(39.0, 41.0, 53)
+        lons = np.linspace(115.5, 117.5, 41)
+        radars = [make_radar(39.5, 116.0, power=100.0), make_radar(40.5, 117.0, power=250.0)]
+        
+        def kernel(distance_km, radar):
+            return radar.radar_params.power / (1.0 + distance_km**2)
+        
+        whole = CoverageRaster(lats, lons).evaluate(radars, kernel)
+        tiled = CoverageRaster(lats, lons, tile_cells=100).evaluate(radars, kernel)
+        
+        assert whole.shape == (53, 41)
+        np.testing.assert_allclose(tiled, whole)
+        
+        strongest = CoverageRaster(lats, lons, tile_cells=100).evaluate(radars, kernel, combine=np.maximum)
+        assert np.all(strongest <= whole)
+        assert np.all(strongest > 0)
@@ -0,0 +1,73 @@
+"""
+HDF5分块存储单元测试
+"""
+import numpy as np
+import pytest
+
+from src.utils.hdf5_store import HDF5Recording, chunk_shape, write_hdf5
+
+
+def make_recording():
+    """模拟一段交战记录：时间轴、逐脉冲回波与静态参数"""
+    times = np.arange(0.0, 100.0, 0.01)
+    return {
+        "time": times,
+        "echo": np.random.default_rng(0).normal(size=(times.size, 64)).astype(np.float32),
+        "radar": {
+            "snr_db": np.sin(times),
+            "name": np.array(["R1", "R2"]),
+        },
+        "prf": 1000.0,
+    }
+
+
+class TestHDF5Store:
+    """测试HDF5分块存储"""
+
+    def test_chunk_shape(self):
+        """测试分块沿第0维取整行且不超过目标大小"""
+        assert chunk_shape((10000, 64), 4, chunk_bytes=1 << 16) == (256, 64)
+        assert chunk_shape((5, 3), 8) == (5, 3)
+        assert chunk_shape((), 8) is None
+        assert chunk_shape((0, 3), 8) is None
+
+        chunks = chunk_shape((10, 1024, 1024), 8, chunk_bytes=1 << 20)
+        assert chunks[0] == 1 and np.prod(chunks) * 8 <= 1 << 20
+
+    def test_roundtrip_chunked_and_compressed(self, tmp_path):
+        """测试写入的数据集已分块压缩且完整读取与原数据一致"""
+        data = make_recording()
+        path = write_hdf5(tmp_path / "run.h5", data, time_key="time")
+
+        with HDF5Recording(path) as recording:
+            assert recording["echo"].chunks[1:] == (64,)
+            assert recording["echo"].compression == "gzip"
+            assert sorted(recording.fields) == ["echo", "prf", "radar/name", "radar/snr_db", "time"]
+            loaded = recording.load()
+
+        np.testing.assert_array_equal(loaded["echo"], data["echo"])
+        np.testing.assert_array_equal(loaded["radar"]["snr_db"], data["radar"]["snr_db"])
+        assert list(loaded["radar"]["name"]) == ["R1", "R2"]
+        assert loaded["prf"] == 1000.0
+
+    def test_partial_and_time_window_reads(self, tmp_path):
+        """测试按字段、切片与时间窗口读取，非时间对齐字段完整返回"""
+        data = make_recording()
+        path = write_hdf5(tmp_path / "run.h5", data, time_key="time")
+
+        with HDF5Recording(path) as recording:
+            assert recording.time_slice(10.0, 10.5) == slice(1000, 1050)
+
+            window = recording.load(["echo", "radar/name", "prf"], time_window=(10.0, 10.5))
+            assert set(window) == {"echo", "radar", "prf"}
+            np.testing.assert_array_equal(window["echo"], data["echo"][1000:1050])
+            assert list(window["radar"]["name"]) == ["R1", "R2"]
+
+            part = recording.load(["radar/snr_db"], index=slice(-10, None))
+            np.testing.assert_array_equal(part["radar"]["snr_db"], data["radar"]["snr_db"][-10:])
+
+            with pytest.raises(ValueError):
+                recording.load(index=slice(0, 1), time_window=(0.0, 1.0))
+
+        with pytest.raises(ValueError):
+            write_hdf5(tmp_path / "bad.h5", data, time_key="echo")
@@ -0,0 +1,128 @@
+"""
+ePDE优化算法单元测试
+"""
+import random
+import pytest
+import numpy as np
+from src.core.analysis.combat_analyzer import CombatAnalyzer
+from src.core.entities.radar_enhanced import EnhancedRadar
+from src.core.optimization.epde_algorithm import EPDEOptimizer
+
+
+def make_scenario(n_radars=12, n_jammers=6, seed=0):
+    """创建测试场景"""
+    rng = random.Random(seed)
+    stages = ['search', 'acquisition', 'tracking', 'guidance']
+    radars = []
+    for i in range(n_radars):
+        radar = EnhancedRadar(f"R{i+1}", f"雷达{i+1}",
+                              {"lat": 39.8 + rng.random() * 0.4, "lon": 116.2 + rng.random() * 0.4, "alt": 50},
+                              3.0, 100 + rng.random() * 100)
+        radar.current_stage = stages[i % len(stages)]
+        radars.append(radar)
+    jammers = [
+        {'id': f"J{i+1}", 'name': f"干扰机{i+1}",
+         'position': {"lat": 39.8 + rng.random() * 0.4, "lon": 116.2 + rng.random() * 0.4, "alt": 10000},
+         'power': 1000 + rng.random() * 500}
+        for i in range(n_jammers)
+    ]
+    return {'radars': radars, 'jammers': jammers}
+
+
+class TestEPDEOptimizer:
+    """测试ePDE优化器"""
+    
+    def test_encoding_roundtrip(self):
+        """测试分配字典与种群矩阵编码互相转换一致"""
+        optimizer = EPDEOptimizer(population_size=8, seed=0)
+        scenario = make_scenario()
+        population = optimizer._initialize_population(scenario)
+        
+        assert population.shape == (8, 3 * len(scenario['jammers']))
+        for row in population:
+            individual = optimizer._decode_individual(row, scenario)
+            assert set(individual) == {jammer['id'] for jammer in scenario['jammers']}
+            np.testing.assert_array_equal(optimizer._encode_individual(individual, scenario), row)
+    
+    def test_repair_removes_bandwidth_violations(self):
+        """测试修复后不再违反带宽约束"""
+        optimizer = EPDEOptimizer(population_size=200, seed=1)
+        scenario = make_scenario(n_radars=12, n_jammers=10)
+        population = optimizer._initialize_population(scenario)
+        # 所有干扰机使用窄带并集中到同一雷达
+        n_jammers = len(scenario['jammers'])
+        population[:, :n_jammers] = 0
+        population[:, 2 * n_jammers:] = optimizer.bandwidth_types.index('N')
+        
+        assert np.all(optimizer._calculate_constraint_penalty(population, scenario) > 0)
+        repaired = optimizer._repair_solution(population, scenario)
+        np.testing.assert_array_equal(optimizer._calculate_constraint_penalty(repaired, scenario), 0.0)
+        # 修复只改变目标分配
+        np.testing.assert_array_equal(repaired[:, n_jammers:], population[:, n_jammers:])
+    
+    def test_population_evaluation_uses_cache(self):
+        """测试批量评估与逐个评估一致，重复个体只评估一次"""
+        optimizer = EPDEOptimizer(population_size=10, seed=0)
+        scenario = make_scenario()
+        analyzer = CombatAnalyzer()
+        population = optimizer._initialize_population(scenario)
+        
+        fitness = optimizer._evaluate_population(np.vstack([population, population]), scenario, analyzer)
+        
+        expected = [optimizer._evaluate_fitness(row, scenario, analyzer)[0] for row in population]
+        np.testing.assert_allclose(fitness, expected + expected)
+        assert optimizer.evaluation_stats['evaluations'] <= len(population)
+        assert optimizer.evaluation_stats['cache_hits'] >= len(population)
+    
+    def test_optimize_returns_cached_best_fitness(self):
+        """测试优化结果的适应度与重新评估一致"""
+        optimizer = EPDEOptimizer(population_size=12, max_generations=15, time_limit=30.0, seed=1)
+        scenario = make_scenario()
+        analyzer = CombatAnalyzer()
+        
+        best_solution, best_fitness, convergence_data = optimizer.optimize(scenario, analyzer)
+        
+        assert len(convergence_data) == 15
+        row = optimizer._encode_individual(best_solution, scenario)
+        assert best_fitness == pytest.approx(optimizer._evaluate_fitness(row, scenario, analyzer)[0])
+        assert np.all(np.diff([c['best_fitness'] for c in convergence_data]) >= 0)
+    
+    def test_vectorized_effectiveness_matches_analyzer(self):
+        """测试查表评估与逐个体调用对抗分析器的结果一致"""
+        optimizer = EPDEOptimizer(population_size=100, seed=2)
+        analyzer = CombatAnalyzer()
+        for n_radars, n_jammers in [(12, 6), (3, 8), (1, 4), (0, 3)]:
+            scenario = make_scenario(n_radars=n_radars, n_jammers=n_jammers, seed=n_radars)
+            population = optimizer._initialize_population(scenario)
+            trials = optimizer._crossover(population, optimizer._mutation(population))
+            population = np.vstack([population, optimizer._repair_solution(trials, scenario)])
+            
+            np.testing.assert_allclose(
+                optimizer._evaluate_effectiveness_vectorized(population, scenario, analyzer),
+                optimizer._evaluate_effectiveness_each(population, scenario, analyzer),
+                rtol=0, atol=1e-12
+            )
+    
+    def test_optimize_without_jammers(self):
+        """测试无干扰机时直接返回空分配"""
+        optimizer = EPDEOptimizer(population_size=12, seed=0)
+        scenario = make_scenario(n_jammers=0)
+        
+        best_solution, best_fitness, convergence_data = optimizer.optimize(scenario, CombatAnalyzer())
+        
+        assert best_solution == {}
+        assert best_fitness == 0.0
+        assert convergence_data == []
+    
+    def test_optimize_returns_initial_best_when_time_limit_expires(self):
+        """测试第一代前即到达时间限制时返回初始种群的最优解"""
+        optimizer = EPDEOptimizer(population_size=50, time_limit=0.0, seed=3)
+        scenario = make_scenario()
+        analyzer = CombatAnalyzer()
+        
+        best_solution, best_fitness, convergence_data = optimizer.optimize(scenario, analyzer)
+        
+        assert convergence_data == []
+        assert best_solution is not None
+        row = optimizer._encode_individual(best_solution, scenario)
+        assert best_fitness == pytest.approx(optimizer._evaluate_fitness(row, scenario, analyzer)[0])
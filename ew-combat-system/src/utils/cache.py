@@ -0,0 +1,492 @@
+"""
+分层缓存模块
+内存LRU + 磁盘（或Redis）两级缓存，按CacheConfig限制条目数、字节数与过期时间
+"""
+import fnmatch
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+from .config_manager import CacheConfig, RedisConfig
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheTier(ABC):
+    """缓存层抽象基类，存取已序列化的字节串"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """读取 (数据, 过期时刻)，不存在或已过期返回None"""
+
+    @abstractmethod
+    def set(self, key: str, payload: bytes, expires_at: float) -> None:
+        """写入数据，expires_at为time.time()时刻"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """删除单个键"""
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        """遍历全部键"""
+
+    def clear(self, pattern: str = "*") -> int:
+        """删除匹配通配符的键，返回删除数量"""
+        removed = 0
+        for key in list(self.keys()):
+            if fnmatch.fnmatchcase(key, pattern):
+                self.delete(key)
+                removed += 1
+        return removed
+
+    def touch(self, key: str) -> None:
+        """标记键被访问（上层缓存命中时调用，用于维护本层的LRU顺序）"""
+
+    def purge_expired(self) -> int:
+        """清理过期条目，返回清理数量"""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryTier(CacheTier):
+    """内存LRU层，同时按条目数和字节数限制容量"""
+
+    def __init__(self, max_items: int, max_bytes: int):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _entry_size(key: str, payload: bytes) -> int:
+        return len(key.encode("utf-8")) + len(payload)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, payload, expires_at):
+        size = self._entry_size(key, payload)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes or self.max_items <= 0:
+                return
+            self._entries[key] = (payload, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._entry_size(key, entry[0])
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def keys(self):
+        with self._lock:
+            return iter(list(self._entries))
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {"items": len(self._entries), "bytes": self._bytes}
+
+
+class DiskTier(CacheTier):
+    """
+    磁盘层
+
+    每个键一个文件，文件名为键的SHA-1，文件头记录过期时刻与原始键名。
+    先写临时文件再原子重命名，读写并发或进程中断都不会留下半截文件。
+    字节数按实际文件大小统计，超出容量时按访问时间淘汰。
+    """
+
+    _MAGIC = b"EWC1"
+    _HEADER = struct.Struct("<4sdI")  # 魔数, 过期时刻, 键长度
+    _SUFFIX = ".cache"
+
+    def __init__(self, cache_dir: Path, max_items: int, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        # 文件名 -> (键, 文件字节数, 过期时刻)，按最近访问排序
+        self._index: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.rescan()
+
+    def _filename(self, key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest() + self._SUFFIX
+
+    def _read_header(self, path: Path) -> Optional[Tuple[str, float, int]]:
+        """读取 (键, 过期时刻, 数据偏移)"""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(self._HEADER.size)
+                magic, expires_at, key_length = self._HEADER.unpack(header)
+                if magic != self._MAGIC:
+                    return None
+                key = f.read(key_length).decode("utf-8")
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+        return key, expires_at, self._HEADER.size + key_length
+
+    def rescan(self):
+        """从磁盘重建索引（并清理过期与损坏文件），用于多实例共享目录时校正统计"""
+        entries = []
+        now = time.time()
+        for path in self.cache_dir.glob(f"*{self._SUFFIX}"):
+            header = self._read_header(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if header is None or header[1] <= now:
+                self._unlink(path)
+                continue
+            entries.append((stat.st_atime, path.name, header[0], stat.st_size, header[1]))
+        entries.sort()
+        with self._lock:
+            self._index = OrderedDict((name, (key, size, expires_at)) for _, name, key, size, expires_at in entries)
+            self._bytes = sum(size for _, size, _ in self._index.values())
+            self._enforce_bounds()
+
+    @staticmethod
+    def _unlink(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def get(self, key):
+        name = self._filename(key)
+        path = self.cache_dir / name
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._drop(name)
+            return None
+        try:
+            magic, expires_at, key_length = self._HEADER.unpack_from(data)
+        except struct.error:
+            magic = None
+        offset = self._HEADER.size + key_length if magic == self._MAGIC else 0
+        if magic != self._MAGIC or data[self._HEADER.size:offset].decode("utf-8", "replace") != key:
+            return None
+        with self._lock:
+            if expires_at <= time.time():
+                self._drop(name)
+                self._unlink(path)
+                return None
+            if name not in self._index:
+                # 其他实例写入的文件
+                self._track(name, key, len(data), expires_at)
+            self._index.move_to_end(name)
+        return data[offset:], expires_at
+
+    def set(self, key, payload, expires_at):
+        name = self._filename(key)
+        key_bytes = key.encode("utf-8")
+        size = self._HEADER.size + len(key_bytes) + len(payload)
+        with self._lock:
+            self._drop(name)
+        if size > self.max_bytes or self.max_items <= 0:
+            self._unlink(self.cache_dir / name)
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._HEADER.pack(self._MAGIC, expires_at, len(key_bytes)))
+                f.write(key_bytes)
+                f.write(payload)
+            os.replace(tmp_path, self.cache_dir / name)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._lock:
+            self._track(name, key, size, expires_at)
+            self._enforce_bounds()
+
+    def _track(self, name: str, key: str, size: int, expires_at: float):
+        self._drop(name)
+        self._index[name] = (key, size, expires_at)
+        self._bytes += size
+
+    def _drop(self, name: str):
+        entry = self._index.pop(name, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _enforce_bounds(self):
+        while self._index and (len(self._index) > self.max_items or self._bytes > self.max_bytes):
+            name = next(iter(self._index))
+            self._drop(name)
+            self._unlink(self.cache_dir / name)
+
+    def touch(self, key):
+        name = self._filename(key)
+        with self._lock:
+            if name in self._index:
+                self._index.move_to_end(name)
+
+    def delete(self, key):
+        name = self._filename(key)
+        with self._lock:
+            self._drop(name)
+        self._unlink(self.cache_dir / name)
+
+    def keys(self):
+        with self._lock:
+            return iter([key for key, _, _ in self._index.values()])
+
+    def clear(self, pattern="*"):
+        if pattern == "*":
+            with self._lock:
+                removed = len(self._index)
+                self._index.clear()
+                self._bytes = 0
+            # 同时清理旧版本遗留的.pkl缓存文件
+            for path in list(self.cache_dir.glob(f"*{self._SUFFIX}")) + list(self.cache_dir.glob("*.pkl")):
+                self._unlink(path)
+            return removed
+        return super().clear(pattern)
+
+    def purge_expired(self):
+        before = len(self._index)
+        self.rescan()
+        return max(0, before - len(self._index))
+
+    def stats(self):
+        with self._lock:
+            return {"items": len(self._index), "bytes": self._bytes}
+
+
+class RedisTier(CacheTier):
+    """
+    Redis层
+
+    使用redis-py兼容的客户端（get/set/delete/scan_iter），过期由Redis的EX参数
+    控制，容量由服务端maxmemory策略限制。键统一加前缀以便按模式清理。
+    """
+
+    def __init__(self, client, prefix: str = "ew:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_config(cls, redis_config: RedisConfig, prefix: str = "ew:cache:") -> "RedisTier":
+        if not REDIS_AVAILABLE:
+            raise ImportError("未安装redis，无法使用Redis缓存")
+        client = redis.Redis(
+            host=redis_config.host,
+            port=redis_config.port,
+            db=redis_config.db,
+            password=redis_config.password or None,
+            socket_timeout=redis_config.socket_timeout,
+            decode_responses=False,  # 缓存数据为二进制
+        )
+        client.ping()
+        return cls(client, prefix)
+
+    def get(self, key):
+        payload = self.client.get(self.prefix + key)
+        if payload is None:
+            return None
+        # PTTL返回-1表示未设置过期
+        ttl_ms = self.client.pttl(self.prefix + key)
+        expires_at = time.time() + ttl_ms / 1000 if ttl_ms is not None and ttl_ms >= 0 else float("inf")
+        return bytes(payload), expires_at
+
+    def set(self, key, payload, expires_at):
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            self.delete(key)
+            return
+        self.client.set(self.prefix + key, payload, px=ttl_ms)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def keys(self):
+        for name in self.client.scan_iter(match=self.prefix + "*"):
+            if isinstance(name, bytes):
+                name = name.decode("utf-8")
+            yield name[len(self.prefix):]
+
+
+def _sweep_loop(cache_ref: "weakref.ReferenceType[TieredCache]", interval: float, stop: threading.Event):
+    """后台清理线程，缓存对象被回收或关闭后退出"""
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        try:
+            cache.purge_expired()
+        except Exception as e:
+            logger.warning(f"缓存后台清理失败: {e}")
+        del cache
+
+
+class TieredCache:
+    """
+    分层缓存
+
+    数据序列化一次后写入内存层并直写到二级层（磁盘或Redis）；读取时先查内存层，
+    未命中再查二级层并回填内存层。条目数上限取CacheConfig.max_size，默认过期时间
+    取CacheConfig.ttl，过期条目由后台线程每cleanup_interval秒清理一次。
+    """
+
+    def __init__(self, config: Optional[CacheConfig] = None, cache_dir: Optional[Path] = None,
+                 second_tier: Optional[CacheTier] = None, redis_config: Optional[RedisConfig] = None):
+        """
+        参数:
+            config: 缓存配置，type为memory/file/redis
+            cache_dir: 磁盘层目录（type为file或Redis不可用时使用）
+            second_tier: 显式指定的二级层（如使用测试替身客户端的RedisTier）
+            redis_config: Redis连接配置
+        """
+        self.config = config or CacheConfig()
+        self.memory = MemoryTier(self.config.max_size, self.config.max_memory_bytes)
+        self.second_tier = second_tier if second_tier is not None else self._create_second_tier(cache_dir, redis_config)
+        self.hits = 0
+        self.misses = 0
+
+        self._stop = threading.Event()
+        if self.config.enabled and self.config.cleanup_interval > 0:
+            threading.Thread(
+                target=_sweep_loop, args=(weakref.ref(self), self.config.cleanup_interval, self._stop),
+                name="cache-sweeper", daemon=True
+            ).start()
+
+    def _create_second_tier(self, cache_dir: Optional[Path], redis_config: Optional[RedisConfig]) -> Optional[CacheTier]:
+        cache_type = self.config.type
+        if cache_type == "memory":
+            return None
+        if cache_type == "redis":
+            if not REDIS_AVAILABLE:
+                logger.info("未安装redis，改用磁盘缓存")
+            else:
+                try:
+                    return RedisTier.from_config(redis_config or RedisConfig())
+                except Exception as e:
+                    logger.warning(f"Redis缓存不可用，改用磁盘缓存: {e}")
+        if cache_dir is None:
+            raise ValueError("磁盘缓存需要指定cache_dir")
+        return DiskTier(cache_dir, self.config.max_size, self.config.max_disk_bytes)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取缓存，未命中或已过期返回default"""
+        if not self.config.enabled:
+            return default
+        entry = self.memory.get(key)
+        if self.second_tier is not None:
+            if entry is not None:
+                self.second_tier.touch(key)
+            else:
+                entry = self.second_tier.get(key)
+                if entry is not None:
+                    self.memory.set(key, *entry)
+        if entry is None:
+            self.misses += 1
+            return default
+        try:
+            value = pickle.loads(entry[0])
+        except Exception as e:
+            logger.warning(f"缓存数据损坏，已删除: {key}: {e}")
+            self.delete(key)
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存，ttl为过期秒数，默认取CacheConfig.ttl"""
+        if not self.config.enabled:
+            return
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = time.time() + (self.config.ttl if ttl is None else ttl)
+        self.memory.set(key, payload, expires_at)
+        if self.second_tier is not None:
+            self.second_tier.set(key, payload, expires_at)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.second_tier is not None:
+            self.second_tier.delete(key)
+
+    def clear(self, pattern: str = "*") -> int:
+        """删除键名匹配通配符的缓存，返回二级层（无二级层时为内存层）删除数量"""
+        removed = self.memory.clear(pattern)
+        if self.second_tier is not None:
+            removed = self.second_tier.clear(pattern)
+        return removed
+
+    def purge_expired(self) -> int:
+        removed = self.memory.purge_expired()
+        if self.second_tier is not None:
+            removed += self.second_tier.purge_expired()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"hits": self.hits, "misses": self.misses, "memory": self.memory.stats()}
+        if self.second_tier is not None:
+            stats["second_tier"] = self.second_tier.stats()
+        return stats
+
+    def close(self):
+        """停止后台清理线程"""
+        self._stop.set()
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
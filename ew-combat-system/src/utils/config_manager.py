@@ -63,6 +63,8 @@ class CacheConfig:
     type: str = "redis"  # redis, memory, file
     ttl: int = 3600  # 缓存时间（秒）
     max_size: int = 1000  # 最大缓存项数
+    max_memory_bytes: int = 67108864  # 内存层最大字节数（64MB）
+    max_disk_bytes: int = 536870912  # 磁盘层最大字节数（512MB）
     cleanup_interval: int = 300  # 清理间隔（秒）
 
 @dataclass
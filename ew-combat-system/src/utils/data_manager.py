@@ -2,22 +2,31 @@
 数据管理模块
 """
 import json
-import pickle
 import pandas as pd
-import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import yaml
 import csv
-import h5py
 import warnings
 warnings.filterwarnings('ignore')
 
+from .cache import TieredCache, CacheTier
+from .hdf5_store import CHUNK_BYTES, HDF5Recording, write_hdf5
+from .config_manager import CacheConfig, RedisConfig
+
 class DataManager:
     """数据管理器"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", cache_config: Optional[CacheConfig] = None,
+                 redis_config: Optional[RedisConfig] = None, cache_tier: Optional[CacheTier] = None):
+        """
+        参数:
+            data_dir: 数据目录
+            cache_config: 缓存配置（条目数、字节数、过期时间、后端类型）
+            redis_config: Redis连接配置（cache_config.type为redis时使用）
+            cache_tier: 显式指定的二级缓存层，优先于cache_config.type
+        """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
@@ -29,6 +38,9 @@ class DataManager:
         # 创建子目录
         for directory in [self.results_dir, self.temp_dir, self.cache_dir]:
             directory.mkdir(parents=True, exist_ok=True)
+        
+        # 内存LRU + 磁盘/Redis分层缓存
+        self.cache = TieredCache(cache_config, self.cache_dir, cache_tier, redis_config)
     
     def save_simulation_results(self, results: Dict[str, Any], 
                               scenario_name: str = None) -> str:
@@ -107,75 +119,59 @@ class DataManager:
         
         return data
     
-    def save_to_hdf5(self, data: Dict[str, np.ndarray], 
-                    filename: str) -> str:
-        """保存到HDF5文件"""
-        filepath = self.data_dir / f"{filename}.h5"
-        
-        with h5py.File(filepath, 'w') as f:
-            for key, value in data.items():
-                f.create_dataset(key, data=value)
+    def save_to_hdf5(self, data: Dict[str, Any], filename: str,
+                    compression: Optional[str] = "gzip", compression_level: Optional[int] = 4,
+                    chunk_bytes: int = CHUNK_BYTES, time_key: Optional[str] = None) -> str:
+        """
+        保存到HDF5文件
         
+        数组沿第0维分块并压缩，嵌套字典保存为组；time_key指定一维单调递增的
+        时间轴字段后，可用load_from_hdf5按时间窗口读取。
+        """
+        filepath = self.data_dir / f"{filename}.h5"
+        write_hdf5(filepath, data, compression, compression_level, chunk_bytes, time_key)
         return str(filepath)
     
-    def load_from_hdf5(self, filepath: str) -> Dict[str, np.ndarray]:
-        """从HDF5文件加载"""
+    def open_hdf5(self, filepath: str) -> Optional[HDF5Recording]:
+        """惰性打开HDF5文件（调用方负责关闭，可用with语句）"""
         path = Path(filepath)
         
         if not path.exists():
-            return {}
+            return None
         
-        data = {}
-        with h5py.File(path, 'r') as f:
-            for key in f.keys():
-                data[key] = f[key][:]
+        return HDF5Recording(path)
+    
+    def load_from_hdf5(self, filepath: str, fields: Optional[List[str]] = None,
+                      index: Optional[Union[int, slice, tuple]] = None,
+                      time_window: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        从HDF5文件加载
         
-        return data
+        参数:
+            filepath: 文件路径
+            fields: 只读取的字段路径，None表示全部
+            index: 沿第0维的切片/下标
+            time_window: 时间窗口 (start, end)，需保存时指定time_key
+        """
+        recording = self.open_hdf5(filepath)
+        if recording is None:
+            return {}
+        
+        with recording:
+            return recording.load(fields, index, time_window)
     
     def cache_data(self, key: str, data: Any, 
-                  expire_seconds: int = 3600) -> None:
-        """缓存数据"""
-        cache_data = {
-            'data': data,
-            'timestamp': datetime.now().isoformat(),
-            'expire_seconds': expire_seconds
-        }
-        
-        cache_path = self.cache_dir / f"{key}.pkl"
-        with open(cache_path, 'wb') as f:
-            pickle.dump(cache_data, f)
+                  expire_seconds: Optional[int] = None) -> None:
+        """缓存数据，expire_seconds默认取CacheConfig.ttl"""
+        self.cache.set(key, data, expire_seconds)
     
     def get_cached_data(self, key: str) -> Optional[Any]:
-        """获取缓存数据"""
-        cache_path = self.cache_dir / f"{key}.pkl"
-        
-        if not cache_path.exists():
-            return None
-        
-        try:
-            with open(cache_path, 'rb') as f:
-                cache_data = pickle.load(f)
-            
-            # 检查是否过期
-            cache_time = datetime.fromisoformat(cache_data['timestamp'])
-            expire_seconds = cache_data.get('expire_seconds', 3600)
-            
-            if (datetime.now() - cache_time).seconds > expire_seconds:
-                # 删除过期缓存
-                cache_path.unlink()
-                return None
-            
-            return cache_data['data']
-        except Exception:
-            return None
+        """获取缓存数据，不存在或已过期返回None"""
+        return self.cache.get(key)
     
     def clear_cache(self, pattern: str = "*") -> None:
-        """清理缓存"""
-        for cache_file in self.cache_dir.glob(pattern):
-            try:
-                cache_file.unlink()
-            except Exception:
-                pass
+        """清理键名匹配通配符的缓存"""
+        self.cache.clear(pattern)
     
     def export_to_excel(self, data_dict: Dict[str, pd.DataFrame], 
                        filename: str) -> str:
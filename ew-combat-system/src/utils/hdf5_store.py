@@ -0,0 +1,188 @@
+"""
+HDF5分块存储模块
+数组按第0维（时间/脉冲维）分块压缩写入，读取时按字段、切片或时间窗口惰性加载
+"""
+import bisect
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import h5py
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 1 << 20  # 单个分块的目标字节数（约1MiB）
+TIME_KEY_ATTR = "time_key"  # 文件属性：时间轴数据集路径
+
+Index = Union[int, slice, Tuple, List[int], np.ndarray]
+
+
+def chunk_shape(shape: Tuple[int, ...], itemsize: int,
+                chunk_bytes: int = CHUNK_BYTES) -> Optional[Tuple[int, ...]]:
+    """
+    计算分块形状
+
+    沿第0维取若干整行组成一块，使按时间窗口读取时只解压相邻的少数分块；
+    单行已超过目标大小时再对其余维减半。标量与空数组不分块。
+    """
+    if not shape or 0 in shape:
+        return None
+    row_bytes = itemsize * int(np.prod(shape[1:], dtype=np.int64))
+    chunks = [max(1, min(shape[0], chunk_bytes // max(1, row_bytes)))] + list(shape[1:])
+    while int(np.prod(chunks, dtype=np.int64)) * itemsize > chunk_bytes:
+        axis = int(np.argmax(chunks))
+        if chunks[axis] == 1:
+            break
+        chunks[axis] = (chunks[axis] + 1) // 2
+    return tuple(chunks)
+
+
+def _write_group(group: h5py.Group, data: Mapping[str, Any], compression: Optional[str],
+                 compression_level: Optional[int], chunk_bytes: int):
+    """递归写入：字典保存为组，其余值保存为数据集"""
+    for key, value in data.items():
+        if isinstance(value, Mapping):
+            _write_group(group.create_group(key), value, compression, compression_level, chunk_bytes)
+            continue
+
+        array = np.asarray(value)
+        dtype = None
+        if array.dtype.kind == 'U':
+            # h5py不支持numpy定长Unicode，转为变长UTF-8字符串
+            array = array.astype(object)
+            dtype = h5py.string_dtype()
+
+        chunks = chunk_shape(array.shape, array.dtype.itemsize, chunk_bytes)
+        if chunks is None:
+            group.create_dataset(key, data=array, dtype=dtype)
+            continue
+
+        options = {}
+        if compression is not None:
+            options["compression"] = compression
+            if compression == "gzip":
+                options["compression_opts"] = compression_level
+            # 字节重排对数值数组的压缩率提升明显
+            options["shuffle"] = array.dtype.kind in "biufc"
+        group.create_dataset(key, data=array, dtype=dtype, chunks=chunks, **options)
+
+
+def write_hdf5(filepath: Union[str, Path], data: Mapping[str, Any],
+               compression: Optional[str] = "gzip", compression_level: Optional[int] = 4,
+               chunk_bytes: int = CHUNK_BYTES, time_key: Optional[str] = None) -> Path:
+    """
+    写入HDF5文件
+
+    参数:
+        filepath: 文件路径
+        data: 字段名到数组的映射，嵌套字典保存为组
+        compression: 压缩算法（gzip/lzf），None表示不压缩
+        compression_level: gzip压缩级别
+        chunk_bytes: 单个分块的目标字节数
+        time_key: 时间轴数据集路径（一维单调递增），供按时间窗口读取
+    """
+    filepath = Path(filepath)
+    with h5py.File(filepath, 'w') as f:
+        _write_group(f, data, compression, compression_level, chunk_bytes)
+        if time_key is not None:
+            if time_key not in f or f[time_key].ndim != 1:
+                raise ValueError(f"时间轴必须是一维数据集: {time_key}")
+            f.attrs[TIME_KEY_ATTR] = time_key
+    return filepath
+
+
+class HDF5Recording:
+    """
+    HDF5记录的惰性只读视图
+
+    打开时只读取元数据；数据在按字段、切片或时间窗口访问时才从磁盘读取，
+    且只解压所涉及的分块，适合浏览长时间的交战记录。
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.filepath = Path(filepath)
+        self.file = h5py.File(self.filepath, 'r')
+        time_key = self.file.attrs.get(TIME_KEY_ATTR)
+        self.time_key = time_key.decode() if isinstance(time_key, bytes) else time_key
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "HDF5Recording":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, field: str) -> h5py.Dataset:
+        """返回数据集句柄（不读取数据，可直接切片）"""
+        return self.file[field]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.file
+
+    @property
+    def fields(self) -> List[str]:
+        """全部数据集路径（组内数据集以"/"分隔）"""
+        names = []
+        self.file.visititems(lambda name, obj: names.append(name) if isinstance(obj, h5py.Dataset) else None)
+        return names
+
+    def shape(self, field: str) -> Tuple[int, ...]:
+        return self.file[field].shape
+
+    def read(self, field: str, index: Optional[Index] = None) -> Any:
+        """读取单个字段，index为沿第0维（或各维）的切片/下标，None表示整个字段"""
+        dataset = self.file[field]
+        if index is None or dataset.ndim == 0:
+            index = ()
+        if h5py.check_string_dtype(dataset.dtype) is not None:
+            value = dataset.asstr()[index]
+            return value.astype(str) if isinstance(value, np.ndarray) else value
+        return dataset[index]
+
+    def time_slice(self, start: Optional[float] = None, end: Optional[float] = None) -> slice:
+        """
+        时间窗口 [start, end) 对应的第0维切片
+
+        在时间轴数据集上二分查找，只读取查找路径上的少数分块，不加载整条时间轴。
+        """
+        if self.time_key is None:
+            raise ValueError(f"文件未记录时间轴: {self.filepath}")
+        times = self.file[self.time_key]
+        low = 0 if start is None else bisect.bisect_left(times, start)
+        high = len(times) if end is None else bisect.bisect_left(times, end, lo=low)
+        return slice(low, high)
+
+    def load(self, fields: Optional[Iterable[str]] = None, index: Optional[Index] = None,
+             time_window: Optional[Tuple[Optional[float], Optional[float]]] = None) -> Dict[str, Any]:
+        """
+        读取多个字段为嵌套字典（结构与写入时一致）
+
+        参数:
+            fields: 字段路径列表，None表示全部字段
+            index: 沿第0维的切片/下标
+            time_window: 时间窗口 (start, end)，与index互斥
+
+        有时间轴时，index/time_window只作用于第0维长度与时间轴相同的字段，
+        其余字段（如配置参数、静态表）完整返回。
+        """
+        if time_window is not None:
+            if index is not None:
+                raise ValueError("index与time_window不能同时指定")
+            index = self.time_slice(*time_window)
+
+        aligned_length = len(self.file[self.time_key]) if self.time_key is not None else None
+        data: Dict[str, Any] = {}
+        for field in (self.fields if fields is None else fields):
+            dataset = self.file[field]
+            sliced = index is not None and dataset.ndim > 0 and (
+                aligned_length is None or dataset.shape[0] == aligned_length
+            )
+            node = data
+            *groups, name = field.strip("/").split("/")
+            for group in groups:
+                node = node.setdefault(group, {})
+            node[name] = self.read(field, index if sliced else None)
+        return data
@@ -17,6 +17,7 @@ from datetime import datetime
 import math
 
 from ..core.entities import Radar, Jammer, Target, Position
+from ..core.simulation.coverage import CoverageRaster
 
 
 class EWVisualizer:
@@ -736,24 +737,19 @@ class EWVisualizer:
         lat_grid = np.arange(lat_min, lat_max, resolution)
         lon_grid = np.arange(lon_min, lon_max, resolution)
         
-        # 计算每个网格点的信号强度
-        heat_data = []
+        # 计算每个网格点的信号强度（各雷达按地面大圆距离做平方衰减后叠加）
+        def received_signal(distance_km: np.ndarray, radar: Radar) -> np.ndarray:
+            with np.errstate(divide='ignore'):
+                signal = radar.radar_params.power / distance_km**2
+            return np.where(distance_km > 0, signal, 0.0)
         
-        for lat in lat_grid:
-            for lon in lon_grid:
-                total_signal = 0
-                for radar in radars:
-                    # 简化的信号强度计算（距离衰减）
-                    distance = math.sqrt((lon - radar.position.lon)**2 + (lat - radar.position.lat)**2)
-                    if distance > 0:
-                        # 转换为度数距离
-                        distance_km = distance * 111.32  # 近似转换
-                        signal = radar.radar_params.power / (distance_km**2)
-                        total_signal += signal
-                
-                # 归一化信号强度
-                if total_signal > 0:
-                    heat_data.append([lat, lon, min(total_signal, 100)])  # 限制最大值
+        total_signal = CoverageRaster(lat_grid, lon_grid, include_altitude=False).evaluate(radars, received_signal)
+        
+        # 归一化信号强度
+        rows, cols = np.nonzero(total_signal > 0)
+        heat_data = np.column_stack([
+            lat_grid[rows], lon_grid[cols], np.minimum(total_signal[rows, cols], 100)  # 限制最大值
+        ]).tolist()
         
         if heat_data:
             # 创建热力图
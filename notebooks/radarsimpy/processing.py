@@ -27,6 +27,7 @@ from numpy.typing import NDArray
 from scipy.signal import convolve, find_peaks
 from scipy import linalg
 from scipy import fft
+from scipy import ndimage
 from typing import Union, Optional, List
 from .tools import log_factorial  # pylint: disable=no-name-in-module
 
@@ -367,18 +368,20 @@ def cfar_os_1d(
     if np.iscomplexobj(data):
         raise ValueError("Input data should not be complex.")
 
-    data_shape = np.shape(data)
+    data = np.asarray(data)
     cfar = np.zeros_like(data)
-    leading = trailing
-    # trailing = n-leading
 
     if offset is None:
-        if detector == "squarelaw":
-            a = os_cfar_threshold(k, trailing * 2, pfa)
-        elif detector == "linear":
-            a = np.sqrt(os_cfar_threshold(k, trailing * 2, pfa))
-        else:
+        if detector not in ("linear", "squarelaw"):
             raise ValueError("`detector` can only be `linear` or `squarelaw`.")
+        a = os_cfar_threshold(k, trailing * 2, pfa)
+        if a is None:
+            raise ValueError(
+                "No OS-CFAR threshold in [1, 1e32] for ``k`` = " + str(k)
+                + ", ``pfa`` = " + str(pfa) + "; specify ``offset`` instead."
+            )
+        if detector == "linear":
+            a = np.sqrt(a)
     else:
         a = offset
 
@@ -389,38 +392,27 @@ def cfar_os_1d(
             "Typically, ``k`` is on the order of ``0.75N``"
         )
 
-    if axis == 0:
-        for idx in range(0, data_shape[0]):
-            win_idx = np.mod(
-                np.concatenate(
-                    [
-                        np.arange(idx - leading - guard, idx - guard, 1),
-                        np.arange(idx + 1 + guard, idx + 1 + trailing + guard, 1),
-                    ]
-                ),
-                data_shape[0],
+    # Sliding-window partial selection over the training cells; ``wrap``
+    # mode reproduces the rollover used for edge cells
+    cfar_win = np.ones((guard + trailing) * 2 + 1, dtype=bool)
+    cfar_win[trailing : (trailing + guard * 2 + 1)] = False
+
+    if data.ndim == 1:
+        # Evaluated as a single column: the 1-D fast path of ``rank_filter``
+        # does not honour holes in the footprint
+        if axis == 0:
+            cfar = a * ndimage.rank_filter(
+                data[:, np.newaxis], k, footprint=cfar_win[:, np.newaxis], mode="wrap"
+            )[:, 0]
+    elif data.ndim == 2:
+        if axis == 0:
+            cfar = a * ndimage.rank_filter(
+                data, k, footprint=cfar_win[:, np.newaxis], mode="wrap"
             )
-            if data.ndim == 1:
-                samples = np.sort(data[win_idx.astype(int)])
-                cfar[idx] = a * samples[k]
-            elif data.ndim == 2:
-                samples = np.sort(data[win_idx.astype(int), :], axis=0)
-                cfar[idx, :] = a * samples[k, :]
-
-    elif axis == 1:
-        for idx in range(0, data_shape[1]):
-            win_idx = np.mod(
-                np.concatenate(
-                    [
-                        np.arange(idx - leading - guard, idx - guard, 1),
-                        np.arange(idx + 1 + guard, idx + 1 + trailing + guard, 1),
-                    ]
-                ),
-                data_shape[1],
+        elif axis == 1:
+            cfar = a * ndimage.rank_filter(
+                data, k, footprint=cfar_win[np.newaxis, :], mode="wrap"
             )
-            samples = np.sort(data[:, win_idx.astype(int)], axis=1)
-
-            cfar[:, idx] = a * samples[:, k]
 
     return cfar
 
@@ -478,9 +470,6 @@ def cfar_os_2d(
     if np.iscomplexobj(data):
         raise ValueError("Input data should not be complex.")
 
-    data_shape = np.shape(data)
-    cfar = np.zeros_like(data)
-
     guard = np.array(guard)
     if guard.size == 1:
         guard = np.tile(guard, 2)
@@ -489,19 +478,23 @@ def cfar_os_2d(
         trailing = np.tile(trailing, 2)
 
     tg_sum = trailing + guard
-    if offset is None:
-        t_num = (2 * tg_sum[0] + 1) * (2 * tg_sum[1] + 1)
-        g_num = (2 * guard[0] + 1) * (2 * guard[1] + 1)
+    t_num = (2 * tg_sum[0] + 1) * (2 * tg_sum[1] + 1)
+    g_num = (2 * guard[0] + 1) * (2 * guard[1] + 1)
 
-        if t_num == g_num:
-            raise ValueError("No trailing bins!")
+    if t_num == g_num:
+        raise ValueError("No trailing bins!")
 
-        if detector == "squarelaw":
-            a = os_cfar_threshold(k, t_num - g_num, pfa)
-        elif detector == "linear":
-            a = np.sqrt(os_cfar_threshold(k, t_num - g_num, pfa))
-        else:
+    if offset is None:
+        if detector not in ("linear", "squarelaw"):
             raise ValueError("`detector` can only be `linear` or `squarelaw`.")
+        a = os_cfar_threshold(k, t_num - g_num, pfa)
+        if a is None:
+            raise ValueError(
+                "No OS-CFAR threshold in [1, 1e32] for ``k`` = " + str(k)
+                + ", ``pfa`` = " + str(pfa) + "; specify ``offset`` instead."
+            )
+        if detector == "linear":
+            a = np.sqrt(a)
     else:
         a = offset
 
@@ -518,22 +511,11 @@ def cfar_os_2d(
         trailing[1] : (trailing[1] + guard[1] * 2 + 1),
     ] = False
 
-    for idx_0 in range(0, data_shape[0]):
-        for idx_1 in range(0, data_shape[1]):
-            win_idx_0 = np.mod(
-                np.arange(idx_0 - tg_sum[0], idx_0 + 1 + tg_sum[0], 1), data_shape[0]
-            )
-            win_idx_1 = np.mod(
-                np.arange(idx_1 - tg_sum[1], idx_1 + 1 + tg_sum[1], 1), data_shape[1]
-            )
-
-            x, y = np.meshgrid(win_idx_0, win_idx_1, indexing="ij")
-            sample_cube = data[x, y]
-            samples = np.sort(sample_cube[cfar_win].flatten())
-
-            cfar[idx_0, idx_1] = a * samples[k]
-
-    return cfar
+    # Sliding-window partial selection over the 2D training ring; ``wrap``
+    # mode reproduces the rollover used for edge cells
+    return a * ndimage.rank_filter(
+        np.asarray(data), k, footprint=cfar_win, mode="wrap"
+    )
 
 
 def doa_music(
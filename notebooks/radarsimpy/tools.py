@@ -427,12 +427,12 @@ def roc_pd(
             pd[it_pfa.index, :] = pd_swerling0(npulses, snr, thred)
 
         elif stype == "Coherent":
-            snr = snr * npulses
-            pd[it_pfa.index, :] = erfc(erfcinv(2 * it_pfa[0]) - np.sqrt(snr)) / 2
+            snr_int = snr * npulses
+            pd[it_pfa.index, :] = erfc(erfcinv(2 * it_pfa[0]) - np.sqrt(snr_int)) / 2
 
         elif stype == "Real":
-            snr = snr * npulses / 2
-            pd[it_pfa.index, :] = erfc(erfcinv(2 * it_pfa[0]) - np.sqrt(snr)) / 2
+            snr_int = snr * npulses / 2
+            pd[it_pfa.index, :] = erfc(erfcinv(2 * it_pfa[0]) - np.sqrt(snr_int)) / 2
 
         else:
             return None
@@ -1,11 +1,56 @@
 # radar_station_manager.py
 import yaml
+from collections.abc import ItemsView, Mapping
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, asdict, field
 import uuid
 import json
+import math
 import os
+import sqlite3
+import tempfile
+
+# 优先使用libyaml加速的加载/导出器
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# 1度纬度对应的距离（km）
+_KM_PER_DEG = 111.32
+
+# 雷达台站分区（在记录表中带索引列）
+_STATION_SECTION = '雷达台站'
+
+# 写入一条记录，已存在时原位替换（保持原有顺序）
+_UPSERT_RECORD = (
+    "INSERT INTO records (section, key, value, country, radar_type, latitude, longitude) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (section, key) DO UPDATE SET value = excluded.value, "
+    "country = excluded.country, radar_type = excluded.radar_type, "
+    "latitude = excluded.latitude, longitude = excluded.longitude"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    seq INTEGER PRIMARY KEY,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    country TEXT,
+    radar_type TEXT,
+    latitude REAL,
+    longitude REAL,
+    UNIQUE (section, key)
+);
+CREATE INDEX IF NOT EXISTS records_order ON records (section, seq);
+CREATE INDEX IF NOT EXISTS records_country ON records (section, country, seq);
+CREATE INDEX IF NOT EXISTS records_type ON records (section, radar_type, seq);
+CREATE INDEX IF NOT EXISTS records_location ON records (section, latitude, longitude);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
 
 @dataclass
 class RadarParameters:
@@ -150,47 +195,254 @@ class EWScenario:
             'scenario_file': self.scenario_file
         }
 
+def _station_field(section: Dict, *keys: str, default: Any = None) -> Any:
+    """读取台站字段，兼容中文键（手工编写的数据库）与英文键（add_radar_station写入）"""
+    for key in keys:
+        if key in section:
+            return section[key]
+    return default
+
+
+class _SectionItems(ItemsView):
+    """分区键值视图：一次查询按插入顺序取出全部记录"""
+    
+    def __iter__(self):
+        yield from self._mapping._items()
+
+
+class _SectionView(Mapping):
+    """
+    数据库分区的只读视图
+    
+    记录保存在SQLite中，按插入顺序遍历，访问某条记录时才解析其JSON；
+    修改请通过RadarStationDatabase的方法进行
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, section: str):
+        self._conn = conn
+        self._section = section
+    
+    def __getitem__(self, key: str) -> Any:
+        row = self._conn.execute(
+            "SELECT value FROM records WHERE section = ? AND key = ?", (self._section, key)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+    
+    def __contains__(self, key: object) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM records WHERE section = ? AND key = ?", (self._section, key)
+        ).fetchone() is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        rows = self._conn.execute(
+            "SELECT key FROM records WHERE section = ? ORDER BY seq", (self._section,)
+        ).fetchall()
+        return iter([key for key, in rows])
+    
+    def __len__(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM records WHERE section = ?", (self._section,)
+        ).fetchone()[0]
+    
+    def items(self) -> ItemsView:
+        return _SectionItems(self)
+    
+    def _items(self) -> Iterator[tuple]:
+        rows = self._conn.execute(
+            "SELECT key, value FROM records WHERE section = ? ORDER BY seq", (self._section,)
+        ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+
 class RadarStationDatabase:
-    """雷达台站数据库管理器"""
+    """
+    雷达台站数据库管理器
+    
+    数据保存在与YAML同名的.sqlite文件中，每条台站/想定为一行记录，增删只写
+    一行；国家、类型与经纬度作为带B树索引的列，筛选与区域查询走索引，加载时
+    不解析全部记录。YAML文件作为导入/导出格式：加载时若YAML比上次导入/导出
+    更新（如手工编辑或其他程序写入），将其记录合并进数据库（同键记录以YAML为准，
+    数据库中YAML没有的记录保留）；save_database()导出YAML快照。
+    """
     
     def __init__(self, db_file: str = "radar_station_database.yaml"):
         self.db_file = db_file
-        self.database: Dict[str, Any] = {
+        self.store_file = f"{db_file}.sqlite"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._database: Dict[str, Any] = {}
+        self._metadata: Dict[str, Any] = {
             '版本': "2.0",
             '创建时间': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            '最后更新时间': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            '雷达台站': {},
-            '作战区域': {},
-            '电磁对抗关系': {},
-            '电子战单元': {},
-            '场景想定': {}
+            '最后更新时间': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
-        
+        self._sections = [_STATION_SECTION, '作战区域', '电磁对抗关系', '电子战单元', '场景想定']
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """数据库连接（首次使用时打开并建表）"""
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.store_file))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.store_file)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._read_meta()
+        return self._conn
+    
+    @property
+    def database(self) -> Dict[str, Any]:
+        """数据库内容：元数据字段与各分区的只读视图"""
+        self.conn  # 首次访问时打开连接并读取元数据
+        return self._database
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _read_meta(self) -> None:
+        """读取元数据（版本、时间等非分区字段与分区列表），并刷新database视图"""
+        rows = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        if 'metadata' in rows:
+            self._metadata = json.loads(rows['metadata'])
+        if 'sections' in rows:
+            self._sections = json.loads(rows['sections'])
+        self._database = {
+            **self._metadata,
+            **{name: _SectionView(self._conn, name) for name in self._sections}
+        }
+    
+    def _write_meta(self, **values: Any) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value, ensure_ascii=False, default=str)) for key, value in values.items()]
+        )
+    
+    def _yaml_mtime(self) -> Optional[int]:
+        return os.stat(self.db_file).st_mtime_ns if os.path.exists(self.db_file) else None
+    
     def load_database(self) -> bool:
-        """加载数据库"""
+        """加载数据库；YAML比上次导入/导出更新时先将其合并导入"""
         try:
-            if os.path.exists(self.db_file):
-                with open(self.db_file, 'r', encoding='utf-8') as f:
-                    self.database = yaml.safe_load(f)
-                return True
-            else:
+            yaml_mtime = self._yaml_mtime()
+            if yaml_mtime is None and not os.path.exists(self.store_file):
                 print(f"数据库文件{self.db_file}不存在")
+                return False
+            
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'yaml_mtime'").fetchone()
+            if yaml_mtime is not None and (row is None or json.loads(row[0]) != yaml_mtime):
+                with open(self.db_file, 'r', encoding='utf-8') as f:
+                    self._import(yaml.load(f, Loader=_YamlLoader) or {}, yaml_mtime)
+            return True
         except Exception as e:
             print(f"加载数据库失败: {e}")
         return False
     
+    def _import(self, data: Dict[str, Any], yaml_mtime: int) -> None:
+        """
+        将YAML内容合并进数据库（单个事务）
+        
+        同键记录以YAML为准，数据库中YAML没有的记录（如上次导出后新增的台站）保留，
+        避免其他程序写入同一YAML时丢失未导出的修改
+        """
+        metadata = {key: value for key, value in data.items() if not isinstance(value, dict)}
+        sections = self._sections + [key for key, value in data.items()
+                                     if isinstance(value, dict) and key not in self._sections]
+        with self.conn:
+            for section, records in data.items():
+                if not isinstance(records, dict):
+                    continue
+                self.conn.executemany(
+                    _UPSERT_RECORD,
+                    [self._record_row(section, key, value) for key, value in records.items()]
+                )
+            self._write_meta(metadata={**self._metadata, **metadata}, sections=sections,
+                             yaml_mtime=yaml_mtime)
+        self._read_meta()
+    
     def save_database(self) -> bool:
-        """保存数据库"""
+        """导出数据库为YAML快照（原子替换）"""
         try:
-            self.database['最后更新时间'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                yaml.dump(self.database, f, default_flow_style=False, 
-                         allow_unicode=True, sort_keys=False)
+            self._metadata['最后更新时间'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            snapshot = {
+                **self._metadata,
+                **{name: dict(_SectionView(self.conn, name).items()) for name in self._sections}
+            }
+            directory = os.path.dirname(os.path.abspath(self.db_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    yaml.dump(snapshot, f, Dumper=_YamlDumper, default_flow_style=False,
+                              allow_unicode=True, sort_keys=False)
+                os.replace(tmp_path, self.db_file)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            # 记录导出后的YAML时间戳，避免下次加载时重复导入
+            with self.conn:
+                self._write_meta(metadata=self._metadata, yaml_mtime=self._yaml_mtime())
+            self._read_meta()
             return True
         except Exception as e:
             print(f"保存数据库失败: {e}")
         return False
     
+    def compact(self) -> bool:
+        """将WAL日志合入数据库文件并截断"""
+        try:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return True
+        except sqlite3.Error as e:
+            print(f"压缩数据库失败: {e}")
+        return False
+    
+    @staticmethod
+    def _station_keys(station: Dict) -> tuple:
+        """提取索引键：(国家, 类型, 纬度, 经度)"""
+        basic = station.get('基本信息', {}) or {}
+        location = station.get('部署位置', {}) or {}
+        return (
+            _station_field(basic, '国家', 'country'),
+            _station_field(basic, '类型', 'radar_type'),
+            float(_station_field(location, '纬度', 'latitude', default=0) or 0),
+            float(_station_field(location, '经度', 'longitude', default=0) or 0)
+        )
+    
+    def _record_row(self, section: str, key: Any, value: Any) -> tuple:
+        """记录表的一行；雷达台站分区填写索引列"""
+        index_columns = (None, None, None, None)
+        if section == _STATION_SECTION and isinstance(value, dict):
+            index_columns = self._station_keys(value)
+        return (section, str(key), json.dumps(value, ensure_ascii=False, default=str), *index_columns)
+    
+    def _put(self, section: str, key: str, value: Any) -> bool:
+        """写入一条记录（已存在时原位替换，保持原有顺序）"""
+        try:
+            with self.conn:
+                if section not in self._sections:
+                    self._sections.append(section)
+                    self._write_meta(sections=self._sections)
+                self.conn.execute(_UPSERT_RECORD, self._record_row(section, key, value))
+            if section not in self._database:
+                self._read_meta()
+            return True
+        except sqlite3.Error as e:
+            print(f"写入数据库失败: {e}")
+        return False
+    
+    def _query_stations(self, where: str, params: tuple, columns: str = "key, value") -> List[tuple]:
+        """按条件查询台站，按加入数据库的顺序排列"""
+        return self.conn.execute(
+            f"SELECT {columns} FROM records WHERE section = ? AND {where} ORDER BY seq",
+            (_STATION_SECTION, *params)
+        ).fetchall()
+    
     def add_radar_station(self, station: RadarStation) -> bool:
         """添加雷达台站"""
         station_id = station.station_id
@@ -233,59 +485,64 @@ class RadarStationDatabase:
             '连接性': station_dict['connectivity']
         }
         
-        self.database['雷达台站'][station_id] = yaml_station
-        return self.save_database()
+        return self._put(_STATION_SECTION, station_id, yaml_station)
     
     def get_radar_station(self, station_id: str) -> Optional[Dict]:
         """获取雷达台站"""
-        return self.database.get('雷达台站', {}).get(station_id)
+        return _SectionView(self.conn, _STATION_SECTION).get(station_id)
     
     def delete_radar_station(self, station_id: str) -> bool:
         """删除雷达台站"""
-        if station_id in self.database.get('雷达台站', {}):
-            del self.database['雷达台站'][station_id]
-            return self.save_database()
+        try:
+            with self.conn:
+                deleted = self.conn.execute(
+                    "DELETE FROM records WHERE section = ? AND key = ?", (_STATION_SECTION, station_id)
+                ).rowcount
+            return deleted > 0
+        except sqlite3.Error as e:
+            print(f"删除雷达台站失败: {e}")
         return False
     
-    def get_all_stations(self) -> Dict:
-        """获取所有雷达台站"""
-        return self.database.get('雷达台站', {})
+    def get_all_stations(self) -> Mapping:
+        """获取所有雷达台站（按加入顺序的只读映射，访问时才解析记录）"""
+        return _SectionView(self.conn, _STATION_SECTION)
     
     def get_stations_by_country(self, country: str) -> List[Dict]:
         """按国家筛选雷达台站"""
-        stations = []
-        for station_id, station in self.database.get('雷达台站', {}).items():
-            if station.get('基本信息', {}).get('国家') == country:
-                stations.append({'id': station_id, **station})
-        return stations
+        return [{'id': station_id, **json.loads(value)}
+                for station_id, value in self._query_stations("country IS ?", (country,))]
     
     def get_stations_by_type(self, radar_type: str) -> List[Dict]:
         """按类型筛选雷达台站"""
-        stations = []
-        for station_id, station in self.database.get('雷达台站', {}).items():
-            if station.get('基本信息', {}).get('类型') == radar_type:
-                stations.append({'id': station_id, **station})
-        return stations
+        return [{'id': station_id, **json.loads(value)}
+                for station_id, value in self._query_stations("radar_type IS ?", (radar_type,))]
     
     def get_stations_in_area(self, lat: float, lon: float, radius_km: float) -> List[Dict]:
-        """获取指定区域内的雷达台站"""
-        import math
-        stations = []
+        """获取指定区域内的雷达台站（经纬度索引按包围盒预筛选）"""
+        cos_lat = math.cos(math.radians(lat))
         
-        for station_id, station in self.database.get('雷达台站', {}).items():
-            location = station.get('部署位置', {})
-            station_lat = location.get('纬度', 0)
-            station_lon = location.get('经度', 0)
-            
+        # 查询圆的经纬度包围盒（略微放宽以免边界上的浮点误差漏选），极点附近不限经度
+        margin = 1 + 1e-9
+        lat_span = radius_km / _KM_PER_DEG * margin
+        where = "latitude BETWEEN ? AND ?"
+        params = (lat - lat_span, lat + lat_span)
+        if abs(cos_lat) > 1e-12:
+            lon_span = radius_km / (_KM_PER_DEG * abs(cos_lat)) * margin
+            where += " AND longitude BETWEEN ? AND ?"
+            params += (lon - lon_span, lon + lon_span)
+        
+        stations = []
+        rows = self._query_stations(where, params, "key, value, latitude, longitude")
+        for station_id, value, station_lat, station_lon in rows:
             # 计算距离（简化球面距离）
-            lat_diff = abs(station_lat - lat) * 111.32  # 1度纬度约111.32km
-            lon_diff = abs(station_lon - lon) * 111.32 * math.cos(math.radians(lat))
+            lat_diff = abs(station_lat - lat) * _KM_PER_DEG  # 1度纬度约111.32km
+            lon_diff = abs(station_lon - lon) * _KM_PER_DEG * cos_lat
             distance = math.sqrt(lat_diff**2 + lon_diff**2)
             
             if distance <= radius_km:
                 stations.append({
                     'id': station_id,
-                    'station': station,
+                    'station': json.loads(value),
                     'distance_km': distance
                 })
         
@@ -293,12 +550,11 @@ class RadarStationDatabase:
     
     def add_ew_scenario(self, scenario: EWScenario) -> bool:
         """添加电子战想定"""
-        self.database['场景想定'][scenario.scenario_id] = scenario.to_dict()
-        return self.save_database()
+        return self._put('场景想定', scenario.scenario_id, scenario.to_dict())
     
     def get_scenario(self, scenario_id: str) -> Optional[Dict]:
         """获取想定"""
-        return self.database.get('场景想定', {}).get(scenario_id)
+        return _SectionView(self.conn, '场景想定').get(scenario_id)
     
     def simulate_engagement(self, red_radars: List[str], blue_radars: List[str], 
                            ew_units: List[str] = None) -> Dict:
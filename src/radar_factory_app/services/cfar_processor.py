@@ -1,42 +1,506 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import warnings
 import numpy as np
-from scipy.signal import convolve
-from typing import Union, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, Union, List, Optional, Tuple
 from numpy.typing import NDArray
+from scipy import ndimage
+from scipy.special import gammaln, logsumexp
 from radarsimpy.tools import roc_pd, roc_snr, threshold
 
+from radar_factory_app.services.pd_table import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== 滑动窗口求和（前缀和/积分图） ====================
+# 边缘按零填充处理，与scipy.signal.convolve(mode="same")的结果一致；
+# 每个单元的窗口和由前缀和查表相减得到，计算量与窗口大小无关
+
+def _prefix_sum_1d(data: NDArray, span: int, axis: int) -> NDArray:
+    """
+    沿axis两侧各补span个零并求前缀和（首位额外补一个0），计算轴移到最后一维
+
+    返回的S满足：补零后序列[a, b)区间之和为 S[..., b] - S[..., a]
+    """
+    data = np.moveaxis(np.asarray(data, dtype=float), axis, -1)
+    pad_width = [(0, 0)] * (data.ndim - 1) + [(span + 1, span)]
+    return np.cumsum(np.pad(data, pad_width), axis=-1)
+
+
+def _window_sum_1d(prefix: NDArray, n: int, start: int, length: int) -> NDArray:
+    """每个单元的窗口和，窗口为补零后序列中相对该单元起点偏移start、长度length的区间"""
+    return prefix[..., start + length:start + length + n] - prefix[..., start:start + n]
+
+
+def _prefix_sum_2d(data: NDArray, span: NDArray) -> NDArray:
+    """最后两维两侧分别补span个零并求积分图（首行首列额外补0），前导维视为批次"""
+    data = np.asarray(data, dtype=float)
+    pad_width = [(0, 0)] * (data.ndim - 2) + [(span[0] + 1, span[0]), (span[1] + 1, span[1])]
+    return np.pad(data, pad_width).cumsum(axis=-2).cumsum(axis=-1)
+
+
+def _box_sum_2d(prefix: NDArray, shape: Tuple[int, int], start: Tuple[int, int],
+                size: Tuple[int, int]) -> NDArray:
+    """每个单元的矩形窗口和，窗口左上角相对该单元在补零图中的偏移为start，尺寸为size"""
+    (n0, n1), (r, c), (h, w) = shape, start, size
+    return (
+        prefix[..., r + h:r + h + n0, c + w:c + w + n1]
+        - prefix[..., r:r + n0, c + w:c + w + n1]
+        - prefix[..., r + h:r + h + n0, c:c + n1]
+        + prefix[..., r:r + n0, c:c + n1]
+    )
+
+
+def _training_sums_1d(data: NDArray, guard: int, trailing: int, axis: int) -> Tuple[NDArray, NDArray]:
+    """
+    沿axis计算每个单元前后两侧参考窗之和
+
+    :return: (前侧参考窗和, 后侧参考窗和)，计算轴位于最后一维
+    """
+    span = guard + trailing
+    n = np.shape(data)[axis]
+    prefix = _prefix_sum_1d(data, span, axis)
+    leading = _window_sum_1d(prefix, n, 0, trailing)
+    lagging = _window_sum_1d(prefix, n, span + guard + 1, trailing)
+    return leading, lagging
+
+
+def _training_sums_2d(data: NDArray, guard: NDArray, trailing: NDArray) -> Tuple[NDArray, NDArray]:
+    """
+    最后两维上每个单元参考区（外框减保护框）的前后两半之和
+
+    参考区沿最后一维（距离维）按中心对称分为两半：前半为列偏移<0的单元
+    及中心列中行偏移<0的单元，后半为其余单元，两半单元数相等。
+
+    :return: (前半参考区和, 后半参考区和)
+    """
+    span = guard + trailing
+    shape = np.shape(data)[-2:]
+    prefix = _prefix_sum_2d(data, span)
+    total = (
+        _box_sum_2d(prefix, shape, (0, 0), tuple(2 * span + 1))
+        - _box_sum_2d(prefix, shape, tuple(trailing), tuple(2 * guard + 1))
+    )
+    leading = (
+        _box_sum_2d(prefix, shape, (0, 0), (2 * span[0] + 1, span[1]))
+        - _box_sum_2d(prefix, shape, (trailing[0], trailing[1]), (2 * guard[0] + 1, guard[1]))
+        + _box_sum_2d(prefix, shape, (0, span[1]), (trailing[0], 1))
+    )
+    return leading, total - leading
+
+
+# ==================== 滑动窗口部分选择（OS-CFAR） ====================
+# 参考区为窗口中footprint为True的单元，边缘按循环方式取参考单元；
+# 由scipy.ndimage.rank_filter一次完成全部单元的部分选择，不逐单元排序
+
+def _ranked_training_1d(data: NDArray, guard: int, trailing: int, k: int, axis: int) -> NDArray:
+    """沿axis取每个单元两侧参考窗中排序后第k个（从0开始）的值"""
+    data = np.asarray(data)
+    axis = axis % max(data.ndim, 1)
+    window = np.ones((guard + trailing) * 2 + 1, dtype=bool)
+    window[trailing:trailing + guard * 2 + 1] = False
+
+    # 一维数据按单列处理：rank_filter的一维快速路径不支持带空洞的footprint
+    columns = data[:, np.newaxis] if data.ndim == 1 else data
+    footprint_shape = [1] * columns.ndim
+    footprint_shape[axis] = window.size
+    ranked = ndimage.rank_filter(columns, k, footprint=window.reshape(footprint_shape), mode="wrap")
+    return ranked.reshape(data.shape)
+
+
+def _ranked_training_2d(data: NDArray, guard: NDArray, trailing: NDArray, k: int) -> NDArray:
+    """最后两维上取每个单元参考区（外框减保护框）中排序后第k个（从0开始）的值，前导维视为批次"""
+    data = np.asarray(data)
+    span = guard + trailing
+    window = np.ones(tuple(2 * span + 1), dtype=bool)
+    window[trailing[0]:trailing[0] + guard[0] * 2 + 1,
+           trailing[1]:trailing[1] + guard[1] * 2 + 1] = False
+    footprint = window.reshape((1,) * (data.ndim - 2) + window.shape)
+    return ndimage.rank_filter(data, k, footprint=footprint, mode="wrap")
+
+
+# 参考单元均值类CFAR：由前后两半参考区之和合成噪声功率估计
+CFAR_MEAN_METHODS = {
+    "ca": lambda leading, lagging: leading + lagging,
+    "go": np.maximum,
+    "so": np.minimum,
+}
+
+
+def _log_pfa_so(t: NDArray, n: NDArray) -> NDArray:
+    """SO-CFAR对数虚警概率（平方律检测、指数分布噪声，t为对半窗之和的门限乘子），按元素计算"""
+    k = np.arange(max(int(n.max(initial=0)), 1))[np.newaxis, :]
+    n = n[:, np.newaxis]
+    log_terms = gammaln(n + k) - gammaln(k + 1) - gammaln(n) - (n + k) * np.log(2 + t)[:, np.newaxis]
+    return np.log(2) + logsumexp(np.where(k < n, log_terms, -np.inf), axis=1)
+
+
+def _log_pfa_go(t: NDArray, n: NDArray) -> NDArray:
+    """GO-CFAR对数虚警概率，Pfa_GO = 2(1+t)^(-n) - Pfa_SO"""
+    log_half_ca = np.log(2) - n * np.log1p(t)
+    # 门限极大时两项相消为0，对数取-inf，不影响求根；舍入误差可能使比值略大于1，
+    # 截断到1避免log1p的参数小于-1
+    ratio = np.minimum(np.exp(_log_pfa_so(t, n) - log_half_ca), 1.0)
+    with np.errstate(divide="ignore"):
+        return log_half_ca + np.log1p(-ratio)
+
+
+def go_so_thresholds(method: str, n: NDArray, pfa: NDArray) -> NDArray:
+    """
+    批量计算GO/SO-CFAR门限乘子（作用于半窗参考单元均值）
+
+    虚警概率随门限单调递减，对全部配置在对数门限上同时二分求根
+
+    :param method: "go"或"so"
+    :param n: 半窗参考单元数
+    :param pfa: 虚警概率
+    :return: 门限乘子
+
+    *Reference*
+
+    P. P. Gandhi and S. A. Kassam, "Analysis of CFAR processors in
+    nonhomogeneous background," IEEE Trans. Aerosp. Electron. Syst.,
+    vol. 24, no. 4, pp. 427-445, 1988.
+    """
+    log_pfa = {"go": _log_pfa_go, "so": _log_pfa_so}[method]
+    n, pfa = np.broadcast_arrays(np.asarray(n, dtype=int), np.asarray(pfa, dtype=float))
+    shape = n.shape
+    n, target = n.ravel(), np.log(pfa.ravel())
+
+    low = np.full(n.shape, -30.0)
+    high = np.full(n.shape, 80.0)
+    for _ in range(64):
+        mid = (low + high) / 2
+        above = log_pfa(np.exp(mid), n) > target
+        low = np.where(above, mid, low)
+        high = np.where(above, high, mid)
+
+    return (np.exp((low + high) / 2) * n).reshape(shape)
+
+
+def os_thresholds(k: NDArray, n: NDArray, pfa: NDArray) -> NDArray:
+    """
+    批量计算OS-CFAR门限乘子（作用于排序后第k个参考单元，k从0开始）
+
+    第k个（从0开始）即第k+1小的参考单元，门限方程为
+    log(n!/(n-k-1)!) - sum_{i<=k} log(n - i + T) = log(pfa)，左边随T
+    单调递减，对全部配置在[1, 1e32]内的对数门限上同时二分求根
+
+    :param k: 排序秩（从0开始，与scipy.ndimage.rank_filter一致）
+    :param n: 参考单元数
+    :param pfa: 虚警概率
+    :return: 门限乘子，区间内无解的配置为nan（并发出警告）
+
+    *Reference*
+
+    Rohling, Hermann. "Radar CFAR thresholding in clutter and multiple target
+    situations." IEEE transactions on aerospace and electronic systems 4
+    (1983): 608-621.
+    """
+    k, n, pfa = np.broadcast_arrays(
+        np.asarray(k, dtype=int), np.asarray(n, dtype=int), np.asarray(pfa, dtype=float)
+    )
+    shape = k.shape
+    k, n, pfa = k.ravel(), n.ravel(), pfa.ravel()
+
+    # Rohling公式中的排序秩从1开始，乘积取k+1项
+    terms = k + 1
+    rank = np.arange(max(int(terms.max(initial=0)), 1))
+    in_rank = rank[np.newaxis, :] < terms[:, np.newaxis]
+    n_minus_rank = n[:, np.newaxis] - rank[np.newaxis, :]
+    const = gammaln(n + 1) - gammaln(n - terms + 1) - np.log(pfa)
+
+    def fun(log_t):
+        cells = np.where(in_rank, n_minus_rank + np.exp(log_t)[:, np.newaxis], 1.0)
+        return const - np.sum(np.log(cells), axis=1)
+
+    low = np.zeros_like(const)
+    high = np.full_like(const, np.log(1e32))
+    valid = (fun(low) >= 0) & (fun(high) <= 0)
+    if not valid.all():
+        warnings.warn(f"{int(np.count_nonzero(~valid))}个OS-CFAR配置在[1, 1e32]内无门限解，返回nan")
+
+    # 二分64次后区间宽度低于双精度分辨率
+    for _ in range(64):
+        mid = (low + high) / 2
+        above = fun(mid) > 0
+        low = np.where(above, mid, low)
+        high = np.where(above, high, mid)
+
+    return np.where(valid, np.exp((low + high) / 2), np.nan).reshape(shape)
+
+
+# ==================== 门限因子表 ====================
+
+ThresholdKey = Tuple[str, str, int, int, float]  # (CFAR类型, 检测器, 参考单元数, 排序秩, 虚警概率)
+
+# 磁盘表格式版本，求解公式变化时递增，旧版本的表在读取时丢弃
+THRESHOLD_TABLE_VERSION = 2
+
+
+def solve_threshold_factors(keys: List[ThresholdKey]) -> NDArray:
+    """
+    批量求解门限因子，同类型的配置一次向量化求解
+
+    CA使用tools.py中的threshold函数；GO/SO按指数分布噪声下的虚警概率闭式解求根；
+    OS按排序统计量的门限方程求根，无解时为nan（并发出警告）
+    """
+    factors = np.full(len(keys), np.nan)
+    for method in {key[0] for key in keys}:
+        index = np.array([i for i, key in enumerate(keys) if key[0] == method])
+        n = np.array([keys[i][2] for i in index])
+        k = np.array([keys[i][3] for i in index])
+        pfa = np.array([keys[i][4] for i in index])
+        if method == "ca":
+            factors[index] = threshold(pfa, n) # type: ignore
+        elif method in ("go", "so"):
+            factors[index] = go_so_thresholds(method, n // 2, pfa)
+        elif method == "os":
+            factors[index] = os_thresholds(k, n, pfa)
+        else:
+            raise ValueError(f"未知的CFAR类型: {method}")
+
+    linear = np.array([key[1] == "linear" for key in keys], dtype=bool)
+    factors[linear] = np.sqrt(factors[linear])
+    return factors
+
+
+class ThresholdTable:
+    """
+    CFAR门限因子表
+    
+    以 (CFAR类型, 检测器, 参考单元数, 排序秩, 虚警概率) 为键缓存门限因子，
+    内存字典之外可指定磁盘JSON表在进程间复用；批量查询时未命中的配置
+    一次向量化求解并写回磁盘（临时文件+原子替换）。
+    """
+    
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        :param path: 磁盘表路径，None表示只保存在内存中
+        """
+        self.path = Path(path) if path else None
+        self._factors: Dict[ThresholdKey, float] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self._load()
+    
+    @staticmethod
+    def make_key(method: str, detector: str, n: int, pfa: float, k: Optional[int] = None) -> ThresholdKey:
+        """规范化键，只有OS-CFAR使用排序秩"""
+        method = method.lower()
+        return (method, detector, int(n), int(k) if method == "os" else 0, float(pfa))
+    
+    def __len__(self) -> int:
+        return len(self._factors)
+    
+    def __contains__(self, key: ThresholdKey) -> bool:
+        return key in self._factors
+    
+    def lookup(self, keys: Iterable[ThresholdKey]) -> NDArray:
+        """查询一组配置的门限因子，未命中的配置批量求解后加入表中"""
+        keys = list(keys)
+        with self._lock:
+            missing = [key for key in dict.fromkeys(keys) if key not in self._factors]
+            if missing:
+                self._factors.update(zip(missing, solve_threshold_factors(missing).tolist()))
+                if self.path is not None:
+                    self._save()
+            return np.array([self._factors[key] for key in keys], dtype=float)
+    
+    def get(self, method: str, detector: str, n: int, pfa: float, k: Optional[int] = None) -> float:
+        """查询单个配置的门限因子"""
+        return float(self.lookup([self.make_key(method, detector, n, pfa, k)])[0])
+    
+    def clear(self):
+        with self._lock:
+            self._factors.clear()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: # type: ignore
+                table = json.load(f)
+            if not isinstance(table, dict) or table.get("version") != THRESHOLD_TABLE_VERSION:
+                logger.info(f"门限因子表版本不符，将重新计算: {self.path}")
+                return
+            for record in table["records"]:
+                key = self.make_key(record["method"], record["detector"], record["n"], record["pfa"], record["k"])
+                self._factors[key] = record["factor"] if record["factor"] is not None else np.nan
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"门限因子表读取失败，将重新计算: {self.path}: {e}")
+    
+    def _save(self):
+        records = [
+            {"method": method, "detector": detector, "n": n, "k": k, "pfa": pfa,
+             "factor": None if np.isnan(factor) else factor}
+            for (method, detector, n, k, pfa), factor in self._factors.items()
+        ]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True) # type: ignore
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp") # type: ignore
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": THRESHOLD_TABLE_VERSION, "records": records}, f, indent=1)
+            os.replace(tmp_path, self.path) # type: ignore
+        except OSError as e:
+            logger.warning(f"门限因子表写入失败: {self.path}: {e}")
+
+
+# 进程内共享的门限因子表，持久化到环境变量CFAR_THRESHOLD_TABLE指定的路径，未设置时使用应用缓存目录
+DEFAULT_THRESHOLD_TABLE = ThresholdTable(
+    os.environ.get("CFAR_THRESHOLD_TABLE") or default_cache_dir("cfar_thresholds.json")
+)
+
+
+def _os_rank(n: int, k: Optional[int]) -> int:
+    """
+    OS-CFAR排序秩（从0开始，排序后第k个参考单元）
+    
+    默认取参考单元数的3/4，并限制在[0, n-1]内；指定值超出范围时报错
+    """
+    if n < 1:
+        raise ValueError("没有参考单元！")
+    if k is None:
+        return min(int(round(0.75 * n)), n - 1)
+    if not 0 <= k < n:
+        raise ValueError(f"OS-CFAR排序秩k必须在[0, {n})范围内，当前为{k}")
+    return int(k)
+
+
 class CFARProcessor:
     """
     CFAR处理器类，集成tools.py中的检测概率函数
     """
     
-    def __init__(self, detector_type: str = "squarelaw"):
+    def __init__(self, detector_type: str = "squarelaw", threshold_table: Optional[ThresholdTable] = None):
         """
         初始化CFAR处理器
         
         :param detector_type: 检测器类型，"linear"或"squarelaw"
+        :param threshold_table: 门限因子表，默认使用进程内共享表
         """
         self.detector_type = detector_type
         self.valid_detectors = ["linear", "squarelaw"]
+        self.threshold_table = threshold_table if threshold_table is not None else DEFAULT_THRESHOLD_TABLE
         
         if detector_type not in self.valid_detectors:
             raise ValueError(f"检测器类型必须是 {self.valid_detectors} 之一")
     
-    def calculate_threshold_factor(self, n: int, pfa: float) -> float:
+    def calculate_threshold_factor(self, n: int, pfa: float, method: str = "ca",
+                                   k: Optional[int] = None) -> float:
         """
-        使用tools.py中的threshold函数计算CFAR门限因子
+        计算CFAR门限因子（经门限因子表缓存）
+        
+        CA使用tools.py中的threshold函数；GO/SO按指数分布噪声下的虚警概率
+        闭式解求根，n为全部参考单元数（两半各n/2）；OS按排序秩k求解
         
         :param n: 参考单元数量
         :param pfa: 虚警概率
+        :param method: CFAR类型，"ca"、"go"、"so"或"os"
+        :param k: OS-CFAR排序秩，None时取默认排序秩
         :return: 门限乘子
+        :raises ValueError: 该配置无解（如OS-CFAR虚警概率过大）
+        """
+        if method.lower() == "os":
+            k = _os_rank(n, k)
+        factor = self.threshold_table.get(method, self.detector_type, n, pfa, k)
+        if np.isnan(factor):
+            raise ValueError(f"{method.upper()}-CFAR门限因子无解: n={n}, pfa={pfa}, k={k}")
+        return factor
+    
+    def calculate_threshold_factors(
+        self,
+        n: Union[int, NDArray],
+        pfa: Union[float, NDArray],
+        method: str = "ca",
+        k: Optional[Union[int, NDArray]] = None
+    ) -> NDArray:
         """
-        if self.detector_type == "squarelaw":
-            # 对于平方律检测器，直接使用threshold函数
-            thresh = threshold(pfa, n) # type: ignore
-            return thresh
+        批量计算门限因子，参数按广播规则组合，未缓存的配置一次向量化求解
+        
+        :return: 门限乘子数组，形状为参数广播后的形状，无解的配置为nan
+        """
+        if k is None:
+            # OS-CFAR默认排序秩随参考单元数变化，与calculate_threshold_factor一致
+            n = np.asarray(n)
+            k = np.reshape([_os_rank(int(n_item), None) for n_item in n.ravel()], n.shape) \
+                if method.lower() == "os" else 0
+        n, pfa, k = np.broadcast_arrays(np.asarray(n), np.asarray(pfa), np.asarray(k))
+        keys = [
+            self.threshold_table.make_key(method, self.detector_type, n_item, pfa_item, k_item)
+            for n_item, pfa_item, k_item in zip(n.ravel(), pfa.ravel(), k.ravel())
+        ]
+        return self.threshold_table.lookup(keys).reshape(n.shape)
+    
+    def _cfar_mean_1d(
+        self,
+        data: NDArray,
+        guard: int,
+        trailing: int,
+        pfa: float,
+        axis: int,
+        offset: Optional[float],
+        method: str
+    ) -> NDArray:
+        """CA/GO/SO 1-D CFAR公共实现：前缀和求两侧参考窗之和，再按method合成噪声估计"""
+        if np.iscomplexobj(data):
+            raise ValueError("输入数据不应为复数")
+        
+        if trailing < 1:
+            raise ValueError("没有参考单元！")
+        
+        # 计算门限因子
+        if offset is None:
+            n_trailing = trailing * 2  # 总参考单元数
+            alpha = self.calculate_threshold_factor(n_trailing, pfa, method)
         else:
-            # 对于线性检测器，需要转换
-            thresh = threshold(pfa, n) # type: ignore
-            return np.sqrt(thresh)
+            alpha = offset
+        
+        leading, lagging = _training_sums_1d(data, guard, trailing, axis)
+        noise = CFAR_MEAN_METHODS[method](leading, lagging)
+        n_cells = 2 * trailing if method == "ca" else trailing
+        
+        return alpha * np.moveaxis(noise / n_cells, -1, axis)
+    
+    def _cfar_mean_2d(
+        self,
+        data: NDArray,
+        guard: Union[int, List[int]],
+        trailing: Union[int, List[int]],
+        pfa: float,
+        offset: Optional[float],
+        method: str
+    ) -> NDArray:
+        """CA/GO/SO 2-D CFAR公共实现：积分图求参考区前后两半之和，再按method合成噪声估计"""
+        if np.iscomplexobj(data):
+            raise ValueError("输入数据不应为复数")
+        
+        guard = np.broadcast_to(np.asarray(guard, dtype=int), 2) # type: ignore
+        trailing = np.broadcast_to(np.asarray(trailing, dtype=int), 2) # type: ignore
+        
+        # 计算总参考单元数
+        tg_sum = trailing + guard # type: ignore
+        t_num = (2 * tg_sum[0] + 1) * (2 * tg_sum[1] + 1) # type: ignore
+        g_num = (2 * guard[0] + 1) * (2 * guard[1] + 1) # type: ignore
+        
+        if t_num == g_num:
+            raise ValueError("没有参考单元！")
+        
+        # 计算门限因子
+        n_effective = t_num - g_num
+        if offset is None:
+            alpha = self.calculate_threshold_factor(n_effective, pfa, method)
+        else:
+            alpha = offset
+        
+        leading, lagging = _training_sums_2d(data, guard, trailing) # type: ignore
+        noise = CFAR_MEAN_METHODS[method](leading, lagging)
+        n_cells = n_effective if method == "ca" else n_effective // 2
+        
+        return alpha * noise / n_cells
     
     def cfar_ca_1d(
         self,
@@ -48,7 +512,10 @@ class CFARProcessor:
         offset: Optional[float] = None
     ) -> NDArray:
         """
-        重构的1-D Cell Averaging CFAR (CA-CFAR)
+        1-D Cell Averaging CFAR (CA-CFAR)
+        
+        参考窗均值由前缀和求得，每个单元O(1)，与参考窗大小无关；
+        data可为任意维数组（如堆叠的多帧），沿axis一次计算
         
         :param data: 幅度/功率数据
         :param guard: 一侧保护单元数
@@ -58,37 +525,102 @@ class CFARProcessor:
         :param offset: 手动指定的门限偏移
         :return: CFAR门限
         """
-        if np.iscomplexobj(data):
-            raise ValueError("输入数据不应为复数")
+        return self._cfar_mean_1d(data, guard, trailing, pfa, axis, offset, "ca")
+    
+    def cfar_ca_2d(
+        self,
+        data: NDArray,
+        guard: Union[int, List[int]],
+        trailing: Union[int, List[int]],
+        pfa: float = 1e-5,
+        offset: Optional[float] = None
+    ) -> NDArray:
+        """
+        2-D Cell Averaging CFAR (CA-CFAR)
         
-        data_shape = np.shape(data)
-        cfar_threshold = np.zeros_like(data)
+        参考区均值由积分图求得，每个单元O(1)，与参考窗大小无关；
+        在最后两维上计算，前导维（如通道、帧）作为批次一次处理
         
-        # 计算门限因子
-        if offset is None:
-            n_trailing = trailing * 2  # 总参考单元数
-            alpha = self.calculate_threshold_factor(n_trailing, pfa)
-        else:
-            alpha = offset
+        :param data: 幅度/功率数据
+        :param guard: 保护单元数（可分别指定两个维度）
+        :param trailing: 参考单元数（可分别指定两个维度）
+        :param pfa: 虚警概率
+        :param offset: 手动指定的门限偏移
+        :return: CFAR门限
+        """
+        return self._cfar_mean_2d(data, guard, trailing, pfa, offset, "ca")
+    
+    def cfar_go_1d(
+        self,
+        data: NDArray,
+        guard: int,
+        trailing: int,
+        pfa: float = 1e-5,
+        axis: int = 0,
+        offset: Optional[float] = None
+    ) -> NDArray:
+        """
+        1-D Greatest-Of CFAR (GO-CFAR)
+        
+        噪声估计取前后两侧参考窗均值的较大者，抑制杂波边缘处的虚警
+        
+        :param data: 幅度/功率数据
+        :param guard: 一侧保护单元数
+        :param trailing: 一侧参考单元数
+        :param pfa: 虚警概率
+        :param axis: 计算轴
+        :param offset: 手动指定的门限偏移
+        :return: CFAR门限
+        """
+        return self._cfar_mean_1d(data, guard, trailing, pfa, axis, offset, "go")
+    
+    def cfar_so_1d(
+        self,
+        data: NDArray,
+        guard: int,
+        trailing: int,
+        pfa: float = 1e-5,
+        axis: int = 0,
+        offset: Optional[float] = None
+    ) -> NDArray:
+        """
+        1-D Smallest-Of CFAR (SO-CFAR)
         
-        # 创建CFAR窗口
-        cfar_win = np.ones((guard + trailing) * 2 + 1)
-        cfar_win[trailing:(trailing + guard * 2 + 1)] = 0
-        cfar_win = cfar_win / np.sum(cfar_win)
+        噪声估计取前后两侧参考窗均值的较小者，改善邻近多目标时的检测
         
-        if axis == 0:
-            if data.ndim == 1:
-                cfar_threshold = alpha * convolve(data, cfar_win, mode="same")
-            elif data.ndim == 2:
-                for idx in range(data_shape[1]):
-                    cfar_threshold[:, idx] = alpha * convolve(data[:, idx], cfar_win, mode="same")
-        elif axis == 1:
-            for idx in range(data_shape[0]):
-                cfar_threshold[idx, :] = alpha * convolve(data[idx, :], cfar_win, mode="same")
+        :param data: 幅度/功率数据
+        :param guard: 一侧保护单元数
+        :param trailing: 一侧参考单元数
+        :param pfa: 虚警概率
+        :param axis: 计算轴
+        :param offset: 手动指定的门限偏移
+        :return: CFAR门限
+        """
+        return self._cfar_mean_1d(data, guard, trailing, pfa, axis, offset, "so")
+    
+    def cfar_go_2d(
+        self,
+        data: NDArray,
+        guard: Union[int, List[int]],
+        trailing: Union[int, List[int]],
+        pfa: float = 1e-5,
+        offset: Optional[float] = None
+    ) -> NDArray:
+        """
+        2-D Greatest-Of CFAR (GO-CFAR)
         
-        return cfar_threshold
+        参考区沿最后一维（距离维）分为前后两半，噪声估计取两半均值的较大者
+        
+        :param data: 幅度/功率数据
+        :param guard: 保护单元数（可分别指定两个维度）
+        :param trailing: 参考单元数（可分别指定两个维度）
+        :param pfa: 虚警概率
+        :param offset: 手动指定的门限偏移
+        :return: CFAR门限
+        """
+        return self._cfar_mean_2d(data, guard, trailing, pfa, offset, "go")
     
-    def cfar_ca_2d(
+    def cfar_so_2d(
         self,
         data: NDArray,
         guard: Union[int, List[int]],
@@ -97,7 +629,9 @@ class CFARProcessor:
         offset: Optional[float] = None
     ) -> NDArray:
         """
-        重构的2-D Cell Averaging CFAR (CA-CFAR)
+        2-D Smallest-Of CFAR (SO-CFAR)
+        
+        参考区沿最后一维（距离维）分为前后两半，噪声估计取两半均值的较小者
         
         :param data: 幅度/功率数据
         :param guard: 保护单元数（可分别指定两个维度）
@@ -106,40 +640,78 @@ class CFARProcessor:
         :param offset: 手动指定的门限偏移
         :return: CFAR门限
         """
+        return self._cfar_mean_2d(data, guard, trailing, pfa, offset, "so")
+    
+    def cfar_os_1d(
+        self,
+        data: NDArray,
+        guard: int,
+        trailing: int,
+        k: Optional[int] = None,
+        pfa: float = 1e-5,
+        axis: int = 0,
+        offset: Optional[float] = None
+    ) -> NDArray:
+        """
+        1-D Ordered Statistic CFAR (OS-CFAR)
+        
+        基于滑动窗口部分选择（scipy.ndimage.rank_filter），边缘单元按循环方式取参考单元
+        
+        :param data: 幅度/功率数据
+        :param guard: 一侧保护单元数
+        :param trailing: 一侧参考单元数
+        :param k: 排序秩（从0开始，需小于参考单元总数），默认取参考单元总数的3/4
+        :param pfa: 虚警概率
+        :param axis: 计算轴
+        :param offset: 手动指定的门限偏移
+        :return: CFAR门限
+        """
         if np.iscomplexobj(data):
             raise ValueError("输入数据不应为复数")
         
-        guard = np.array(guard) # type: ignore
-        if guard.size == 1: # type: ignore
-            guard = np.tile(guard, 2) # type: ignore
-        trailing = np.array(trailing) # type: ignore
-        if trailing.size == 1: # type: ignore
-            trailing = np.tile(trailing, 2) # type: ignore
+        k = _os_rank(trailing * 2, k)
         
-        # 计算总参考单元数
-        tg_sum = trailing + guard # type: ignore
-        t_num = (2 * tg_sum[0] + 1) * (2 * tg_sum[1] + 1) # type: ignore
-        g_num = (2 * guard[0] + 1) * (2 * guard[1] + 1) # type: ignore
+        if offset is None:
+            offset = self.calculate_threshold_factor(trailing * 2, pfa, "os", k)
         
-        if t_num == g_num:
-            raise ValueError("没有参考单元！")
+        return offset * _ranked_training_1d(data, guard, trailing, k, axis)
+    
+    def cfar_os_2d(
+        self,
+        data: NDArray,
+        guard: Union[int, List[int]],
+        trailing: Union[int, List[int]],
+        k: Optional[int] = None,
+        pfa: float = 1e-5,
+        offset: Optional[float] = None
+    ) -> NDArray:
+        """
+        2-D Ordered Statistic CFAR (OS-CFAR)
         
-        # 计算门限因子
-        if offset is None:
-            n_effective = t_num - g_num
-            alpha = self.calculate_threshold_factor(n_effective, pfa)
-        else:
-            alpha = offset
+        参考单元为矩形窗减去保护区的环形区域，两个维度可分别指定保护/参考单元数；
+        作用于最后两维，前导维视为批次，边缘单元按循环方式取参考单元
+        
+        :param data: 幅度/功率数据
+        :param guard: 保护单元数（可分别指定两个维度）
+        :param trailing: 参考单元数（可分别指定两个维度）
+        :param k: 排序秩（从0开始，需小于参考单元总数），默认取参考单元总数的3/4
+        :param pfa: 虚警概率
+        :param offset: 手动指定的门限偏移
+        :return: CFAR门限
+        """
+        if np.iscomplexobj(data):
+            raise ValueError("输入数据不应为复数")
+        
+        guard = np.broadcast_to(np.asarray(guard, dtype=int), 2) # type: ignore
+        trailing = np.broadcast_to(np.asarray(trailing, dtype=int), 2) # type: ignore
+        tg_sum = trailing + guard # type: ignore
+        n_effective = int(np.prod(2 * tg_sum + 1) - np.prod(2 * guard + 1))
+        k = _os_rank(n_effective, k)
         
-        # 创建2D CFAR窗口
-        cfar_win = np.ones(((guard + trailing) * 2 + 1)) # type: ignore
-        cfar_win[
-            trailing[0]:(trailing[0] + guard[0] * 2 + 1), # type: ignore
-            trailing[1]:(trailing[1] + guard[1] * 2 + 1), # type: ignore
-        ] = 0
-        cfar_win = cfar_win / np.sum(cfar_win)
+        if offset is None:
+            offset = self.calculate_threshold_factor(n_effective, pfa, "os", k)
         
-        return alpha * convolve(data, cfar_win, mode="same")
+        return offset * _ranked_training_2d(data, guard, trailing, k) # type: ignore
     
     def calculate_detection_performance(
         self,
@@ -193,6 +765,61 @@ class CFARProcessor:
         
         return roc_snr(pfa, pd, npulses, target_type) # type: ignore
     
+    def cfar_1d(
+        self,
+        data: NDArray,
+        guard: int,
+        trailing: int,
+        pfa: float = 1e-5,
+        axis: int = 0,
+        offset: Optional[float] = None,
+        cfar_type: str = "ca"
+    ) -> NDArray:
+        """
+        按类型选择1-D CFAR
+        
+        :param cfar_type: CFAR类型，"ca"、"go"、"so"或"os"（OS秩取默认值）
+        :return: CFAR门限
+        """
+        cfar_methods = {
+            "ca": self.cfar_ca_1d,
+            "go": self.cfar_go_1d,
+            "so": self.cfar_so_1d,
+            "os": self.cfar_os_1d,
+        }
+        cfar_type = cfar_type.lower()
+        if cfar_type not in cfar_methods:
+            raise ValueError(f"CFAR类型必须是 {list(cfar_methods)} 之一")
+        
+        return cfar_methods[cfar_type](data, guard, trailing, pfa=pfa, axis=axis, offset=offset)
+    
+    def cfar_2d(
+        self,
+        data: NDArray,
+        guard: Union[int, List[int]],
+        trailing: Union[int, List[int]],
+        pfa: float = 1e-5,
+        offset: Optional[float] = None,
+        cfar_type: str = "ca"
+    ) -> NDArray:
+        """
+        按类型选择2-D CFAR
+        
+        :param cfar_type: CFAR类型，"ca"、"go"、"so"或"os"（OS秩取默认值）
+        :return: CFAR门限
+        """
+        cfar_methods = {
+            "ca": self.cfar_ca_2d,
+            "go": self.cfar_go_2d,
+            "so": self.cfar_so_2d,
+            "os": self.cfar_os_2d,
+        }
+        cfar_type = cfar_type.lower()
+        if cfar_type not in cfar_methods:
+            raise ValueError(f"CFAR类型必须是 {list(cfar_methods)} 之一")
+        
+        return cfar_methods[cfar_type](data, guard, trailing, pfa=pfa, offset=offset)
+    
     def adaptive_cfar_detection(
         self,
         data: NDArray,
@@ -200,7 +827,9 @@ class CFARProcessor:
         trailing: int,
         pfa: float = 1e-5,
         min_snr: float = 10.0,
-        target_type: str = "Swerling 0"
+        target_type: str = "Swerling 0",
+        cfar_type: str = "ca",
+        window_2d: bool = False
     ) -> Tuple[NDArray, NDArray, dict]:
         """
         自适应CFAR检测，结合检测性能分析
@@ -211,10 +840,16 @@ class CFARProcessor:
         :param pfa: 虚警概率
         :param min_snr: 最小可检测信噪比(dB)
         :param target_type: 目标类型
+        :param cfar_type: CFAR类型，"ca"、"go"、"so"或"os"
+        :param window_2d: 二维数据（如距离-多普勒图）是否使用2-D参考区；默认各类型
+                          均沿第0维做1-D CFAR（与原有行为一致）
         :return: (检测结果, CFAR门限, 性能统计)
         """
-        # 计算CFAR门限
-        cfar_threshold = self.cfar_ca_1d(data, guard, trailing, pfa)
+        # 计算CFAR门限，参考区形状与CFAR类型无关，2-D参考区需显式开启
+        if window_2d and np.ndim(data) == 2:
+            cfar_threshold = self.cfar_2d(data, guard, trailing, pfa, cfar_type=cfar_type)
+        else:
+            cfar_threshold = self.cfar_1d(data, guard, trailing, pfa, cfar_type=cfar_type)
         
         # 执行检测
         detections = data > cfar_threshold
@@ -360,6 +995,101 @@ def cfar_ca_2d(
     return processor.cfar_ca_2d(data, guard, trailing, pfa, offset)
 
 
+def cfar_go_1d(
+    data: NDArray,
+    guard: int,
+    trailing: int,
+    pfa: float = 1e-5,
+    axis: int = 0,
+    detector: str = "squarelaw",
+    offset: Optional[float] = None
+) -> NDArray:
+    """
+    与CA-CFAR接口一致的1D GO-CFAR函数
+    """
+    processor = CFARProcessor(detector)
+    return processor.cfar_go_1d(data, guard, trailing, pfa, axis, offset)
+
+
+def cfar_so_1d(
+    data: NDArray,
+    guard: int,
+    trailing: int,
+    pfa: float = 1e-5,
+    axis: int = 0,
+    detector: str = "squarelaw",
+    offset: Optional[float] = None
+) -> NDArray:
+    """
+    与CA-CFAR接口一致的1D SO-CFAR函数
+    """
+    processor = CFARProcessor(detector)
+    return processor.cfar_so_1d(data, guard, trailing, pfa, axis, offset)
+
+
+def cfar_go_2d(
+    data: NDArray,
+    guard: Union[int, List[int]],
+    trailing: Union[int, List[int]],
+    pfa: float = 1e-5,
+    detector: str = "squarelaw",
+    offset: Optional[float] = None
+) -> NDArray:
+    """
+    与CA-CFAR接口一致的2D GO-CFAR函数
+    """
+    processor = CFARProcessor(detector)
+    return processor.cfar_go_2d(data, guard, trailing, pfa, offset)
+
+
+def cfar_so_2d(
+    data: NDArray,
+    guard: Union[int, List[int]],
+    trailing: Union[int, List[int]],
+    pfa: float = 1e-5,
+    detector: str = "squarelaw",
+    offset: Optional[float] = None
+) -> NDArray:
+    """
+    与CA-CFAR接口一致的2D SO-CFAR函数
+    """
+    processor = CFARProcessor(detector)
+    return processor.cfar_so_2d(data, guard, trailing, pfa, offset)
+
+
+def cfar_os_1d(
+    data: NDArray,
+    guard: int,
+    trailing: int,
+    k: int,
+    pfa: float = 1e-5,
+    axis: int = 0,
+    detector: str = "squarelaw",
+    offset: Optional[float] = None
+) -> NDArray:
+    """
+    兼容原有接口的1D OS-CFAR函数
+    """
+    processor = CFARProcessor(detector)
+    return processor.cfar_os_1d(data, guard, trailing, k, pfa, axis, offset)
+
+
+def cfar_os_2d(
+    data: NDArray,
+    guard: Union[int, List[int]],
+    trailing: Union[int, List[int]],
+    k: int,
+    pfa: float = 1e-5,
+    detector: str = "squarelaw",
+    offset: Optional[float] = None
+) -> NDArray:
+    """
+    兼容原有接口的2D OS-CFAR函数
+    """
+    processor = CFARProcessor(detector)
+    return processor.cfar_os_2d(data, guard, trailing, k, pfa, offset)
+
+
 # 示例使用代码
 if __name__ == "__main__":
     # 创建测试数据
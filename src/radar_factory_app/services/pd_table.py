@@ -0,0 +1,235 @@
+"""
+检测概率查找表服务
+在(SNR, Pfa)网格上为每个(积累脉冲数, 目标模型)预先制表，批量插值查询，
+制表结果按网格参数持久化到磁盘缓存，扫描计算时不再重复计算Marcum Q函数与不完全伽马函数
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def default_cache_dir(*parts: str) -> str:
+    """
+    应用的磁盘缓存目录
+
+    设置环境变量RADAR_FACTORY_CACHE_DIR时使用该目录，否则为
+    ~/.cache/radar_factory_app；parts为其下的子路径
+    """
+    root = os.environ.get("RADAR_FACTORY_CACHE_DIR")
+    if root is None:
+        root = os.path.join(os.path.expanduser("~"), ".cache", "radar_factory_app")
+    return os.path.join(root, *parts)
+
+
+class PdTable:
+    """
+    检测概率查找表
+
+    每个(积累脉冲数, 目标模型)对应一张Pd表，行为均匀的log10(Pfa)网格，
+    列为均匀的SNR(dB)网格，查询时对整个数组做双线性插值。表在首次使用时
+    计算（或由precompute预先计算），并以.npz文件保存，文件名包含模型与
+    网格参数的哈希；网格外的查询截断到最近的网格边界。
+    """
+
+    def __init__(
+        self,
+        pd_func: Callable[..., NDArray],
+        model_name: str,
+        snr_min_db: float = -30.0,
+        snr_max_db: float = 40.0,
+        snr_step_db: float = 0.05,
+        log10_pfa_min: float = -12.0,
+        log10_pfa_max: float = -1.0,
+        log10_pfa_step: float = 0.125,
+        cache_dir: Union[str, bool, None] = None
+    ):
+        """
+        :param pd_func: 制表函数 pd_func(pfa, snr_db, npulses, model)，
+                        返回形状为(len(pfa), len(snr_db))的检测概率
+        :param model_name: 检测模型名称，作为缓存键的一部分
+        :param snr_min_db: SNR网格下界(dB)
+        :param snr_max_db: SNR网格上界(dB)
+        :param snr_step_db: SNR网格间隔(dB)
+        :param log10_pfa_min: log10(Pfa)网格下界
+        :param log10_pfa_max: log10(Pfa)网格上界
+        :param log10_pfa_step: log10(Pfa)网格间隔
+        :param cache_dir: 缓存目录，None使用默认缓存目录，False不持久化
+        """
+        self.snr_min_db = float(snr_min_db)
+        self.snr_step_db = float(snr_step_db)
+        self.num_snr = int(round((snr_max_db - snr_min_db) / snr_step_db)) + 1
+        self.log10_pfa_min = float(log10_pfa_min)
+        self.log10_pfa_step = float(log10_pfa_step)
+        self.num_pfa = int(round((log10_pfa_max - log10_pfa_min) / log10_pfa_step)) + 1
+
+        self.snr_grid_db = self.snr_min_db + self.snr_step_db * np.arange(self.num_snr)
+        self.pfa_grid = 10.0 ** (self.log10_pfa_min + self.log10_pfa_step * np.arange(self.num_pfa))
+
+        self.pd_func = pd_func
+        self.model_name = model_name
+        if cache_dir is None:
+            cache_dir = default_cache_dir("pd_tables")
+        self.cache_dir = cache_dir if cache_dir else None
+
+        self._tables: Dict[Tuple[int, str], NDArray] = {}
+
+    def covers(self, snr_db: float, pfa: float) -> bool:
+        """工作点是否落在网格范围内（网格外的查询会被截断到边界）"""
+        snr_max_db = self.snr_min_db + self.snr_step_db * (self.num_snr - 1)
+        log10_pfa_max = self.log10_pfa_min + self.log10_pfa_step * (self.num_pfa - 1)
+        if not (np.isfinite(snr_db) and pfa > 0):
+            return False
+        return (self.snr_min_db <= snr_db <= snr_max_db
+                and self.log10_pfa_min <= np.log10(pfa) <= log10_pfa_max)
+
+    def cache_key(self, npulses: int, model: str) -> str:
+        """单张表的缓存键：模型名称与网格参数的哈希"""
+        params = {
+            "model_name": self.model_name,
+            "npulses": int(npulses),
+            "model": model,
+            "snr_min_db": self.snr_min_db,
+            "snr_step_db": self.snr_step_db,
+            "num_snr": self.num_snr,
+            "log10_pfa_min": self.log10_pfa_min,
+            "log10_pfa_step": self.log10_pfa_step,
+            "num_pfa": self.num_pfa,
+        }
+        blob = json.dumps(params, sort_keys=True).encode("utf-8")
+        return hashlib.sha1(blob).hexdigest()[:16]
+
+    def _cache_path(self, npulses: int, model: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        name = f"{model.replace(' ', '').lower()}_{int(npulses)}_{self.cache_key(npulses, model)}.npz"
+        return os.path.join(self.cache_dir, name)
+
+    def _compute(self, npulses: int, model: str) -> NDArray:
+        table = self.pd_func(self.pfa_grid, self.snr_grid_db, npulses, model)
+        if table is None:
+            raise ValueError(f"不支持的目标模型: {model}")
+        table = np.asarray(table, dtype=float).reshape(self.num_pfa, self.num_snr)
+        return np.clip(np.nan_to_num(table, nan=0.0), 0.0, 1.0)
+
+    def _save(self, path: str, table: NDArray):
+        # 先写临时文件再原子替换，并发读取不会看到写了一半的表
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, pd=table)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def table(self, npulses: int, model: str) -> NDArray:
+        """
+        单个(积累脉冲数, 目标模型)的Pd表
+
+        :return: 形状为(num_pfa, num_snr)的检测概率
+        """
+        key = (int(npulses), model)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        path = self._cache_path(npulses, model)
+        if path is not None and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    table = data["pd"]
+                if table.shape != (self.num_pfa, self.num_snr):
+                    table = None
+            except (OSError, ValueError, KeyError):
+                table = None
+
+        if table is None:
+            table = self._compute(npulses, model)
+            if path is not None:
+                self._save(path, table)
+
+        self._tables[key] = table
+        return table
+
+    def precompute(self, npulses_list, models):
+        """预先计算（或加载）一组(积累脉冲数, 目标模型)的全部表"""
+        for model in models:
+            for npulses in npulses_list:
+                self.table(npulses, model)
+
+    def lookup(
+        self,
+        snr_db: Union[float, NDArray],
+        pfa: Union[float, NDArray],
+        npulses: int = 1,
+        model: str = "Coherent"
+    ) -> Union[float, NDArray]:
+        """
+        插值查询检测概率
+
+        :param snr_db: 信噪比(dB)
+        :param pfa: 虚警概率，与snr_db按广播规则组合
+        :param npulses: 积累脉冲数
+        :param model: 目标模型
+        :return: 检测概率，形状为snr_db与pfa广播后的形状
+        """
+        table = self.table(npulses, model)
+        snr_db, pfa = np.broadcast_arrays(np.asarray(snr_db, dtype=float), np.asarray(pfa, dtype=float))
+
+        # 非正Pfa先截断到最小正数再取对数，避免产生-inf/NaN索引
+        u = (snr_db - self.snr_min_db) / self.snr_step_db
+        v = (np.log10(np.maximum(pfa, np.finfo(float).tiny)) - self.log10_pfa_min) / self.log10_pfa_step
+        u = np.clip(np.nan_to_num(u, nan=0.0), 0, self.num_snr - 1)
+        v = np.clip(np.nan_to_num(v, nan=0.0), 0, self.num_pfa - 1)
+
+        i0 = np.minimum(u.astype(np.int64), self.num_snr - 2)
+        j0 = np.minimum(v.astype(np.int64), self.num_pfa - 2)
+        du = u - i0
+        dv = v - j0
+
+        pd = (
+            table[j0, i0] * (1 - du) * (1 - dv)
+            + table[j0, i0 + 1] * du * (1 - dv)
+            + table[j0 + 1, i0] * (1 - du) * dv
+            + table[j0 + 1, i0 + 1] * du * dv
+        )
+
+        if pd.ndim == 0:
+            return float(pd)
+        return pd
+
+
+_ROC_PD_TABLE: Optional[PdTable] = None
+
+
+def roc_pd_lookup(
+    pfa: Union[float, NDArray],
+    snr_db: Union[float, NDArray],
+    npulses: int = 1,
+    stype: str = "Coherent"
+) -> Union[float, NDArray]:
+    """
+    查表计算radarsimpy.tools.roc_pd模型的检测概率
+
+    与roc_pd使用相同的模型（Swerling 0-4、Coherent、Real），但pfa与snr_db
+    按元素广播而不是做外积，任意形状的工作点一次查询
+
+    :param pfa: 虚警概率
+    :param snr_db: 信噪比(dB)
+    :param npulses: 积累脉冲数
+    :param stype: 信号类型，取值同roc_pd
+    :return: 检测概率
+    """
+    global _ROC_PD_TABLE
+    if _ROC_PD_TABLE is None:
+        # roc_pd只在首次查表时需要，导入本模块不依赖radarsimpy
+        from radarsimpy.tools import roc_pd
+        _ROC_PD_TABLE = PdTable(roc_pd, "roc_pd")
+    return _ROC_PD_TABLE.lookup(snr_db, pfa, npulses, stype)
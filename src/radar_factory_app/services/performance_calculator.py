@@ -13,6 +13,7 @@ import math
 from models.radar_models import RadarModel, RadarBand
 from models.simulation_models import TargetParameters
 from utils.helpers import db_to_linear, linear_to_db, calculate_radar_range
+from services.pd_table import PdTable
 
 
 class DetectionModel(Enum):
@@ -36,6 +37,7 @@ class RadarPerformanceCalculator:
     def __init__(self):
         self.boltzmann_constant = 1.38e-23  # 玻尔兹曼常数
         self.light_speed = 3e8  # 光速(m/s)
+        self._pd_table: Optional[PdTable] = None  # 检测概率查找表（首次批量计算时创建）
     
     def calculate_system_performance(self, radar: RadarModel, target_rcs: float = 1.0) -> Dict[str, Any]:
         """
@@ -259,18 +261,82 @@ class RadarPerformanceCalculator:
         if snr_linear <= 0 or pfa <= 0:
             return 0.0
         
+        # 网格范围内查表插值，网格外按模型直接计算
+        snr_db = 10 * np.log10(snr_linear)
+        if self.pd_table.covers(snr_db, pfa):
+            return float(self.pd_table.lookup(snr_db, pfa, n_pulses, target_model))
+        
         # 计算检测门限
         threshold = self.calculate_detection_threshold(pfa, n_pulses)
         
         if target_model == "swerling1":
             # Swerling I模型（慢起伏，瑞利分布）
-            return self._swerling1_detection_probability(snr_linear, threshold, n_pulses)
+            pd = self._swerling1_detection_probability(snr_linear, threshold, n_pulses)
         elif target_model == "swerling3":
             # Swerling III模型（慢起伏，卡方分布）
-            return self._swerling3_detection_probability(snr_linear, threshold, n_pulses)
+            pd = self._swerling3_detection_probability(snr_linear, threshold, n_pulses)
         else:
             # 非起伏目标（恒定RCS）
-            return self._non_fluctuating_detection_probability(snr_linear, threshold, n_pulses)
+            pd = self._non_fluctuating_detection_probability(snr_linear, threshold, n_pulses)
+        
+        # 与查表结果一致截断到[0, 1]
+        return float(np.clip(pd, 0.0, 1.0))
+    
+    def calculate_detection_probability_batch(self, snr_linear: np.ndarray, pfa: float,
+                                            n_pulses: int,
+                                            target_model: str = "swerling1") -> np.ndarray:
+        """
+        批量计算检测概率（查表插值）
+        
+        与calculate_detection_probability使用相同的检测模型，但预先在
+        (SNR, Pfa)网格上制表并持久化到磁盘缓存，扫描计算时只做插值，
+        不再重复计算不完全伽马函数。
+        
+        Args:
+            snr_linear: 信噪比数组(线性值)
+            pfa: 虚警概率，可为与snr_linear广播对齐的数组
+            n_pulses: 积累脉冲数
+            target_model: 目标起伏模型
+            
+        Returns:
+            检测概率数组
+        """
+        snr_linear = np.asarray(snr_linear, dtype=float)
+        pfa = np.asarray(pfa, dtype=float)
+        
+        # 非正SNR先截断到最小正数再取对数，避免产生-inf/NaN索引，结果由下方掩码置零
+        snr_db = 10 * np.log10(np.maximum(snr_linear, np.finfo(float).tiny))
+        pd = self.pd_table.lookup(snr_db, pfa, n_pulses, target_model)
+        
+        return np.where((snr_linear > 0) & (pfa > 0), pd, 0.0)
+    
+    @property
+    def pd_table(self) -> PdTable:
+        """检测概率查找表，基于本计算器的检测模型"""
+        if self._pd_table is None:
+            self._pd_table = PdTable(
+                pd_func=self._detection_probability_grid,
+                model_name="radar_performance_calculator"
+            )
+        return self._pd_table
+    
+    def _detection_probability_grid(self, pfa: np.ndarray, snr_db: np.ndarray,
+                                    n_pulses: int, target_model: str) -> np.ndarray:
+        """在(Pfa, SNR)网格上计算检测概率，供查找表制表使用"""
+        snr = np.power(10.0, np.asarray(snr_db, dtype=float) / 10)
+        
+        if target_model == "swerling1":
+            model = self._swerling1_detection_probability
+        elif target_model == "swerling3":
+            model = self._swerling3_detection_probability
+        else:
+            model = self._non_fluctuating_detection_probability
+        
+        rows = []
+        for pfa_value in np.atleast_1d(pfa):
+            threshold = self.calculate_detection_threshold(pfa_value, n_pulses)
+            rows.append(np.broadcast_to(model(snr, threshold, n_pulses), snr.shape))
+        return np.vstack(rows)
     
     def calculate_detection_threshold(self, pfa: float, n_pulses: int) -> float:
         """
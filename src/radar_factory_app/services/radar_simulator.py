@@ -4,6 +4,7 @@
 提供目标检测、信号处理和性能评估功能
 """
 
+from itertools import chain
 from pathlib import Path
 import pprint
 import traceback
@@ -12,10 +13,10 @@ from numpy.typing import NDArray
 import radarsimpy as rsp
 from radarsimpy.simulator import sim_radar
 from radarsimpy import Radar, Transmitter, Receiver
-from scipy.fft import fft, fftshift, fftfreq
+from scipy.fft import fft, fft2, fftshift, fftfreq
 
 import matplotlib.pyplot as plt
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import logging
 from dataclasses import dataclass
 from enum import Enum
@@ -37,6 +38,7 @@ from services.radar_plotter_enhance import EnhancedRadarPlotter
 
 # 导入新重构的模块
 from .cfar_processor import CFARProcessor
+from .stream_processor import PulseStreamProcessor, make_window
 from .target_matching import (
     _match_target_to_detection_2d, 
     _match_target_to_detection_1d,
@@ -77,6 +79,7 @@ class SimulationConfig:
     # 新重构功能的配置参数
     cfar_config: Dict[str, Any] = None # type: ignore
     matching_config: Dict[str, Any] = None # type: ignore
+    stream_config: Dict[str, Any] = None # type: ignore
     
     def __post_init__(self):
         if self.cfar_config is None:
@@ -86,7 +89,9 @@ class SimulationConfig:
                 'trailing_cells': 10,
                 'pfa': 1e-6,
                 'min_snr': 10.0,
-                'target_type': 'Swerling 0'
+                'target_type': 'Swerling 0',
+                'cfar_type': 'ca',
+                'window_2d': False
             }
         
         if self.matching_config is None:
@@ -96,6 +101,15 @@ class SimulationConfig:
                 'doppler_tolerance': 2.0,
                 'max_distance': None
             }
+        
+        if self.stream_config is None:
+            self.stream_config = {
+                'enabled': False,      # 是否逐脉冲流式处理
+                'cpi_pulses': None,    # 每个CPI的脉冲数，None表示取发射机脉冲数
+                'hop_pulses': None,    # 相邻CPI间隔的脉冲数，None表示不重叠
+                'block_pulses': 32,    # 每次仿真并送入流式处理器的脉冲数
+                'cpi_callback': None   # 接收每个CPI完整处理结果的回调，结果本身不保留
+            }
 
 
 class RadarSimulator:
@@ -109,6 +123,9 @@ class RadarSimulator:
         self.detection_evaluator = None
         # self.plotter = RadarPlotter()
         self.plotter = EnhancedRadarPlotter()
+        # scipy.fft工作线程数（-1为全部CPU核）
+        self.fft_workers = -1
+        self._window_cache: Dict[Tuple, np.ndarray] = {}
         
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器"""
@@ -134,12 +151,15 @@ class RadarSimulator:
         
         self.logger.info("新重构的CFAR处理器和目标匹配模块已初始化")
     
-    def create_radarsimpy_radar(self, radar_model: RadarModel) -> Radar:
+    def create_radarsimpy_radar(self, radar_model: RadarModel, pulses: Optional[int] = None,
+                                frame_time: float = 0.0) -> Radar:
         """
         将我们的雷达模型转换为radarsimpy的Radar对象
         
         Args:
             radar_model: 雷达模型
+            pulses: 脉冲数，None表示取发射机脉冲数
+            frame_time: 第一个脉冲的时间(秒)，目标位置与回波相位按该时间推进
             
         Returns:
             radarsimpy雷达对象
@@ -156,7 +176,7 @@ class RadarSimulator:
         speed = getattr(radar_model, 'speed', [0.0, 0.0, 0.0])
         
         # 构建发射机参数
-        transmitter = self._build_transmitter(radar_model, location, speed)
+        transmitter = self._build_transmitter(radar_model, location, speed, pulses)
         
         # 构建接收机参数
         receiver = self._build_receiver(radar_model, location, speed)
@@ -165,6 +185,7 @@ class RadarSimulator:
         radar = Radar(
             transmitter=transmitter,
             receiver=receiver,
+            frame_time=frame_time,
             location=location,
             speed=speed,
             rotation=[0.0, 0.0, 0.0],  # 默认方向
@@ -173,7 +194,8 @@ class RadarSimulator:
         
         return radar
 
-    def _build_transmitter(self, radar_model: RadarModel, location: List[float], speed: List[float]) -> Transmitter:
+    def _build_transmitter(self, radar_model: RadarModel, location: List[float], speed: List[float],
+                           pulses: Optional[int] = None) -> Transmitter:
         """构建发射机参数"""
         tx = radar_model.transmitter
         
@@ -203,7 +225,7 @@ class RadarSimulator:
             t=tx.pulse_width_s,
             tx_power=tx.power_w,
             prp=1.0 / tx.prf_hz,
-            pulses=tx.pulses,
+            pulses=tx.pulses if pulses is None else pulses,
             channels=[tx_channel]
         )
         
@@ -422,6 +444,14 @@ class RadarSimulator:
             for t in [0]:  # 临时只运行第一个时间步以加快测试速度
                 timestamp = t * scenario.time_step
                 
+                if config.stream_config.get('enabled'):
+                    # 按脉冲块生成回波并逐CPI检测，不生成也不保留整帧数据
+                    self._update_targets_position(scenario.targets, timestamp)
+                    raw_data[timestamp] = self._simulate_streaming(
+                        radar_model, targets, scenario, config, results, timestamp
+                    )
+                    continue
+                
                 # 运行radarsimpy仿真
                 data = sim_radar(radar, targets, density=0.1)                
                 # 获取回波数据
@@ -455,6 +485,116 @@ class RadarSimulator:
         
         return raw_data
     
+    def create_stream_processor(self, radar_model: RadarModel, config: SimulationConfig,
+                                n_samples: int, start_time: float = 0.0) -> PulseStreamProcessor:
+        """
+        创建逐脉冲流式处理器
+        
+        每个CPI的检测与整帧处理相同（_apply_new_cfar_detection）
+        
+        Args:
+            radar_model: 雷达模型
+            config: 仿真配置（使用stream_config与cfar_config）
+            n_samples: 每个脉冲的采样点数
+            start_time: 第一个脉冲的时间(秒)
+            
+        Returns:
+            流式处理器
+        """
+        stream_config = config.stream_config
+        return PulseStreamProcessor(
+            n_samples=n_samples,
+            cpi_pulses=stream_config.get('cpi_pulses') or radar_model.transmitter.pulses,
+            hop_pulses=stream_config.get('hop_pulses'),
+            detector=lambda processed: self._apply_new_cfar_detection(processed, radar_model, config),
+            pulse_interval=1.0 / radar_model.transmitter.prf_hz,
+            start_time=start_time,
+            fft_workers=self.fft_workers
+        )
+    
+    def _generate_pulse_blocks(self, radar_model: RadarModel, targets: List[Dict[str, Any]],
+                               start_time: float, block_pulses: int) -> Iterator[np.ndarray]:
+        """
+        按脉冲块生成回波，每块调用一次sim_radar
+        
+        每块的radarsimpy雷达只含该块的脉冲，frame_time取块内第一个脉冲的时间，
+        块间目标运动与回波相位连续；同一时刻只有一块回波在内存中
+        
+        Args:
+            radar_model: 雷达模型
+            targets: radarsimpy目标列表
+            start_time: 帧内第一个脉冲的时间(秒)
+            block_pulses: 每块的脉冲数
+            
+        Yields:
+            回波数据 [通道数, 块内脉冲数, 采样点数]
+        """
+        total_pulses = radar_model.transmitter.pulses
+        pulse_interval = 1.0 / radar_model.transmitter.prf_hz
+        for first_pulse in range(0, total_pulses, block_pulses):
+            radar = self.create_radarsimpy_radar(
+                radar_model,
+                pulses=min(block_pulses, total_pulses - first_pulse),
+                frame_time=start_time + first_pulse * pulse_interval
+            )
+            data = sim_radar(radar, targets, density=0.1)
+            yield data["baseband"] + data["noise"]
+    
+    def _simulate_streaming(self, radar_model: RadarModel, targets: List[Dict[str, Any]],
+                            scenario: SimulationScenario, config: SimulationConfig,
+                            results: SimulationResults, timestamp: float) -> Dict[str, Any]:
+        """
+        按脉冲块生成回波并送入流式处理器，逐CPI检测并匹配目标
+        
+        回波逐块生成（_generate_pulse_blocks），不生成整帧数据；每个CPI只保留检测结果
+        与标量统计，距离-多普勒图和门限图在处理完后即释放，内存占用与帧长和CPI数无关；
+        需要完整处理结果时通过stream_config['cpi_callback']逐个接收
+        
+        Returns:
+            各CPI的摘要（CPI序号、时间、检测单元数、标量检测统计）与检测结果
+        """
+        block = config.stream_config.get('block_pulses') or 1
+        cpi_callback = config.stream_config.get('cpi_callback')
+        pulse_blocks = self._generate_pulse_blocks(radar_model, targets, timestamp, block)
+        
+        # 采样点数由第一块回波确定
+        first_block = next(pulse_blocks)
+        stream = self.create_stream_processor(radar_model, config, first_block.shape[-1], timestamp)
+        pulse_blocks = chain([first_block], pulse_blocks)
+        
+        cpi_results = []
+        for processed_data in stream.process(pulse_blocks):
+            detections = self._detect_and_match_targets(
+                processed_data, radar_model, scenario.targets, processed_data['timestamp'], config
+            )
+            for detection in detections:
+                results.add_detection(detection)
+            if cpi_callback is not None:
+                cpi_callback(processed_data)
+            
+            summary = self._summarize_cpi(processed_data)
+            summary['detections'] = [d.to_dict() for d in detections]
+            cpi_results.append(summary)
+        
+        self.logger.info(f"流式处理完成: {stream.pulses_received} 个脉冲, {stream.cpi_count} 个CPI")
+        return {'cpi_results': cpi_results}
+    
+    @staticmethod
+    def _summarize_cpi(processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """提取单个CPI处理结果中的标量信息（不引用任何图数据）"""
+        detection_map = processed_data.get('detection_map')
+        stats = processed_data.get('detection_stats') or {}
+        return {
+            'cpi_index': processed_data['cpi_index'],
+            'start_pulse': processed_data['start_pulse'],
+            'timestamp': processed_data['timestamp'],
+            'data_type': processed_data.get('data_type'),
+            'detection_cells': int(np.count_nonzero(detection_map)) if detection_map is not None else 0,
+            'detection_stats': {
+                key: float(value) for key, value in stats.items() if np.ndim(value) == 0
+            }
+        }
+    
     def _update_targets_position(self, targets: List[TargetParameters], 
                                timestamp: float):
         """更新目标位置"""
@@ -485,23 +625,15 @@ class RadarSimulator:
             'range_profile': None,
             'doppler_profile': None,
             'rd_map': None,
+            'rd_power': None,
             'detection_map': None,
             'cfar_threshold': None,
             'detection_stats': None
         }
         
         try:
-            # 距离处理
-            range_profile = self._range_processing(baseband_data, radar_model)
-            processed_data['range_profile'] = range_profile
-            
-            # 多普勒处理
-            doppler_profile = self._doppler_processing(baseband_data, radar_model)
-            processed_data['doppler_profile'] = doppler_profile
-            
-            # 距离-多普勒处理
-            rd_map = self._range_doppler_map(baseband_data)
-            processed_data['rd_map'] = rd_map
+            # 距离-多普勒处理（单次二维FFT，距离/多普勒剖面由功率图导出）
+            processed_data.update(self._range_doppler_processing(baseband_data))
             
             self.plot_radar(radar_model, processed_data)                       
             
@@ -574,14 +706,9 @@ class RadarSimulator:
         
         try:
             # 优先使用距离-多普勒图进行2D检测
-            if processed_data['rd_map'] is not None and processed_data['rd_map'].ndim == 2:
-                data = processed_data['rd_map']
-                
-                # 转换为线性功率
-                if np.any(data < 0):  # dB单位
-                    data_linear = 10 ** (data / 10)
-                else:
-                    data_linear = data
+            if processed_data.get('rd_power') is not None:
+                # 线性功率图直接用于检测，无需dB往返转换
+                data_linear = processed_data['rd_power']
                 
                 # 使用新重构的CFAR检测
                 detections, threshold, stats = self.cfar_processor.adaptive_cfar_detection( # type: ignore
@@ -590,7 +717,9 @@ class RadarSimulator:
                     trailing=cfar_config['trailing_cells'],
                     pfa=cfar_config['pfa'],
                     min_snr=cfar_config['min_snr'],
-                    target_type=cfar_config['target_type']
+                    target_type=cfar_config['target_type'],
+                    cfar_type=cfar_config.get('cfar_type', 'ca'),
+                    window_2d=cfar_config.get('window_2d', False)
                 )
                 
                 return {
@@ -610,12 +739,13 @@ class RadarSimulator:
                     data_linear = data
                 
                 # 1D CFAR检测
-                cfar_threshold = self.cfar_processor.cfar_ca_1d( # type: ignore
+                cfar_threshold = self.cfar_processor.cfar_1d( # type: ignore
                     data=data_linear,
                     guard=cfar_config['guard_cells'],
                     trailing=cfar_config['trailing_cells'],
                     pfa=cfar_config['pfa'],
-                    axis=0
+                    axis=0,
+                    cfar_type=cfar_config.get('cfar_type', 'ca')
                 )
                 
                 detections = data_linear > cfar_threshold
@@ -980,111 +1110,69 @@ class RadarSimulator:
     
     # 保留原有的信号处理函数（但使用新重构的CFAR检测）
     def _get_window_array(self, window_type: WindowType, n: int, beta: float = 14.0) -> np.ndarray:
-        """生成窗函数数组"""
-        if window_type == WindowType.RECTANGULAR:
-            window = np.ones(n)
-        elif window_type == WindowType.HANNING:
-            window = np.hanning(n)
-        elif window_type == WindowType.HAMMING:
-            window = np.hamming(n)
-        elif window_type == WindowType.BLACKMAN:
-            window = np.blackman(n)
-        elif window_type == WindowType.KAISER:
-            window = np.kaiser(n, beta)
-        elif window_type == WindowType.BARTLETT:
-            window = np.bartlett(n)
-        else:
-            window = np.ones(n)
-        return window
+        """生成窗函数数组（按窗类型和长度缓存，返回只读数组）"""
+        key = (window_type, n, beta)
+        if key not in self._window_cache:
+            window = self._make_window(window_type, n, beta)
+            window.flags.writeable = False
+            self._window_cache[key] = window
+        return self._window_cache[key]
     
-    def _range_processing(self, baseband_data: np.ndarray, 
-                        radar_model: RadarModel) -> np.ndarray:
-        """距离处理"""
-        try:
-            from radarsimpy.processing import range_fft
-            
-            # 使用radarsimpy的距离FFT
-            range_win = self._get_window_array(WindowType.HANNING, baseband_data.shape[2])
-            range_profile_3d = range_fft(baseband_data, rwin=range_win)
-            
-            # 取第一个通道和第一个脉冲的结果
-            if range_profile_3d.ndim == 3:
-                range_profile = np.abs(range_profile_3d[0, 0, :])  # [通道, 脉冲, 距离]
-            else:
-                range_profile = np.abs(range_profile_3d[0, :])  # [脉冲, 距离]
-            
-            # 转换为dB
-            range_profile_db = 20 * np.log10(range_profile + 1e-12)
-            
-            return range_profile_db
-            
-        except Exception as e:
-            self.logger.error(f"距离处理错误: {str(e)}")
-            return np.zeros(baseband_data.shape[2])
-
-    def _doppler_processing(self, baseband_data: np.ndarray, 
-                        radar_model: RadarModel) -> np.ndarray:
-        """多普勒处理"""
-        try:
-            from radarsimpy.processing import doppler_fft
-            
-            # 使用radarsimpy的多普勒FFT
-            doppler_win = self._get_window_array(WindowType.HANNING, baseband_data.shape[1])
-            doppler_profile_3d = doppler_fft(baseband_data, dwin=doppler_win)
-            
-            # 取第一个通道和第一个距离门的结果
-            if doppler_profile_3d.ndim == 3:
-                doppler_profile = np.abs(doppler_profile_3d[0, :, 0])  # [通道, 多普勒, 距离]
-            else:
-                doppler_profile = np.abs(doppler_profile_3d[:, 0])  # [多普勒, 距离]
-            
-            # 进行fftshift
-            doppler_profile_shifted = fftshift(doppler_profile)
-            
-            # 转换为dB
-            doppler_profile_db = 20 * np.log10(doppler_profile_shifted + 1e-12)
-            
-            return doppler_profile_db
-            
-        except Exception as e:
-            self.logger.error(f"多普勒处理错误: {str(e)}")
-            return np.zeros(baseband_data.shape[1])
+    def _get_window_2d(self, range_window: WindowType, doppler_window: WindowType,
+                       n_pulses: int, n_samples: int) -> np.ndarray:
+        """生成距离-多普勒二维窗 [脉冲数, 采样点数]（缓存，返回只读数组）"""
+        key = (range_window, doppler_window, n_pulses, n_samples)
+        if key not in self._window_cache:
+            window = np.outer(self._get_window_array(doppler_window, n_pulses),
+                              self._get_window_array(range_window, n_samples))
+            window.flags.writeable = False
+            self._window_cache[key] = window
+        return self._window_cache[key]
     
-    def _range_doppler_map(self, baseband_data: np.ndarray,
-                        range_window: WindowType = WindowType.HANNING,
-                        doppler_window: WindowType = WindowType.HANNING) -> np.ndarray:
-        """
-        计算距离-多普勒图
+    @staticmethod
+    def _make_window(window_type: WindowType, n: int, beta: float = 14.0) -> np.ndarray:
+        """生成窗函数数组"""
+        return make_window(window_type, n, beta)
+    
+    def _range_doppler_processing(self, baseband_data: np.ndarray,
+                                  range_window: WindowType = WindowType.HANNING,
+                                  doppler_window: WindowType = WindowType.HANNING) -> Dict[str, np.ndarray]:
         """
-        try:
-            from radarsimpy.processing import range_doppler_fft
-            
-            # 确保数据形状正确 [通道数, 脉冲数, 采样点数]
-            if baseband_data.ndim != 3:
-                raise ValueError(f"基带数据维度错误: {baseband_data.shape}")        
-            
-            # 生成窗函数
-            range_win = self._get_window_array(range_window, baseband_data.shape[2])
-            doppler_win = self._get_window_array(doppler_window, baseband_data.shape[1])
-
-            # 使用radarsimpy的距离-多普勒FFT
-            rd_map = range_doppler_fft(baseband_data, rwin=range_win, dwin=doppler_win)
-            
-            # 取第一个通道的结果
-            if rd_map.ndim == 3:
-                rd_map = rd_map[0]  # 取第一个通道
-            
-            # 沿多普勒维进行fftshift
-            rd_map_shifted = fftshift(rd_map, axes=0)
-            
-            # 转换为幅度（dB）
-            rd_map_db = 20 * np.log10(np.abs(rd_map_shifted) + 1e-12)
-            
-            return rd_map_db   
+        单次二维FFT距离-多普勒处理
+        
+        对第一个通道的基带数据 [脉冲数, 采样点数] 乘以缓存的二维窗后做一次fft2，
+        距离剖面和多普勒剖面由距离-多普勒功率图分别沿多普勒维和距离维取峰值得到。
+        
+        Args:
+            baseband_data: 基带数据 [通道数, 脉冲数, 采样点数]
+            range_window: 距离维窗函数
+            doppler_window: 多普勒维窗函数
             
-        except Exception as e:
-            self.logger.error(f"距离-多普勒图计算错误: {str(e)}")
-            return np.zeros((baseband_data.shape[1], baseband_data.shape[2]))
+        Returns:
+            rd_power: 线性功率距离-多普勒图 [多普勒, 距离]（零多普勒居中），供CFAR使用
+            rd_map: rd_power的dB表示，供绘图使用
+            range_profile: 距离剖面（dB）
+            doppler_profile: 多普勒剖面（dB）
+        """
+        # 确保数据形状正确 [通道数, 脉冲数, 采样点数]
+        if baseband_data.ndim != 3:
+            raise ValueError(f"基带数据维度错误: {baseband_data.shape}")
+        
+        n_pulses, n_samples = baseband_data.shape[1:]
+        window = self._get_window_2d(range_window, doppler_window, n_pulses, n_samples)
+        
+        # 乘窗结果为临时数组，允许FFT原地覆盖
+        rd_spectrum = fft2(baseband_data[0] * window, axes=(0, 1),
+                           workers=self.fft_workers, overwrite_x=True)
+        rd_spectrum = fftshift(rd_spectrum, axes=0)
+        rd_power = rd_spectrum.real ** 2 + rd_spectrum.imag ** 2
+        
+        return {
+            'rd_power': rd_power,
+            'rd_map': 10 * np.log10(rd_power + 1e-24),
+            'range_profile': 10 * np.log10(rd_power.max(axis=0) + 1e-24),
+            'doppler_profile': 10 * np.log10(rd_power.max(axis=1) + 1e-24)
+        }
     
     def analyze_performance(self, results: SimulationResults) -> Dict[str, Any]:
         """
@@ -1342,7 +1430,9 @@ if __name__ == "__main__":
                 'trailing_cells': 10,
                 'pfa': 1e-6,
                 'min_snr': 10.0,
-                'target_type': 'Swerling 0'
+                'target_type': 'Swerling 0',
+                'cfar_type': 'ca',
+                'window_2d': False
             },
             matching_config={
                 'match_method': MatchMethod.NEAREST_NEIGHBOR,
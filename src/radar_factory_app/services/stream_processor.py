@@ -0,0 +1,176 @@
+"""
+逐脉冲流式信号处理
+
+按脉冲增量接收基带数据，维护慢时间环形缓冲区，每个相干处理间隔（CPI）
+输出一次距离-多普勒图与CFAR检测结果，内存占用只与CPI长度有关
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from scipy.fft import fft, fftshift
+
+from radar_factory_app.models.radar_models import WindowType
+
+logger = logging.getLogger(__name__)
+
+
+def make_window(window_type: WindowType, n: int, beta: float = 14.0) -> np.ndarray:
+    """生成窗函数数组"""
+    if window_type == WindowType.RECTANGULAR:
+        window = np.ones(n)
+    elif window_type == WindowType.HANNING:
+        window = np.hanning(n)
+    elif window_type == WindowType.HAMMING:
+        window = np.hamming(n)
+    elif window_type == WindowType.BLACKMAN:
+        window = np.blackman(n)
+    elif window_type == WindowType.KAISER:
+        window = np.kaiser(n, beta)
+    elif window_type == WindowType.BARTLETT:
+        window = np.bartlett(n)
+    else:
+        window = np.ones(n)
+    return window
+
+
+class PulseStreamProcessor:
+    """
+    逐脉冲流式距离-多普勒处理与CFAR检测
+
+    每个脉冲到达时即完成乘窗与距离FFT并写入环形缓冲区 [CPI脉冲数, 采样点数]，
+    累计满一个CPI后沿慢时间乘窗做多普勒FFT并执行检测。相邻CPI间隔hop_pulses
+    个脉冲（小于CPI长度时为滑动重叠处理）。输出与整帧处理
+    （RadarSimulator._range_doppler_processing）对同一段脉冲的结果一致。
+    """
+
+    def __init__(self, n_samples: int, cpi_pulses: int,
+                 hop_pulses: Optional[int] = None,
+                 range_window: WindowType = WindowType.HANNING,
+                 doppler_window: WindowType = WindowType.HANNING,
+                 detector: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 pulse_interval: float = 0.0,
+                 start_time: float = 0.0,
+                 channel: int = 0,
+                 fft_workers: int = -1):
+        """
+        Args:
+            n_samples: 每个脉冲的快时间采样点数
+            cpi_pulses: 每个CPI的脉冲数
+            hop_pulses: 相邻CPI起点间隔的脉冲数，默认等于cpi_pulses（不重叠）
+            range_window: 距离维窗函数
+            doppler_window: 多普勒维窗函数
+            detector: 检测函数，输入处理结果字典，返回需合并的检测结果字典
+            pulse_interval: 脉冲重复周期(秒)，用于计算CPI时间戳
+            start_time: 第一个脉冲的时间(秒)
+            channel: 输入为 [通道数, 脉冲数, 采样点数] 时处理的通道
+            fft_workers: scipy.fft工作线程数（-1为全部CPU核）
+        """
+        hop_pulses = cpi_pulses if hop_pulses is None else hop_pulses
+        if cpi_pulses < 1 or n_samples < 1:
+            raise ValueError("CPI脉冲数与采样点数必须为正")
+        if not 1 <= hop_pulses <= cpi_pulses:
+            raise ValueError(f"CPI间隔必须在1到{cpi_pulses}个脉冲之间")
+
+        self.n_samples = n_samples
+        self.cpi_pulses = cpi_pulses
+        self.hop_pulses = hop_pulses
+        self.detector = detector
+        self.pulse_interval = pulse_interval
+        self.start_time = start_time
+        self.channel = channel
+        self.fft_workers = fft_workers
+
+        self.range_window = make_window(range_window, n_samples)
+        self.doppler_window = make_window(doppler_window, cpi_pulses)[:, np.newaxis]
+
+        # 慢时间环形缓冲区，保存已完成距离FFT的脉冲
+        self._buffer = np.zeros((cpi_pulses, n_samples), dtype=complex)
+        self.reset()
+
+    def reset(self):
+        """清空缓冲区，重新从第0个脉冲开始计数"""
+        self._write_index = 0
+        self.pulses_received = 0
+        self.cpi_count = 0
+        self._next_cpi_end = self.cpi_pulses
+
+    def _as_pulse_block(self, pulses: np.ndarray) -> np.ndarray:
+        """整理为 [脉冲数, 采样点数]"""
+        pulses = np.asarray(pulses)
+        if pulses.ndim == 3:
+            pulses = pulses[self.channel]
+        elif pulses.ndim == 1:
+            pulses = pulses[np.newaxis, :]
+        if pulses.ndim != 2 or pulses.shape[1] != self.n_samples:
+            raise ValueError(f"脉冲数据形状错误: {pulses.shape}，每个脉冲应有 {self.n_samples} 个采样点")
+        return pulses
+
+    def push(self, pulses: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        输入一个或多个脉冲
+
+        Args:
+            pulses: 单个脉冲 [采样点数]、脉冲块 [脉冲数, 采样点数]
+                或多通道脉冲块 [通道数, 脉冲数, 采样点数]
+
+        Returns:
+            本次输入完成的CPI处理结果列表（可能为空）
+        """
+        block = self._as_pulse_block(pulses)
+        # 距离FFT随脉冲到达完成，CPI边界处只剩多普勒FFT
+        spectra = fft(block * self.range_window, axis=1, workers=self.fft_workers)
+
+        results = []
+        offset = 0
+        while offset < len(spectra):
+            take = min(len(spectra) - offset, self._next_cpi_end - self.pulses_received)
+            self._write(spectra[offset:offset + take])
+            offset += take
+            if self.pulses_received == self._next_cpi_end:
+                results.append(self._process_cpi())
+                self._next_cpi_end += self.hop_pulses
+        return results
+
+    def process(self, source: Iterable[np.ndarray]) -> Iterator[Dict[str, Any]]:
+        """逐块消费脉冲源，每完成一个CPI产出一次处理结果"""
+        for pulses in source:
+            yield from self.push(pulses)
+
+    def _write(self, spectra: np.ndarray):
+        """写入环形缓冲区（块长度不超过CPI脉冲数）"""
+        positions = (self._write_index + np.arange(len(spectra))) % self.cpi_pulses
+        self._buffer[positions] = spectra
+        self._write_index = (self._write_index + len(spectra)) % self.cpi_pulses
+        self.pulses_received += len(spectra)
+
+    def _process_cpi(self) -> Dict[str, Any]:
+        """对缓冲区中最近一个CPI做多普勒处理与检测"""
+        # 写指针处为最早的脉冲，按时间顺序取出后沿慢时间乘窗
+        order = (self._write_index + np.arange(self.cpi_pulses)) % self.cpi_pulses
+        rd_spectrum = fft(self._buffer[order] * self.doppler_window, axis=0,
+                          workers=self.fft_workers, overwrite_x=True)
+        rd_spectrum = fftshift(rd_spectrum, axes=0)
+        rd_power = rd_spectrum.real ** 2 + rd_spectrum.imag ** 2
+
+        start_pulse = self.pulses_received - self.cpi_pulses
+        processed = {
+            'cpi_index': self.cpi_count,
+            'start_pulse': start_pulse,
+            'timestamp': self.start_time + start_pulse * self.pulse_interval,
+            'rd_power': rd_power,
+            'rd_map': 10 * np.log10(rd_power + 1e-24),
+            'range_profile': 10 * np.log10(rd_power.max(axis=0) + 1e-24),
+            'doppler_profile': 10 * np.log10(rd_power.max(axis=1) + 1e-24),
+            'detection_map': None,
+            'cfar_threshold': None,
+            'detection_stats': None
+        }
+        self.cpi_count += 1
+
+        if self.detector is not None:
+            processed.update(self.detector(processed))
+
+        logger.debug(f"CPI {processed['cpi_index']} 完成，起始脉冲 {start_pulse}")
+        return processed
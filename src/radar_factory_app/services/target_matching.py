@@ -1,11 +1,20 @@
 import numpy as np
 from typing import Tuple, List, Dict, Union, Optional
 from numpy.typing import NDArray
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
 from dataclasses import dataclass
 from enum import Enum
 
 
+# 匈牙利匹配代价矩阵单元数超过该值时改用稀疏门限模式：
+# KD树找出门限内的候选对，按连通分量分别求解
+HUNGARIAN_DENSE_MAX_CELLS = 1_000_000
+
+
 class MatchMethod(Enum):
     """目标匹配方法枚举"""
     NEAREST_NEIGHBOR = "nearest_neighbor"  # 最近邻匹配
@@ -160,6 +169,157 @@ def _match_target_to_detection_2d(
         raise ValueError(f"不支持的匹配方法: {match_method}")
 
 
+def _solve_assignment(cost: NDArray, valid: NDArray) -> Tuple[NDArray, NDArray]:
+    """
+    在有效边上求基数最大、总代价最小的匹配
+    
+    无效边代价取一个足够大的有限值（多一条无效边的代价总大于全部有效边代价之和），
+    避免linear_sum_assignment因存在无法分配的行/列而报不可行
+    
+    :return: (行索引, 列索引)，只含有效边
+    """
+    if not valid.any():
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    
+    sentinel = (cost[valid].max() + 1.0) * (min(cost.shape) + 1)
+    rows, cols = linear_sum_assignment(np.where(valid, cost, sentinel))
+    keep = valid[rows, cols]
+    return rows[keep], cols[keep]
+
+
+def _gated_pairs(
+    targets: NDArray,
+    detections: NDArray,
+    tolerance: NDArray,
+    max_distance: float,
+    weights: NDArray
+) -> Optional[Tuple[NDArray, NDArray, NDArray]]:
+    """
+    用KD树找出各维容差与最大距离门限内的全部 (目标, 检测) 对
+    
+    坐标按各维最大容差归一化后做切比雪夫半径查询得到候选对，再按每个目标
+    自身的容差与加权距离精确筛选。容差为0或无穷时无法归一化，返回None。
+    
+    :return: (目标索引, 检测索引, 加权距离)
+    """
+    gate = tolerance.max(axis=0)
+    if not np.all(np.isfinite(gate) & (gate > 0)):
+        return None
+    
+    target_tree = cKDTree(targets / gate)
+    detection_tree = cKDTree(detections / gate)
+    # 半径略放大，避免归一化舍入漏掉恰在容差边界上的点对
+    candidates = target_tree.sparse_distance_matrix(
+        detection_tree, 1.0 + 1e-9, p=np.inf, output_type="ndarray"
+    )
+    rows, cols = candidates["i"].astype(int), candidates["j"].astype(int)
+    
+    diff = np.abs(targets[rows] - detections[cols])
+    distances = np.sqrt(np.sum((diff * weights) ** 2, axis=1))
+    keep = np.all(diff <= tolerance[rows], axis=1) & (distances <= max_distance)
+    return rows[keep], cols[keep], distances[keep]
+
+
+def _sparse_hungarian(
+    rows: NDArray,
+    cols: NDArray,
+    distances: NDArray,
+    n_targets: int,
+    n_detections: int
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    稀疏门限匹配：把目标与检测按候选对连成二分图，各连通分量互不影响，
+    分别求最优匹配后合并即为全局最优。只有一条候选边的分量直接匹配。
+    
+    :return: (目标索引, 检测索引, 匹配距离)，按目标索引排序
+    """
+    n_nodes = n_targets + n_detections
+    graph = coo_matrix((np.ones(len(rows)), (rows, n_targets + cols)), shape=(n_nodes, n_nodes))
+    _, labels = connected_components(graph, directed=False)
+    
+    edge_component = labels[rows]
+    edges_per_component = np.bincount(edge_component, minlength=labels.max() + 1)
+    single = edges_per_component[edge_component] == 1
+    
+    matched = [(rows[single], cols[single], distances[single])]
+    
+    # 多条候选边的分量：按分量分组后各自构造小代价矩阵
+    multi = np.flatnonzero(~single)
+    multi = multi[np.argsort(edge_component[multi], kind="stable")]
+    boundaries = np.flatnonzero(np.diff(edge_component[multi])) + 1
+    for edges in np.split(multi, boundaries):
+        if len(edges) == 0:
+            continue
+        local_targets, target_index = np.unique(rows[edges], return_inverse=True)
+        local_detections, detection_index = np.unique(cols[edges], return_inverse=True)
+        cost = np.zeros((len(local_targets), len(local_detections)))
+        valid = np.zeros(cost.shape, dtype=bool)
+        cost[target_index, detection_index] = distances[edges]
+        valid[target_index, detection_index] = True
+        local_rows, local_cols = _solve_assignment(cost, valid)
+        matched.append((local_targets[local_rows], local_detections[local_cols], cost[local_rows, local_cols]))
+    
+    matched_rows, matched_cols, matched_distances = (np.concatenate(parts) for parts in zip(*matched))
+    order = np.argsort(matched_rows, kind="stable")
+    return matched_rows[order], matched_cols[order], matched_distances[order]
+
+
+def _hungarian_assign(
+    targets: NDArray,
+    detections: NDArray,
+    tolerance: NDArray,
+    max_distance: float,
+    weights: NDArray
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    匈牙利匹配公共实现（targets/detections为 (N, 维数)）
+    
+    规模不超过HUNGARIAN_DENSE_MAX_CELLS时广播计算完整代价矩阵一次求解，
+    否则使用稀疏门限模式
+    
+    :return: (目标索引, 检测索引, 匹配距离)
+    """
+    n_targets, n_detections = len(targets), len(detections)
+    
+    if n_targets * n_detections > HUNGARIAN_DENSE_MAX_CELLS:
+        gated = _gated_pairs(targets, detections, tolerance, max_distance, weights)
+        if gated is not None:
+            return _sparse_hungarian(*gated, n_targets, n_detections)
+    
+    diff = np.abs(targets[:, np.newaxis, :] - detections[np.newaxis, :, :])
+    distances = np.sqrt(np.sum((diff * weights) ** 2, axis=-1))
+    valid = np.all(diff <= tolerance[:, np.newaxis, :], axis=-1) & (distances <= max_distance)
+    rows, cols = _solve_assignment(distances, valid)
+    return rows, cols, distances[rows, cols]
+
+
+def _build_match_result(
+    matched_pairs: List[Tuple[int, int]],
+    match_distances: List[float],
+    n_targets: int,
+    n_detections: int
+) -> MatchResult:
+    """由匹配对统计正确检测、虚警、漏检及精确率/召回率/F1"""
+    true_positives = len(matched_pairs)
+    false_positives = n_detections - true_positives
+    false_negatives = n_targets - true_positives
+    
+    precision = true_positives / (true_positives + false_positives) if (true_positives + false_positives) > 0 else 0.0
+    recall = true_positives / (true_positives + false_negatives) if (true_positives + false_negatives) > 0 else 0.0
+    f1_score = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    
+    return MatchResult(
+        true_positives=true_positives,
+        false_positives=false_positives,
+        false_negatives=false_negatives,
+        matched_pairs=matched_pairs,
+        match_distances=match_distances,
+        precision=precision,
+        recall=recall,
+        f1_score=f1_score
+    )
+
+
 def _nearest_neighbor_match_1d(
     targets: NDArray,
     detections: NDArray,
@@ -226,52 +386,14 @@ def _hungarian_match_1d(
     max_distance: float
 ) -> MatchResult:
     """1D匈牙利算法匹配（最优分配）"""
-    try:
-        from scipy.optimize import linear_sum_assignment
-    except ImportError:
-        raise ImportError("匈牙利算法需要scipy.optimize.linear_sum_assignment")
-    
-    n_targets = len(targets)
-    n_detections = len(detections)
-    
-    # 创建代价矩阵
-    cost_matrix = np.full((n_targets, n_detections), np.inf)
-    
-    for i in range(n_targets):
-        for j in range(n_detections):
-            dist = np.abs(targets[i] - detections[j])
-            if dist <= tolerance[i] and dist <= max_distance:
-                cost_matrix[i, j] = dist  # 使用距离作为代价
-    
-    # 匈牙利算法寻找最优匹配
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
-    
-    # 收集匹配结果
-    matched_pairs = []
-    match_distances = []
-    
-    for i, j in zip(row_ind, col_ind):
-        if cost_matrix[i, j] < np.inf:  # 有效的匹配
-            matched_pairs.append((i, j))
-            match_distances.append(cost_matrix[i, j])
-    
-    true_positives = len(matched_pairs)
-    false_positives = n_detections - true_positives
-    false_negatives = n_targets - true_positives
-    
-    precision = true_positives / (true_positives + false_positives) if (true_positives + false_positives) > 0 else 0.0
-    recall = true_positives / (true_positives + false_negatives) if (true_positives + false_negatives) > 0 else 0.0
-    f1_score = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    rows, cols, distances = _hungarian_assign(
+        targets.astype(float)[:, np.newaxis], detections.astype(float)[:, np.newaxis],
+        tolerance.astype(float)[:, np.newaxis], max_distance, np.ones(1)
+    )
     
-    return MatchResult(
-        true_positives=true_positives,
-        false_positives=false_positives,
-        false_negatives=false_negatives,
-        matched_pairs=matched_pairs,
-        match_distances=match_distances,
-        precision=precision,
-        recall=recall,
-        f1_score=f1_score
+    return _build_match_result(
+        list(zip(rows.tolist(), cols.tolist())), distances.tolist(),
+        len(targets), len(detections)
     )
 
 
@@ -406,59 +528,14 @@ def _hungarian_match_2d(
     weights: Tuple[float, float]
 ) -> MatchResult:
     """2D匈牙利算法匹配"""
-    try:
-        from scipy.optimize import linear_sum_assignment
-    except ImportError:
-        raise ImportError("匈牙利算法需要scipy.optimize.linear_sum_assignment")
-    
-    n_targets = len(targets)
-    n_detections = len(detections)
-    
-    # 计算加权距离矩阵
-    weighted_targets = targets * np.array(weights)
-    weighted_detections = detections * np.array(weights)
-    distance_matrix = cdist(weighted_targets, weighted_detections)
-    
-    # 创建代价矩阵，无效匹配设为极大值
-    cost_matrix = np.full_like(distance_matrix, np.inf)
-    
-    for i in range(n_targets):
-        for j in range(n_detections):
-            # 检查是否在容差范围内
-            diff = np.abs(targets[i] - detections[j])
-            if (diff[0] <= tolerance[i, 0] and 
-                diff[1] <= tolerance[i, 1] and 
-                distance_matrix[i, j] <= max_distance):
-                cost_matrix[i, j] = distance_matrix[i, j]
-    
-    # 匈牙利算法
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
-    
-    matched_pairs = []
-    match_distances = []
-    
-    for i, j in zip(row_ind, col_ind):
-        if cost_matrix[i, j] < np.inf:
-            matched_pairs.append((i, j))
-            match_distances.append(cost_matrix[i, j])
-    
-    true_positives = len(matched_pairs)
-    false_positives = n_detections - true_positives
-    false_negatives = n_targets - true_positives
-    
-    precision = true_positives / (true_positives + false_positives) if (true_positives + false_positives) > 0 else 0.0
-    recall = true_positives / (true_positives + false_negatives) if (true_positives + false_negatives) > 0 else 0.0
-    f1_score = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    rows, cols, distances = _hungarian_assign(
+        targets.astype(float), detections.astype(float),
+        tolerance.astype(float), max_distance, np.asarray(weights, dtype=float)
+    )
     
-    return MatchResult(
-        true_positives=true_positives,
-        false_positives=false_positives,
-        false_negatives=false_negatives,
-        matched_pairs=matched_pairs,
-        match_distances=match_distances,
-        precision=precision,
-        recall=recall,
-        f1_score=f1_score
+    return _build_match_result(
+        list(zip(rows.tolist(), cols.tolist())), distances.tolist(),
+        len(targets), len(detections)
     )
 
 
@@ -21,6 +21,7 @@ from views.settings_view import render_settings
 from views.export_view import render_export
 from utils.config import AppConfig
 from utils.helpers import setup_logging, check_dependencies
+from utils.metrics import start_metrics_exporter
 
 def init_session_state():
     """初始化会话状态"""
@@ -527,6 +528,10 @@ def main():
     # 主内容区域
     config = AppConfig()
     
+    # 启动指标导出器（Streamlit每次重跑脚本时只会启动一次）
+    if config.get('monitoring.enabled', True):
+        start_metrics_exporter(config.get('monitoring.metrics_port'))
+    
     # 渲染当前页面
     render_current_page(sidebar_config, config)
     
@@ -22,6 +22,7 @@ from models.pattern_models import (
     RadiationPattern, PatternSlice, PatternComponent, 
     PatternFormat, PatternStatistics
 )
+from utils.metrics import ANALYSIS_SECONDS, ANALYSIS_FAILURES
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -976,7 +977,12 @@ class AnalysisFacade:
                 )
             
             analyzer = self.analyzers[analyzer_type]
-            results = analyzer.analyze(pattern, **kwargs)
+            try:
+                with ANALYSIS_SECONDS.time(analyzer=analyzer_type):
+                    results = analyzer.analyze(pattern, **kwargs)
+            except Exception:
+                ANALYSIS_FAILURES.inc(analyzer=analyzer_type)
+                raise
             all_results[analyzer_type] = results
         
         # 合并结果
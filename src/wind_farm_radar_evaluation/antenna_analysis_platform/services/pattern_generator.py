@@ -8,6 +8,7 @@ import numpy as np
 from typing import List, Tuple, Optional, Dict, Any, Union
 from abc import ABC, abstractmethod
 import json
+import time
 from datetime import datetime
 import logging
 from scipy import signal, interpolate
@@ -38,6 +39,9 @@ from models.pattern_models import (
     RadiationPattern, PatternCoordinateSystem, 
     PatternFormat, PatternComponent, PatternPoint, PatternSlice
 )
+from utils.metrics import (
+    PATTERN_GENERATION_SECONDS, CACHE_ENTRIES, pattern_grid_label, record_cache_lookup
+)
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -525,15 +529,24 @@ class PatternGenerationFacade:
         
         # 检查缓存
         if cache_key in self.cache:
+            record_cache_lookup("pattern", hit=True)
             logger.info("从缓存加载方向图")
             return self.cache[cache_key]
+        record_cache_lookup("pattern", hit=False)
         
         # 生成方向图
-        logger.info(f"使用 {self.generator.__class__.__name__} 生成方向图")
+        generator_name = self.generator.__class__.__name__
+        logger.info(f"使用 {generator_name} 生成方向图")
+        start = time.perf_counter()
         pattern = self.generator.generate_pattern(antenna, **kwargs)
+        PATTERN_GENERATION_SECONDS.observe(
+            time.perf_counter() - start,
+            generator=generator_name, grid=pattern_grid_label(pattern)
+        )
         
         # 缓存结果
         self.cache[cache_key] = pattern
+        CACHE_ENTRIES.set(len(self.cache), cache="pattern")
         
         return pattern
     
@@ -555,6 +568,7 @@ class PatternGenerationFacade:
     def clear_cache(self):
         """清空缓存"""
         self.cache.clear()
+        CACHE_ENTRIES.set(0, cache="pattern")
     
     def _create_cache_key(self, antenna: AntennaParameters, 
                          kwargs: Dict[str, Any]) -> str:
@@ -22,6 +22,7 @@ from models.pattern_models import (
     PatternFormat, PatternStatistics
 )
 from services.analysis_service import PatternStatistics as AnalysisPatternStatistics
+from utils.metrics import VISUALIZATION_SECONDS, timed
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -1037,6 +1038,7 @@ class VisualizationService:
         self.visualizer = PatternVisualizer(self.config)
         self.animation_generator = AnimationGenerator()
     
+    @timed(VISUALIZATION_SECONDS, plot="radiation_pattern")
     def plot_radiation_pattern(self, 
                              pattern: RadiationPattern,
                              plot_type: PlotType = None,
@@ -1047,12 +1049,14 @@ class VisualizationService:
             pattern, plot_type, component, **kwargs
         )
     
+    @timed(VISUALIZATION_SECONDS, plot="pattern_slice")
     def plot_pattern_slice(self, 
                           pattern_slice: PatternSlice,
                           **kwargs) -> go.Figure:
         """绘制方向图切面"""
         return self.visualizer.create_pattern_slice_plot(pattern_slice, **kwargs)
     
+    @timed(VISUALIZATION_SECONDS, plot="multiple_slices")
     def plot_multiple_slices(self, 
                            slices: List[PatternSlice],
                            slice_names: List[str] = None,
@@ -1060,12 +1064,14 @@ class VisualizationService:
         """绘制多个切面"""
         return self.visualizer.create_multiple_slices_plot(slices, slice_names, **kwargs)
     
+    @timed(VISUALIZATION_SECONDS, plot="polarization")
     def plot_polarization(self, 
                          pattern: RadiationPattern,
                          **kwargs) -> go.Figure:
         """绘制极化特性"""
         return self.visualizer.create_polarization_plot(pattern, **kwargs)
     
+    @timed(VISUALIZATION_SECONDS, plot="comparison")
     def plot_comparison(self, 
                        patterns: List[RadiationPattern],
                        pattern_names: List[str] = None,
@@ -1076,6 +1082,7 @@ class VisualizationService:
             patterns, pattern_names, comparison_type, **kwargs
         )
     
+    @timed(VISUALIZATION_SECONDS, plot="statistics_dashboard")
     def plot_statistics_dashboard(self, 
                                 pattern_stats: PatternStatistics,
                                 analysis_results: Dict[str, Any] = None,
@@ -1085,6 +1092,7 @@ class VisualizationService:
             pattern_stats, analysis_results, **kwargs
         )
     
+    @timed(VISUALIZATION_SECONDS, plot="animation")
     def create_animation(self, 
                         patterns: List[RadiationPattern],
                         pattern_names: List[str] = None,
@@ -0,0 +1,67 @@
+"""
+天线分析平台 - 运行指标测试
+"""
+
+import urllib.request
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics import MetricsRegistry, MetricsExporter, CACHE_REQUESTS, PATTERN_GENERATION_SECONDS
+
+
+def test_registry_renders_prometheus_text():
+    """测试计数器与直方图的文本格式输出"""
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests", "请求次数", ("result",))
+    latency = registry.histogram("demo_seconds", "耗时", ("op",), buckets=(0.1, 1.0))
+
+    requests.inc(result="hit")
+    requests.inc(2, result="miss")
+    latency.observe(0.05, op="a")
+    latency.observe(0.5, op="a")
+    latency.observe(3.0, op="a")
+
+    assert registry.counter("demo_requests", "请求次数", ("result",)) is requests
+    text = registry.render()
+    assert '# TYPE demo_requests counter' in text
+    assert 'demo_requests_total{result="miss"} 2.0' in text
+    assert 'demo_seconds_bucket{op="a",le="0.1"} 1.0' in text
+    assert 'demo_seconds_bucket{op="a",le="1.0"} 2.0' in text
+    assert 'demo_seconds_bucket{op="a",le="+Inf"} 3.0' in text
+    assert 'demo_seconds_count{op="a"} 3.0' in text
+
+
+def test_exporter_serves_metrics():
+    """测试HTTP导出器输出注册表内容"""
+    registry = MetricsRegistry()
+    registry.gauge("demo_entries", "条目数").set(7)
+    exporter = MetricsExporter(port=0, host="127.0.0.1", registry=registry).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "demo_entries 7.0" in body
+    finally:
+        exporter.stop()
+
+
+def test_pattern_facade_records_cache_and_latency():
+    """测试方向图生成记录缓存命中与按网格尺寸的耗时"""
+    from models.antenna_models import create_dipole_antenna
+    from services.pattern_generator import PatternGenerationFacade
+
+    antenna = create_dipole_antenna()
+    facade = PatternGenerationFacade("analytical")
+    hits = CACHE_REQUESTS.get(cache="pattern", result="hit")
+    misses = CACHE_REQUESTS.get(cache="pattern", result="miss")
+
+    pattern = facade.generate_radiation_pattern(antenna, theta_resolution=10, phi_resolution=10)
+    facade.generate_radiation_pattern(antenna, theta_resolution=10, phi_resolution=10)
+
+    grid = f"{len(pattern.theta_grid)}x{len(pattern.phi_grid)}"
+    assert CACHE_REQUESTS.get(cache="pattern", result="miss") == misses + 1
+    assert CACHE_REQUESTS.get(cache="pattern", result="hit") == hits + 1
+    assert PATTERN_GENERATION_SECONDS.get_count(generator="AnalyticalPatternStrategy", grid=grid) >= 1
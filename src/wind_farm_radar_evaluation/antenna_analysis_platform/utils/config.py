@@ -79,6 +79,10 @@ class AppConfig:
                 'max_file_size_mb': 100,
                 'enable_cors': True,
                 'session_timeout': 3600  # seconds
+            },
+            'monitoring': {
+                'enabled': True,
+                'metrics_port': 9464
             }
         }
         
@@ -109,7 +113,8 @@ class AppConfig:
             'simulation': {},
             'visualization': {},
             'export': {},
-            'security': {}
+            'security': {},
+            'monitoring': {}
         }
         
         # 合并配置
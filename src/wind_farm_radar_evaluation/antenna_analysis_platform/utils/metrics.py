@@ -0,0 +1,410 @@
+"""
+运行指标模块
+进程内指标注册表与Prometheus文本格式HTTP导出器
+"""
+
+import functools
+import logging
+import math
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 默认导出端口（Streamlit占用8501，指标单独监听）
+DEFAULT_METRICS_PORT = 9464
+
+# 默认延迟直方图分桶（秒）
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                           1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """格式化样本值"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """指标基类，按标签值组合保存样本"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"指标 {self.name} 需要标签 {self.labelnames}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """生成样本 (名称后缀, 标签字符串, 值)"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("计数器只能增加")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "_total", _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值"""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def set_function(self, callback: Callable[[], Dict[Tuple[str, ...], float]]):
+        """设置采集回调，每次导出时调用，返回 {标签值元组: 值}"""
+        self._callback = callback
+
+    def samples(self):
+        if self._callback is not None:
+            try:
+                values = self._callback()
+            except Exception as e:
+                logger.warning(f"采集指标 {self.name} 失败: {e}")
+                values = {}
+            with self._lock:
+                self._values.update(values)
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """累积分桶直方图"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [各分桶计数（非累积）..., 总和, 总数]
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """计时上下文，退出时（包括异常退出）记录耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels) -> float:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[-1] if state else 0.0
+
+    def get_sum(self, **labels) -> float:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[-2] if state else 0.0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        bucket_names = self.labelnames + ("le",)
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield "_bucket", _format_labels(bucket_names, key + (_format_value(bound),)), cumulative
+            yield "_bucket", _format_labels(bucket_names, key + ("+Inf",)), state[-1]
+            yield "_sum", _format_labels(self.labelnames, key), state[-2]
+            yield "_count", _format_labels(self.labelnames, key), state[-1]
+
+
+class MetricsRegistry:
+    """指标注册表，同名指标只创建一次"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, documentation: str,
+                       labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"指标 {name} 已以不同类型或标签注册")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """生成Prometheus文本格式"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# 平台指标定义
+# ============================================================================
+
+REGISTRY = MetricsRegistry()
+
+PATTERN_GENERATION_SECONDS = REGISTRY.histogram(
+    "antenna_pattern_generation_seconds",
+    "方向图生成耗时（不含缓存命中）",
+    ("generator", "grid"),
+)
+ANALYSIS_SECONDS = REGISTRY.histogram(
+    "antenna_analysis_seconds",
+    "单个分析器耗时",
+    ("analyzer",),
+)
+ANALYSIS_FAILURES = REGISTRY.counter(
+    "antenna_analysis_failures",
+    "分析器异常次数",
+    ("analyzer",),
+)
+VISUALIZATION_SECONDS = REGISTRY.histogram(
+    "antenna_visualization_render_seconds",
+    "图表渲染耗时",
+    ("plot",),
+)
+EXPORT_SECONDS = REGISTRY.histogram(
+    "antenna_export_seconds",
+    "导出耗时",
+    ("kind",),
+)
+EXPORT_FAILURES = REGISTRY.counter(
+    "antenna_export_failures",
+    "导出失败次数",
+    ("kind",),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "antenna_cache_requests",
+    "缓存查询次数",
+    ("cache", "result"),
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "antenna_cache_entries",
+    "缓存条目数",
+    ("cache",),
+)
+MEMORY_BYTES = REGISTRY.gauge(
+    "antenna_process_memory_bytes",
+    "进程内存占用",
+    ("type",),
+)
+
+
+def pattern_grid_label(pattern) -> str:
+    """方向图网格尺寸标签，如 '37x73'"""
+    return f"{len(pattern.theta_grid)}x{len(pattern.phi_grid)}"
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """记录一次缓存查询"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def timed(histogram: Histogram, **labels):
+    """函数耗时装饰器"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _collect_memory() -> Dict[Tuple[str, ...], float]:
+    """读取当前RSS与峰值RSS"""
+    values = {}
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    values[("peak_rss",)] = float(peak if sys.platform == "darwin" else peak * 1024)
+    try:
+        with open("/proc/self/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        values[("rss",)] = float(rss_pages * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, IndexError):
+        try:
+            import psutil
+            values[("rss",)] = float(psutil.Process().memory_info().rss)
+        except ImportError:
+            pass
+    return values
+
+
+MEMORY_BYTES.set_function(_collect_memory)
+
+
+# ============================================================================
+# HTTP导出器
+# ============================================================================
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics: " + format, *args)
+
+
+class MetricsExporter:
+    """后台线程中运行的指标HTTP服务"""
+
+    def __init__(self, port: int = DEFAULT_METRICS_PORT, host: str = "0.0.0.0",
+                 registry: MetricsRegistry = REGISTRY):
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       name="metrics-exporter", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def start(self) -> "MetricsExporter":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_exporter: Optional[MetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def start_metrics_exporter(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[MetricsExporter]:
+    """
+    启动指标导出器（进程内只启动一次）
+
+    Args:
+        port: 监听端口，环境变量ANTENNA_METRICS_PORT优先，默认9464
+
+    Returns:
+        导出器实例，端口被占用时返回None
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            port = int(os.environ.get("ANTENNA_METRICS_PORT", port or DEFAULT_METRICS_PORT))
+            try:
+                _exporter = MetricsExporter(port, host).start()
+                logger.info(f"指标导出器已启动: http://{host}:{_exporter.port}/metrics")
+            except OSError as e:
+                logger.warning(f"指标导出器启动失败: {e}")
+                return None
+        return _exporter
@@ -31,6 +31,7 @@ from models.pattern_models import RadiationPattern, PatternStatistics
 from services.visualization_service import get_visualization_service
 from utils.config import AppConfig
 from utils.helpers import format_frequency, format_gain, format_percentage
+from utils.metrics import EXPORT_SECONDS, EXPORT_FAILURES, timed
 
 class ExportView:
     """导出视图类"""
@@ -263,6 +264,7 @@ class ExportView:
         
         return key_results
     
+    @timed(EXPORT_SECONDS, kind="data")
     def _export_data(self, export_options: Dict[str, bool], export_formats: List[str], 
                     export_name: str, compression: bool, compress_level: int,
                     include_metadata: bool):
@@ -317,6 +319,7 @@ class ExportView:
                 st.success(f"已导出 {len(export_files)} 个文件")
             
         except Exception as e:
+            EXPORT_FAILURES.inc(kind="data")
             st.error(f"导出失败: {e}")
             st.exception(e)
     
@@ -1064,6 +1067,7 @@ class ExportView:
         }
         return themes.get(theme, "plotly")
     
+    @timed(EXPORT_SECONDS, kind="charts")
     def _export_charts(self, charts: List[Dict[str, Any]], formats: List[str], 
                       prefix: str, width: int, height: int, dpi: int, theme: str,
                       include_title: bool, include_legend: bool, transparent_bg: bool,
@@ -1132,6 +1136,7 @@ class ExportView:
                 st.success(f"已导出 {len(export_files)} 个图表文件")
             
         except Exception as e:
+            EXPORT_FAILURES.inc(kind="charts")
             st.error(f"导出图表失败: {e}")
             st.exception(e)
     
@@ -1361,6 +1366,7 @@ class ExportView:
             else:
                 st.markdown(item)
     
+    @timed(EXPORT_SECONDS, kind="report")
     def _generate_report(self, report_type: str, report_formats: List[str],
                         title: str, author: str, date: datetime.date,
                         content_options: Dict[str, bool], page_size: str,
@@ -1396,6 +1402,7 @@ class ExportView:
             st.success("报告生成完成！")
             
         except Exception as e:
+            EXPORT_FAILURES.inc(kind="report")
             st.error(f"生成报告失败: {e}")
     
     def _generate_markdown_report(self, title: str, author: str, 
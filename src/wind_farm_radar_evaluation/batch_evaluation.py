@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+批量评估引擎
+无界面地并行评估风电场对雷达目标探测的影响，并按配置导出结果
+"""
+
+import csv
+import json
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from data_models import RadarParameters, RadarGeolocation, TargetParameters, CoordinateConverter
+
+logger = logging.getLogger(__name__)
+
+C = 299792458.0  # 光速 (m/s)
+K_BOLTZMANN = 1.380649e-23  # 玻尔兹曼常数 (J/K)
+T0 = 290.0  # 标准噪声温度 (K)
+
+MIN_RANGE_M = 500.0  # 评估区域最小地面距离 (m)
+RANGE_STEP_M = 100.0  # 密度为1时的距离采样间隔 (m)
+ALTITUDE_LEVELS = 5  # 密度为1时的高度层数
+AZIMUTH_MARGIN_BEAMS = 2.0  # 风电场方位扇区两侧扩展的波束宽度数
+ROTOR_SOLIDITY = 0.1  # 风轮扫掠面中叶片实际遮挡的比例
+
+
+@dataclass
+class TurbineSite:
+    """风机相对雷达的位置（地面距离与方位）"""
+    index: int
+    ground_range: float  # 地面距离 (m)
+    azimuth: float  # 方位角 (度，从北顺时针)
+    base_height: float  # 塔基相对雷达天线的高度 (m)
+
+
+@dataclass
+class ImpactModel:
+    """评估所需的雷达、风机与传播参数（可在进程间传递）"""
+    wavelength: float
+    radar_height: float
+    tx_power_w: float
+    antenna_gain: float  # 线性值
+    noise_power: float  # 接收机噪声功率 (W)
+    processing_gain: float  # 脉冲压缩与相干积累增益（线性值）
+    range_cell: float  # 判定同一分辨单元的距离门宽 (m)
+    beamwidth_azimuth: float
+    detection_threshold_db: float
+    multipath: bool
+    reflection_coeff: float
+    sea_level: float
+    hub_height: float
+    rotor_radius: float
+    tower_diameter: float
+    turbine_rcs: float  # 单台风机RCS (m²)
+    turbine_ranges: np.ndarray
+    turbine_azimuths: np.ndarray
+    turbine_heights: np.ndarray  # 轮毂相对雷达天线的高度 (m)
+
+    def received_snr(self, slant_range: np.ndarray, rcs: np.ndarray,
+                     propagation: np.ndarray) -> np.ndarray:
+        """雷达方程计算处理后信噪比（线性值）"""
+        power = (self.tx_power_w * self.antenna_gain ** 2 * self.wavelength ** 2 * rcs * propagation
+                 / ((4 * np.pi) ** 3 * slant_range ** 4))
+        return power * self.processing_gain / self.noise_power
+
+    def propagation_factor(self, ground_range: np.ndarray, target_height: np.ndarray) -> np.ndarray:
+        """海面双射线多径传播因子F⁴（双程），未启用多径时为1"""
+        if not self.multipath:
+            return np.ones(np.broadcast(ground_range, target_height).shape)
+        radar_h = max(self.radar_height - self.sea_level, 0.0)
+        target_h = np.maximum(target_height - self.sea_level, 0.0)
+        phase = 2 * np.pi * (2 * radar_h * target_h / ground_range) / self.wavelength + np.pi
+        factor_sq = 1 + self.reflection_coeff ** 2 + 2 * self.reflection_coeff * np.cos(phase)
+        return factor_sq ** 2
+
+
+def _wrap_deg(angle: np.ndarray) -> np.ndarray:
+    """角度差规整到[-180, 180)"""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def evaluate_points(model: ImpactModel, target_rcs_dbsm: float, rg: np.ndarray,
+                    az: np.ndarray, alt: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    评估目标位于(地面距离, 方位, 高度)时的探测情况，三个数组按NumPy规则广播
+
+    返回各点的无风电场信噪比、有风电场信干噪比、遮挡损耗以及
+    受遮挡/受杂波影响的风机计数，数组形状为广播后的形状。
+    """
+    height = alt - model.radar_height
+    shape = np.broadcast(rg, az, alt).shape
+
+    slant = np.sqrt(rg ** 2 + height ** 2)
+    rcs = 10 ** (target_rcs_dbsm / 10)
+    snr_clear = model.received_snr(slant, rcs, model.propagation_factor(rg, alt))
+    snr_clear = np.broadcast_to(snr_clear, shape)
+
+    shadow_loss_db = np.zeros(shape)
+    clutter = np.zeros(shape)
+    shadowed_by = np.zeros(shape, dtype=np.int32)
+    cluttered_by = np.zeros(shape, dtype=np.int32)
+
+    for k in range(len(model.turbine_ranges)):
+        turbine_range = model.turbine_ranges[k]
+        d_az = _wrap_deg(az - model.turbine_azimuths[k])
+
+        # 遮挡：目标在风机之后，且视线经过风机处时落在塔筒或风轮投影内
+        behind = (rg > turbine_range) & (np.abs(d_az) < 90.0)
+        cross_range = np.abs(turbine_range * np.sin(np.radians(d_az)))
+        # 视线在风机处相对塔基的高度
+        ray_height = height * (turbine_range / rg) - (model.turbine_heights[k] - model.hub_height)
+        rotor_offset = ray_height - model.hub_height
+        in_tower = (ray_height >= 0) & (rotor_offset < -model.rotor_radius)
+        in_rotor = np.abs(rotor_offset) <= model.rotor_radius
+        rotor_half_width = np.sqrt(np.maximum(model.rotor_radius ** 2 - rotor_offset ** 2, 0.0))
+        half_width = np.where(in_tower, model.tower_diameter / 2, np.where(in_rotor, rotor_half_width, 0.0))
+        # 视线从塔筒和风轮上方越过时不遮挡（half_width为0时cross_range也可能为0）
+        blocked = behind & (in_tower | in_rotor) & (cross_range <= half_width)
+        if blocked.any():
+            # 按第一菲涅尔区被遮挡的比例估算绕射后的损耗（最大约6dB）
+            d2 = np.maximum(rg - turbine_range, 1.0)
+            fresnel = np.sqrt(model.wavelength * turbine_range * d2 / (turbine_range + d2))
+            width = np.where(in_tower, model.tower_diameter, 2 * rotor_half_width * ROTOR_SOLIDITY)
+            fraction = np.minimum(width / (2 * fresnel), 1.0)
+            shadow_loss_db += np.where(blocked, -20 * np.log10(1 - fraction / 2), 0.0)
+            shadowed_by += blocked
+
+        # 杂波：风机与目标落入同一距离-方位分辨单元
+        same_cell = (np.abs(rg - turbine_range) <= model.range_cell / 2) & (np.abs(d_az) <= model.beamwidth_azimuth / 2)
+        if same_cell.any():
+            turbine_slant = math.hypot(turbine_range, model.turbine_heights[k])
+            turbine_cnr = model.received_snr(
+                turbine_slant, model.turbine_rcs,
+                model.propagation_factor(turbine_range, model.turbine_heights[k] + model.radar_height)
+            )
+            clutter += np.where(same_cell, turbine_cnr, 0.0)
+            cluttered_by += same_cell
+
+    sinr = snr_clear * 10 ** (-shadow_loss_db / 10) / (1 + clutter)
+    return {
+        "snr_clear_db": 10 * np.log10(snr_clear),
+        "sinr_db": 10 * np.log10(sinr),
+        "shadow_loss_db": shadow_loss_db,
+        "shadowed_by": shadowed_by,
+        "cluttered_by": cluttered_by,
+    }
+
+
+def evaluate_chunk(model: ImpactModel, target_rcs_dbsm: float, ground_ranges: np.ndarray,
+                   azimuths: np.ndarray, altitudes: np.ndarray) -> Dict[str, np.ndarray]:
+    """评估一块采样网格，结果数组形状为 (距离数, 方位数, 高度数)"""
+    return evaluate_points(
+        model, target_rcs_dbsm,
+        ground_ranges[:, None, None], azimuths[None, :, None], altitudes[None, None, :]
+    )
+
+
+def _evaluate_task(args: Tuple[ImpactModel, int, float, np.ndarray, np.ndarray, np.ndarray]):
+    """进程池任务入口"""
+    model, target_index, rcs_dbsm, ground_ranges, azimuths, altitudes = args
+    return target_index, ground_ranges[0], evaluate_chunk(model, rcs_dbsm, ground_ranges, azimuths, altitudes)
+
+
+def load_turbine_coordinates(wind_farm_config) -> List[Tuple[float, float, float]]:
+    """按数据源配置读取风机坐标 [(纬度, 经度, 海拔), ...]"""
+    data_source = wind_farm_config.data_source or {}
+    if data_source.get("type", "array") != "file":
+        return [tuple(float(v) for v in coord[:3]) for coord in wind_farm_config.turbine_coordinates]
+
+    file_path = Path(data_source.get("file_path", "data/turbine_coordinates.csv"))
+    file_format = data_source.get("file_format", "csv")
+    if file_format == "json":
+        with open(file_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    elif file_format == "csv":
+        with open(file_path, "r", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        raise ValueError(f"不支持的风机坐标文件格式: {file_format}")
+    return [
+        (float(row["latitude"]), float(row["longitude"]), float(row.get("altitude") or 0.0))
+        for row in rows
+    ]
+
+
+class BatchEvaluationEngine:
+    """
+    风电场-雷达影响批量评估引擎
+
+    对每个评估目标在风电场所在方位扇区内按距离×方位×高度网格采样，
+    分别计算无风电场与有风电场（风机遮挡、同分辨单元风机杂波）时的
+    检测情况。采样网格按距离分块后提交到进程池并行计算。
+    """
+
+    def __init__(self, radar: RadarParameters, geolocation: RadarGeolocation,
+                 turbine_common: Dict[str, Any], turbine_coordinates: List[Tuple[float, float, float]],
+                 simulation_config, max_workers: int = 1):
+        self.radar = radar
+        self.geolocation = geolocation
+        self.turbine_common = turbine_common or {}
+        self.turbine_coordinates = turbine_coordinates
+        self.simulation_config = simulation_config
+        self.max_workers = max(1, int(max_workers))
+        self.density = max(1.0, float((simulation_config.accuracy or {}).get("density", 1)))
+        self.sites = self._locate_turbines()
+        self.model = self._build_model()
+
+    @classmethod
+    def from_config_manager(cls, config_manager, radar: RadarParameters,
+                            geolocation: RadarGeolocation) -> "BatchEvaluationEngine":
+        """根据配置管理器创建引擎"""
+        wind_farm_config = config_manager.get_wind_farm_config()
+        parallel = config_manager.get_system_config().parallel or {}
+        max_workers = parallel.get("max_workers", os.cpu_count() or 1) if parallel.get("enable", True) else 1
+        return cls(
+            radar=radar,
+            geolocation=geolocation,
+            turbine_common=wind_farm_config.turbine_common,
+            turbine_coordinates=load_turbine_coordinates(wind_farm_config),
+            simulation_config=config_manager.get_simulation_config(),
+            max_workers=max_workers,
+        )
+
+    def _locate_turbines(self) -> List[TurbineSite]:
+        """将风机经纬度转换为相对雷达的地面距离与方位"""
+        sites = []
+        geo = self.geolocation
+        for index, (lat, lon, alt) in enumerate(self.turbine_coordinates):
+            east, north, _ = CoordinateConverter.wgs84_to_enu(geo.latitude, geo.longitude, geo.altitude, lat, lon, alt)
+            sites.append(TurbineSite(
+                index=index,
+                ground_range=math.hypot(east, north),
+                azimuth=math.degrees(math.atan2(east, north)) % 360.0,
+                base_height=alt - geo.altitude,
+            ))
+        return sites
+
+    def _turbine_rcs(self, wavelength: float) -> float:
+        """风机RCS：配置给定rcs(dBsm)时直接使用，否则按塔筒圆柱体侧向RCS估算"""
+        if "rcs" in self.turbine_common:
+            return 10 ** (float(self.turbine_common["rcs"]) / 10)
+        radius = self.turbine_common.get("tower_diameter", 8) / 2
+        height = self.turbine_common.get("height", 100)
+        return 2 * np.pi * radius * height ** 2 / wavelength
+
+    def _build_model(self) -> ImpactModel:
+        radar = self.radar
+        sim = self.simulation_config
+        multipath = sim.multipath or {}
+        wavelength = C / radar.frequency
+        noise_power = K_BOLTZMANN * T0 * radar.bandwidth * 10 ** (radar.noise_figure / 10)
+        processing_gain = max(1.0, radar.bandwidth * radar.pulse_width) * max(1, radar.pulses)
+        hub_height = self.turbine_common.get("height", 100)
+        return ImpactModel(
+            wavelength=wavelength,
+            radar_height=radar.radar_height,
+            tx_power_w=10 ** ((radar.tx_power - 30) / 10),
+            antenna_gain=10 ** (radar.antenna_gain / 10),
+            noise_power=noise_power,
+            processing_gain=processing_gain,
+            range_cell=max(C / (2 * radar.bandwidth), RANGE_STEP_M / self.density),
+            beamwidth_azimuth=radar.beamwidth_azimuth,
+            detection_threshold_db=(sim.signal_processing or {}).get("detection_threshold_db", 13.0),
+            multipath=bool(multipath.get("enable", False)),
+            reflection_coeff=multipath.get("reflection_coeff", 0.4),
+            sea_level=multipath.get("sea_level", 0.0),
+            hub_height=hub_height,
+            rotor_radius=self.turbine_common.get("rotor_diameter", 120) / 2,
+            tower_diameter=self.turbine_common.get("tower_diameter", 8),
+            turbine_rcs=self._turbine_rcs(wavelength),
+            turbine_ranges=np.array([s.ground_range for s in self.sites]),
+            turbine_azimuths=np.array([s.azimuth for s in self.sites]),
+            turbine_heights=np.array([s.base_height + hub_height for s in self.sites]),
+        )
+
+    def sample_bounds(self, target: TargetParameters) -> Tuple[Tuple[float, float], ...]:
+        """
+        目标的评估区域：至最远风机两倍距离、风电场方位扇区（展开后可能超出360度）、目标高度范围
+
+        返回:
+            ((最小距离, 最大距离), (起始方位, 终止方位), (最低高度, 最高高度))
+        """
+        margin = AZIMUTH_MARGIN_BEAMS * self.radar.beamwidth_azimuth
+        azimuths = np.array([s.azimuth for s in self.sites])
+        # 以第一台风机为参考展开方位，避免扇区跨越正北时出错
+        unwrapped = azimuths[0] + _wrap_deg(azimuths - azimuths[0])
+        max_range = 2 * max(s.ground_range for s in self.sites)
+        return (
+            (MIN_RANGE_M, max_range),
+            (float(unwrapped.min() - margin), float(unwrapped.max() + margin)),
+            tuple(target.altitude_range),
+        )
+
+    def sample_grid(self, target: TargetParameters) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """目标的规则采样网格（距离、方位、高度）"""
+        (range_low, range_high), (az_low, az_high), (alt_low, alt_high) = self.sample_bounds(target)
+        az_step = self.radar.beamwidth_azimuth / (2 * self.density)
+        azimuth_grid = np.arange(az_low, az_high + az_step / 2, az_step) % 360.0
+        range_grid = np.arange(range_low, range_high, RANGE_STEP_M / self.density)
+        altitude_grid = np.linspace(alt_low, alt_high, int(round(ALTITUDE_LEVELS * self.density)))
+        return range_grid, azimuth_grid, altitude_grid
+
+    def run(self, targets: List[TargetParameters]) -> List[Dict[str, Any]]:
+        """
+        并行评估全部目标
+
+        返回:
+            每个目标一项结果，含汇总指标(summary)与各采样点数组(samples)
+        """
+        if not self.sites:
+            logger.warning("风电场未配置风机，跳过评估")
+            return []
+
+        tasks = []
+        grids = []
+        for target_index, target in enumerate(targets):
+            range_grid, azimuth_grid, altitude_grid = self.sample_grid(target)
+            grids.append((range_grid, azimuth_grid, altitude_grid))
+            n_chunks = min(len(range_grid), self.max_workers * 4)
+            for chunk in np.array_split(range_grid, n_chunks):
+                tasks.append((self.model, target_index, target.rcs, chunk, azimuth_grid, altitude_grid))
+
+        logger.info(f"批量评估: {len(targets)} 个目标, {len(tasks)} 个任务, {self.max_workers} 个工作进程")
+        if self.max_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                outputs = list(pool.map(_evaluate_task, tasks))
+        else:
+            outputs = [_evaluate_task(task) for task in tasks]
+
+        chunks: Dict[int, List[Tuple[float, Dict[str, np.ndarray]]]] = {}
+        for target_index, first_range, result in outputs:
+            chunks.setdefault(target_index, []).append((first_range, result))
+
+        results = []
+        for target_index, target in enumerate(targets):
+            ordered = [result for _, result in sorted(chunks[target_index], key=lambda item: item[0])]
+            samples = {key: np.concatenate([part[key] for part in ordered]) for key in ordered[0]}
+            results.append({
+                "target": target,
+                "grid": grids[target_index],
+                "samples": samples,
+                "summary": self._summarize(target, samples),
+            })
+        return results
+
+    def _summarize(self, target: TargetParameters, samples: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """汇总单个目标的影响指标"""
+        threshold = self.model.detection_threshold_db
+        detected_clear = samples["snr_clear_db"] >= threshold
+        detected_farm = samples["sinr_db"] >= threshold
+        lost = detected_clear & ~detected_farm
+        loss_db = samples["snr_clear_db"] - samples["sinr_db"]
+        affected = loss_db > 1e-9
+        n_samples = detected_clear.size
+        return {
+            "target": target.name,
+            "target_type": target.target_type,
+            "samples": int(n_samples),
+            "detection_ratio_clear": float(detected_clear.mean()),
+            "detection_ratio_with_farm": float(detected_farm.mean()),
+            "lost_detection_ratio": float(lost.sum() / max(1, detected_clear.sum())),
+            "shadowed_ratio": float((samples["shadowed_by"] > 0).mean()),
+            "cluttered_ratio": float((samples["cluttered_by"] > 0).mean()),
+            "mean_loss_db": float(loss_db[affected].mean()) if affected.any() else 0.0,
+            "max_loss_db": float(loss_db.max()),
+            "turbines": len(self.sites),
+        }
+
+
+def export_results(results: List[Dict[str, Any]], export_config: Dict[str, Any],
+                   output_dir: Optional[str] = None) -> List[str]:
+    """
+    按reporting.data_export配置导出评估结果
+
+    参数:
+        results: BatchEvaluationEngine.run的返回值
+        export_config: 数据导出配置（enable、formats、include_raw_data、directory）
+        output_dir: 输出目录，默认取配置directory或results/data
+
+    返回:
+        已写出的文件路径列表
+    """
+    if not export_config.get("enable", True):
+        return []
+    written = export_table("impact_summary", [result["summary"] for result in results],
+                           export_config, output_dir)
+    if export_config.get("include_raw_data", False):
+        for index, result in enumerate(results):
+            written += export_table(f"impact_samples_{index:02d}", _sample_rows(result),
+                                    export_config, output_dir)
+
+    logger.info(f"评估结果已导出: {', '.join(written)}")
+    return written
+
+
+def export_table(name: str, rows: List[Dict[str, Any]], export_config: Dict[str, Any],
+                 output_dir: Optional[str] = None) -> List[str]:
+    """将行记录按data_export配置的每种格式写为 <输出目录>/<name>.<格式>"""
+    directory = Path(output_dir or export_config.get("directory", "results/data"))
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for fmt in export_config.get("formats", ["csv", "json"]):
+        fmt = fmt.lower()
+        if fmt not in ("csv", "json"):
+            logger.warning(f"不支持的导出格式: {fmt}")
+            continue
+        path = directory / f"{name}.{fmt}"
+        _write_rows(path, fmt, rows)
+        written.append(str(path))
+    return written
+
+
+def _sample_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """展开单个目标的采样点数组为行记录"""
+    range_grid, azimuth_grid, altitude_grid = result["grid"]
+    samples = result["samples"]
+    rg, az, alt = np.meshgrid(range_grid, azimuth_grid, altitude_grid, indexing="ij")
+    columns = {"ground_range_m": rg, "azimuth_deg": az, "altitude_m": alt, **samples}
+    flat = {name: values.ravel().tolist() for name, values in columns.items()}
+    return [dict(zip(flat, row)) for row in zip(*flat.values())]
+
+
+def _write_rows(path: Path, fmt: str, rows: List[Dict[str, Any]]):
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        return
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
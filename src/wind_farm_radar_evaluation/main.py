@@ -14,6 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config.configuration import get_config_manager
 from data_models import RadarParameters, RadarGeolocation, TargetParameters
+from batch_evaluation import BatchEvaluationEngine, export_results, export_table
+from monte_carlo import MonteCarloRunner
 
 def setup_logging(config: dict):
     """设置日志系统"""
@@ -125,16 +127,35 @@ def main():
         
         logging.info(f"加载了 {len(targets)} 个评估目标")
         
-        # 这里可以添加实际的评估逻辑
-        # 由于这是一个框架，我们只输出配置信息
         logging.info("系统初始化完成，准备开始评估...")
         
-        # 示例：输出配置摘要
-        wind_farm_config = config_manager.get_wind_farm_config()
-        logging.info(f"风电场配置: {len(wind_farm_config.turbine_coordinates)} 台风机")
+        # 创建批量评估引擎（工作进程数取 system.parallel.max_workers）
+        engine = BatchEvaluationEngine.from_config_manager(config_manager, radar_params, radar_geolocation)
+        logging.info(f"风电场配置: {len(engine.sites)} 台风机, 工作进程 {engine.max_workers} 个")
         
-        simulation_config = config_manager.get_simulation_config()
-        logging.info(f"仿真配置: 时长 {simulation_config.duration}s, 步长 {simulation_config.time_step}s")
+        results = engine.run(targets)
+        for result in results:
+            summary = result['summary']
+            logging.info(
+                f"{summary['target']}: 检测率 {summary['detection_ratio_clear']:.1%} -> "
+                f"{summary['detection_ratio_with_farm']:.1%}, 最大损耗 {summary['max_loss_db']:.1f} dB"
+            )
+        
+        # 蒙特卡洛评估（运行次数取 simulation.accuracy.monte_carlo_runs）
+        monte_carlo = MonteCarloRunner.from_config_manager(config_manager, engine)
+        mc_results = monte_carlo.run(targets)
+        for result in mc_results:
+            summary = result['summary']
+            logging.info(
+                f"{summary['target']}: 蒙特卡洛检测概率 {summary['pd_clear']:.1%} -> "
+                f"{summary['pd_with_farm']:.1%} ({summary['runs']} 次运行)"
+            )
+        
+        # 按 reporting.data_export 导出结果
+        export_config = config_manager.get_reporting_config().get('data_export', {})
+        export_results(results, export_config)
+        if export_config.get('enable', True) and mc_results:
+            export_table('monte_carlo_summary', [r['summary'] for r in mc_results], export_config)
         
         logging.info("评估完成！")
         return 0
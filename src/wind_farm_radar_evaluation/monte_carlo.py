@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+蒙特卡洛评估引擎
+以相互独立的随机数流并行执行多次随机抽样评估，用可合并的流式统计量汇总结果
+"""
+
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_evaluation import BatchEvaluationEngine, ImpactModel, evaluate_points
+from data_models import TargetParameters
+
+logger = logging.getLogger(__name__)
+
+SAMPLES_PER_RUN = 10000  # 密度为1时每次运行每个目标的抽样点数
+
+# dB量的直方图范围与分辨率，决定分位数精度
+DB_HISTOGRAM = (-100.0, 200.0, 3000)
+
+
+class StreamingStats:
+    """
+    可合并的流式统计量
+
+    均值与方差按Chan并行算法增量更新与合并，分位数由固定分箱直方图
+    （含下溢/上溢箱）给出，内存占用与样本数无关。两个统计量合并的结果
+    与把全部样本一次性输入相同（分位数精度为一个分箱宽度）。
+    """
+
+    def __init__(self, low: float = 0.0, high: float = 1.0, bins: int = 0):
+        """
+        参数:
+            low, high: 直方图范围
+            bins: 分箱数，0表示不统计分位数
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.edges = np.linspace(low, high, bins + 1) if bins else None
+        self.histogram = np.zeros(bins + 2, dtype=np.int64) if bins else None
+
+    def _empty_like(self) -> "StreamingStats":
+        other = StreamingStats()
+        if self.edges is not None:
+            other.edges = self.edges
+            other.histogram = np.zeros_like(self.histogram)
+        return other
+
+    def update(self, values: np.ndarray):
+        """加入一批样本"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        batch = self._empty_like()
+        batch.count = values.size
+        batch.mean = float(values.mean())
+        batch.m2 = float(np.square(values - batch.mean).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        if batch.histogram is not None:
+            # 下标0为下溢箱，末位为上溢箱
+            indices = np.searchsorted(self.edges, values, side="right")
+            indices[values == self.edges[-1]] = len(self.edges) - 1
+            batch.histogram += np.bincount(indices, minlength=len(batch.histogram))
+        self.merge(batch)
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """合并另一个统计量（原地修改并返回自身）"""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self.histogram is not None:
+            self.histogram += other.histogram
+        return self
+
+    @property
+    def variance(self) -> float:
+        """样本方差"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> float:
+        """由直方图线性插值估计分位数"""
+        if self.histogram is None:
+            raise ValueError("未启用直方图，无法计算分位数")
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        cumulative = np.cumsum(self.histogram)
+        index = int(np.searchsorted(cumulative, rank, side="left"))
+        index = min(index, len(self.histogram) - 1)
+        if index == 0:
+            return self.min
+        if index == len(self.histogram) - 1:
+            return self.max
+        below = cumulative[index - 1]
+        fraction = (rank - below) / self.histogram[index] if self.histogram[index] else 0.0
+        low, high = self.edges[index - 1], self.edges[index]
+        return float(min(max(low + fraction * (high - low), self.min), self.max))
+
+    def summary(self, prefix: str, quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict[str, float]:
+        """导出为扁平字典"""
+        result = {
+            f"{prefix}_mean": self.mean,
+            f"{prefix}_std": self.std,
+        }
+        if self.histogram is not None:
+            result[f"{prefix}_min"] = self.min
+            for q in quantiles:
+                result[f"{prefix}_p{int(round(q * 100)):02d}"] = self.quantile(q)
+            result[f"{prefix}_max"] = self.max
+        return result
+
+
+def _new_accumulators() -> Dict[str, StreamingStats]:
+    return {
+        "detected_clear": StreamingStats(),
+        "detected_with_farm": StreamingStats(),
+        "snr_clear_db": StreamingStats(*DB_HISTOGRAM),
+        "sinr_db": StreamingStats(*DB_HISTOGRAM),
+        "loss_db": StreamingStats(*DB_HISTOGRAM),
+    }
+
+
+def _run_once(args: Tuple[ImpactModel, List[Tuple[float, Tuple[Tuple[float, float], ...]]], int,
+                          np.random.SeedSequence]) -> List[Dict[str, StreamingStats]]:
+    """
+    单次蒙特卡洛运行（进程池任务入口）
+
+    每个目标在评估区域内均匀抽取位置，目标RCS按Swerling I模型（指数分布）起伏。
+    """
+    model, targets, samples, seed_sequence = args
+    rng = np.random.default_rng(seed_sequence)
+    threshold = model.detection_threshold_db
+    accumulators = []
+    for rcs_dbsm, ((range_low, range_high), (az_low, az_high), (alt_low, alt_high)) in targets:
+        rg = rng.uniform(range_low, range_high, samples)
+        az = rng.uniform(az_low, az_high, samples) % 360.0
+        alt = rng.uniform(alt_low, alt_high, samples)
+        fluctuation_db = 10 * np.log10(rng.exponential(1.0, samples))
+
+        result = evaluate_points(model, rcs_dbsm, rg, az, alt)
+        snr_clear = result["snr_clear_db"] + fluctuation_db
+        sinr = result["sinr_db"] + fluctuation_db
+
+        stats = _new_accumulators()
+        stats["detected_clear"].update(snr_clear >= threshold)
+        stats["detected_with_farm"].update(sinr >= threshold)
+        stats["snr_clear_db"].update(snr_clear)
+        stats["sinr_db"].update(sinr)
+        stats["loss_db"].update(snr_clear - sinr)
+        accumulators.append(stats)
+    return accumulators
+
+
+class MonteCarloRunner:
+    """
+    风电场影响蒙特卡洛评估
+
+    由根SeedSequence为每次运行派生独立的子序列，运行与种子一一对应，
+    结果只取决于根种子与运行次数（同一实例重复调用run()结果相同），与工作进程数和调度顺序无关。每次运行
+    只返回固定大小的流式统计量，父进程按运行序号依次合并。
+    """
+
+    def __init__(self, engine: BatchEvaluationEngine, runs: int,
+                 samples_per_run: Optional[int] = None, seed: Optional[int] = None,
+                 max_workers: Optional[int] = None):
+        """
+        参数:
+            engine: 批量评估引擎（提供影响模型与评估区域）
+            runs: 运行次数
+            samples_per_run: 每次运行每个目标的抽样点数，默认按仿真密度确定
+            seed: 根种子，None时取系统熵并记录到日志以便复现
+            max_workers: 工作进程数，默认与引擎相同
+        """
+        self.engine = engine
+        self.runs = max(1, int(runs))
+        self.samples_per_run = int(samples_per_run or SAMPLES_PER_RUN * engine.density)
+        # 只保存根种子熵：SeedSequence.spawn会推进序列状态，每次run()从新的根序列派生
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self.max_workers = max(1, int(max_workers or engine.max_workers))
+
+    @classmethod
+    def from_config_manager(cls, config_manager, engine: BatchEvaluationEngine) -> "MonteCarloRunner":
+        """按 simulation.accuracy 配置创建（monte_carlo_runs、可选的 seed 与 monte_carlo_samples）"""
+        accuracy = config_manager.get_simulation_config().accuracy or {}
+        return cls(
+            engine,
+            runs=accuracy.get("monte_carlo_runs", 1),
+            samples_per_run=accuracy.get("monte_carlo_samples"),
+            seed=accuracy.get("seed"),
+        )
+
+    def run(self, targets: List[TargetParameters]) -> List[Dict[str, Any]]:
+        """
+        执行全部运行
+
+        返回:
+            每个目标一项结果，含合并后的统计量(stats)与汇总指标(summary)
+        """
+        if not self.engine.sites or not targets:
+            return []
+
+        target_specs = [(target.rcs, self.engine.sample_bounds(target)) for target in targets]
+        tasks = [
+            (self.engine.model, target_specs, self.samples_per_run, child)
+            for child in np.random.SeedSequence(self.entropy).spawn(self.runs)
+        ]
+        logger.info(
+            f"蒙特卡洛评估: {self.runs} 次运行 × {self.samples_per_run} 点, "
+            f"{self.max_workers} 个工作进程, 根种子熵 {self.entropy}"
+        )
+
+        merged = [_new_accumulators() for _ in targets]
+        if self.max_workers > 1 and self.runs > 1:
+            chunksize = max(1, self.runs // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                # map按提交顺序返回，保证合并顺序固定
+                for run_result in pool.map(_run_once, tasks, chunksize=chunksize):
+                    self._merge(merged, run_result)
+        else:
+            for task in tasks:
+                self._merge(merged, _run_once(task))
+
+        return [
+            {"target": target, "stats": stats, "summary": self._summarize(target, stats)}
+            for target, stats in zip(targets, merged)
+        ]
+
+    @staticmethod
+    def _merge(merged: List[Dict[str, StreamingStats]], run_result: List[Dict[str, StreamingStats]]):
+        for total, part in zip(merged, run_result):
+            for key, stats in part.items():
+                total[key].merge(stats)
+
+    def _summarize(self, target: TargetParameters, stats: Dict[str, StreamingStats]) -> Dict[str, Any]:
+        """汇总单个目标：检测概率及其标准误差、信噪比与损耗的均值/标准差/分位数"""
+        detected_clear = stats["detected_clear"]
+        detected_farm = stats["detected_with_farm"]
+        summary = {
+            "target": target.name,
+            "target_type": target.target_type,
+            "runs": self.runs,
+            "samples": detected_clear.count,
+            "pd_clear": detected_clear.mean,
+            "pd_clear_stderr": detected_clear.std / math.sqrt(max(1, detected_clear.count)),
+            "pd_with_farm": detected_farm.mean,
+            "pd_with_farm_stderr": detected_farm.std / math.sqrt(max(1, detected_farm.count)),
+        }
+        for key in ("snr_clear_db", "sinr_db", "loss_db"):
+            summary.update(stats[key].summary(key))
+        return summary
@@ -4,13 +4,20 @@
 """
 
 import pytest
-from wind_farm_radar_evaluation.main import main
+from wind_farm_radar_evaluation.main import main, get_config_manager
 
-def test_main_function():
+def test_main_function(tmp_path, monkeypatch):
     """测试主函数"""
+    # 导出结果与日志写到临时目录，不写入工作区
+    config = get_config_manager("conf/config.yaml").config
+    monkeypatch.setitem(config['reporting']['data_export'], 'directory', str(tmp_path / "data"))
+    monkeypatch.setitem(config['system']['logging'], 'file', str(tmp_path / "system.log"))
+    
     # 主函数应该能够正常运行（即使只是加载配置）
     result = main()
     assert result in [0, 1]  # 返回码应该是0或1
+    if result == 0:
+        assert (tmp_path / "data" / "impact_summary.json").exists()
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+批量评估引擎测试
+"""
+
+import csv
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from wind_farm_radar_evaluation.batch_evaluation import BatchEvaluationEngine, evaluate_points, export_results
+from wind_farm_radar_evaluation.config.configuration import SimulationConfig
+from wind_farm_radar_evaluation.data_models import RadarParameters, RadarGeolocation, TargetParameters
+
+
+def make_engine(max_workers):
+    """创建测试用评估引擎：雷达以东约5km处两台风机"""
+    radar = RadarParameters(
+        name="测试雷达", frequency=9.4e9, bandwidth=10e6, pulse_width=50e-6, tx_power=40,
+        pulses=512, prp=1e-3, fs=20e6, noise_figure=6, rf_gain=30, baseband_gain=50,
+        radar_height=50
+    )
+    geolocation = RadarGeolocation(latitude=36.5, longitude=120.5, altitude=50, heading=90)
+    simulation = SimulationConfig(
+        duration=600, time_step=10.0,
+        multipath={"enable": True, "reflection_coeff": 0.4, "sea_level": 0.0},
+        signal_processing={"detection_threshold_db": 20},
+        accuracy={"density": 1}
+    )
+    turbine_common = {"height": 100, "rotor_diameter": 120, "tower_diameter": 8}
+    return BatchEvaluationEngine(
+        radar, geolocation, turbine_common,
+        [(36.5, 120.556, 0), (36.505, 120.56, 0)],
+        simulation, max_workers=max_workers
+    )
+
+
+def make_target():
+    return TargetParameters(
+        name="低空目标", target_type="airborne", rcs=0.0,
+        speed_range=(50, 100), altitude_range=(20, 200), operational_profile={}
+    )
+
+
+def test_parallel_matches_serial():
+    """测试进程池并行评估与串行结果一致"""
+    serial = make_engine(1).run([make_target()])[0]
+    parallel = make_engine(3).run([make_target()])[0]
+
+    for key, values in serial["samples"].items():
+        np.testing.assert_array_equal(values, parallel["samples"][key])
+    assert serial["summary"] == parallel["summary"]
+
+
+def test_turbines_shadow_and_clutter_targets():
+    """测试风机后方出现遮挡损耗、风机所在分辨单元出现杂波"""
+    engine = make_engine(1)
+    result = engine.run([make_target()])[0]
+    samples = result["samples"]
+    range_grid, azimuth_grid, _ = result["grid"]
+
+    site = engine.sites[0]
+    az_index = np.argmin(np.abs(azimuth_grid - site.azimuth))
+    in_front = range_grid < site.ground_range - 200
+    assert not samples["shadowed_by"][in_front, az_index].any()
+    assert samples["shadow_loss_db"][~in_front, az_index].max() > 0
+    assert samples["cluttered_by"].any()
+    assert np.all(samples["sinr_db"] <= samples["snr_clear_db"] + 1e-9)
+
+    summary = result["summary"]
+    assert summary["detection_ratio_with_farm"] <= summary["detection_ratio_clear"]
+    assert summary["turbines"] == 2
+
+
+def test_target_above_rotor_is_not_shadowed():
+    """测试风机正后方、远高于风轮的目标不受遮挡"""
+    engine = make_engine(1)
+    site = engine.sites[0]
+    rg = site.ground_range + np.array([1000.0, 5000.0, 10000.0])
+
+    high = evaluate_points(engine.model, 0.0, rg, np.full(3, site.azimuth), np.full(3, 5000.0))
+    assert not high["shadowed_by"].any()
+    np.testing.assert_array_equal(high["shadow_loss_db"], 0.0)
+
+    low = evaluate_points(engine.model, 0.0, rg, np.full(3, site.azimuth), np.full(3, 60.0))
+    assert low["shadowed_by"].all()
+    assert np.all(low["shadow_loss_db"] > 0)
+
+
+def test_export_writes_configured_formats():
+    """测试按data_export配置导出汇总与原始采样数据"""
+    results = make_engine(1).run([make_target()])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        written = export_results(
+            results, {"enable": True, "formats": ["csv", "json"], "include_raw_data": True}, tmp_dir
+        )
+        assert sorted(Path(p).name for p in written) == [
+            "impact_samples_00.csv", "impact_samples_00.json", "impact_summary.csv", "impact_summary.json"
+        ]
+        with open(Path(tmp_dir) / "impact_summary.json", encoding="utf-8") as f:
+            assert json.load(f)[0]["target"] == "低空目标"
+        with open(Path(tmp_dir) / "impact_samples_00.csv", encoding="utf-8") as f:
+            assert sum(1 for _ in csv.DictReader(f)) == results[0]["samples"]["sinr_db"].size
+
+        assert export_results(results, {"enable": False}, tmp_dir) == []
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+CFAR处理器测试
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+from scipy.signal import convolve
+
+from radar_factory_app.services.cfar_processor import CFARProcessor
+
+
+def ca_window_1d(guard, trailing):
+    """CA-CFAR一维归一化窗（卷积参考实现）"""
+    win = np.ones((guard + trailing) * 2 + 1)
+    win[trailing:trailing + guard * 2 + 1] = 0
+    return win / win.sum()
+
+
+def test_ca_1d_matches_convolution_reference():
+    """测试前缀和实现与逐列卷积结果一致（含零填充边缘）"""
+    data = np.random.default_rng(0).exponential(1.0, (200, 16))
+    processor = CFARProcessor("squarelaw")
+
+    for guard, trailing in [(0, 1), (2, 8), (3, 40)]:
+        win = ca_window_1d(guard, trailing)
+        expected = np.stack([convolve(data[:, i], win, mode="same") for i in range(data.shape[1])], axis=1)
+        np.testing.assert_allclose(processor.cfar_ca_1d(data, guard, trailing, offset=1.0), expected, atol=1e-12)
+        np.testing.assert_allclose(
+            processor.cfar_ca_1d(data.T, guard, trailing, offset=1.0, axis=1), expected.T, atol=1e-12
+        )
+
+    with pytest.raises(ValueError):
+        processor.cfar_ca_1d(data, 2, 0)
+
+
+def test_ca_2d_matches_convolution_and_batches_frames():
+    """测试积分图实现与二维卷积一致，且堆叠多帧一次计算与逐帧计算一致"""
+    frames = np.random.default_rng(1).exponential(1.0, (3, 64, 48))
+    processor = CFARProcessor("squarelaw")
+    guard, trailing = [1, 2], [4, 6]
+
+    win = np.ones((2 * (np.array(guard) + trailing) + 1))
+    win[trailing[0]:trailing[0] + 2 * guard[0] + 1, trailing[1]:trailing[1] + 2 * guard[1] + 1] = 0
+    expected = convolve(frames[0], win / win.sum(), mode="same")
+    np.testing.assert_allclose(processor.cfar_ca_2d(frames[0], guard, trailing, offset=1.0), expected, atol=1e-12)
+
+    batched = processor.cfar_ca_2d(frames, guard, trailing, pfa=1e-6)
+    assert batched.shape == frames.shape
+    for frame, threshold in zip(frames, batched):
+        np.testing.assert_allclose(processor.cfar_ca_2d(frame, guard, trailing, pfa=1e-6), threshold)
+
+
+def brute_force_halves_2d(data, guard, trailing):
+    """逐单元求参考区前后两半的均值（零填充边缘，沿最后一维按中心对称划分）"""
+    span = np.array(guard) + trailing
+    padded = np.pad(data, [(span[0], span[0]), (span[1], span[1])])
+    rows, cols = np.mgrid[-span[0]:span[0] + 1, -span[1]:span[1] + 1]
+    ring = (np.abs(rows) > guard[0]) | (np.abs(cols) > guard[1])
+    leading = ring & ((cols < 0) | ((cols == 0) & (rows < 0)))
+    lagging = ring & ~leading
+    result = np.zeros(data.shape + (2,))
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            window = padded[i:i + 2 * span[0] + 1, j:j + 2 * span[1] + 1]
+            result[i, j] = window[leading].mean(), window[lagging].mean()
+    return result
+
+
+def test_go_so_match_brute_force_and_bracket_ca():
+    """测试GO/SO噪声估计与逐单元参考实现一致，且SO ≤ CA ≤ GO"""
+    data = np.random.default_rng(2).exponential(1.0, (40, 30))
+    data[:, 15:] *= 100.0  # 杂波边缘
+    processor = CFARProcessor("squarelaw")
+
+    win = 6
+    padded = np.pad(data, [(0, 0), (win + 1, win + 1)])
+    leading = np.stack([padded[:, j:j + win].mean(axis=1) for j in range(data.shape[1])], axis=1)
+    lagging = np.stack([padded[:, j + win + 3:j + 2 * win + 3].mean(axis=1) for j in range(data.shape[1])], axis=1)
+    np.testing.assert_allclose(processor.cfar_go_1d(data, 1, win, axis=1, offset=1.0), np.maximum(leading, lagging))
+    np.testing.assert_allclose(processor.cfar_so_1d(data, 1, win, axis=1, offset=1.0), np.minimum(leading, lagging))
+
+    guard, trailing = [1, 2], [2, 3]
+    halves = brute_force_halves_2d(data, guard, trailing)
+    go = processor.cfar_go_2d(data, guard, trailing, offset=1.0)
+    so = processor.cfar_so_2d(data, guard, trailing, offset=1.0)
+    np.testing.assert_allclose(go, halves.max(axis=-1))
+    np.testing.assert_allclose(so, halves.min(axis=-1))
+    ca = processor.cfar_ca_2d(data, guard, trailing, offset=1.0)
+    assert np.all(so <= ca + 1e-12) and np.all(ca <= go + 1e-12)
+
+
+def test_go_so_threshold_factor_gives_design_pfa():
+    """测试GO/SO门限因子在均匀噪声下的虚警率接近设计值"""
+    noise = np.random.default_rng(3).exponential(1.0, (400, 2000))
+    processor = CFARProcessor("squarelaw")
+    pfa = 1e-3
+
+    for cfar_type in ("go", "so"):
+        threshold = processor.cfar_1d(noise, 2, 8, pfa, axis=1, cfar_type=cfar_type)
+        interior = (noise > threshold)[:, 10:-10]
+        assert abs(interior.mean() - pfa) < 0.2 * pfa
+
+    with pytest.raises(ValueError):
+        processor.cfar_1d(noise, 2, 8, pfa, cfar_type="xx")
+
+
+def test_os_threshold_factor_gives_design_pfa():
+    """测试OS门限因子（排序秩从0开始）在均匀噪声下的虚警率接近设计值"""
+    noise = np.random.default_rng(6).exponential(1.0, (400, 2000))
+    processor = CFARProcessor("squarelaw")
+    pfa = 1e-3
+
+    threshold = processor.cfar_os_1d(noise, 2, 8, k=12, pfa=pfa, axis=1)
+    interior = (noise > threshold)[:, 10:-10]
+    assert abs(interior.mean() - pfa) < 0.2 * pfa
+
+
+def test_adaptive_detection_window_geometry():
+    """测试自适应检测默认沿第0维做1-D CFAR，显式开启window_2d时各类CFAR使用2-D参考区"""
+    data = np.random.default_rng(4).exponential(1.0, (40, 30))
+    data[:, 15:] *= 100.0
+    data[20, 10] = 1e4
+    processor = CFARProcessor("squarelaw")
+
+    methods_2d = {
+        "ca": processor.cfar_ca_2d,
+        "go": processor.cfar_go_2d,
+        "so": processor.cfar_so_2d,
+        "os": processor.cfar_os_2d,
+    }
+    for cfar_type, method_2d in methods_2d.items():
+        _, threshold, _ = processor.adaptive_cfar_detection(
+            data, guard=1, trailing=4, pfa=1e-4, cfar_type=cfar_type.upper()
+        )
+        np.testing.assert_allclose(threshold, processor.cfar_1d(data, 1, 4, 1e-4, axis=0, cfar_type=cfar_type))
+
+        detections, threshold, stats = processor.adaptive_cfar_detection(
+            data, guard=1, trailing=4, pfa=1e-4, cfar_type=cfar_type.upper(), window_2d=True
+        )
+        np.testing.assert_allclose(threshold, method_2d(data, 1, 4, pfa=1e-4))
+        np.testing.assert_array_equal(detections, data > threshold)
+        assert detections[20, 10]
+
+    _, threshold, _ = processor.adaptive_cfar_detection(data, guard=1, trailing=4, pfa=1e-4)
+    np.testing.assert_allclose(threshold, processor.cfar_ca_1d(data, 1, 4, 1e-4))
+
+
+def test_go_threshold_solver_does_not_warn():
+    """测试GO-CFAR门限求解在大门限处不产生log1p无效值警告"""
+    from radar_factory_app.services.cfar_processor import go_so_thresholds
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        factors = go_so_thresholds("go", np.arange(1, 80), 1e-6)
+    assert np.all(np.isfinite(factors))
+
+
+def test_threshold_table_memoizes_and_persists(tmp_path, monkeypatch):
+    """测试门限因子表：批量求解与逐个求解一致，命中缓存不再求解，磁盘表可跨实例复用"""
+    from radar_factory_app.services import cfar_processor
+
+    path = tmp_path / "thresholds.json"
+    processor = CFARProcessor("linear", threshold_table=cfar_processor.ThresholdTable(path))
+    pfas = np.array([1e-6, 1e-5, 1e-4])
+
+    batch = processor.calculate_threshold_factors(16, pfas[:, np.newaxis], "os", k=np.array([10, 12]))
+    assert batch.shape == (3, 2)
+    assert batch[0, 1] == pytest.approx(np.sqrt(cfar_processor.os_thresholds(12, 16, 1e-6)))
+    go = processor.calculate_threshold_factors([8, 20], 1e-6, "go")
+    assert len(processor.threshold_table) == 8
+
+    solved = []
+    monkeypatch.setattr(cfar_processor, "solve_threshold_factors",
+                        lambda keys: solved.append(keys) or np.zeros(len(keys)))
+    assert processor.calculate_threshold_factor(20, 1e-6, "go") == go[1]
+    assert solved == []
+
+    reloaded = CFARProcessor("linear", threshold_table=cfar_processor.ThresholdTable(path))
+    np.testing.assert_array_equal(
+        reloaded.calculate_threshold_factors(16, pfas[:, np.newaxis], "os", k=np.array([10, 12])), batch
+    )
+    assert solved == []
+    assert reloaded.calculate_threshold_factor(20, 1e-6, "so") == 0.0
+    assert len(solved) == 1
+
+
+def test_os_default_rank_fits_small_window():
+    """测试参考窗很小时默认OS排序秩不超出窗长，且非法秩报ValueError"""
+    data = np.random.default_rng(4).exponential(1.0, (64, 8))
+    processor = CFARProcessor("squarelaw")
+
+    threshold = processor.cfar_os_1d(data, 1, 1, pfa=1e-3)
+    padded = np.concatenate([data[-2:], data, data[:2]])
+    expected = np.maximum(padded[:-4], padded[4:])  # 两个参考单元中的较大者（k = N-1）
+    offset = processor.calculate_threshold_factor(2, 1e-3, "os", 1)
+    np.testing.assert_allclose(threshold, offset * expected)
+    np.testing.assert_allclose(processor.cfar_1d(data, 1, 1, 1e-3, cfar_type="os"), threshold)
+
+    for k in (-1, 2):
+        with pytest.raises(ValueError):
+            processor.cfar_os_1d(data, 1, 1, k=k, pfa=1e-3)
+    with pytest.raises(ValueError):
+        processor.cfar_os_2d(data, 1, [1, 2], k=40)
+
+
+def test_os_2d_matches_sorted_training_ring():
+    """测试2-D OS-CFAR与逐单元排序环形参考区（循环取边缘单元）的结果一致，并支持批次维"""
+    data = np.random.default_rng(5).exponential(1.0, (2, 12, 9))
+    processor = CFARProcessor("squarelaw")
+    guard, trailing, k = (1, 1), (2, 1), 20
+
+    window = np.ones((7, 5), dtype=bool)
+    window[2:5, 1:4] = False
+    expected = np.empty(data.shape)
+    for b, i, j in np.ndindex(*data.shape):
+        rows = np.arange(i - 3, i + 4) % data.shape[1]
+        cols = np.arange(j - 2, j + 3) % data.shape[2]
+        expected[b, i, j] = np.sort(data[b][np.ix_(rows, cols)][window])[k]
+
+    threshold = processor.cfar_os_2d(data, guard, trailing, k=k, pfa=1e-3)
+    offset = processor.calculate_threshold_factor(int(window.sum()), 1e-3, "os", k)
+    np.testing.assert_allclose(threshold, offset * expected)
+
+
+def test_os_threshold_without_root_is_reported():
+    """测试OS-CFAR门限无解时报错或警告，而不是以nan门限静默漏检"""
+    from radar_factory_app.services import cfar_processor
+
+    processor = CFARProcessor("squarelaw", threshold_table=cfar_processor.ThresholdTable())
+    with pytest.warns(UserWarning), pytest.raises(ValueError):
+        processor.cfar_os_1d(np.ones(32), 1, 4, k=7, pfa=0.5)
+    with pytest.warns(UserWarning):
+        factors = processor.calculate_threshold_factors(8, np.array([1e-6, 0.4]), "os", k=7)
+    assert np.isfinite(factors[0]) and np.isnan(factors[1])
+
+
+def test_os_threshold_factor_defaults_rank():
+    """测试未指定排序秩时门限因子使用与OS-CFAR检测相同的默认排序秩"""
+    from radar_factory_app.services import cfar_processor
+
+    processor = CFARProcessor("squarelaw", threshold_table=cfar_processor.ThresholdTable())
+    factor = processor.calculate_threshold_factor(16, 1e-4, "os")
+    assert factor == processor.calculate_threshold_factor(16, 1e-4, "os", k=12)
+
+    factors = processor.calculate_threshold_factors(np.array([4, 16]), 1e-4, "os")
+    assert np.all(np.isfinite(factors))
+    assert factors[1] == factor
+    assert factors[0] == processor.calculate_threshold_factor(4, 1e-4, "os", k=3)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+历史数据环形缓冲区测试
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from digital_rf_battlefield_web.backend.history_buffer import ColumnarRingBuffer, SimulationHistory
+
+COLUMNS = {"timestamp": float, "target_id": object, "position.latitude": float}
+
+
+def make_record(i):
+    """第i条记录，每7条缺少一次位置"""
+    return {
+        "timestamp": float(i),
+        "target_id": f"target_{i % 3}",
+        "position": {"latitude": None if i % 7 == 0 else 30.0 + i},
+    }
+
+
+def test_spilled_history_reads_back_unchanged(tmp_path):
+    """测试超出内存容量的记录落盘后按行号、切片和列读取均与写入一致"""
+    buffer = ColumnarRingBuffer("detections", COLUMNS, str(tmp_path), capacity=16, block_size=4)
+    expected = [make_record(i) for i in range(50)]
+    for record in expected:
+        buffer.append(record)
+
+    assert len(buffer) == 50
+    assert buffer.spilled_rows == 48
+    assert len(os.listdir(tmp_path)) == 12
+
+    assert buffer.records() == expected
+    assert buffer[5] == expected[5]
+    assert buffer[-1] == expected[-1]
+    assert buffer[10:30:3] == expected[10:30:3]
+    assert buffer.tail(3) == expected[-3:]
+    with pytest.raises(IndexError):
+        buffer[50]
+
+    columns = buffer.read(2, 40)
+    np.testing.assert_array_equal(columns["timestamp"], np.arange(2, 40, dtype=float))
+    np.testing.assert_array_equal(columns["position.latitude"].mask, np.arange(2, 40) % 7 == 0)
+    assert columns["target_id"].tolist() == [f"target_{i % 3}" for i in range(2, 40)]
+
+
+def test_simulation_history_removes_spill_dir_on_close():
+    """测试自建落盘目录在close()后删除，重复调用不报错"""
+    history = SimulationHistory({"detections": COLUMNS}, capacity=8)
+    for i in range(20):
+        history["detections"].append(make_record(i))
+    assert os.path.isdir(history.spill_dir)
+
+    history.close()
+    history.close()
+    assert not os.path.exists(history.spill_dir)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+检测概率查找表测试
+"""
+
+import os
+
+import numpy as np
+import pytest
+from radarsimpy.tools import roc_pd
+
+from radar_factory_app.services import pd_table
+from radar_factory_app.services.pd_table import PdTable
+
+
+@pytest.mark.parametrize("stype", ["Swerling 0", "Swerling 1", "Swerling 3", "Coherent"])
+@pytest.mark.parametrize("npulses", [1, 8])
+def test_lookup_matches_roc_pd(tmp_path, monkeypatch, stype, npulses):
+    monkeypatch.setenv("RADAR_FACTORY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(pd_table, "_ROC_PD_TABLE", None)
+    pfa = np.array([1e-8, 1e-6, 3e-4])
+    snr_db = np.linspace(-20, 30, 37)
+
+    expected = roc_pd(pfa, snr_db, npulses, stype)
+    actual = pd_table.roc_pd_lookup(pfa[:, np.newaxis], snr_db[np.newaxis, :], npulses, stype)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, atol=5e-3)
+
+
+def test_table_is_persisted_and_reloaded(tmp_path):
+    calls = []
+
+    def pd_func(pfa, snr_db, npulses, model):
+        calls.append((npulses, model))
+        return roc_pd(pfa, snr_db, npulses, model)
+
+    table = PdTable(pd_func, "roc_pd", snr_step_db=0.5, log10_pfa_step=0.5, cache_dir=str(tmp_path))
+    first = table.lookup(10.0, 1e-6, 4, "Swerling 1")
+    assert len(os.listdir(tmp_path)) == 1
+
+    reloaded = PdTable(pd_func, "roc_pd", snr_step_db=0.5, log10_pfa_step=0.5, cache_dir=str(tmp_path))
+    assert reloaded.lookup(10.0, 1e-6, 4, "Swerling 1") == first
+    assert calls == [(4, "Swerling 1")]
+
+
+def test_non_positive_pfa_does_not_produce_nan(tmp_path):
+    table = PdTable(roc_pd, "roc_pd", snr_step_db=0.5, log10_pfa_step=0.5, cache_dir=str(tmp_path))
+    pd = table.lookup(np.array([0.0, 10.0]), np.array([0.0, -1.0]))
+    assert np.all(np.isfinite(pd))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+雷达台站数据库测试
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from radar_factory_app.radar_station_manager import (
+    RadarStationDatabase, RadarStation, BasicInfo, Location, RadarParameters,
+    PerformanceMetrics, Capability, Connectivity
+)
+
+
+def make_station(station_id, country, radar_type, lat, lon):
+    """创建测试用雷达台站"""
+    return RadarStation(
+        station_id=station_id,
+        basic_info=BasicInfo(name=station_id, radar_type=radar_type, country=country),
+        location=Location(latitude=lat, longitude=lon, altitude=0.0),
+        radar_params=RadarParameters(),
+        performance=PerformanceMetrics(
+            range_resolution_m=1.5,
+            max_unambiguous_range_m=20000,
+            velocity_resolution_mps=0.5,
+            max_unambiguous_velocity_mps=50,
+            snr_db=15
+        ),
+        capability=Capability(detection_range_km=100, track_targets=50, update_rate_hz=1.0),
+        connectivity=Connectivity()
+    )
+
+
+@pytest.fixture
+def db_file():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield str(Path(tmp_dir) / "stations.yaml")
+
+
+def test_mutations_update_store_without_rewriting_yaml(db_file):
+    """测试增删只写数据库记录而不重写YAML，重新打开后状态一致，导出的YAML可被重新导入"""
+    db = RadarStationDatabase(db_file)
+    assert db.add_radar_station(make_station("R1", "中国", "预警雷达", 30.0, 120.0))
+    assert db.add_radar_station(make_station("R2", "中国", "火控雷达", 30.5, 120.5))
+    assert db.add_radar_station(make_station("R3", "美国", "预警雷达", 40.0, -75.0))
+    assert db.delete_radar_station("R1")
+    assert not db.delete_radar_station("R1")
+    assert db.add_radar_station(make_station("R2", "中国", "搜索雷达", 30.5, 120.5))
+    assert not os.path.exists(db_file)
+
+    reloaded = RadarStationDatabase(db_file)
+    assert reloaded.load_database()
+    assert list(reloaded.get_all_stations()) == ["R2", "R3"]
+    assert reloaded.get_radar_station("R2")['基本信息']['radar_type'] == "搜索雷达"
+    assert [s['id'] for s in reloaded.get_stations_by_type("火控雷达")] == []
+
+    assert reloaded.save_database()
+    copied = str(Path(db_file).with_name("copied.yaml"))
+    shutil.copy(db_file, copied)
+    imported = RadarStationDatabase(copied)
+    assert imported.load_database()
+    assert dict(imported.get_all_stations().items()) == dict(reloaded.get_all_stations().items())
+
+
+def test_edited_yaml_is_imported(db_file):
+    """测试手工编辑（比上次导入/导出更新）的YAML在加载时导入，中文字段同样建立索引"""
+    db = RadarStationDatabase(db_file)
+    db.add_radar_station(make_station("R1", "中国", "预警雷达", 30.0, 120.0))
+    assert db.save_database()
+
+    with open(db_file, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    data['雷达台站']['R9'] = {'基本信息': {'名称': "手工台站", '国家': "俄罗斯", '类型': "预警雷达"},
+                              '部署位置': {'纬度': 30.1, '经度': 120.1}}
+    with open(db_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+    stat = os.stat(db_file)
+    os.utime(db_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    reloaded = RadarStationDatabase(db_file)
+    assert reloaded.load_database()
+    assert list(reloaded.get_all_stations()) == ["R1", "R9"]
+    assert [s['id'] for s in reloaded.get_stations_by_country("俄罗斯")] == ["R9"]
+    assert [s['id'] for s in reloaded.get_stations_in_area(30.0, 120.0, 50.0)] == ["R1", "R9"]
+    assert reloaded.database['版本'] == "2.0"
+
+
+def test_newer_yaml_merges_without_dropping_unsaved_stations(db_file):
+    """测试导出后新增的台站在YAML被其他程序重写后仍保留，YAML中的记录合并进数据库"""
+    db = RadarStationDatabase(db_file)
+    db.add_radar_station(make_station("R1", "中国", "预警雷达", 30.0, 120.0))
+    assert db.save_database()
+    db.add_radar_station(make_station("R2", "中国", "火控雷达", 30.5, 120.5))
+    db.close()
+
+    with open(db_file, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    data['雷达台站']['R1']['基本信息']['country'] = "法国"
+    with open(db_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+    stat = os.stat(db_file)
+    os.utime(db_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    reloaded = RadarStationDatabase(db_file)
+    assert reloaded.load_database()
+    assert list(reloaded.get_all_stations()) == ["R1", "R2"]
+    assert [s['id'] for s in reloaded.get_stations_by_country("法国")] == ["R1"]
+
+
+def test_indexed_queries_match_full_scan(db_file):
+    """测试国家/类型/区域索引查询与全量遍历结果一致"""
+    db = RadarStationDatabase(db_file)
+    stations = [
+        make_station(f"R{i}", ["中国", "美国", "俄罗斯"][i % 3], ["预警雷达", "火控雷达"][i % 2],
+                     20.0 + (i * 7 % 30) * 0.4, 100.0 + (i * 11 % 40) * 0.5)
+        for i in range(120)
+    ]
+    for station in stations:
+        db.add_radar_station(station)
+    db.delete_radar_station("R5")
+    db.add_radar_station(make_station("R7", "美国", "火控雷达", 25.0, 110.0))
+
+    all_stations = db.get_all_stations()
+
+    by_country = [s['id'] for s in db.get_stations_by_country("美国")]
+    assert by_country == [sid for sid, s in all_stations.items() if s['基本信息']['country'] == "美国"]
+
+    by_type = [s['id'] for s in db.get_stations_by_type("火控雷达")]
+    assert by_type == [sid for sid, s in all_stations.items() if s['基本信息']['radar_type'] == "火控雷达"]
+
+    for radius_km in (50.0, 300.0, 5000.0):
+        in_area = [s['id'] for s in db.get_stations_in_area(26.0, 110.0, radius_km)]
+        expected = []
+        for sid, station in all_stations.items():
+            location = station['部署位置']
+            lat_diff = abs(location['latitude'] - 26.0) * 111.32
+            lon_diff = abs(location['longitude'] - 110.0) * 111.32 * math.cos(math.radians(26.0))
+            if (lat_diff ** 2 + lon_diff ** 2) ** 0.5 <= radius_km:
+                expected.append(sid)
+        assert in_area == expected
+
+    # 极点附近不按经度预筛选
+    assert [s['id'] for s in db.get_stations_in_area(90.0, 0.0, 7000.0)] == [
+        sid for sid, s in all_stations.items() if (90.0 - s['部署位置']['latitude']) * 111.32 <= 7000.0
+    ]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+逐脉冲流式处理测试
+"""
+
+import numpy as np
+import pytest
+from scipy.fft import fft2, fftshift
+
+from radar_factory_app.models.radar_models import WindowType
+from radar_factory_app.services.stream_processor import PulseStreamProcessor, make_window
+
+
+def frame_rd_power(frame):
+    """整帧距离-多普勒功率图（与RadarSimulator._range_doppler_processing相同的处理）"""
+    window = np.outer(make_window(WindowType.HANNING, frame.shape[0]),
+                      make_window(WindowType.HANNING, frame.shape[1]))
+    return np.abs(fftshift(fft2(frame * window), axes=0)) ** 2
+
+
+def make_echo(n_pulses, n_samples, seed=0):
+    """噪声加一个运动目标的基带回波 [通道数, 脉冲数, 采样点数]"""
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(size=(1, n_pulses, n_samples)) + 1j * rng.normal(size=(1, n_pulses, n_samples))
+    pulses = np.arange(n_pulses)[:, np.newaxis]
+    samples = np.arange(n_samples)[np.newaxis, :]
+    target = 20 * np.exp(2j * np.pi * (0.2 * pulses + 0.3 * samples))
+    return noise + target
+
+
+def test_cpi_output_matches_frame_processing():
+    """测试分块不规则输入时每个CPI与对应整段脉冲的整帧处理结果一致"""
+    echo = make_echo(96, 40)
+    stream = PulseStreamProcessor(n_samples=40, cpi_pulses=32, hop_pulses=16, pulse_interval=1e-3)
+
+    blocks = np.split(echo, [1, 7, 30, 31, 70], axis=1)
+    results = list(stream.process(blocks))
+
+    assert [r['start_pulse'] for r in results] == [0, 16, 32, 48, 64]
+    assert results[2]['timestamp'] == pytest.approx(0.032)
+    for result in results:
+        start = result['start_pulse']
+        expected = frame_rd_power(echo[0, start:start + 32])
+        np.testing.assert_allclose(result['rd_power'], expected, rtol=1e-9, atol=1e-9)
+
+    # 单个脉冲逐一输入，缓冲区大小不随输入长度增长
+    single = PulseStreamProcessor(n_samples=40, cpi_pulses=32)
+    outputs = [out for pulse in echo[0] for out in single.push(pulse)]
+    assert len(outputs) == 3 and single._buffer.shape == (32, 40)
+    np.testing.assert_allclose(outputs[-1]['rd_power'], frame_rd_power(echo[0, 64:96]), rtol=1e-9, atol=1e-9)
+
+
+def test_detector_runs_once_per_cpi():
+    """测试每个CPI调用一次检测函数并合并其结果"""
+    calls = []
+
+    def detector(processed):
+        calls.append(processed['cpi_index'])
+        power = processed['rd_power']
+        return {'detection_map': power > 10 * np.median(power)}
+
+    stream = PulseStreamProcessor(n_samples=40, cpi_pulses=32, detector=detector)
+    results = stream.push(make_echo(70, 40))
+
+    assert calls == [0, 1] and stream.pulses_received == 70
+    doppler_bin, range_bin = np.unravel_index(np.argmax(results[0]['rd_power']), (32, 40))
+    assert results[0]['detection_map'][doppler_bin, range_bin]
+    assert (doppler_bin, range_bin) == (16 + round(0.2 * 32), round(0.3 * 40))
+
+    with pytest.raises(ValueError):
+        stream.push(np.zeros((4, 39)))
+    with pytest.raises(ValueError):
+        PulseStreamProcessor(n_samples=40, cpi_pulses=32, hop_pulses=64)
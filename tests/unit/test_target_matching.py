@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+目标匹配测试
+"""
+
+import numpy as np
+
+from radar_factory_app.services import target_matching
+from radar_factory_app.services.target_matching import (
+    MatchMethod, _match_target_to_detection_1d, _match_target_to_detection_2d
+)
+
+
+def make_scene(n_targets, n_clutter, seed):
+    """真实目标附近的检测（带测量误差）加均匀分布的虚警"""
+    rng = np.random.default_rng(seed)
+    targets = rng.uniform(0, 60, (n_targets, 2))
+    detections = np.vstack([
+        targets[:n_targets - 20] + rng.normal(0, 0.8, (n_targets - 20, 2)),
+        rng.uniform(0, 60, (n_clutter, 2))
+    ])
+    return targets, detections
+
+
+def test_hungarian_handles_unmatchable_targets():
+    """测试存在门限内无检测的目标时仍能求解（不因代价矩阵不可行而报错）"""
+    result = _match_target_to_detection_1d(
+        np.array([0.0, 100.0]), np.array([0.5, 1.0]), tolerance=2.0, match_method=MatchMethod.HUNGARIAN
+    )
+    assert result.matched_pairs == [(0, 0)]
+    assert (result.true_positives, result.false_positives, result.false_negatives) == (1, 1, 1)
+
+    # 最优分配优于贪心：贪心会把检测1分给目标0，导致目标1无法匹配
+    result = _match_target_to_detection_1d(
+        np.array([0.0, 2.0]), np.array([-1.5, 1.0]), tolerance=1.6, match_method=MatchMethod.HUNGARIAN
+    )
+    assert result.matched_pairs == [(0, 0), (1, 1)]
+
+
+def test_sparse_gating_matches_dense_solution(monkeypatch):
+    """测试稀疏门限模式与完整代价矩阵求解的匹配数和总代价一致"""
+    for seed in range(5):
+        targets, detections = make_scene(300, 80, seed)
+        dense = _match_target_to_detection_2d(
+            targets, detections, (2.0, 1.5), MatchMethod.HUNGARIAN, weights=(1.0, 2.0)
+        )
+        with monkeypatch.context() as patch:
+            patch.setattr(target_matching, "HUNGARIAN_DENSE_MAX_CELLS", 0)
+            sparse = _match_target_to_detection_2d(
+                targets, detections, (2.0, 1.5), MatchMethod.HUNGARIAN, weights=(1.0, 2.0)
+            )
+
+        assert sparse.true_positives == dense.true_positives
+        assert np.isclose(sum(sparse.match_distances), sum(dense.match_distances))
+        assert [i for i, _ in sparse.matched_pairs] == sorted(i for i, _ in sparse.matched_pairs)
+        for (i, j), distance in zip(sparse.matched_pairs, sparse.match_distances):
+            diff = np.abs(targets[i] - detections[j])
+            assert diff[0] <= 2.0 and diff[1] <= 1.5
+            assert np.isclose(distance, np.hypot(diff[0], 2.0 * diff[1]))
+
+
+def test_large_problem_uses_sparse_mode():
+    """测试万级目标与检测的匹配（超过稠密规模阈值）"""
+    rng = np.random.default_rng(0)
+    targets = rng.uniform(0, 10000, (10000, 2))
+    detections = targets + rng.normal(0, 0.3, targets.shape)
+
+    result = _match_target_to_detection_2d(targets, detections, (2.0, 2.0), MatchMethod.HUNGARIAN)
+    assert result.true_positives == 10000
+    assert result.precision == result.recall == 1.0
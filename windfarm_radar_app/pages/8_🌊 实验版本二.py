@@ -11,6 +11,10 @@ from datetime import datetime
 import time
 import os
 
+from utils.impact_analyzer import RadarImpactAnalyzer
+from utils.sweep_executor import ChunkedSweepExecutor, SweepAggregator
+from utils.adaptive_sampler import AdaptiveSampler
+
 # 页面配置
 st.set_page_config(
     page_title="海上风电雷达影响专业分析系统",
@@ -83,100 +87,48 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class RadarImpactAnalyzer:
-    """雷达影响分析器"""
-    
-    def __init__(self):
-        self.radar_bands = {
-            "L波段": {"freq": 1.5e9, "description": "远程警戒雷达"},
-            "S波段": {"freq": 3.0e9, "description": "中程监视雷达"}, 
-            "C波段": {"freq": 5.6e9, "description": "气象雷达"},
-            "X波段": {"freq": 9.4e9, "description": "海事雷达"},
-            "Ku波段": {"freq": 15.0e9, "description": "高精度雷达"}
-        }
-        
-    def calculate_doppler_shift(self, freq, speed, angle_deg):
-        """计算多普勒频移"""
-        wavelength = 3e8 / freq
-        angle_rad = np.radians(angle_deg)
-        doppler_shift = 2 * speed * np.cos(angle_rad) / wavelength
-        return doppler_shift
-    
-    def calculate_snr_degradation(self, distance, turbine_distance, incidence_angle, radar_band):
-        """计算SNR恶化"""
-        # 基于距离的基准SNR
-        base_snr = 20 * np.log10(100/distance) if distance > 0 else 0
-        
-        # 风机引起的附加损耗模型
-        angle_factor = 0.5 * (1 - np.cos(np.radians(incidence_angle)))
-        distance_factor = 10 * np.log10(max(turbine_distance, 0.1))
-        freq = self.radar_bands[radar_band]["freq"]
-        freq_factor = 20 * np.log10(freq / 1e9) * 0.1
-        
-        turbine_loss = angle_factor + distance_factor + freq_factor
-        degraded_snr = base_snr - turbine_loss
-        
-        return base_snr, degraded_snr, turbine_loss
-    
-    def calculate_detection_probability(self, snr_db):
-        """计算探测概率"""
-        if snr_db < -10:
-            return 0.1
-        elif snr_db > 10:
-            return 0.95
-        else:
-            return 0.1 + 0.85 * (snr_db + 10) / 20
-    
-    def generate_comprehensive_analysis(self, params):
-        """生成综合分析报告"""
-        analysis = {}
-        
-        # 多普勒分析
-        freq = self.radar_bands[params['radar_band']]["freq"]
-        analysis['doppler_shift'] = self.calculate_doppler_shift(
-            freq, params['target_speed'], params['incidence_angle']
-        )
-        analysis['doppler_velocity'] = analysis['doppler_shift'] * 3e8 / (2 * freq)
-        
-        # SNR分析
-        base_snr, degraded_snr, snr_loss = self.calculate_snr_degradation(
-            params['target_distance'], params['turbine_distance'], 
-            params['incidence_angle'], params['radar_band']
-        )
-        analysis.update({
-            'base_snr': base_snr,
-            'degraded_snr': degraded_snr,
-            'snr_degradation': snr_loss,
-            'snr_reduction_percent': (base_snr - degraded_snr) / abs(base_snr) * 100 if base_snr != 0 else 0
-        })
-        
-        # 探测概率分析
-        analysis['base_pd'] = self.calculate_detection_probability(base_snr)
-        analysis['degraded_pd'] = self.calculate_detection_probability(degraded_snr)
-        analysis['pd_reduction'] = analysis['base_pd'] - analysis['degraded_pd']
-        
-        # 风险等级评估
-        risk_score = min(1.0, max(0, (snr_loss/20 + analysis['pd_reduction']/0.3) / 2))
-        if risk_score > 0.7:
-            analysis['risk_level'] = "高风险"
-            analysis['risk_color'] = "risk-high"
-        elif risk_score > 0.4:
-            analysis['risk_level'] = "中风险" 
-            analysis['risk_color'] = "risk-medium"
-        else:
-            analysis['risk_level'] = "低风险"
-            analysis['risk_color'] = "risk-low"
-            
-        analysis['risk_score'] = risk_score
-        
-        return analysis
+# 采样方式：界面名称 -> 内部标识
+SAMPLING_METHODS = {
+    "全因子网格": "grid",
+    "拉丁超立方": "lhs",
+    "Sobol序列": "sobol",
+    "自适应代理模型": "adaptive"
+}
+
+# 按对数尺度采样的参数（响应随距离呈对数变化）
+LOG_SCALE_PARAMS = ('target_distance', 'turbine_distance')
+
+# 执行控制参数，不属于分析模型输入
+CONTROL_KEYS = ('simulation_mode', 'simulation_step_size', 'max_workers',
+                'sampling_method', 'sample_budget', 'target_accuracy')
+
+# 报告中可选的分析参数（按其单参数及两两组合逐块累计分组均值）
+ANALYSIS_PARAMS = ['target_distance', 'turbine_distance', 'incidence_angle', 'target_speed']
+
+# 散点图、分布图和数据浏览使用的随机样本行数
+REPORT_SAMPLE_SIZE = 20000
+
+# 代理模型响应面热力图中，非坐标轴数值参数参与平均的取值个数
+SURFACE_MARGINAL_LEVELS = 5
+
+def create_result_aggregator():
+    """创建仿真结果汇总器（报告所需统计量逐块累计，不保留全部结果）"""
+    return SweepAggregator(
+        group_columns=ANALYSIS_PARAMS,
+        value_columns=['snr_degradation'],
+        category_columns=['risk_level', 'radar_band'],
+        sample_size=REPORT_SAMPLE_SIZE
+    )
 
 class SimulationEngine:
     """仿真引擎类"""
     
     def __init__(self, analyzer):
         self.analyzer = analyzer
-        self.simulation_data = pd.DataFrame()
+        self.simulation_data = create_result_aggregator()
+        self.executor = None
+        self.sampler = None
+        self.sweep_grid = None
         
     def define_parameter_ranges(self, base_params, simulation_step_size=1.0):
         """定义参数扫描范围"""
@@ -195,88 +147,199 @@ class SimulationEngine:
         }
         return param_ranges
     
-    def run_simulation(self, base_params, simulation_step_size=1.0, max_iterations=1000):
-        """运行参数扫描仿真"""
+    def define_sweep_grid(self, base_params, simulation_step_size=1.0):
+        """定义全因子扫描网格（雷达波段 × 目标距离 × 目标速度 × 风机距离 × 照射角度）"""
         param_ranges = self.define_parameter_ranges(base_params, simulation_step_size)
+        sweep_names = ['radar_band', 'target_distance', 'target_speed',
+                       'turbine_distance', 'incidence_angle']
+        return {name: param_ranges[name] for name in sweep_names}
+    
+    def run_simulation(self, base_params, simulation_step_size=1.0, max_workers=None,
+                       chunk_size=5000, sampling_method='grid', sample_budget=2000,
+                       target_accuracy=0.02):
+        """
+        运行参数扫描仿真
+        
+        sampling_method为'grid'时执行全因子扫描（分块并行执行，结果列式落盘，
+        支持断点续算）；为'lhs'/'sobol'/'adaptive'时在同一参数空间内按采样预算
+        进行试验设计采样
         
-        # 计算总迭代次数
-        total_iterations = np.prod([len(v) for v in param_ranges.values()])
-        st.info(f"预计总仿真次数: {total_iterations:,} (将限制在{max_iterations}次以内)")
+        返回结果汇总器（SweepAggregator）：全因子扫描的每个分块完成后立即
+        累计到汇总器，完整结果只保留在磁盘分块中
+        """
+        if sampling_method != 'grid':
+            return self.run_sampled_simulation(
+                base_params, simulation_step_size, sampling_method,
+                sample_budget, target_accuracy
+            )
+        
+        sweep_grid = self.define_sweep_grid(base_params, simulation_step_size)
+        self.sampler = None
+        self.sweep_grid = None
+        
+        # 仅保留影响分析结果的参数，执行控制参数不参与扫描签名
+        model_params = {k: v for k, v in base_params.items() if k not in CONTROL_KEYS}
+        
+        executor = self.executor = ChunkedSweepExecutor(
+            self.analyzer.generate_comprehensive_analysis,
+            sweep_grid,
+            base_params=model_params,
+            chunk_size=chunk_size,
+            max_workers=max_workers
+        )
+        
+        completed = len(executor.completed_chunks())
+        st.info(f"预计总仿真次数: {executor.total_points:,} "
+                f"(分 {executor.num_chunks} 块执行，已完成 {completed} 块)")
         
         # 创建进度条
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        results = []
-        iteration = 0
-        
-        # 使用嵌套循环进行参数扫描（限制最大迭代次数）
-        for radar_band in param_ranges['radar_band'][:2]:
-            for target_distance in param_ranges['target_distance'][::3]:
-                for target_speed in param_ranges['target_speed'][::5]:
-                    for turbine_distance in param_ranges['turbine_distance'][::2]:
-                        for incidence_angle in param_ranges['incidence_angle'][::3]:
-                            
-                            if iteration >= max_iterations:
-                                break
-                                
-                            # 构建参数组合
-                            sim_params = base_params.copy()
-                            sim_params.update({
-                                'radar_band': radar_band,
-                                'target_distance': target_distance,
-                                'target_speed': target_speed,
-                                'turbine_distance': turbine_distance,
-                                'incidence_angle': incidence_angle
-                            })
-                            
-                            try:
-                                # 运行分析
-                                analysis = self.analyzer.generate_comprehensive_analysis(sim_params)
-                                
-                                # 合并参数和分析结果
-                                result_row = {**sim_params, **analysis}
-                                results.append(result_row)
-                                
-                                iteration += 1
-                                
-                                # 更新进度
-                                progress = iteration / min(total_iterations, max_iterations)
-                                progress_bar.progress(progress)
-                                status_text.text(f"仿真进度: {iteration}/{min(total_iterations, max_iterations)} "
-                                               f"({progress*100:.1f}%)")
-                                
-                            except Exception as e:
-                                st.warning(f"参数组合分析失败: {e}")
-                                continue
-                
-                if iteration >= max_iterations:
-                    break
-            if iteration >= max_iterations:
-                break
-                
-        # 转换为DataFrame
-        self.simulation_data = pd.DataFrame(results)
+        def update_progress(done, total):
+            progress = done / total if total else 1.0
+            progress_bar.progress(min(progress, 1.0))
+            status_text.text(f"仿真进度: {done:,}/{total:,} ({progress*100:.1f}%)")
+        
+        # 各分块完成后逐块汇总
+        self.simulation_data = create_result_aggregator()
+        stats = executor.run(
+            progress_callback=update_progress,
+            chunk_callback=lambda chunk_index, frame: self.simulation_data.update(frame)
+        )
+        
+        if stats['failed_points']:
+            _report_sweep_failures(executor, stats)
+        if stats['resumed_points']:
+            st.info(f"从已完成的分块续算，复用 {stats['resumed_points']:,} 个参数组合的结果")
         
         # 显示完成信息
-        status_text.text(f"仿真完成！共生成 {len(self.simulation_data)} 条数据")
+        status_text.text(f"仿真完成！共生成 {self.simulation_data.count:,} 条数据")
+        progress_bar.empty()
+        
+        return self.simulation_data
+    
+    def run_sampled_simulation(self, base_params, simulation_step_size=1.0,
+                               sampling_method='adaptive', sample_budget=2000,
+                               target_accuracy=0.02):
+        """运行试验设计采样仿真（拉丁超立方/Sobol/代理模型自适应加密）"""
+        sweep_grid = self.sweep_grid = self.define_sweep_grid(base_params, simulation_step_size)
+        model_params = {k: v for k, v in base_params.items() if k not in CONTROL_KEYS}
+        grid_points = int(np.prod([len(v) for v in sweep_grid.values()]))
+        
+        self.sampler = AdaptiveSampler(
+            self.analyzer.generate_comprehensive_analysis,
+            sweep_grid,
+            base_params=model_params,
+            design='sobol' if sampling_method == 'adaptive' else sampling_method,
+            log_scale=LOG_SCALE_PARAMS
+        )
+        
+        st.info(f"采样预算: {sample_budget:,} 次 (全因子网格需 {grid_points:,} 次)")
+        
+        # 创建进度条
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        def update_progress(done, total):
+            progress = done / total if total else 1.0
+            progress_bar.progress(min(progress, 1.0))
+            status_text.text(f"仿真进度: {done:,}/{total:,} ({progress*100:.1f}%)")
+        
+        if sampling_method == 'adaptive':
+            samples = self.sampler.run_adaptive(
+                sample_budget, tolerance=target_accuracy, progress_callback=update_progress
+            )
+        else:
+            samples = self.sampler.sample(
+                sample_budget, progress_callback=update_progress
+            )
+        self.executor = None
+        self.simulation_data = create_result_aggregator()
+        self.simulation_data.update(samples)
+        
+        if self.sampler.failures:
+            st.warning(f"{self.sampler.failures} 个参数组合分析失败，已跳过")
+        
+        # 代理模型精度（归一化交叉验证RMSE）
+        cv_error = self.sampler.cross_validation_error()
+        st.info("代理模型交叉验证误差: " + ", ".join(
+            f"{_get_param_label(name)} {err*100:.2f}%" for name, err in cv_error.items()
+        ))
+        
+        status_text.text(f"仿真完成！共生成 {self.simulation_data.count} 条数据 "
+                         f"(评估次数为全因子网格的 {self.simulation_data.count/grid_points*100:.1f}%)")
         progress_bar.empty()
         
         return self.simulation_data
     
+    def response_surface(self, x_param, y_param, value='snr_degradation'):
+        """
+        用代理模型在扫描网格上预测两参数响应面（仅试验设计采样模式）
+        
+        坐标轴参数取扫描网格的全部取值，其余数值参数取至多
+        SURFACE_MARGINAL_LEVELS 个均匀分布的网格取值，非数值参数取全部取值，
+        对其余参数求平均后返回以y_param为行、x_param为列的透视表；
+        全因子扫描模式返回None
+        """
+        if self.sampler is None or self.sweep_grid is None:
+            return None
+        
+        surface_grid = {}
+        for name, values in self.sweep_grid.items():
+            values = list(values)
+            if name in (x_param, y_param) or name in self.sampler.categorical_params:
+                surface_grid[name] = values
+            else:
+                index = np.unique(np.linspace(0, len(values) - 1, SURFACE_MARGINAL_LEVELS).round().astype(int))
+                surface_grid[name] = [values[i] for i in index]
+        
+        predicted = self.sampler.predict_grid(surface_grid)
+        surface = predicted.groupby([x_param, y_param], as_index=False)[value].mean()
+        return surface.pivot(index=y_param, columns=x_param, values=value)
+    
     def save_simulation_data(self, filename=None):
-        """保存仿真数据到CSV文件"""
+        """
+        保存仿真数据到CSV文件
+        
+        全因子扫描结果由磁盘分块逐块写出到扫描目录，返回该文件的二进制句柄；
+        试验设计采样结果规模受采样预算限制，直接返回CSV文本
+        """
         if filename is None:
             filename = f"radar_simulation_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        csv = self.simulation_data.to_csv(index=False)
+        if self.executor is not None:
+            return open(self.executor.export_csv(), 'rb'), filename
+        
+        csv = self.simulation_data.sample.to_csv(index=False)
         return csv, filename
 
-def create_simulation_analysis_wide(analyzer, params, simulation_data):
-    """创建宽幅仿真分析报告 - 优化布局"""
+def _report_sweep_failures(executor, stats):
+    """报告扫描中失败的参数组合与分块"""
+    message = f"{stats['failed_points']:,} 个参数组合分析失败，结果中不包含这些组合"
+    if stats['failed_chunks']:
+        message += f"；其中 {stats['failed_chunks']} 个分块整体失败，重新运行仿真将重试这些分块"
+    st.error(message)
+    
+    records = []
+    for error in stats['errors']:
+        params = executor.point_params(error['point']) if error['point'] is not None else {}
+        records.append({'分块': error['chunk'], '参数组合序号': error['point'],
+                        '错误信息': error['error'], **params})
+    with st.expander(f"失败记录（前 {len(records)} 条）"):
+        st.dataframe(pd.DataFrame(records), width='stretch')
+
+def create_simulation_analysis_wide(analyzer, params, simulation_data, simulation_engine=None):
+    """
+    创建宽幅仿真分析报告 - 优化布局
+    
+    simulation_data为结果汇总器：统计量、分组均值、相关系数与风险频数为全部结果的
+    精确值，散点图、分布图和数据浏览使用其中的均匀随机样本；
+    试验设计采样模式下热力图由simulation_engine的代理模型响应面绘制
+    """
     st.markdown('<div class="section-header">📈 仿真数据分析报告</div>', unsafe_allow_html=True)
     
-    if simulation_data.empty:
+    if not simulation_data.count:
         st.warning("没有仿真数据可用，请先运行仿真")
         return
     
@@ -284,24 +347,28 @@ def create_simulation_analysis_wide(analyzer, params, simulation_data):
     st.markdown("### 📊 仿真数据概览")
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("总数据量", f"{len(simulation_data):,} 条")
+        st.metric("总数据量", f"{simulation_data.count:,} 条")
     with col2:
-        avg_snr_loss = simulation_data['snr_degradation'].mean()
+        avg_snr_loss = simulation_data.mean()['snr_degradation']
         st.metric("平均SNR损失", f"{avg_snr_loss:.2f} dB")
     with col3:
-        high_risk_count = len(simulation_data[simulation_data['risk_score'] > 0.7])
+        high_risk_count = _high_risk_count(simulation_data)
         st.metric("高风险场景", f"{high_risk_count} 个")
     with col4:
-        max_snr_loss = simulation_data['snr_degradation'].max()
+        max_snr_loss = simulation_data.max()['snr_degradation']
         st.metric("最大SNR损失", f"{max_snr_loss:.2f} dB")
     
+    if simulation_data.count > len(simulation_data.sample):
+        st.caption(f"散点图与分布图基于 {len(simulation_data.sample):,} 条均匀随机样本绘制，"
+                   "统计量基于全部结果")
+    
     # 使用全宽度标签页
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 参数影响分析", "📈 性能分布", "🎯 风险分析", "🔍 相关性分析", "📋 数据探索"
     ])
     
     with tab1:
-        _create_parameter_impact_analysis_wide(simulation_data)
+        _create_parameter_impact_analysis_wide(simulation_data, simulation_engine)
     
     with tab2:
         _create_performance_distribution_wide(simulation_data)
@@ -315,7 +382,11 @@ def create_simulation_analysis_wide(analyzer, params, simulation_data):
     with tab5:
         _create_data_exploration_wide(simulation_data)
 
-def _create_parameter_impact_analysis_wide(simulation_data):
+def _high_risk_count(simulation_data):
+    """高风险场景数（风险分数>0.7即风险等级为高风险）"""
+    return int(simulation_data.value_counts('risk_level').get("高风险", 0))
+
+def _create_parameter_impact_analysis_wide(simulation_data, simulation_engine=None):
     """创建宽幅参数影响分析"""
     st.markdown("#### 🎯 参数对SNR损失的影响")
     
@@ -324,13 +395,13 @@ def _create_parameter_impact_analysis_wide(simulation_data):
     
     with col1:
         # 参数选择
-        param_options = ['target_distance', 'turbine_distance', 'incidence_angle', 'target_speed']
+        param_options = ANALYSIS_PARAMS
         selected_param = st.selectbox("选择分析参数", param_options, key="param_select")
         
         # 创建散点图 - 使用全宽度
         if selected_param in param_options:
             fig = px.scatter(
-                simulation_data, 
+                simulation_data.sample, 
                 x=selected_param, 
                 y='snr_degradation',
                 color='radar_band',
@@ -345,8 +416,8 @@ def _create_parameter_impact_analysis_wide(simulation_data):
     with col2:
         # 参数统计信息
         st.markdown("##### 参数统计")
-        if selected_param in simulation_data.columns:
-            param_stats = simulation_data[selected_param].describe()
+        if selected_param in simulation_data.numeric_columns:
+            param_stats = simulation_data.describe()[selected_param]
             st.dataframe(pd.DataFrame(param_stats).T, width='stretch')
     
     # 多参数影响热力图 - 使用全宽度
@@ -354,15 +425,26 @@ def _create_parameter_impact_analysis_wide(simulation_data):
     
     col1, col2 = st.columns(2)
     with col1:
-        x_param = st.selectbox("X轴参数", ['target_distance', 'turbine_distance', 'incidence_angle', 'target_speed'], 
+        x_param = st.selectbox("X轴参数", ANALYSIS_PARAMS, 
                               index=0, key="x_param")
     with col2:
-        y_param = st.selectbox("Y轴参数", ['target_distance', 'turbine_distance', 'incidence_angle', 'target_speed'], 
+        y_param = st.selectbox("Y轴参数", ANALYSIS_PARAMS, 
                               index=1, key="y_param")
     
-    # 创建热力图数据
-    heatmap_data = simulation_data.groupby([x_param, y_param])['snr_degradation'].mean().reset_index()
-    heatmap_pivot = heatmap_data.pivot(index=y_param, columns=x_param, values='snr_degradation')
+    if x_param == y_param:
+        st.warning("请选择两个不同的参数")
+        return
+    
+    # 采样结果的参数取值连续且几乎互不相同，热力图使用代理模型在扫描网格上的响应面；
+    # 全因子扫描使用逐块累计的分组均值
+    heatmap_pivot = None
+    if simulation_engine is not None:
+        heatmap_pivot = simulation_engine.response_surface(x_param, y_param, 'snr_degradation')
+    if heatmap_pivot is None:
+        heatmap_data = simulation_data.group_mean([x_param, y_param], 'snr_degradation')
+        heatmap_pivot = heatmap_data.pivot(index=y_param, columns=x_param, values='snr_degradation')
+    else:
+        st.caption("试验设计采样模式：热力图为代理模型在扫描网格上预测的平均SNR损失")
     
     fig = px.imshow(
         heatmap_pivot,
@@ -385,7 +467,7 @@ def _create_performance_distribution_wide(simulation_data):
     with col1:
         # SNR损失分布
         fig1 = px.histogram(
-            simulation_data, 
+            simulation_data.sample, 
             x='snr_degradation',
             nbins=50,
             title='SNR损失分布',
@@ -398,7 +480,7 @@ def _create_performance_distribution_wide(simulation_data):
     with col2:
         # 探测概率变化分布
         fig2 = px.histogram(
-            simulation_data, 
+            simulation_data.sample, 
             x='pd_reduction',
             nbins=50,
             title='探测概率变化分布',
@@ -411,7 +493,7 @@ def _create_performance_distribution_wide(simulation_data):
     # 按雷达波段的性能对比 - 使用全宽度
     st.markdown("#### 📡 各雷达波段性能对比")
     fig = px.box(
-        simulation_data, 
+        simulation_data.sample, 
         x='radar_band', 
         y='snr_degradation',
         title='各雷达波段的SNR损失分布',
@@ -428,7 +510,7 @@ def _create_risk_analysis_wide(simulation_data):
     
     with col1:
         # 风险等级统计
-        risk_counts = simulation_data['risk_level'].value_counts()
+        risk_counts = simulation_data.value_counts('risk_level')
         fig = px.pie(
             values=risk_counts.values,
             names=risk_counts.index,
@@ -441,7 +523,7 @@ def _create_risk_analysis_wide(simulation_data):
     with col2:
         # 风险统计表格
         st.markdown("##### 风险统计")
-        risk_summary = simulation_data['risk_level'].value_counts().reset_index()
+        risk_summary = simulation_data.value_counts('risk_level').reset_index()
         risk_summary.columns = ['风险等级', '数量']
         st.dataframe(risk_summary, width='stretch')
     
@@ -452,7 +534,7 @@ def _create_risk_analysis_wide(simulation_data):
                         key="risk_param")
     
     fig = px.scatter(
-        simulation_data,
+        simulation_data.sample,
         x=param,
         y='risk_score',
         color='risk_level',
@@ -468,7 +550,7 @@ def _create_correlation_analysis_wide(simulation_data):
     st.markdown("#### 🔗 参数相关性矩阵")
     
     # 选择数值型参数
-    numeric_columns = simulation_data.select_dtypes(include=[np.number]).columns
+    numeric_columns = simulation_data.numeric_columns
     selected_columns = st.multiselect(
         "选择分析参数", 
         numeric_columns, 
@@ -477,7 +559,7 @@ def _create_correlation_analysis_wide(simulation_data):
     )
     
     if len(selected_columns) >= 2:
-        corr_matrix = simulation_data[selected_columns].corr()
+        corr_matrix = simulation_data.corr(selected_columns)
         
         fig = px.imshow(
             corr_matrix,
@@ -495,10 +577,10 @@ def _create_data_exploration_wide(simulation_data):
     """创建宽幅数据探索界面"""
     st.markdown("#### 📋 仿真数据探索")
     
-    # 数据显示
-    st.dataframe(simulation_data, width='stretch')
+    # 数据显示（随机样本）
+    st.dataframe(simulation_data.sample, width='stretch')
     
-    # 数据统计
+    # 数据统计（全部结果）
     st.markdown("#### 📊 数据统计摘要")
     st.write(simulation_data.describe())
 
@@ -529,10 +611,25 @@ def create_parameter_sidebar():
             "仿真步长", 0.5, 5.0, 2.0, 0.5,
             help="控制参数扫描的步长，较小的步长会产生更多数据点"
         )
-        simulation_params['max_iterations'] = st.sidebar.slider(
-            "最大迭代次数", 100, 5000, 1000, 100,
-            help="限制总仿真次数，避免计算时间过长"
+        simulation_params['max_workers'] = st.sidebar.slider(
+            "并行进程数", 1, max(os.cpu_count() or 1, 2), os.cpu_count() or 1, 1,
+            help="参数扫描分块并行计算的进程数"
+        )
+        sampling_label = st.sidebar.selectbox(
+            "采样方式", list(SAMPLING_METHODS.keys()),
+            help="全因子网格遍历全部参数组合；试验设计采样以少量评估覆盖同一参数空间"
         )
+        simulation_params['sampling_method'] = SAMPLING_METHODS[sampling_label]
+        if simulation_params['sampling_method'] != 'grid':
+            simulation_params['sample_budget'] = st.sidebar.slider(
+                "采样预算", 200, 20000, 2000, 100,
+                help="分析模型的最大评估次数"
+            )
+        if simulation_params['sampling_method'] == 'adaptive':
+            simulation_params['target_accuracy'] = st.sidebar.slider(
+                "目标精度 (%)", 0.5, 10.0, 2.0, 0.5,
+                help="代理模型归一化交叉验证误差达到该值时停止加密"
+            ) / 100
     
     with st.sidebar.expander("雷达参数", expanded=True):
         radar_band = st.selectbox(
@@ -594,8 +691,8 @@ def create_simulation_interface_wide(analyzer, params):
         gen_report = st.button("📊 生成分析报告", width='stretch')
     
     with col3:
-        if 'simulation_data' in st.session_state:
-            csv_data, filename = simulation_engine.save_simulation_data()
+        if 'simulation_engine' in st.session_state:
+            csv_data, filename = st.session_state.simulation_engine.save_simulation_data()
             st.download_button(
                 label="💾 下载仿真数据CSV",
                 data=csv_data,
@@ -603,6 +700,8 @@ def create_simulation_interface_wide(analyzer, params):
                 mime="text/csv",
                 width='stretch'
             )
+            if hasattr(csv_data, 'close'):
+                csv_data.close()
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -615,7 +714,10 @@ def create_simulation_interface_wide(analyzer, params):
             simulation_data = simulation_engine.run_simulation(
                 params, 
                 params.get('simulation_step_size', 2.0),
-                params.get('max_iterations', 1000)
+                params.get('max_workers'),
+                sampling_method=params.get('sampling_method', 'grid'),
+                sample_budget=params.get('sample_budget', 2000),
+                target_accuracy=params.get('target_accuracy', 0.02)
             )
             
             end_time = time.time()
@@ -636,25 +738,26 @@ def create_simulation_interface_wide(analyzer, params):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("总数据量", f"{len(simulation_data):,}")
+            st.metric("总数据量", f"{simulation_data.count:,}")
         with col2:
             st.metric("参数维度", f"{len(simulation_data.columns)}")
         with col3:
-            avg_snr = simulation_data['snr_degradation'].mean()
+            avg_snr = simulation_data.mean().get('snr_degradation', np.nan)
             st.metric("平均SNR损失", f"{avg_snr:.2f} dB")
         with col4:
-            high_risk = len(simulation_data[simulation_data['risk_score'] > 0.7])
+            high_risk = _high_risk_count(simulation_data)
             st.metric("高风险场景", high_risk)
     
     # 生成分析报告
     if gen_report and 'simulation_data' in st.session_state:
         simulation_data = st.session_state.simulation_data
-        create_simulation_analysis_wide(analyzer, params, simulation_data)
+        create_simulation_analysis_wide(analyzer, params, simulation_data,
+                                        st.session_state.get('simulation_engine'))
     
     # 快速数据预览
     if 'simulation_data' in st.session_state:
         with st.expander("📋 数据预览", expanded=False):
-            st.dataframe(st.session_state.simulation_data.head(10), width='stretch')
+            st.dataframe(st.session_state.simulation_data.sample.head(10), width='stretch')
 
 def main():
     """主函数"""
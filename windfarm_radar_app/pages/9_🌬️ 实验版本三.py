@@ -6,6 +6,8 @@ import pandas as pd
 import random
 from math import sqrt, sin, cos, radians
 
+from utils.occlusion import TurbineOcclusionEngine
+
 
 
 # 设置页面配置
@@ -146,48 +148,38 @@ def create_targets(num_targets, area_size, target_types):
     
     return targets
 
-def calculate_line_of_sight(radar_pos, target_pos, turbines):
-    """计算雷达与目标之间的视线"""
-    radar_x, radar_y, radar_z = radar_pos
-    target_x, target_y, target_z = target_pos
+def build_occlusion_engine(turbines):
+    """由风机列表构建遮挡引擎（页面坐标即米制局部坐标）"""
+    positions = np.array([t.position for t in turbines], dtype=float).reshape(-1, 3)
+    blade_length = np.array([t.blade_length for t in turbines], dtype=float)
+    height = np.array([t.height for t in turbines], dtype=float)
+    return TurbineOcclusionEngine(
+        centers_xy=positions[:, :2],
+        base_z=positions[:, 2],
+        top_z=positions[:, 2] + height + blade_length,
+        radius=blade_length
+    )
+
+def calculate_line_of_sight(radar_positions, target_positions, turbines, engine=None):
+    """
+    批量计算R部雷达与T个目标之间的视线
     
-    line_of_sight_clear = True
-    blocking_turbine = None
-    occlusion_factor = 0.0
+    视线与各风机（塔基至叶尖、半径为叶片长度的竖直圆柱）求交，经网格索引
+    和包围盒剔除后仅对候选风机做精确测试。
     
-    for turbine in turbines:
-        tx, ty, tz_base = turbine.position
-        turbine_height = turbine.height + turbine.blade_length
-        
-        # 计算视线与风机圆柱体的交点
-        # 简化模型：检查目标是否在风机后面且被遮挡
-        dx = target_x - radar_x
-        dy = target_y - radar_y
-        dz = target_z - radar_z
-        
-        # 计算参数t，表示在视线上的位置
-        t = ((tx - radar_x) * dx + (ty - radar_y) * dy) / (dx**2 + dy**2) if (dx**2 + dy**2) != 0 else 0
-        
-        if 0 <= t <= 1:  # 风机在雷达和目标之间
-            # 计算最近点
-            closest_x = radar_x + t * dx
-            closest_y = radar_y + t * dy
-            
-            # 计算距离
-            distance = sqrt((closest_x - tx)**2 + (closest_y - ty)**2)
-            
-            # 如果距离小于风机半径，且高度在范围内
-            if distance <= turbine.rotor_diameter/2:
-                # 计算视线高度
-                line_z = radar_z + t * dz
-                
-                if 0 <= line_z <= turbine_height:
-                    line_of_sight_clear = False
-                    blocking_turbine = turbine.id
-                    occlusion_factor = 0.7  # 70%信号衰减
-                    break
+    返回:
+        (视线畅通矩阵 (R, T), 最近遮挡风机序号矩阵 (R, T)（无遮挡为-1),
+         遮挡衰减系数矩阵 (R, T))
+    """
+    radar_positions = np.asarray(radar_positions, dtype=float).reshape(-1, 3)
+    target_positions = np.asarray(target_positions, dtype=float).reshape(-1, 3)
+    if engine is None:
+        engine = build_occlusion_engine(turbines)
+    
+    los_clear, blocking_turbine, _ = engine.visibility_matrix(radar_positions, target_positions)
+    occlusion_factor = np.where(los_clear, 0.0, 0.7)  # 遮挡时70%信号衰减
     
-    return line_of_sight_clear, blocking_turbine, occlusion_factor
+    return los_clear, blocking_turbine, occlusion_factor
 
 def calculate_snr(radar_power, radar_freq, target_rcs, distance, occlusion_factor):
     """计算信噪比"""
@@ -664,6 +656,7 @@ def main():
             if st.button("重置场景", width='stretch'):
                 st.session_state.turbines = []
                 st.session_state.targets = []
+                st.session_state.pop('occlusion_engine', None)
                 st.session_state.simulation_time = 0
                 st.rerun()
         
@@ -675,6 +668,7 @@ def main():
             st.session_state.turbines = create_wind_farm(
                 num_turbines, turbine_spacing, turbine_params
             )
+            st.session_state.occlusion_engine = build_occlusion_engine(st.session_state.turbines)
             target_area= st.session_state.turbines[0].position[0] + np.random.randint(500, 5000)
             # target_y_area= st.session_state.turbines[0].position[1] + np.random.randint(-1000, 1000)
             st.session_state.targets = create_targets(
@@ -705,6 +699,14 @@ def main():
         detection_data = []
         weather_atten = weather_attenuation.get(st.session_state.get('weather', '晴朗'), 0.0)
         
+        # 一次性计算雷达到全部目标的视线
+        if 'occlusion_engine' not in st.session_state:
+            st.session_state.occlusion_engine = build_occlusion_engine(turbines)
+        los_matrix, blocking_matrix, occlusion_matrix = calculate_line_of_sight(
+            radar['position'], [target.position for target in targets], turbines,
+            engine=st.session_state.occlusion_engine
+        )
+        
         for i, target in enumerate(targets):
             # 计算距离
             distance = np.sqrt(
@@ -713,10 +715,10 @@ def main():
                 (target.position[2] - radar['position'][2])**2
             )
             
-            # 检查视线
-            los_clear, blocking_turbine, occlusion_factor = calculate_line_of_sight(
-                radar['position'], target.position, turbines
-            )
+            # 视线检查结果
+            los_clear = bool(los_matrix[0, i])
+            blocking_turbine = int(blocking_matrix[0, i]) if blocking_matrix[0, i] >= 0 else None
+            occlusion_factor = float(occlusion_matrix[0, i])
             
             # 计算信噪比
             total_attenuation = occlusion_factor + weather_atten
@@ -22,7 +22,7 @@ from ..config import (
     PHYSICAL_CONSTANTS, TARGET_RCS_DB
 )
 from utils.radar_calculations import (
-    RadarCalculator, RadarParameters, TargetParameters, TurbineParameters,
+    RadarCalculator, RadarParameters, TargetParameters, TurbineParameters, TurbineField,
     CalculationResults, create_radar_parameters_from_config,
     create_target_parameters_from_config, create_turbine_parameters_from_config
 )
@@ -320,50 +320,39 @@ def perform_comprehensive_analysis(
     for turbine in scenario_data.get('wind_turbines', []):
         turbine_params = create_turbine_parameters_from_config(turbine)
         turbines_params.append(turbine_params)
+    turbine_field = TurbineField.from_turbines(turbines_params)
     
     # 分析有/无风机条件
     print("开始分析有/无风机条件...")
     
-    # 存储结果
-    snr_without = []
-    snr_with = []
-    received_power_without = []
-    received_power_with = []
-    detection_prob_without = []
-    detection_prob_with = []
-    multipath_loss_without = []
-    multipath_loss_with = []
-    doppler_freq = []
+    # 批量计算有/无风机条件（一次向量化调用覆盖全部距离点）
+    batch_kwargs = dict(
+        altitudes_m=target_params.altitude_m,
+        rcs_m2=target_params.rcs_m2,
+        velocities_ms=target_params.velocity_ms,
+        azimuths_deg=target_params.azimuth_deg
+    )
+    batch_without = calculator.perform_batch_analysis(
+        radar_params, distances_m, turbines=None, include_turbine_effects=False,
+        **batch_kwargs
+    )
+    batch_with = calculator.perform_batch_analysis(
+        radar_params, distances_m, turbines=turbine_field, include_turbine_effects=True,
+        **batch_kwargs
+    )
     
-    for i, distance_m in enumerate(distances_m):
-        # 更新目标距离
-        target_params.distance_m = distance_m
-        
-        # 无风机条件
-        result_without = calculator.perform_comprehensive_analysis(
-            radar_params, target_params, turbines=None, include_turbine_effects=False
-        )
-        
-        # 有风机条件
-        result_with = calculator.perform_comprehensive_analysis(
-            radar_params, target_params, turbines=turbines_params, include_turbine_effects=True
-        )
-        
-        # 保存结果
-        snr_without.append(result_without.snr_db)
-        snr_with.append(result_with.snr_db)
-        received_power_without.append(result_without.received_power_db)
-        received_power_with.append(result_with.received_power_db)
-        detection_prob_without.append(result_without.detection_probability)
-        detection_prob_with.append(result_with.detection_probability)
-        multipath_loss_without.append(result_without.multipath_loss_db)
-        multipath_loss_with.append(result_with.multipath_loss_db)
-        
-        # 计算多普勒频率
-        doppler = calculator.calculate_doppler_frequency(
-            radar_params.frequency_ghz, target_params.velocity_ms
-        )
-        doppler_freq.append(doppler)
+    snr_without = batch_without.snr_db.tolist()
+    snr_with = batch_with.snr_db.tolist()
+    received_power_without = batch_without.received_power_db.tolist()
+    received_power_with = batch_with.received_power_db.tolist()
+    detection_prob_without = batch_without.detection_probability.tolist()
+    detection_prob_with = batch_with.detection_probability.tolist()
+    multipath_loss_without = batch_without.multipath_loss_db.tolist()
+    multipath_loss_with = batch_with.multipath_loss_db.tolist()
+    doppler_freq = batch_with.doppler_frequency_hz.tolist()
+    
+    # 性能指标基于最远距离点
+    result_with = batch_with.row(-1)
     
     # 保存对比结果
     results['comparison_results'] = {
@@ -0,0 +1,370 @@
+"""
+自适应试验设计采样模块
+拉丁超立方/Sobol空间填充设计，以及基于径向基函数代理模型的自适应加密采样
+"""
+
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import RBFInterpolator
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
+
+# 支持的空间填充设计
+DESIGN_METHODS = ('lhs', 'sobol')
+
+# 默认建立代理模型的响应量
+DEFAULT_RESPONSES = ('snr_degradation', 'degraded_snr', 'pd_reduction', 'risk_score')
+
+
+def _is_numeric(values: Sequence[Any]) -> bool:
+    """判断参数取值是否为数值型（数值型参数按连续区间采样）"""
+    return all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool)
+               for v in values)
+
+
+class AdaptiveSampler:
+    """
+    自适应参数空间采样器
+
+    数值型参数视为连续区间 [min, max]，在单位超立方体内用拉丁超立方或Sobol序列
+    采样；非数值型参数（如雷达波段）按全部取值组合分层，每层独立建立代理模型。
+    自适应加密时以K折交叉验证残差作为误差指示，在残差大且远离已有样本的区域
+    补充采样，直到代理模型的归一化交叉验证误差达到目标精度或用完采样预算。
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Dict[str, Any]], Dict[str, Any]],
+        param_space: Dict[str, Sequence[Any]],
+        base_params: Optional[Dict[str, Any]] = None,
+        responses: Sequence[str] = DEFAULT_RESPONSES,
+        design: str = 'sobol',
+        seed: Optional[int] = None,
+        smoothing: float = 0.0,
+        log_scale: Sequence[str] = ()
+    ):
+        """
+        初始化采样器
+
+        参数:
+            evaluate: 单点评估函数，接收参数字典返回结果字典
+            param_space: 参数空间 {参数名: 取值序列}，可直接使用全因子扫描网格
+            base_params: 基准参数，采样参数覆盖其中的同名项
+            responses: 建立代理模型的数值响应量名称
+            design: 空间填充设计方法，'lhs' 或 'sobol'
+            seed: 随机种子
+            smoothing: 径向基函数插值的平滑系数，0为精确插值
+            log_scale: 按对数尺度采样的正值参数（如距离），使样本在响应变化
+                       剧烈的小取值端更密集
+        """
+        if design not in DESIGN_METHODS:
+            raise ValueError(f"未知的采样设计: {design}，可选 {DESIGN_METHODS}")
+
+        self.evaluate = evaluate
+        self.base_params = dict(base_params or {})
+        self.responses = list(responses)
+        self.design = design
+        self.smoothing = smoothing
+        self._rng = np.random.default_rng(seed)
+
+        self.continuous_params: List[str] = []
+        self.categorical_params: List[str] = []
+        self._lower: List[float] = []
+        self._upper: List[float] = []
+        categorical_values = []
+        for name, values in param_space.items():
+            values = list(values)
+            if _is_numeric(values):
+                self.continuous_params.append(name)
+                self._lower.append(float(min(values)))
+                self._upper.append(float(max(values)))
+            else:
+                self.categorical_params.append(name)
+                categorical_values.append(values)
+
+        if not self.continuous_params:
+            raise ValueError("参数空间中至少需要一个数值型参数")
+
+        self._log = np.array([name in log_scale for name in self.continuous_params])
+        self._lower = np.asarray(self._lower)
+        self._upper = np.asarray(self._upper)
+        if np.any(self._lower[self._log] <= 0):
+            raise ValueError("对数尺度参数的取值必须为正")
+        self._lower[self._log] = np.log(self._lower[self._log])
+        self._upper[self._log] = np.log(self._upper[self._log])
+        self.strata: List[Tuple] = list(itertools.product(*categorical_values))
+
+        dim = len(self.continuous_params)
+        self._X = {stratum: np.empty((0, dim)) for stratum in self.strata}
+        self._Y = {stratum: np.empty((0, len(self.responses))) for stratum in self.strata}
+        self._surrogates: Dict[Tuple, RBFInterpolator] = {}
+        self._rows: List[Dict[str, Any]] = []
+
+        self.evaluations = 0
+        self.failures = 0
+        self.history: List[Dict[str, Any]] = []
+
+    @property
+    def dimension(self) -> int:
+        """连续参数维数"""
+        return len(self.continuous_params)
+
+    @property
+    def samples(self) -> pd.DataFrame:
+        """全部已评估样本（参数与完整分析结果）"""
+        return pd.DataFrame(self._rows)
+
+    def _design(self, n: int, method: Optional[str] = None) -> np.ndarray:
+        """在单位超立方体内生成n个空间填充样本"""
+        method = method or self.design
+        if method == 'lhs':
+            return qmc.LatinHypercube(self.dimension, seed=self._rng).random(n)
+        if method == 'sobol':
+            # 取2的幂长度序列的前n项，避免破坏Sobol序列的平衡性警告
+            m = max(0, int(np.ceil(np.log2(max(n, 1)))))
+            return qmc.Sobol(self.dimension, seed=self._rng).random_base2(m)[:n]
+        raise ValueError(f"未知的采样设计: {method}，可选 {DESIGN_METHODS}")
+
+    def _to_physical(self, unit: np.ndarray) -> np.ndarray:
+        values = self._lower + unit * (self._upper - self._lower)
+        return np.where(self._log, np.exp(values), values)
+
+    def _to_unit(self, values: np.ndarray) -> np.ndarray:
+        values = np.where(self._log, np.log(np.where(self._log, values, 1.0)), values)
+        span = np.where(self._upper > self._lower, self._upper - self._lower, 1.0)
+        return (values - self._lower) / span
+
+    def _evaluate_points(
+        self,
+        stratum: Tuple,
+        unit: np.ndarray,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        total: Optional[int] = None
+    ) -> None:
+        """评估分层内的一批样本并记录结果"""
+        accepted_x = []
+        accepted_y = []
+        for u, x in zip(unit, self._to_physical(unit)):
+            sim_params = dict(self.base_params)
+            sim_params.update(zip(self.categorical_params, stratum))
+            sim_params.update(zip(self.continuous_params, x.tolist()))
+            try:
+                analysis = self.evaluate(sim_params)
+            except Exception:
+                self.failures += 1
+                continue
+
+            self.evaluations += 1
+            self._rows.append({**sim_params, **analysis})
+            accepted_x.append(u)
+            accepted_y.append([float(analysis[name]) for name in self.responses])
+
+            if progress_callback:
+                progress_callback(self.evaluations, total or self.evaluations)
+
+        if accepted_x:
+            self._X[stratum] = np.vstack([self._X[stratum], accepted_x])
+            self._Y[stratum] = np.vstack([self._Y[stratum], accepted_y])
+            self._surrogates.pop(stratum, None)
+
+    def _split(self, n: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """按权重将n个样本分配到各分层（最大余数法）"""
+        if weights is None or not np.any(weights > 0):
+            weights = np.ones(len(self.strata))
+        share = n * weights / weights.sum()
+        counts = np.floor(share).astype(int)
+        remainder = n - counts.sum()
+        if remainder > 0:
+            counts[np.argsort(counts - share)[:remainder]] += 1
+        return counts
+
+    def sample(
+        self,
+        n_samples: int,
+        method: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> pd.DataFrame:
+        """
+        一次性空间填充采样
+
+        参数:
+            n_samples: 总采样点数（平均分配到各分层）
+            method: 'lhs' 或 'sobol'，默认使用初始化时的设计
+            progress_callback: 进度回调 callback(已评估点数, 目标点数)
+
+        返回:
+            全部已评估样本
+        """
+        total = self.evaluations + n_samples
+        for stratum, count in zip(self.strata, self._split(n_samples)):
+            if count > 0:
+                self._evaluate_points(stratum, self._design(count, method),
+                                      progress_callback, total)
+        return self.samples
+
+    def _fit_surrogate(self, X: np.ndarray, Y: np.ndarray) -> RBFInterpolator:
+        # 样本数不足以确定一次多项式项时退化为常数项
+        degree = 1 if len(X) > self.dimension + 1 else 0
+        return RBFInterpolator(X, Y, kernel='thin_plate_spline',
+                               degree=degree, smoothing=self.smoothing)
+
+    def _response_scale(self, stratum: Tuple) -> np.ndarray:
+        span = np.ptp(self._Y[stratum], axis=0) if len(self._Y[stratum]) else 0.0
+        return np.where(span > 0, span, 1.0)
+
+    def _cv_residuals(self, stratum: Tuple, folds: int = 5) -> np.ndarray:
+        """
+        分层内K折交叉验证残差（按响应量极差归一化）
+
+        返回:
+            每个样本的归一化绝对残差 (n, 响应量数)
+        """
+        X, Y = self._X[stratum], self._Y[stratum]
+        n = len(X)
+        residuals = np.zeros_like(Y)
+        if n < 2 * (self.dimension + 2):
+            # 样本太少，无法可靠估计误差
+            residuals[:] = 1.0
+            return residuals
+
+        fold_of = self._rng.permutation(n) % min(folds, n)
+        for k in range(min(folds, n)):
+            test = fold_of == k
+            surrogate = self._fit_surrogate(X[~test], Y[~test])
+            residuals[test] = np.abs(surrogate(X[test]) - Y[test])
+        return residuals / self._response_scale(stratum)
+
+    def cross_validation_error(self, folds: int = 5) -> Dict[str, float]:
+        """
+        代理模型的归一化交叉验证均方根误差
+
+        返回:
+            {响应量: RMSE / 响应量极差}，各分层合并计算
+        """
+        residuals = [self._cv_residuals(stratum, folds) for stratum in self.strata
+                     if len(self._X[stratum])]
+        if not residuals:
+            return {name: 1.0 for name in self.responses}
+        rmse = np.sqrt(np.mean(np.vstack(residuals) ** 2, axis=0))
+        return dict(zip(self.responses, rmse.tolist()))
+
+    def refine(
+        self,
+        n_points: int,
+        candidate_factor: int = 30,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        total: Optional[int] = None
+    ) -> None:
+        """
+        自适应加密：在误差指示最大的位置补充n_points个样本
+
+        候选点的得分为最近已有样本的交叉验证残差与其到该样本距离的乘积，
+        兼顾误差大的区域和尚未覆盖的区域；每选中一个点后更新候选点距离，
+        避免同一批次的样本聚集在一处。
+        """
+        residuals = {stratum: self._cv_residuals(stratum).max(axis=1) for stratum in self.strata}
+        weights = np.array([residuals[s].mean() if len(residuals[s]) else 1.0
+                            for s in self.strata])
+
+        for stratum, count in zip(self.strata, self._split(n_points, weights)):
+            if count <= 0:
+                continue
+            X = self._X[stratum]
+            candidates = self._design(count * candidate_factor, 'lhs')
+            if len(X) == 0:
+                self._evaluate_points(stratum, candidates[:count], progress_callback, total)
+                continue
+
+            distance, nearest = cKDTree(X).query(candidates)
+            error = residuals[stratum][nearest]
+            chosen = []
+            for _ in range(count):
+                best = int(np.argmax(error * distance))
+                chosen.append(best)
+                distance = np.minimum(distance,
+                                      np.linalg.norm(candidates - candidates[best], axis=1))
+            self._evaluate_points(stratum, candidates[chosen], progress_callback, total)
+
+    def run_adaptive(
+        self,
+        max_samples: int,
+        tolerance: float = 0.02,
+        initial_samples: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> pd.DataFrame:
+        """
+        自适应采样直到满足精度或用完预算
+
+        参数:
+            max_samples: 评估次数上限
+            tolerance: 目标精度，所有响应量的归一化交叉验证RMSE均不超过该值时停止
+            initial_samples: 初始空间填充设计点数，默认为预算的20%
+            batch_size: 每轮加密点数，默认为当前样本数的25%
+            progress_callback: 进度回调 callback(已评估点数, 评估上限)
+
+        返回:
+            全部已评估样本
+        """
+        min_initial = 2 * (self.dimension + 2) * len(self.strata)
+        if initial_samples is None:
+            initial_samples = max(max_samples // 5, min_initial)
+        initial_samples = min(initial_samples, max_samples)
+
+        self.sample(initial_samples, progress_callback=progress_callback)
+        while True:
+            errors = self.cross_validation_error()
+            self.history.append({'evaluations': self.evaluations, **errors})
+            remaining = max_samples - self.evaluations
+            if max(errors.values()) <= tolerance or remaining <= 0:
+                break
+            step = batch_size or max(len(self.strata), self.evaluations // 4)
+            before = self.evaluations
+            self.refine(min(step, remaining), progress_callback=progress_callback,
+                        total=max_samples)
+            if self.evaluations == before:
+                break
+
+        return self.samples
+
+    def _surrogate(self, stratum: Tuple) -> RBFInterpolator:
+        if stratum not in self._surrogates:
+            if len(self._X[stratum]) == 0:
+                raise RuntimeError(f"分层 {stratum} 尚无样本，无法建立代理模型")
+            self._surrogates[stratum] = self._fit_surrogate(self._X[stratum], self._Y[stratum])
+        return self._surrogates[stratum]
+
+    def predict(self, points: pd.DataFrame) -> pd.DataFrame:
+        """
+        用代理模型预测任意参数组合的响应量
+
+        参数:
+            points: 包含全部扫描参数列的DataFrame
+
+        返回:
+            参数列与预测响应量列组成的DataFrame
+        """
+        predictions = np.full((len(points), len(self.responses)), np.nan)
+        if self.categorical_params:
+            groups = points.groupby(self.categorical_params, sort=False).indices
+        else:
+            groups = {(): np.arange(len(points))}
+
+        for key, index in groups.items():
+            stratum = key if isinstance(key, tuple) else (key,)
+            unit = self._to_unit(points[self.continuous_params].to_numpy(dtype=float)[index])
+            predictions[index] = self._surrogate(stratum)(unit)
+
+        result = points.reset_index(drop=True).copy()
+        for j, name in enumerate(self.responses):
+            result[name] = predictions[:, j]
+        return result
+
+    def predict_grid(self, param_grid: Dict[str, Sequence[Any]]) -> pd.DataFrame:
+        """在全因子网格上预测响应面（不调用评估函数）"""
+        names = list(param_grid.keys())
+        rows = list(itertools.product(*(list(param_grid[name]) for name in names)))
+        return self.predict(pd.DataFrame(rows, columns=names))
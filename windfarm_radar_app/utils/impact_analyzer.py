@@ -0,0 +1,95 @@
+"""
+雷达影响分析模块
+海上风电场对雷达探测性能影响的简化分析模型
+"""
+
+import numpy as np
+
+
+class RadarImpactAnalyzer:
+    """雷达影响分析器"""
+    
+    def __init__(self):
+        self.radar_bands = {
+            "L波段": {"freq": 1.5e9, "description": "远程警戒雷达"},
+            "S波段": {"freq": 3.0e9, "description": "中程监视雷达"}, 
+            "C波段": {"freq": 5.6e9, "description": "气象雷达"},
+            "X波段": {"freq": 9.4e9, "description": "海事雷达"},
+            "Ku波段": {"freq": 15.0e9, "description": "高精度雷达"}
+        }
+        
+    def calculate_doppler_shift(self, freq, speed, angle_deg):
+        """计算多普勒频移"""
+        wavelength = 3e8 / freq
+        angle_rad = np.radians(angle_deg)
+        doppler_shift = 2 * speed * np.cos(angle_rad) / wavelength
+        return doppler_shift
+    
+    def calculate_snr_degradation(self, distance, turbine_distance, incidence_angle, radar_band):
+        """计算SNR恶化"""
+        # 基于距离的基准SNR
+        base_snr = 20 * np.log10(100/distance) if distance > 0 else 0
+        
+        # 风机引起的附加损耗模型
+        angle_factor = 0.5 * (1 - np.cos(np.radians(incidence_angle)))
+        distance_factor = 10 * np.log10(max(turbine_distance, 0.1))
+        freq = self.radar_bands[radar_band]["freq"]
+        freq_factor = 20 * np.log10(freq / 1e9) * 0.1
+        
+        turbine_loss = angle_factor + distance_factor + freq_factor
+        degraded_snr = base_snr - turbine_loss
+        
+        return base_snr, degraded_snr, turbine_loss
+    
+    def calculate_detection_probability(self, snr_db):
+        """计算探测概率"""
+        if snr_db < -10:
+            return 0.1
+        elif snr_db > 10:
+            return 0.95
+        else:
+            return 0.1 + 0.85 * (snr_db + 10) / 20
+    
+    def generate_comprehensive_analysis(self, params):
+        """生成综合分析报告"""
+        analysis = {}
+        
+        # 多普勒分析
+        freq = self.radar_bands[params['radar_band']]["freq"]
+        analysis['doppler_shift'] = self.calculate_doppler_shift(
+            freq, params['target_speed'], params['incidence_angle']
+        )
+        analysis['doppler_velocity'] = analysis['doppler_shift'] * 3e8 / (2 * freq)
+        
+        # SNR分析
+        base_snr, degraded_snr, snr_loss = self.calculate_snr_degradation(
+            params['target_distance'], params['turbine_distance'], 
+            params['incidence_angle'], params['radar_band']
+        )
+        analysis.update({
+            'base_snr': base_snr,
+            'degraded_snr': degraded_snr,
+            'snr_degradation': snr_loss,
+            'snr_reduction_percent': (base_snr - degraded_snr) / abs(base_snr) * 100 if base_snr != 0 else 0
+        })
+        
+        # 探测概率分析
+        analysis['base_pd'] = self.calculate_detection_probability(base_snr)
+        analysis['degraded_pd'] = self.calculate_detection_probability(degraded_snr)
+        analysis['pd_reduction'] = analysis['base_pd'] - analysis['degraded_pd']
+        
+        # 风险等级评估
+        risk_score = min(1.0, max(0, (snr_loss/20 + analysis['pd_reduction']/0.3) / 2))
+        if risk_score > 0.7:
+            analysis['risk_level'] = "高风险"
+            analysis['risk_color'] = "risk-high"
+        elif risk_score > 0.4:
+            analysis['risk_level'] = "中风险" 
+            analysis['risk_color'] = "risk-medium"
+        else:
+            analysis['risk_level'] = "低风险"
+            analysis['risk_color'] = "risk-low"
+            
+        analysis['risk_score'] = risk_score
+        
+        return analysis
@@ -0,0 +1,424 @@
+"""
+风机遮挡计算模块
+基于均匀网格空间索引的射线-风机遮挡判定
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple, Any, Optional, Union
+from dataclasses import dataclass
+
+from config.config import PHYSICAL_CONSTANTS
+
+# 单个遍历分块中(射线×网格线)元素数量上限，用于限制临时数组内存
+_TRAVERSAL_CHUNK_ELEMENTS = 2_000_000
+
+# 网格每个方向的最大单元数
+_MAX_GRID_CELLS_PER_AXIS = 512
+
+
+def geodetic_to_local(
+    lat: Union[float, np.ndarray],
+    lon: Union[float, np.ndarray],
+    alt: Union[float, np.ndarray],
+    origin_lat: float,
+    origin_lon: float
+) -> np.ndarray:
+    """
+    经纬度转换为以origin为原点的局部东-北-天坐标（米）
+
+    采用等距圆柱近似，适用于风电场尺度（几十公里以内）的局部计算。
+
+    返回:
+        形状为(..., 3)的坐标数组 [x东, y北, z天]
+    """
+    earth_radius = PHYSICAL_CONSTANTS['earth_radius']
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    alt = np.asarray(alt, dtype=float)
+    x = np.radians(lon - origin_lon) * earth_radius * np.cos(np.radians(origin_lat))
+    y = np.radians(lat - origin_lat) * earth_radius
+    x, y, z = np.broadcast_arrays(x, y, alt)
+    return np.stack([x, y, z], axis=-1)
+
+
+@dataclass
+class OcclusionResult:
+    """
+    批量遮挡结果
+
+    以(射线, 风机)对的形式保存所有相交关系，按射线序号、进入点参数排序，
+    因此每条射线的第一个遮挡风机即其最近的遮挡物。
+    """
+    num_rays: int
+    ray_index: np.ndarray
+    turbine_index: np.ndarray
+    entry_t: np.ndarray
+
+    @property
+    def occluder_counts(self) -> np.ndarray:
+        """每条射线上的遮挡风机数量"""
+        return np.bincount(self.ray_index, minlength=self.num_rays)
+
+    @property
+    def blocked(self) -> np.ndarray:
+        """每条射线是否被遮挡"""
+        return self.occluder_counts > 0
+
+    def turbines_for_ray(self, ray: int) -> np.ndarray:
+        """返回指定射线上的遮挡风机序号（由近及远）"""
+        lo, hi = np.searchsorted(self.ray_index, [ray, ray + 1])
+        return self.turbine_index[lo:hi]
+
+    @property
+    def first_occluder(self) -> np.ndarray:
+        """每条射线上最近的遮挡风机序号，无遮挡为-1"""
+        first = np.full(self.num_rays, -1, dtype=np.int64)
+        if len(self.ray_index):
+            head = np.ones(len(self.ray_index), dtype=bool)
+            head[1:] = self.ray_index[1:] != self.ray_index[:-1]
+            first[self.ray_index[head]] = self.turbine_index[head]
+        return first
+
+
+class TurbineOcclusionEngine:
+    """
+    风机遮挡引擎
+
+    将每台风机建模为竖直圆柱（半径为叶轮半径，高度从塔基到叶尖），
+    在水平面上建立均匀网格索引。批量查询时先用网格包围盒剔除未经过
+    风电场的射线，再沿射线遍历所经过的网格单元得到候选风机，最后对
+    候选对做精确的射线-圆柱相交测试。
+    """
+
+    def __init__(
+        self,
+        centers_xy: np.ndarray,
+        base_z: np.ndarray,
+        top_z: np.ndarray,
+        radius: np.ndarray,
+        cell_size_m: Optional[float] = None
+    ):
+        """
+        初始化遮挡引擎
+
+        参数:
+            centers_xy: 风机中心水平坐标 (W, 2)，单位米
+            base_z: 塔基高度 (W,)
+            top_z: 叶尖最高点高度 (W,)
+            radius: 遮挡半径 (W,)，通常取叶轮半径
+            cell_size_m: 网格单元尺寸，None时按风机密度自动选择
+        """
+        self.centers_xy = np.asarray(centers_xy, dtype=float).reshape(-1, 2)
+        self.base_z = np.asarray(base_z, dtype=float).ravel()
+        self.top_z = np.asarray(top_z, dtype=float).ravel()
+        self.radius = np.asarray(radius, dtype=float).ravel()
+        self.num_turbines = len(self.centers_xy)
+        self.origin_lat = 0.0
+        self.origin_lon = 0.0
+        self._build_grid(cell_size_m)
+
+    @classmethod
+    def from_turbine_field(
+        cls,
+        field: Any,
+        cell_size_m: Optional[float] = None
+    ) -> 'TurbineOcclusionEngine':
+        """
+        从TurbineField构建遮挡引擎
+
+        局部坐标原点取风电场中心，风机高度取轮毂高度加叶轮半径（叶尖）。
+        """
+        origin_lat = float(np.mean(field.lat)) if len(field) else 0.0
+        origin_lon = float(np.mean(field.lon)) if len(field) else 0.0
+        local = geodetic_to_local(field.lat, field.lon, field.alt, origin_lat, origin_lon)
+        radius = np.asarray(field.rotor_diameter_m, dtype=float) / 2
+        engine = cls(
+            centers_xy=local[:, :2],
+            base_z=local[:, 2],
+            top_z=local[:, 2] + np.asarray(field.hub_height_m, dtype=float) + radius,
+            radius=radius,
+            cell_size_m=cell_size_m
+        )
+        engine.origin_lat = origin_lat
+        engine.origin_lon = origin_lon
+        return engine
+
+    def to_local(
+        self,
+        position: Dict[str, Union[float, np.ndarray]]
+    ) -> np.ndarray:
+        """将{lat, lon, alt}位置（分量可为数组）转换为引擎局部坐标"""
+        return geodetic_to_local(
+            position['lat'], position['lon'], position.get('alt', 0.0),
+            self.origin_lat, self.origin_lon
+        ).reshape(-1, 3)
+
+    def _build_grid(self, cell_size_m: Optional[float]) -> None:
+        """建立均匀网格索引，每台风机登记到其水平包围盒覆盖的所有单元"""
+        if self.num_turbines == 0:
+            self.grid_min = np.zeros(2)
+            self.cell_size = 1.0
+            self.grid_shape = (1, 1)
+            self.cell_start = np.zeros(2, dtype=np.int64)
+            self.cell_turbines = np.zeros(0, dtype=np.int64)
+            return
+
+        lo = (self.centers_xy - self.radius[:, None]).min(axis=0)
+        hi = (self.centers_xy + self.radius[:, None]).max(axis=0)
+        extent = np.maximum(hi - lo, 1e-6)
+
+        if cell_size_m is None:
+            # 平均每个单元约一台风机，且单元不小于风机直径
+            cell_size_m = max(
+                2 * float(self.radius.max()),
+                float(np.sqrt(extent[0] * extent[1] / self.num_turbines))
+            )
+        cell_size_m = max(cell_size_m, float(extent.max()) / _MAX_GRID_CELLS_PER_AXIS)
+
+        nx = int(np.ceil(extent[0] / cell_size_m)) or 1
+        ny = int(np.ceil(extent[1] / cell_size_m)) or 1
+
+        self.grid_min = lo
+        self.cell_size = float(cell_size_m)
+        self.grid_shape = (nx, ny)
+
+        # 每台风机覆盖的单元范围
+        ix0 = np.clip(((self.centers_xy[:, 0] - self.radius - lo[0]) // cell_size_m).astype(np.int64), 0, nx - 1)
+        ix1 = np.clip(((self.centers_xy[:, 0] + self.radius - lo[0]) // cell_size_m).astype(np.int64), 0, nx - 1)
+        iy0 = np.clip(((self.centers_xy[:, 1] - self.radius - lo[1]) // cell_size_m).astype(np.int64), 0, ny - 1)
+        iy1 = np.clip(((self.centers_xy[:, 1] + self.radius - lo[1]) // cell_size_m).astype(np.int64), 0, ny - 1)
+
+        cells: List[np.ndarray] = []
+        owners: List[np.ndarray] = []
+        for ox in range(int((ix1 - ix0).max()) + 1):
+            for oy in range(int((iy1 - iy0).max()) + 1):
+                mask = (ix0 + ox <= ix1) & (iy0 + oy <= iy1)
+                cells.append((ix0[mask] + ox) * ny + (iy0[mask] + oy))
+                owners.append(np.nonzero(mask)[0])
+        cell_ids = np.concatenate(cells)
+        turbine_ids = np.concatenate(owners)
+
+        order = np.argsort(cell_ids, kind='stable')
+        self.cell_turbines = turbine_ids[order]
+        counts = np.bincount(cell_ids, minlength=nx * ny)
+        self.cell_start = np.concatenate([[0], np.cumsum(counts)])
+
+    def _clip_to_grid(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Liang-Barsky水平裁剪：返回射线在网格包围盒内的参数区间及是否相交"""
+        grid_max = self.grid_min + self.cell_size * np.array(self.grid_shape)
+        t0 = np.zeros(len(origins))
+        t1 = np.ones(len(origins))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for axis in range(2):
+                o = origins[:, axis]
+                d = directions[:, axis]
+                ta = (self.grid_min[axis] - o) / d
+                tb = (grid_max[axis] - o) / d
+                parallel = d == 0
+                inside = (o >= self.grid_min[axis]) & (o <= grid_max[axis])
+                t_near = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(ta, tb))
+                t_far = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(ta, tb))
+                t0 = np.maximum(t0, t_near)
+                t1 = np.minimum(t1, t_far)
+        return t0, t1, t0 <= t1
+
+    def _traverse_cells(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        t0: np.ndarray,
+        t1: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算每条射线经过的网格单元
+
+        射线与竖直/水平网格线的交点把[t0, t1]切成若干段，每段中点所在单元
+        即为射线经过的单元，整个过程对一批射线向量化完成。
+        """
+        nx, ny = self.grid_shape
+        gx = self.grid_min[0] + self.cell_size * np.arange(1, nx)
+        gy = self.grid_min[1] + self.cell_size * np.arange(1, ny)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tx = (gx[None, :] - origins[:, :1]) / directions[:, :1]
+            ty = (gy[None, :] - origins[:, 1:2]) / directions[:, 1:2]
+        ts = np.concatenate([t0[:, None], tx, ty, t1[:, None]], axis=1)
+        outside = ~((ts >= t0[:, None]) & (ts <= t1[:, None]))
+        ts[outside] = np.nan
+        ts.sort(axis=1)
+
+        mid = 0.5 * (ts[:, :-1] + ts[:, 1:])
+        valid = ~np.isnan(mid)
+        rows, cols = np.nonzero(valid)
+        tm = mid[rows, cols]
+        px = origins[rows, 0] + tm * directions[rows, 0]
+        py = origins[rows, 1] + tm * directions[rows, 1]
+        ix = np.clip(((px - self.grid_min[0]) // self.cell_size).astype(np.int64), 0, nx - 1)
+        iy = np.clip(((py - self.grid_min[1]) // self.cell_size).astype(np.int64), 0, ny - 1)
+        return rows, ix * ny + iy
+
+    def _candidate_pairs(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        candidates: np.ndarray,
+        t0: np.ndarray,
+        t1: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """按块遍历网格，得到(射线, 风机)候选对（跨单元的风机可能重复出现）"""
+        nx, ny = self.grid_shape
+        chunk = max(1, _TRAVERSAL_CHUNK_ELEMENTS // (nx + ny + 2))
+        ray_parts: List[np.ndarray] = []
+        turbine_parts: List[np.ndarray] = []
+
+        for start in range(0, len(candidates), chunk):
+            sel = candidates[start:start + chunk]
+            rows, cells = self._traverse_cells(origins[sel], directions[sel], t0[sel], t1[sel])
+
+            counts = self.cell_start[cells + 1] - self.cell_start[cells]
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # CSR展开：每个(射线, 单元)对展开为单元内的全部风机
+            offsets = np.repeat(self.cell_start[cells] - np.cumsum(counts) + counts, counts)
+            turbines = self.cell_turbines[offsets + np.arange(total)]
+            rays = np.repeat(sel[rows], counts)
+
+            ray_parts.append(rays)
+            turbine_parts.append(turbines)
+
+        if not ray_parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(ray_parts), np.concatenate(turbine_parts)
+
+    def _intersect(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        rays: np.ndarray,
+        turbines: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """对候选对做射线段-竖直圆柱精确相交测试，返回命中掩码和进入点参数"""
+        hit = np.zeros(len(rays), dtype=bool)
+        entry = np.full(len(rays), np.inf)
+
+        # 水平面内线段与圆相交（先做，绝大多数候选在此被排除）
+        dx = directions[rays, 0]
+        dy = directions[rays, 1]
+        fx = origins[rays, 0] - self.centers_xy[turbines, 0]
+        fy = origins[rays, 1] - self.centers_xy[turbines, 1]
+        r = self.radius[turbines]
+        a = dx * dx + dy * dy
+        b = 2 * (fx * dx + fy * dy)
+        c = fx * fx + fy * fy - r * r
+        disc = b * b - 4 * a * c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sqrt_disc = np.sqrt(np.maximum(disc, 0.0))
+            t_in = np.where(a > 0, (-b - sqrt_disc) / (2 * a), np.where(c <= 0, 0.0, np.inf))
+            t_out = np.where(a > 0, (-b + sqrt_disc) / (2 * a), np.where(c <= 0, 1.0, -np.inf))
+        t_lo = np.maximum(t_in, 0.0)
+        t_hi = np.minimum(t_out, 1.0)
+        keep = np.nonzero((disc >= 0) & (t_lo <= t_hi))[0]
+
+        # 竖直方向：射线高度落在[塔基, 叶尖]内的参数区间
+        oz = origins[rays[keep], 2]
+        dz = directions[rays[keep], 2]
+        zb = self.base_z[turbines[keep]]
+        zt = self.top_z[turbines[keep]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tz_a = (zb - oz) / dz
+            tz_b = (zt - oz) / dz
+        flat = dz == 0
+        flat_inside = (oz >= zb) & (oz <= zt)
+        tz_lo = np.where(flat, np.where(flat_inside, -np.inf, np.inf), np.minimum(tz_a, tz_b))
+        tz_hi = np.where(flat, np.where(flat_inside, np.inf, -np.inf), np.maximum(tz_a, tz_b))
+
+        entry_keep = np.maximum(t_lo[keep], tz_lo)
+        hit[keep] = entry_keep <= np.minimum(t_hi[keep], tz_hi)
+        entry[keep] = entry_keep
+        return hit, entry
+
+    def query(
+        self,
+        origins: np.ndarray,
+        targets: np.ndarray
+    ) -> OcclusionResult:
+        """
+        批量查询射线遮挡
+
+        参数:
+            origins: 射线起点 (N, 3)，局部坐标（米），通常为雷达位置
+            targets: 射线终点 (N, 3)，通常为目标位置
+
+        返回:
+            遮挡结果
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+        targets = np.asarray(targets, dtype=float).reshape(-1, 3)
+        origins, targets = np.broadcast_arrays(origins, targets)
+        num_rays = len(origins)
+        empty = np.zeros(0, dtype=np.int64)
+        if self.num_turbines == 0 or num_rays == 0:
+            return OcclusionResult(num_rays, empty, empty, np.zeros(0))
+
+        directions = targets - origins
+
+        # 包围盒剔除：水平方向未经过风电场或全程高于最高叶尖的射线
+        t0, t1, hit = self._clip_to_grid(origins, directions)
+        hit &= np.minimum(origins[:, 2], targets[:, 2]) <= self.top_z.max()
+        hit &= np.maximum(origins[:, 2], targets[:, 2]) >= self.base_z.min()
+        candidates = np.nonzero(hit)[0]
+
+        rays, turbines = self._candidate_pairs(origins, directions, candidates, t0, t1)
+        if len(rays) == 0:
+            return OcclusionResult(num_rays, empty, empty, np.zeros(0))
+
+        intersects, entry = self._intersect(origins, directions, rays, turbines)
+        rays = rays[intersects]
+        turbines = turbines[intersects]
+        entry = entry[intersects]
+
+        # 跨越多个网格单元的风机会产生重复命中，排序后去重
+        order = np.lexsort((turbines, rays))
+        rays, turbines, entry = rays[order], turbines[order], entry[order]
+        first = np.ones(len(rays), dtype=bool)
+        first[1:] = (rays[1:] != rays[:-1]) | (turbines[1:] != turbines[:-1])
+        rays, turbines, entry = rays[first], turbines[first], entry[first]
+
+        order = np.lexsort((entry, rays))
+        return OcclusionResult(num_rays, rays[order], turbines[order], entry[order])
+
+    def visibility_matrix(
+        self,
+        radars: np.ndarray,
+        targets: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, OcclusionResult]:
+        """
+        计算R部雷达与T个目标两两之间的视线
+
+        参数:
+            radars: 雷达位置 (R, 3)，局部坐标（米）
+            targets: 目标位置 (T, 3)
+
+        返回:
+            (视线畅通矩阵 (R, T), 最近遮挡风机序号矩阵 (R, T)（无遮挡为-1),
+             按R×T行优先展开射线的完整遮挡结果)
+        """
+        radars = np.asarray(radars, dtype=float).reshape(-1, 3)
+        targets = np.asarray(targets, dtype=float).reshape(-1, 3)
+        shape = (len(radars), len(targets))
+        result = self.query(np.repeat(radars, shape[1], axis=0), np.tile(targets, (shape[0], 1)))
+        return ~result.blocked.reshape(shape), result.first_occluder.reshape(shape), result
+
+    def query_geodetic(
+        self,
+        radar_position: Dict[str, Union[float, np.ndarray]],
+        target_position: Dict[str, Union[float, np.ndarray]]
+    ) -> OcclusionResult:
+        """以{lat, lon, alt}位置（分量可为数组）批量查询雷达→目标射线遮挡"""
+        return self.query(self.to_local(radar_position), self.to_local(target_position))
@@ -8,13 +8,15 @@
 import numpy as np
 from scipy import constants
 from scipy import signal
+from scipy import special
 from typing import Dict, List, Tuple, Any, Optional, Union
-import math
 from dataclasses import dataclass
 from config.config import (
     PHYSICAL_CONSTANTS, EVALUATION_PARAMS, RADAR_FREQUENCY_BANDS,
     ANTENNA_TYPES, TURBINE_MODELS, TARGET_RCS_DB
 )
+from utils.occlusion import TurbineOcclusionEngine, OcclusionResult
+from utils.pd_table import PdTable, default_cache_dir
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -50,6 +52,107 @@ class TurbineParameters:
     orientation_deg: float
     rcs_profile: str
     blade_material: str
+
+# 大气衰减分段表：频率分界（GHz）与对应衰减（dB/km），与calculate_atmospheric_loss一致
+_ATMOSPHERIC_BAND_EDGES_GHZ = np.array([3.0, 6.0, 10.0, 20.0, 30.0])
+_ATMOSPHERIC_ATTENUATION_DB_PER_KM = np.array([0.01, 0.02, 0.05, 0.1, 0.2, 0.5])
+
+# 风机RCS配置与叶片材料系数，与calculate_turbine_rcs一致
+_TURBINE_BASE_RCS = {"small": 10.0, "medium": 50.0, "large": 100.0}
+_TURBINE_DEFAULT_BASE_RCS = 30.0
+_BLADE_MATERIAL_FACTOR = {"复合材料": 1.0, "金属": 1.2}
+_BLADE_DEFAULT_MATERIAL_FACTOR = 1.1
+
+@dataclass
+class TurbineField:
+    """
+    风机场列式模型
+    
+    以连续的NumPy数组保存整个风电场的风机位置、轮毂高度、叶轮直径和RCS，
+    使整场计算可以一次向量化完成，而不是逐个遍历TurbineParameters实例。
+    base_rcs_m2为与频率、视角无关的部分（基础RCS×叶片材料系数）。
+    """
+    lat: np.ndarray
+    lon: np.ndarray
+    alt: np.ndarray
+    hub_height_m: np.ndarray
+    rotor_diameter_m: np.ndarray
+    orientation_deg: np.ndarray
+    base_rcs_m2: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_turbines(cls, turbines: List[TurbineParameters]) -> 'TurbineField':
+        """从TurbineParameters列表构建列式风机场"""
+        n = len(turbines)
+        lat = np.empty(n)
+        lon = np.empty(n)
+        alt = np.empty(n)
+        hub_height = np.empty(n)
+        diameter = np.empty(n)
+        orientation = np.empty(n)
+        base_rcs = np.empty(n)
+        for i, turbine in enumerate(turbines):
+            position = turbine.position
+            lat[i] = position.get('lat', 0.0)
+            lon[i] = position.get('lon', 0.0)
+            alt[i] = position.get('alt', 0.0)
+            hub_height[i] = turbine.height_m
+            diameter[i] = turbine.rotor_diameter_m
+            orientation[i] = turbine.orientation_deg
+            base_rcs[i] = (
+                _TURBINE_BASE_RCS.get(turbine.rcs_profile, _TURBINE_DEFAULT_BASE_RCS)
+                * _BLADE_MATERIAL_FACTOR.get(turbine.blade_material, _BLADE_DEFAULT_MATERIAL_FACTOR)
+            )
+        return cls(lat, lon, alt, hub_height, diameter, orientation, base_rcs)
+
+    @classmethod
+    def coerce(
+        cls,
+        turbines: Union['TurbineField', List[TurbineParameters], None]
+    ) -> Optional['TurbineField']:
+        """将风机列表或风机场统一转换为TurbineField，空输入返回None"""
+        if turbines is None:
+            return None
+        if isinstance(turbines, TurbineField):
+            return turbines if len(turbines) > 0 else None
+        if len(turbines) == 0:
+            return None
+        return cls.from_turbines(turbines)
+
+    def occlusion_engine(self) -> TurbineOcclusionEngine:
+        """返回本风机场的遮挡引擎（首次调用时建立空间索引并缓存）"""
+        engine = self.__dict__.get('_occlusion_engine')
+        if engine is None:
+            engine = TurbineOcclusionEngine.from_turbine_field(self)
+            self.__dict__['_occlusion_engine'] = engine
+        return engine
+
+    def position_dict(self) -> Dict[str, np.ndarray]:
+        """以{lat, lon, alt}字典形式返回位置数组，与标量接口的位置格式一致"""
+        return {'lat': self.lat, 'lon': self.lon, 'alt': self.alt}
+
+    def rcs_m2(
+        self,
+        frequency_ghz: Union[float, np.ndarray],
+        aspect_angle_deg: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """计算每台风机的RCS（m²），与RadarCalculator.calculate_turbine_rcs模型一致"""
+        freq_factor = 1.0 + 0.1 * (np.asarray(frequency_ghz, dtype=float) - 3)
+        aspect_factor = 1.0 + 0.5 * np.cos(2 * np.radians(aspect_angle_deg))
+        return self.base_rcs_m2 * freq_factor * aspect_factor
+
+    def total_rcs_m2(
+        self,
+        frequency_ghz: Union[float, np.ndarray],
+        aspect_angle_deg: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """计算全场风机RCS之和（m²），频率和视角可为数组"""
+        freq_factor = 1.0 + 0.1 * (np.asarray(frequency_ghz, dtype=float) - 3)
+        aspect_factor = 1.0 + 0.5 * np.cos(2 * np.radians(aspect_angle_deg))
+        return float(self.base_rcs_m2.sum()) * freq_factor * aspect_factor
     
 @dataclass
 class CalculationResults:
@@ -84,6 +187,63 @@ class CalculationResults:
             'phase_shift_rad': self.phase_shift_rad
         }
 
+@dataclass
+class BatchCalculationResults:
+    """批量计算结果类（列式数组，每个字段长度相同）"""
+    distance_m: np.ndarray
+    snr_db: np.ndarray
+    received_power_db: np.ndarray
+    doppler_frequency_hz: np.ndarray
+    range_resolution_m: np.ndarray
+    velocity_resolution_ms: np.ndarray
+    detection_probability: np.ndarray
+    multipath_loss_db: np.ndarray
+    atmospheric_loss_db: np.ndarray
+    interference_level_db: np.ndarray
+    clutter_power_db: np.ndarray
+    bistatic_range_m: np.ndarray
+    time_delay_us: np.ndarray
+    phase_shift_rad: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.distance_m)
+
+    def row(self, index: int) -> CalculationResults:
+        """取出单个点的结果，便于复用标量接口（如性能指标评估）"""
+        return CalculationResults(
+            snr_db=float(self.snr_db[index]),
+            received_power_db=float(self.received_power_db[index]),
+            doppler_frequency_hz=float(self.doppler_frequency_hz[index]),
+            range_resolution_m=float(self.range_resolution_m[index]),
+            velocity_resolution_ms=float(self.velocity_resolution_ms[index]),
+            detection_probability=float(self.detection_probability[index]),
+            multipath_loss_db=float(self.multipath_loss_db[index]),
+            interference_level_db=float(self.interference_level_db[index]),
+            clutter_power_db=float(self.clutter_power_db[index]),
+            bistatic_range_m=float(self.bistatic_range_m[index]),
+            time_delay_us=float(self.time_delay_us[index]),
+            phase_shift_rad=float(self.phase_shift_rad[index])
+        )
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        """转换为字典（列表形式，便于JSON序列化）"""
+        return {
+            'distance_m': self.distance_m.tolist(),
+            'snr_db': self.snr_db.tolist(),
+            'received_power_db': self.received_power_db.tolist(),
+            'doppler_frequency_hz': self.doppler_frequency_hz.tolist(),
+            'range_resolution_m': self.range_resolution_m.tolist(),
+            'velocity_resolution_ms': self.velocity_resolution_ms.tolist(),
+            'detection_probability': self.detection_probability.tolist(),
+            'multipath_loss_db': self.multipath_loss_db.tolist(),
+            'atmospheric_loss_db': self.atmospheric_loss_db.tolist(),
+            'interference_level_db': self.interference_level_db.tolist(),
+            'clutter_power_db': self.clutter_power_db.tolist(),
+            'bistatic_range_m': self.bistatic_range_m.tolist(),
+            'time_delay_us': self.time_delay_us.tolist(),
+            'phase_shift_rad': self.phase_shift_rad.tolist()
+        }
+
 class RadarCalculator:
     """雷达计算器"""
     
@@ -93,6 +253,7 @@ class RadarCalculator:
         self.k = PHYSICAL_CONSTANTS['boltzmann_constant']
         self.T0 = PHYSICAL_CONSTANTS['standard_temperature']
         self.earth_radius = PHYSICAL_CONSTANTS['earth_radius']
+        self._pd_table: Optional[PdTable] = None  # 检测概率查找表（首次计算检测概率时创建）
         
     def wavelength(self, frequency_ghz: float) -> float:
         """计算波长（米）"""
@@ -332,6 +493,25 @@ class RadarCalculator:
         
         return loss_db
     
+    def calculate_atmospheric_loss_batch(
+        self,
+        frequency_ghz: Union[float, np.ndarray],
+        distance_m: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """
+        批量计算大气损耗（与calculate_atmospheric_loss相同的分段模型）
+        
+        参数:
+            frequency_ghz: 频率数组（GHz）
+            distance_m: 距离数组（m），与频率按广播规则对齐
+            
+        返回:
+            大气损耗数组（dB）
+        """
+        band_index = np.digitize(frequency_ghz, _ATMOSPHERIC_BAND_EDGES_GHZ)
+        attenuation_db_per_km = _ATMOSPHERIC_ATTENUATION_DB_PER_KM[band_index]
+        return attenuation_db_per_km * (np.asarray(distance_m, dtype=float) / 1000)
+    
     def calculate_turbine_rcs(
         self,
         turbine: TurbineParameters,
@@ -350,14 +530,7 @@ class RadarCalculator:
             风机RCS（m²）
         """
         # 根据风机型号和RCS配置文件
-        if turbine.rcs_profile == "small":
-            base_rcs = 10.0
-        elif turbine.rcs_profile == "medium":
-            base_rcs = 50.0
-        elif turbine.rcs_profile == "large":
-            base_rcs = 100.0
-        else:
-            base_rcs = 30.0
+        base_rcs = _TURBINE_BASE_RCS.get(turbine.rcs_profile, _TURBINE_DEFAULT_BASE_RCS)
         
         # 频率影响
         wavelength = self.wavelength(frequency_ghz)
@@ -368,12 +541,9 @@ class RadarCalculator:
         aspect_factor = 1.0 + 0.5 * np.cos(2 * aspect_rad)  # 正面和侧面RCS较大
         
         # 叶片材料影响
-        if turbine.blade_material == "复合材料":
-            material_factor = 1.0
-        elif turbine.blade_material == "金属":
-            material_factor = 1.2
-        else:
-            material_factor = 1.1
+        material_factor = _BLADE_MATERIAL_FACTOR.get(
+            turbine.blade_material, _BLADE_DEFAULT_MATERIAL_FACTOR
+        )
         
         # 计算总RCS
         rcs = base_rcs * freq_factor * aspect_factor * material_factor
@@ -383,28 +553,41 @@ class RadarCalculator:
     def calculate_turbine_shadowing(
         self,
         radar_position: Dict[str, float],
-        turbine_position: Dict[str, float],
+        turbine_position: Union[Dict[str, float], TurbineField],
         target_position: Dict[str, float],
-        turbine_height_m: float,
-        turbine_diameter_m: float
-    ) -> Dict[str, float]:
+        turbine_height_m: Optional[float] = None,
+        turbine_diameter_m: Optional[float] = None
+    ) -> Dict[str, Union[float, np.ndarray]]:
         """
         计算风机遮挡效应
         
         参数:
             radar_position: 雷达位置 {lat, lon, alt}
-            turbine_position: 风机位置 {lat, lon, alt}
+            turbine_position: 风机位置 {lat, lon, alt}，或整场TurbineField
             target_position: 目标位置 {lat, lon, alt}
-            turbine_height_m: 风机高度（m）
-            turbine_diameter_m: 风机直径（m）
+            turbine_height_m: 风机高度（m），传入TurbineField时取其轮毂高度
+            turbine_diameter_m: 风机直径（m），传入TurbineField时取其叶轮直径
             
         返回:
-            遮挡效应计算结果
+            遮挡效应计算结果；传入TurbineField时各项为按风机排列的数组，
+            并额外给出is_occluding（该风机是否实际遮挡雷达→目标视线）
         """
         # 简化计算：判断目标是否在风机阴影区内
         # 实际应用中应使用更精确的几何计算
-        
-        # 计算距离
+        occluding = None
+        if isinstance(turbine_position, TurbineField):
+            field = turbine_position
+            # 空间索引遮挡判定：雷达→目标射线实际穿过的风机
+            occlusion = field.occlusion_engine().query_geodetic(radar_position, target_position)
+            occluding = np.zeros(len(field), dtype=bool)
+            occluding[occlusion.turbine_index] = True
+            turbine_position = field.position_dict()
+            if turbine_height_m is None:
+                turbine_height_m = field.hub_height_m
+            if turbine_diameter_m is None:
+                turbine_diameter_m = field.rotor_diameter_m
+        
+        # 计算距离（位置分量可为数组，整场一次完成）
         def distance_3d(pos1, pos2):
             dx = pos1['lat'] - pos2['lat']
             dy = pos1['lon'] - pos2['lon']
@@ -423,15 +606,41 @@ class RadarCalculator:
         shadow_length = turbine_height_m * R_tt / R_rt
         
         # 遮挡概率（简化模型）
-        shadow_probability = min(0.3, turbine_diameter_m / (2 * R_rt_total))
+        shadow_probability = np.minimum(0.3, turbine_diameter_m / (2 * R_rt_total))
         
-        return {
+        results = {
             'shadow_angle_deg': shadow_angle,
             'shadow_length_m': shadow_length,
             'shadow_probability': shadow_probability,
             'radar_turbine_distance_m': R_rt,
             'turbine_target_distance_m': R_tt
         }
+        if occluding is not None:
+            results['is_occluding'] = occluding
+        
+        return results
+    
+    def calculate_ray_occlusion(
+        self,
+        radar_positions: Dict[str, Union[float, np.ndarray]],
+        target_positions: Dict[str, Union[float, np.ndarray]],
+        turbines: Union[TurbineField, List[TurbineParameters]]
+    ) -> OcclusionResult:
+        """
+        批量计算雷达→目标射线的风机遮挡
+        
+        参数:
+            radar_positions: 雷达位置 {lat, lon, alt}，分量可为数组
+            target_positions: 目标位置 {lat, lon, alt}，分量可为数组（与雷达位置广播对齐）
+            turbines: 风机列表或列式风机场TurbineField
+            
+        返回:
+            遮挡结果，包含每条射线穿过的风机序号
+        """
+        field = TurbineField.coerce(turbines)
+        if field is None:
+            field = TurbineField.from_turbines([])
+        return field.occlusion_engine().query_geodetic(radar_positions, target_positions)
     
     def calculate_detection_probability(
         self,
@@ -440,7 +649,7 @@ class RadarCalculator:
         integration_pulses: int = 1
     ) -> float:
         """
-        计算检测概率
+        计算检测概率（查表插值）
         
         参数:
             snr_db: 信噪比（dB）
@@ -450,24 +659,72 @@ class RadarCalculator:
         返回:
             检测概率
         """
-        # Swerling模型（Swerling I）
-        snr_linear = self.db_to_linear(snr_db)
+        return float(self.calculate_detection_probability_batch(snr_db, pfa))
+    
+    def calculate_detection_probability_batch(
+        self,
+        snr_db: np.ndarray,
+        pfa: float = 1e-6
+    ) -> np.ndarray:
+        """
+        批量计算检测概率（查表插值）
         
-        # 门限
-        threshold = -np.log(pfa)
+        与calculate_detection_probability使用相同的近似，检测概率预先在
+        (SNR, Pfa)网格上制表并持久化到磁盘缓存，扫描计算时只做插值；
+        Pfa超出网格范围时按公式直接计算
         
-        # 检测概率（简化计算）
-        if snr_linear <= 0:
-            pd = 0.0
+        参数:
+            snr_db: 信噪比数组（dB）
+            pfa: 虚警概率
+            
+        返回:
+            检测概率数组
+        """
+        snr_db = np.asarray(snr_db, dtype=float)
+        valid = np.isfinite(snr_db)
+        snr_db_valid = np.where(valid, snr_db, 0.0)
+        
+        if self.pd_table.covers(0.0, pfa):
+            pd = self.pd_table.lookup(snr_db_valid, pfa, 1, "swerling1")
         else:
-            # 使用Marcum Q函数近似
-            beta = np.sqrt(2 * snr_linear)
-            pd = 0.5 * (1 + math.erf((beta - threshold) / np.sqrt(2)))
+            pd = self._detection_probability_grid(pfa, snr_db_valid.ravel(), 1, "swerling1")
+            pd = pd.reshape(snr_db.shape)
         
-        # 限制在[0,1]范围内
-        pd = max(0.0, min(1.0, pd))
+        # 非有限SNR（如完全遮挡时的-inf）检测概率为0
+        return np.where(valid, pd, 0.0)
+    
+    @property
+    def pd_table(self) -> PdTable:
+        """检测概率查找表，基于本计算器的检测近似"""
+        if self._pd_table is None:
+            self._pd_table = PdTable(
+                pd_func=self._detection_probability_grid,
+                model_name="windfarm_radar_calculator",
+                cache_dir=default_cache_dir("pd_tables")
+            )
+        return self._pd_table
+    
+    def _detection_probability_grid(
+        self,
+        pfa: np.ndarray,
+        snr_db: np.ndarray,
+        integration_pulses: int,
+        target_model: str
+    ) -> np.ndarray:
+        """
+        在(Pfa, SNR)网格上计算检测概率，供查找表制表使用
+        
+        Swerling I模型，使用Marcum Q函数的erf近似
         
-        return pd
+        返回:
+            形状为(len(pfa), len(snr_db))的检测概率
+        """
+        snr_linear = 10 ** (np.asarray(snr_db, dtype=float) / 10)
+        threshold = -np.log(np.atleast_1d(np.asarray(pfa, dtype=float)))[:, np.newaxis]
+        beta = np.sqrt(2 * snr_linear)[np.newaxis, :]
+        pd = 0.5 * (1 + special.erf((beta - threshold) / np.sqrt(2)))
+        pd = np.where(snr_linear > 0, pd, 0.0)
+        return np.clip(pd, 0.0, 1.0)
     
     def calculate_range_resolution(
         self,
@@ -694,7 +951,7 @@ class RadarCalculator:
         self,
         radar: RadarParameters,
         target: TargetParameters,
-        turbines: Optional[List[TurbineParameters]] = None,
+        turbines: Optional[Union[TurbineField, List[TurbineParameters]]] = None,
         include_turbine_effects: bool = True
     ) -> CalculationResults:
         """
@@ -703,7 +960,7 @@ class RadarCalculator:
         参数:
             radar: 雷达参数
             target: 目标参数
-            turbines: 风机列表
+            turbines: 风机列表或列式风机场TurbineField
             include_turbine_effects: 是否包含风机影响
             
         返回:
@@ -752,17 +1009,14 @@ class RadarCalculator:
         time_delay = 0
         phase_shift = 0
         
-        if include_turbine_effects and turbines:
-            # 计算风机RCS
-            total_turbine_rcs = 0
-            for turbine in turbines:
-                # 简化：假设所有风机在相同方位
-                turbine_rcs = self.calculate_turbine_rcs(
-                    turbine,
-                    radar.frequency_ghz,
-                    target.azimuth_deg
-                )
-                total_turbine_rcs += turbine_rcs
+        field = TurbineField.coerce(turbines) if include_turbine_effects else None
+        if field is not None:
+            # 计算风机RCS（整场向量化求和）
+            # 简化：假设所有风机在相同方位
+            total_turbine_rcs = field.total_rcs_m2(
+                radar.frequency_ghz,
+                target.azimuth_deg
+            )
             
             # 风机引起的额外杂波
             if total_turbine_rcs > 0:
@@ -773,7 +1027,7 @@ class RadarCalculator:
                 )
             
             # 风机引起的干扰（简化模型）
-            interference_level_db = -80 + 10 * np.log10(len(turbines))
+            interference_level_db = -80 + 10 * np.log10(len(field))
             
             # 双基地效应
             bistatic_range = target.distance_m * 1.1  # 增加10%
@@ -798,6 +1052,124 @@ class RadarCalculator:
         
         return results
     
+    def perform_batch_analysis(
+        self,
+        radar: RadarParameters,
+        distances_m: np.ndarray,
+        altitudes_m: Union[float, np.ndarray],
+        rcs_m2: Union[float, np.ndarray],
+        frequencies_ghz: Optional[Union[float, np.ndarray]] = None,
+        velocities_ms: Union[float, np.ndarray] = 0.0,
+        azimuths_deg: Union[float, np.ndarray] = 0.0,
+        turbines: Optional[Union[TurbineField, List[TurbineParameters]]] = None,
+        include_turbine_effects: bool = True
+    ) -> BatchCalculationResults:
+        """
+        批量执行综合分析
+        
+        与perform_comprehensive_analysis逐点计算结果一致，但一次调用对整组
+        目标点做向量化计算，适用于距离扫描等成千上万点的场景。
+        
+        参数:
+            radar: 雷达参数
+            distances_m: 目标距离数组（m）
+            altitudes_m: 目标高度（m），标量或数组
+            rcs_m2: 目标RCS（m²），标量或数组
+            frequencies_ghz: 雷达频率（GHz），标量或数组，None时使用radar.frequency_ghz
+            velocities_ms: 目标径向速度（m/s），标量或数组
+            azimuths_deg: 目标方位（度），标量或数组，用于风机RCS视角
+            turbines: 风机列表或列式风机场TurbineField
+            include_turbine_effects: 是否包含风机影响
+            
+        返回:
+            列式批量计算结果
+        """
+        if frequencies_ghz is None:
+            frequencies_ghz = radar.frequency_ghz
+        
+        R, h, sigma, f, v, az = (
+            np.array(a, dtype=float) for a in np.broadcast_arrays(
+                distances_m, altitudes_m, rcs_m2, frequencies_ghz,
+                velocities_ms, azimuths_deg
+            )
+        )
+        R, h, sigma, f, v, az = (a.ravel() for a in (R, h, sigma, f, v, az))
+        n = R.size
+        
+        wavelength = self.c / (f * 1e9)
+        
+        # 雷达方程（含系统损耗和大气损耗）
+        Pt = radar.peak_power_w
+        Gt = self.db_to_linear(radar.antenna_gain_db)
+        Ls = self.db_to_linear(radar.system_losses_db)
+        atmospheric_loss_db = self.calculate_atmospheric_loss_batch(f, R)
+        La = 10 ** (atmospheric_loss_db / 10)
+        Pr_total = (Pt * Gt**2 * wavelength**2 * sigma) / ((4 * np.pi)**3 * R**4) / (Ls * La)
+        
+        # 噪声功率（带宽由脉冲宽度确定）
+        B = 1.0 / (radar.pulse_width_us * 1e-6)
+        F = self.db_to_linear(radar.noise_figure_db)
+        Pn = self.k * self.T0 * B * F
+        
+        with np.errstate(divide='ignore'):
+            received_power_db = np.where(Pr_total > 0, 10 * np.log10(Pr_total), -np.inf)
+            snr_db = np.where(Pr_total > 0, 10 * np.log10(Pr_total / Pn), -np.inf)
+        
+        # 多普勒与分辨率
+        doppler_freq = 2 * v / wavelength
+        range_res = np.full(n, self.calculate_range_resolution(radar.pulse_width_us))
+        dwell_time = 1.0 / radar.prf_hz
+        velocity_res = wavelength / (2 * dwell_time)
+        
+        # 检测概率
+        detection_prob = self.calculate_detection_probability_batch(snr_db)
+        
+        # 多径效应（calculate_multipath_effect本身支持数组输入）
+        multipath = self.calculate_multipath_effect(
+            radar.antenna_height_m, h, R, f
+        )
+        
+        interference_level_db = np.full(n, -100.0)
+        clutter_power_db = np.full(n, -120.0)
+        bistatic_range = np.zeros(n)
+        time_delay = np.zeros(n)
+        phase_shift = np.zeros(n)
+        
+        field = TurbineField.coerce(turbines) if include_turbine_effects else None
+        if field is not None:
+            total_turbine_rcs = field.total_rcs_m2(f, az)
+            
+            Pc_total = (Pt * Gt**2 * wavelength**2 * total_turbine_rcs) / ((4 * np.pi)**3 * R**4) / Ls
+            with np.errstate(divide='ignore', invalid='ignore'):
+                clutter_power_db = np.where(
+                    total_turbine_rcs > 0,
+                    np.where(Pc_total > 0, 10 * np.log10(Pc_total), -np.inf),
+                    clutter_power_db
+                )
+            
+            interference_level_db[:] = -80 + 10 * np.log10(len(field))
+            
+            bistatic_range = R * 1.1
+            time_delay = bistatic_range / self.c * 1e6
+            phase_shift = 2 * np.pi * bistatic_range / wavelength
+        
+        return BatchCalculationResults(
+            distance_m=R,
+            snr_db=snr_db,
+            received_power_db=received_power_db,
+            doppler_frequency_hz=doppler_freq,
+            range_resolution_m=range_res,
+            velocity_resolution_ms=velocity_res,
+            detection_probability=detection_prob,
+            multipath_loss_db=np.asarray(multipath['multipath_loss_db'], dtype=float),
+            atmospheric_loss_db=atmospheric_loss_db,
+            interference_level_db=interference_level_db,
+            clutter_power_db=clutter_power_db,
+            bistatic_range_m=bistatic_range,
+            time_delay_us=time_delay,
+            phase_shift_rad=phase_shift
+        )
+    
     def calculate_scenario_comparison(
         self,
         scenario_without_turbines: Dict[str, Any],
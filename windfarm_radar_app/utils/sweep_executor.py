@@ -0,0 +1,649 @@
+"""
+参数扫描执行模块
+全因子参数扫描的分块并行执行、列式落盘与断点续算
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 默认扫描结果目录，可通过环境变量WINDFARM_SWEEP_DIR覆盖
+DEFAULT_SWEEP_DIR = Path(
+    os.environ.get(
+        'WINDFARM_SWEEP_DIR',
+        Path.home() / '.cache' / 'windfarm_radar' / 'sweeps'
+    )
+)
+
+_MANIFEST_NAME = 'sweep.json'
+_EXPORT_NAME = 'results.csv'
+
+# 分块文件中记录失败参数组合的字段（不属于结果列）
+_FAILED_INDEX_KEY = '_failed_index'
+_FAILED_ERROR_KEY = '_failed_error'
+
+# 含None或混合类型的结果列以字符串保存，另存有效值掩码（键名为前缀+列名）
+_VALID_PREFIX = '_valid.'
+
+# 分块文件格式版本（参与扫描签名，旧格式的分块不会被续算复用）
+_CHUNK_FORMAT = 2
+
+# 执行统计中最多返回的失败记录条数
+MAX_REPORTED_ERRORS = 100
+
+
+def _to_builtin(value: Any) -> Any:
+    """将NumPy标量/数组转换为可JSON序列化的Python对象"""
+    if isinstance(value, np.ndarray):
+        return [_to_builtin(v) for v in value.tolist()]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_builtin(v) for k, v in value.items()}
+    return value
+
+
+def _grid_points(
+    param_grid: Dict[str, List[Any]],
+    start: int,
+    stop: int
+) -> Iterator[Dict[str, Any]]:
+    """按全因子展开顺序（最后一维变化最快）生成[start, stop)区间的参数组合"""
+    names = list(param_grid.keys())
+    shape = tuple(len(param_grid[name]) for name in names)
+    indices = np.unravel_index(np.arange(start, stop), shape)
+    for row in zip(*indices):
+        yield {name: param_grid[name][i] for name, i in zip(names, row)}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating))
+
+
+def _encode_column(name: str, values: List[Any]) -> Dict[str, np.ndarray]:
+    """
+    将一列结果编码为不需要pickle即可保存的数组
+
+    数值/字符串列直接保存；含None的数值列转为浮点并以NaN表示缺失；
+    其余含None或混合类型的列转为Unicode字符串，并附带有效值掩码
+    """
+    array = np.asarray(values)
+    if array.dtype != object and array.ndim == 1:
+        return {name: array}
+
+    valid = np.array([value is not None for value in values], dtype=bool)
+    if all(_is_number(value) for value, ok in zip(values, valid) if ok):
+        return {name: np.array([value if ok else np.nan for value, ok in zip(values, valid)], dtype=float)}
+    return {
+        name: np.array([str(value) if ok else '' for value, ok in zip(values, valid)], dtype=str),
+        _VALID_PREFIX + name: valid
+    }
+
+
+def _decode_column(data: Any, name: str) -> np.ndarray:
+    """读取一列结果，带有效值掩码的字符串列中无效项还原为None"""
+    array = data[name]
+    mask_key = _VALID_PREFIX + name
+    if mask_key not in data.files:
+        return array
+    values = array.astype(object)
+    values[~data[mask_key]] = None
+    return values
+
+
+def _write_columns(path: Path, columns: Dict[str, np.ndarray]) -> None:
+    """原子写入列式分块文件：先写临时文件再重命名，保证文件存在即完整"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _run_chunk(
+    evaluate: Callable[[Dict[str, Any]], Dict[str, Any]],
+    base_params: Dict[str, Any],
+    param_grid: Dict[str, List[Any]],
+    start: int,
+    stop: int,
+    path: str
+) -> Tuple[int, int, List[Tuple[int, str]]]:
+    """
+    计算一个分块并写入磁盘（在工作进程中执行）
+
+    失败的参数组合序号与错误信息随结果一起写入分块文件，续算时同样可以报告。
+
+    返回:
+        (分块起点, 成功行数, 失败记录列表 [(参数组合序号, 错误信息)])
+    """
+    columns: Dict[str, List[Any]] = {}
+    rows = 0
+    errors: List[Tuple[int, str]] = []
+    for index, point in enumerate(_grid_points(param_grid, start, stop), start):
+        sim_params = dict(base_params)
+        sim_params.update(point)
+        try:
+            analysis = evaluate(sim_params)
+        except Exception as e:
+            errors.append((index, f"{type(e).__name__}: {e}"))
+            continue
+
+        row = {**sim_params, **analysis}
+        if not columns:
+            columns = {key: [] for key in row}
+        for key in columns:
+            columns[key].append(row.get(key))
+        rows += 1
+
+    arrays: Dict[str, np.ndarray] = {}
+    for key, values in columns.items():
+        arrays.update(_encode_column(key, values))
+    arrays[_FAILED_INDEX_KEY] = np.array([index for index, _ in errors], dtype=np.int64)
+    arrays[_FAILED_ERROR_KEY] = np.array([message for _, message in errors], dtype=str)
+    _write_columns(Path(path), arrays)
+    return start, rows, errors
+
+
+class ChunkedSweepExecutor:
+    """
+    分块全因子扫描执行器
+
+    参数网格按全因子顺序编号后切分为固定大小的分块，分块分发到进程池计算，
+    每个分块完成后立即以列式.npz文件落盘。扫描目录由网格与基准参数的哈希
+    确定，重复运行同一扫描时跳过已完成的分块，从而在崩溃后断点续算。
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Dict[str, Any]], Dict[str, Any]],
+        param_grid: Dict[str, Sequence[Any]],
+        base_params: Optional[Dict[str, Any]] = None,
+        output_dir: Optional[Path] = None,
+        chunk_size: int = 5000,
+        max_workers: Optional[int] = None
+    ):
+        """
+        初始化执行器
+
+        参数:
+            evaluate: 单点评估函数，接收参数字典返回结果字典，须可被pickle
+                      （模块级函数或可导入类实例的方法）
+            param_grid: 扫描参数网格 {参数名: 取值序列}
+            base_params: 基准参数，扫描参数覆盖其中的同名项
+            output_dir: 扫描结果根目录，默认DEFAULT_SWEEP_DIR
+            chunk_size: 每个分块的参数组合数
+            max_workers: 工作进程数，None为CPU核数，1为在当前进程内串行执行
+        """
+        self.evaluate = evaluate
+        self.param_grid = {name: _to_builtin(list(values)) for name, values in param_grid.items()}
+        self.base_params = _to_builtin(dict(base_params or {}))
+        self.chunk_size = max(1, int(chunk_size))
+        self.max_workers = max_workers
+
+        self.total_points = int(np.prod([len(v) for v in self.param_grid.values()], dtype=np.int64))
+        self.num_chunks = -(-self.total_points // self.chunk_size)
+
+        self.sweep_id = self._signature()
+        self.sweep_dir = Path(output_dir or DEFAULT_SWEEP_DIR) / self.sweep_id
+
+    def _signature(self) -> str:
+        """扫描签名：网格、基准参数、分块大小和分块文件格式共同决定"""
+        blob = json.dumps(
+            {
+                'format': _CHUNK_FORMAT,
+                'param_grid': self.param_grid,
+                'base_params': self.base_params,
+                'chunk_size': self.chunk_size
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha1(blob.encode('utf-8')).hexdigest()[:16]
+
+    def chunk_path(self, chunk_index: int) -> Path:
+        """分块文件路径"""
+        return self.sweep_dir / f'chunk_{chunk_index:08d}.npz'
+
+    def completed_chunks(self) -> List[int]:
+        """已完成（已落盘）的分块序号"""
+        return [i for i in range(self.num_chunks) if self.chunk_path(i).exists()]
+
+    def _write_manifest(self) -> None:
+        self.sweep_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.sweep_dir / _MANIFEST_NAME
+        if manifest.exists():
+            return
+        manifest.write_text(
+            json.dumps(
+                {
+                    'sweep_id': self.sweep_id,
+                    'total_points': self.total_points,
+                    'chunk_size': self.chunk_size,
+                    'num_chunks': self.num_chunks,
+                    'param_grid': self.param_grid,
+                    'base_params': self.base_params
+                },
+                ensure_ascii=False,
+                indent=2,
+                default=str
+            ),
+            encoding='utf-8'
+        )
+
+    def run(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        chunk_callback: Optional[Callable[[int, pd.DataFrame], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        执行扫描（自动跳过已完成分块）
+
+        参数:
+            progress_callback: 进度回调 callback(已完成点数, 总点数)
+            chunk_callback: 分块结果回调 callback(分块序号, DataFrame)，每个分块完成
+                            （或续算时从磁盘读取）后立即调用，用于逐块汇总结果，
+                            内存中最多只有一个分块的数据
+
+        返回:
+            执行统计 {total_points, completed_points, resumed_points, failed_points,
+                     failed_chunks, errors}，errors为失败记录
+            [{'chunk': 分块序号, 'point': 参数组合序号（整块失败为None）, 'error': 错误信息}]，
+            最多MAX_REPORTED_ERRORS条
+        """
+        self._write_manifest()
+
+        done = self.completed_chunks()
+        done_set = set(done)
+        pending = [i for i in range(self.num_chunks) if i not in done_set]
+        if pending:
+            # 结果将发生变化，已导出的CSV失效
+            export_path = self.sweep_dir / _EXPORT_NAME
+            if export_path.exists():
+                export_path.unlink()
+
+        stats: Dict[str, Any] = {
+            'total_points': self.total_points,
+            'completed_points': 0,
+            'resumed_points': 0,
+            'failed_points': 0,
+            'failed_chunks': 0,
+            'errors': []
+        }
+
+        def record_errors(chunk_index: int, errors: Sequence[Tuple[Optional[int], str]]) -> None:
+            room = MAX_REPORTED_ERRORS - len(stats['errors'])
+            stats['errors'].extend(
+                {'chunk': chunk_index, 'point': point, 'error': message}
+                for point, message in list(errors)[:max(room, 0)]
+            )
+
+        def finish_chunk(chunk_index: int, errors: Sequence[Tuple[int, str]]) -> None:
+            start, stop = self._chunk_bounds(chunk_index)
+            stats['completed_points'] += stop - start
+            stats['failed_points'] += len(errors)
+            record_errors(chunk_index, errors)
+            if chunk_callback:
+                chunk_callback(chunk_index, self.read_chunk(chunk_index))
+            if progress_callback:
+                progress_callback(stats['completed_points'], self.total_points)
+
+        def fail_chunk(chunk_index: int, exc: BaseException) -> None:
+            # 整块失败不落盘，重新运行时会重试
+            start, stop = self._chunk_bounds(chunk_index)
+            stats['completed_points'] += stop - start
+            stats['failed_points'] += stop - start
+            stats['failed_chunks'] += 1
+            record_errors(chunk_index, [(None, f"{type(exc).__name__}: {exc}")])
+            if progress_callback:
+                progress_callback(stats['completed_points'], self.total_points)
+
+        if progress_callback:
+            progress_callback(0, self.total_points)
+
+        for chunk_index in done:
+            finish_chunk(chunk_index, self.chunk_failures(chunk_index))
+        stats['resumed_points'] = stats['completed_points']
+
+        def submit_args(chunk_index: int) -> Tuple:
+            start, stop = self._chunk_bounds(chunk_index)
+            return (self.evaluate, self.base_params, self.param_grid, start, stop,
+                    str(self.chunk_path(chunk_index)))
+
+        if self.max_workers == 1:
+            for chunk_index in pending:
+                try:
+                    _, _, errors = _run_chunk(*submit_args(chunk_index))
+                except Exception as e:
+                    fail_chunk(chunk_index, e)
+                else:
+                    finish_chunk(chunk_index, errors)
+        else:
+            workers = self.max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # 限制在途分块数量，避免一次性提交全部任务
+                max_in_flight = 2 * workers
+                queue = iter(pending)
+                in_flight = {}
+                while True:
+                    for chunk_index in itertools.islice(queue, max_in_flight - len(in_flight)):
+                        future = pool.submit(_run_chunk, *submit_args(chunk_index))
+                        in_flight[future] = chunk_index
+                    if not in_flight:
+                        break
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        chunk_index = in_flight.pop(future)
+                        try:
+                            _, _, errors = future.result()
+                        except Exception as e:
+                            fail_chunk(chunk_index, e)
+                        else:
+                            finish_chunk(chunk_index, errors)
+
+        if stats['failed_points']:
+            first = stats['errors'][0]
+            warnings.warn(
+                f"参数扫描 {self.sweep_id}: {stats['failed_points']} 个参数组合分析失败"
+                f"（其中 {stats['failed_chunks']} 个分块整体失败），"
+                f"首个错误（分块 {first['chunk']}）: {first['error']}",
+                RuntimeWarning,
+                stacklevel=2
+            )
+
+        return stats
+
+    def _chunk_bounds(self, chunk_index: int) -> Tuple[int, int]:
+        start = chunk_index * self.chunk_size
+        return start, min(start + self.chunk_size, self.total_points)
+
+    def point_params(self, index: int) -> Dict[str, Any]:
+        """按全因子序号取得参数组合（用于定位失败的参数组合）"""
+        return next(_grid_points(self.param_grid, index, index + 1))
+
+    def read_chunk(self, chunk_index: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """读取一个已完成分块的结果，可只读取部分列"""
+        with np.load(self.chunk_path(chunk_index), allow_pickle=False) as data:
+            names = [name for name in data.files
+                     if name not in (_FAILED_INDEX_KEY, _FAILED_ERROR_KEY)
+                     and not name.startswith(_VALID_PREFIX)]
+            if columns is not None:
+                names = [name for name in columns if name in names]
+            return pd.DataFrame({name: _decode_column(data, name) for name in names})
+
+    def chunk_failures(self, chunk_index: int) -> List[Tuple[int, str]]:
+        """读取一个已完成分块中失败的参数组合 [(参数组合序号, 错误信息)]"""
+        with np.load(self.chunk_path(chunk_index), allow_pickle=False) as data:
+            if _FAILED_INDEX_KEY not in data.files:
+                return []
+            return list(zip(data[_FAILED_INDEX_KEY].tolist(), data[_FAILED_ERROR_KEY].tolist()))
+
+    def iter_chunks(self, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """逐块读取已完成的结果，可只读取部分列"""
+        for chunk_index in self.completed_chunks():
+            yield self.read_chunk(chunk_index, columns)
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """读取全部已完成结果为DataFrame（仅适用于小规模扫描，大规模扫描请用iter_chunks逐块处理）"""
+        frames = list(self.iter_chunks(columns))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def export_csv(self, path: Optional[Path] = None) -> Path:
+        """逐块追加写出全部已完成结果为CSV文件，默认写入扫描目录并复用已导出的文件"""
+        path = Path(path) if path is not None else self.sweep_dir / _EXPORT_NAME
+        if path.exists() and path == self.sweep_dir / _EXPORT_NAME:
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8-sig', newline='') as f:
+                for i, frame in enumerate(self.iter_chunks()):
+                    frame.to_csv(f, index=False, header=(i == 0))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+
+class SweepAggregator:
+    """
+    扫描结果流式汇总器
+
+    逐块累计结果的精确统计量（计数、均值、标准差、极值、相关系数、
+    类别频数、按扫描参数分组的均值），并以蓄水池抽样保留固定大小的
+    均匀随机样本用于散点图、分布图和数据浏览。内存占用与扫描规模无关。
+
+    数值列中的缺失值（NaN/None）不参与统计：均值与极值按各列有效值计算，
+    协方差与相关系数按两列同时有效的行计算。样本列的数据类型随后续分块
+    提升（如更长的字符串、整数列出现缺失值），不会截断或丢失取值。
+    """
+
+    def __init__(
+        self,
+        group_columns: Sequence[str] = (),
+        value_columns: Sequence[str] = (),
+        category_columns: Sequence[str] = (),
+        sample_size: int = 20000,
+        seed: Optional[int] = 0
+    ):
+        """
+        初始化汇总器
+
+        参数:
+            group_columns: 分组参数，累计其单参数及两两组合分组下value_columns的均值
+            value_columns: 分组统计的结果量
+            category_columns: 统计频数的类别列
+            sample_size: 随机样本的最大行数
+            seed: 蓄水池抽样的随机种子
+        """
+        self.group_columns = list(group_columns)
+        self.value_columns = list(value_columns)
+        self.category_columns = list(category_columns)
+        self.sample_size = max(1, int(sample_size))
+        self._rng = np.random.default_rng(seed)
+
+        self.count = 0
+        self.columns: List[str] = []
+        self.numeric_columns: List[str] = []
+        self._shift: Optional[np.ndarray] = None
+        self._pair_count: Optional[np.ndarray] = None
+        self._pair_sum: Optional[np.ndarray] = None
+        self._pair_square: Optional[np.ndarray] = None
+        self._cross: Optional[np.ndarray] = None
+        self._min: Optional[np.ndarray] = None
+        self._max: Optional[np.ndarray] = None
+        self._categories: Dict[str, pd.Series] = {}
+        self._groups: Dict[Tuple[str, ...], Optional[pd.DataFrame]] = {}
+        self._sample: Dict[str, np.ndarray] = {}
+        self._sample_rows = 0
+
+    def update(self, frame: pd.DataFrame) -> None:
+        """累计一个分块的结果"""
+        if frame.empty:
+            return
+        if not self.columns:
+            self._initialize(frame)
+
+        values = self._numeric_values(frame)
+        valid = np.isfinite(values)
+        mask = valid.astype(float)
+        centered = np.where(valid, values - self._shift, 0.0)
+        # [i, j]元素只累计第i、j列同时有效的行
+        self._pair_count += mask.T @ mask
+        self._pair_sum += centered.T @ mask
+        self._pair_square += (centered ** 2).T @ mask
+        self._cross += centered.T @ centered
+        self._min = np.minimum(self._min, np.where(valid, values, np.inf).min(axis=0))
+        self._max = np.maximum(self._max, np.where(valid, values, -np.inf).max(axis=0))
+
+        for name in self.category_columns:
+            counts = frame[name].value_counts()
+            self._categories[name] = self._categories[name].add(counts, fill_value=0)
+
+        for key in self._groups:
+            grouped = frame.groupby(list(key))[self.value_columns].agg(['sum', 'count'])
+            if self._groups[key] is not None:
+                grouped = self._groups[key].add(grouped, fill_value=0)
+            self._groups[key] = grouped
+
+        self._update_sample(frame)
+        self.count += len(frame)
+
+    def _numeric_values(self, frame: pd.DataFrame) -> np.ndarray:
+        """数值列转为浮点矩阵，None与无法解析的取值记为NaN"""
+        return frame[self.numeric_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+    def _initialize(self, frame: pd.DataFrame) -> None:
+        self.columns = list(frame.columns)
+        self.numeric_columns = list(frame.select_dtypes(include=[np.number]).columns)
+        n = len(self.numeric_columns)
+        # 以首个分块有效值的均值为平移量累计一阶、二阶矩，减小大样本下的舍入误差
+        values = self._numeric_values(frame)
+        valid = np.isfinite(values)
+        counts = valid.sum(axis=0)
+        self._shift = np.where(counts > 0, np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+        self._pair_count = np.zeros((n, n))
+        self._pair_sum = np.zeros((n, n))
+        self._pair_square = np.zeros((n, n))
+        self._cross = np.zeros((n, n))
+        self._min = np.full(n, np.inf)
+        self._max = np.full(n, -np.inf)
+        self._categories = {name: pd.Series(dtype=float) for name in self.category_columns}
+        keys = [(name,) for name in self.group_columns]
+        keys += list(itertools.combinations(self.group_columns, 2))
+        self._groups = {key: None for key in keys}
+        self._sample = {
+            name: np.empty(self.sample_size, dtype=frame[name].to_numpy().dtype)
+            for name in self.columns
+        }
+
+    def _update_sample(self, frame: pd.DataFrame) -> None:
+        """蓄水池抽样（Algorithm R）：每个已见行以相同概率留在样本中"""
+        n = len(frame)
+        arrays = {name: frame[name].to_numpy() for name in self.columns}
+        for name, array in arrays.items():
+            # 按本分块的数据类型提升样本列（更长的字符串、整数列中的NaN、混合类型）
+            dtype = np.result_type(self._sample[name].dtype, array.dtype)
+            if dtype != self._sample[name].dtype:
+                self._sample[name] = self._sample[name].astype(dtype)
+
+        fill = min(self.sample_size - self._sample_rows, n)
+        if fill > 0:
+            for name, array in arrays.items():
+                self._sample[name][self._sample_rows:self._sample_rows + fill] = array[:fill]
+            self._sample_rows += fill
+
+        rows = np.arange(fill, n)
+        if rows.size == 0:
+            return
+        slots = self._rng.integers(0, self.count + rows + 1)
+        accept = slots < self.sample_size
+        slots, rows = slots[accept], rows[accept]
+        # 同一位置多次被替换时保留最后一次
+        _, last = np.unique(slots[::-1], return_index=True)
+        keep = slots.size - 1 - last
+        for name, array in arrays.items():
+            self._sample[name][slots[keep]] = array[rows[keep]]
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """均匀随机样本（总行数不超过sample_size时为全部结果）"""
+        return pd.DataFrame({name: values[:self._sample_rows] for name, values in self._sample.items()})
+
+    def valid_count(self) -> pd.Series:
+        """数值列有效值（非缺失）个数"""
+        if not self.count:
+            return pd.Series(dtype=float)
+        return pd.Series(np.diag(self._pair_count), index=self.numeric_columns)
+
+    def mean(self) -> pd.Series:
+        """数值列均值（忽略缺失值）"""
+        if not self.count:
+            return pd.Series(dtype=float)
+        counts = np.diag(self._pair_count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(counts > 0, self._shift + np.diag(self._pair_sum) / counts, np.nan)
+        return pd.Series(mean, index=self.numeric_columns)
+
+    def min(self) -> pd.Series:
+        """数值列最小值（忽略缺失值）"""
+        return pd.Series(np.where(np.isfinite(self._min), self._min, np.nan),
+                         index=self.numeric_columns, dtype=float)
+
+    def max(self) -> pd.Series:
+        """数值列最大值（忽略缺失值）"""
+        return pd.Series(np.where(np.isfinite(self._max), self._max, np.nan),
+                         index=self.numeric_columns, dtype=float)
+
+    def _covariance(self) -> np.ndarray:
+        """按两列同时有效的行计算的样本协方差矩阵"""
+        n = self._pair_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (self._cross - self._pair_sum * self._pair_sum.T / n) / (n - 1)
+        return np.where(n > 1, cov, np.nan)
+
+    def std(self) -> pd.Series:
+        """数值列样本标准差"""
+        if not self.count:
+            return pd.Series(dtype=float)
+        return pd.Series(np.sqrt(np.clip(np.diag(self._covariance()), 0, None)),
+                         index=self.numeric_columns)
+
+    def describe(self) -> pd.DataFrame:
+        """数值列统计摘要（count/mean/std/min/max）"""
+        return pd.DataFrame({
+            'count': self.valid_count(),
+            'mean': self.mean(),
+            'std': self.std(),
+            'min': self.min(),
+            'max': self.max()
+        }).T
+
+    def corr(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """数值列Pearson相关系数矩阵"""
+        columns = list(columns) if columns is not None else self.numeric_columns
+        index = [self.numeric_columns.index(name) for name in columns]
+        cov = self._covariance()[np.ix_(index, index)]
+        # 方差同样只取两列同时有效的行
+        n = self._pair_count[np.ix_(index, index)]
+        pair_sum = self._pair_sum[np.ix_(index, index)]
+        pair_square = self._pair_square[np.ix_(index, index)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = (pair_square - pair_sum ** 2 / n) / (n - 1)
+            corr = cov / np.sqrt(var * var.T)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def value_counts(self, name: str) -> pd.Series:
+        """类别列频数（降序）"""
+        counts = self._categories.get(name, pd.Series(dtype=float))
+        return counts.astype(np.int64).sort_values(ascending=False)
+
+    def group_mean(self, by: Sequence[str], value: str) -> pd.DataFrame:
+        """按一个或两个分组参数的结果均值，返回列为 [*by, value] 的DataFrame"""
+        by = list(by)
+        key = tuple(name for name in self.group_columns if name in by)
+        if key not in self._groups or len(key) != len(by):
+            raise KeyError(f"未累计分组 {by} 的统计量")
+        grouped = self._groups[key]
+        if grouped is None:
+            return pd.DataFrame(columns=by + [value])
+        result = (grouped[(value, 'sum')] / grouped[(value, 'count')]).rename(value).reset_index()
+        return result[by + [value]]